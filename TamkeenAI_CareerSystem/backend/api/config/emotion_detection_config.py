@@ -5,6 +5,9 @@ EMOTION_LABELS = ['Angry', 'Disgust', 'Fear', 'Happy', 'Sad', 'Surprise', 'Neutr
 MODEL_INPUT_SIZE = (48, 48)
 MODEL_PATH = 'models/emotion_model.h5'
 
+# Number of face crops per forward pass when analyzing video
+VIDEO_BATCH_SIZE = 64
+
 # Hugging Face dataset configuration
 DATASET_REPO = "ashishpatel26/facial-expression-recognitionferchallenge"
 
@@ -12,6 +15,9 @@ DATASET_REPO = "ashishpatel26/facial-expression-recognitionferchallenge"
 DEFAULT_ANSWER_TIME = 30  # seconds
 DEFAULT_NUM_QUESTIONS = 5
 
+# Interview sessions kept in memory per worker (the rest are read from sessions.db)
+INTERVIEW_SESSION_CACHE_SIZE = 256
+
 # Role-specific interview questions (sample categories)
 ROLES = [
     "Data Scientist",
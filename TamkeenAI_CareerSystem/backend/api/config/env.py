@@ -64,4 +64,12 @@ ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
 # Added Hugging Face token
-HF_TOKEN = os.getenv("HF_TOKEN") 
\ No newline at end of file
+HF_TOKEN = os.getenv("HF_TOKEN") 
+
+# Run Hugging Face models with local pipelines instead of the inference API
+HF_LOCAL_INFERENCE = os.getenv("HF_LOCAL_INFERENCE", "False").lower() in ('true', '1', 't')
+
+# Memory budget of loaded local pipelines (MB) and micro-batching settings
+HF_PIPELINE_CACHE_MB = int(os.getenv("HF_PIPELINE_CACHE_MB", "2048"))
+HF_BATCH_WAIT_MS = float(os.getenv("HF_BATCH_WAIT_MS", "5"))
+HF_MAX_BATCH_SIZE = int(os.getenv("HF_MAX_BATCH_SIZE", "16"))
\ No newline at end of file
@@ -10,7 +10,7 @@ import os
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Body, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Path, Request, Response
 from fastapi.responses import JSONResponse
 
 from ..models.dashboard_models import (
@@ -36,8 +36,17 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
 @router.get("/{user_id}", response_model=DashboardResponse)
 async def get_dashboard_data(
+    request: Request,
+    response: Response,
     user_id: str = Path(..., description="User ID"),
     current_user: Dict = Depends(get_current_user)
 ):
@@ -51,6 +60,10 @@ async def get_dashboard_data(
     - Career paths
     - Activity logs
     - Market insights
+    
+    Served from the user's dashboard snapshot with an ETag; a request whose
+    If-None-Match matches gets 304. Sections that could not be loaded in time
+    are listed in the X-Dashboard-Partial header.
     """
     # Verify permissions (user can only access their own data unless admin)
     if current_user["id"] != user_id and current_user["role"] != "admin":
@@ -58,7 +71,7 @@ async def get_dashboard_data(
     
     dashboard_service = DashboardService()
     try:
-        dashboard_data = dashboard_service.get_complete_dashboard(user_id)
+        dashboard_data, etag = dashboard_service.get_dashboard_snapshot(user_id)
         
         # Track dashboard view activity in gamification system
         gamification = GamificationEngine(user_id)
@@ -68,6 +81,16 @@ async def get_dashboard_data(
             "dashboard_stats": {"dashboard_views": 1}
         })
         
+        if etag is None:
+            response.headers["X-Dashboard-Partial"] = ",".join(dashboard_data["partial_sections"])
+            response.headers["Cache-Control"] = "no-store"
+            return dashboard_data
+        
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        
+        response.headers.update(headers)
         return dashboard_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving dashboard: {str(e)}")
@@ -9,6 +9,10 @@ import openai
 import logging
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
+from ..services.llm_service import stream_llm_provider
+from ..services.llm_client import ProviderError
+from ..utils.streaming import wants_stream, stream_response
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -276,6 +280,86 @@ def get_suggested_questions(user_id):
         return jsonify({"error": str(e)}), 500
 
 # Send message
+# Coach persona system prompts
+COACH_PERSONA_PROMPTS = {
+    'noora': "You are Noora, a UAE government sector interview specialist with expertise in Emiratization policies.",
+    'ahmed': "You are Ahmed, a tech industry interview coach with expertise in programming and system design.",
+    'fatima': "You are Fatima, specializing in helping women navigate career opportunities in the UAE.",
+    'zayd': "You are Zayd, an AI-driven interview coach specializing in analytical thinking and problem-solving."
+}
+
+# Reply used when OpenAI is not available
+FALLBACK_COACH_RESPONSE = "I understand your question. To provide the best advice for interview preparation, I would recommend focusing on understanding the job description thoroughly, preparing specific examples from your experience, and practicing common interview questions relevant to your field."
+
+# Build the OpenAI messages for a coach reply from the conversation history
+def build_coach_messages(conversation_id, message, coach_persona):
+    # Get conversation history
+    conversation_history = []
+    try:
+        # Retrieve from MongoDB
+        conversation = conversations_collection.find_one({"_id": ObjectId(conversation_id)})
+        if conversation:
+            conversation_history = conversation.get("messages", [])
+    except Exception as e:
+        logger.error(f"Error retrieving conversation: {e}")
+        # Use in-memory fallback
+        for conv in conversations_memory:
+            if conv.get("id") == conversation_id:
+                conversation_history = conv.get("messages", [])
+                break
+    
+    # Prepare OpenAI messages
+    openai_messages = [
+        {"role": "system", "content": COACH_PERSONA_PROMPTS.get(coach_persona, COACH_PERSONA_PROMPTS['zayd'])}
+    ]
+    
+    # Add conversation history (limit to last 10 messages to save tokens)
+    for msg in conversation_history[-10:]:
+        if msg.get("role") in ["user", "assistant"]:
+            openai_messages.append({
+                "role": msg.get("role"),
+                "content": msg.get("content")
+            })
+    
+    # Add the new user message
+    if isinstance(message, dict) and "content" in message:
+        openai_messages.append({
+            "role": "user",
+            "content": message.get("content")
+        })
+    elif isinstance(message, str):
+        openai_messages.append({
+            "role": "user",
+            "content": message
+        })
+    else:
+        openai_messages.append({
+            "role": "user",
+            "content": str(message)
+        })
+    
+    return openai_messages
+
+# Append the user message and AI response to a conversation
+def save_exchange(conversation_id, user_message, ai_message):
+    try:
+        # Update in MongoDB
+        conversations_collection.update_one(
+            {"_id": ObjectId(conversation_id)},
+            {
+                "$push": {"messages": {"$each": [user_message, ai_message]}},
+                "$set": {"updated_at": datetime.datetime.utcnow()}
+            }
+        )
+    except Exception as e:
+        logger.error(f"Error updating conversation in MongoDB: {e}")
+        # Update in-memory fallback
+        for conv in conversations_memory:
+            if conv.get("id") == conversation_id:
+                conv["messages"].extend([user_message, ai_message])
+                conv["updated_at"] = datetime.datetime.utcnow()
+                break
+
 @interview_bp.route('/api/interviews/message', methods=['POST'])
 def send_message():
     try:
@@ -292,63 +376,50 @@ def send_message():
         # Get current timestamp
         timestamp = datetime.datetime.utcnow().isoformat()
         
+        user_message = {
+            "role": "user",
+            "content": message if isinstance(message, str) else message.get("content"),
+            "timestamp": timestamp
+        }
+        
+        # Save the full reply once it has been streamed
+        def finish_stream(ai_response):
+            save_exchange(conversation_id, user_message, {
+                "role": "assistant",
+                "content": ai_response,
+                "timestamp": timestamp
+            })
+            return {
+                "data": {
+                    "role": "assistant",
+                    "content": ai_response,
+                    "timestamp": timestamp
+                }
+            }
+        
+        # Stream the reply as it is generated if the client accepts it
+        if wants_stream(data):
+            if not (use_openai and openai_api_key):
+                return stream_response(iter([FALLBACK_COACH_RESPONSE]), on_complete=finish_stream)
+            
+            try:
+                chunks = stream_llm_provider(
+                    build_coach_messages(conversation_id, message, coach_persona),
+                    provider='openai',
+                    model="gpt-3.5-turbo",
+                    max_tokens=500,
+                    temperature=0.7
+                )
+                return stream_response(chunks, on_complete=finish_stream)
+            except ProviderError as e:
+                logger.warning(f"Streaming unavailable, sending a single response: {e}")
+        
         # Generate AI response
         ai_response = ""
         
         if use_openai and openai_api_key:
             try:
-                # Prepare a prompt based on coach persona
-                persona_prompts = {
-                    'noora': "You are Noora, a UAE government sector interview specialist with expertise in Emiratization policies.",
-                    'ahmed': "You are Ahmed, a tech industry interview coach with expertise in programming and system design.",
-                    'fatima': "You are Fatima, specializing in helping women navigate career opportunities in the UAE.",
-                    'zayd': "You are Zayd, an AI-driven interview coach specializing in analytical thinking and problem-solving."
-                }
-                
-                # Get conversation history
-                conversation_history = []
-                try:
-                    # Retrieve from MongoDB
-                    conversation = conversations_collection.find_one({"_id": ObjectId(conversation_id)})
-                    if conversation:
-                        conversation_history = conversation.get("messages", [])
-                except Exception as e:
-                    logger.error(f"Error retrieving conversation: {e}")
-                    # Use in-memory fallback
-                    for conv in conversations_memory:
-                        if conv.get("id") == conversation_id:
-                            conversation_history = conv.get("messages", [])
-                            break
-                
-                # Prepare OpenAI messages
-                openai_messages = [
-                    {"role": "system", "content": persona_prompts.get(coach_persona, persona_prompts['zayd'])}
-                ]
-                
-                # Add conversation history (limit to last 10 messages to save tokens)
-                for msg in conversation_history[-10:]:
-                    if msg.get("role") in ["user", "assistant"]:
-                        openai_messages.append({
-                            "role": msg.get("role"),
-                            "content": msg.get("content")
-                        })
-                
-                # Add the new user message
-                if isinstance(message, dict) and "content" in message:
-                    openai_messages.append({
-                        "role": "user",
-                        "content": message.get("content")
-                    })
-                elif isinstance(message, str):
-                    openai_messages.append({
-                        "role": "user",
-                        "content": message
-                    })
-                else:
-                    openai_messages.append({
-                        "role": "user",
-                        "content": str(message)
-                    })
+                openai_messages = build_coach_messages(conversation_id, message, coach_persona)
                 
                 # Call OpenAI API
                 response = openai.ChatCompletion.create(
@@ -365,7 +436,7 @@ def send_message():
                 ai_response = "I apologize, but I'm having trouble generating a response right now. Please try again or ask a different question."
         else:
             # Fallback response if OpenAI is not available
-            ai_response = "I understand your question. To provide the best advice for interview preparation, I would recommend focusing on understanding the job description thoroughly, preparing specific examples from your experience, and practicing common interview questions relevant to your field."
+            ai_response = FALLBACK_COACH_RESPONSE
         
         # Create AI response message
         ai_message = {
@@ -375,29 +446,7 @@ def send_message():
         }
         
         # Update conversation with user message and AI response
-        user_message = {
-            "role": "user",
-            "content": message if isinstance(message, str) else message.get("content"),
-            "timestamp": timestamp
-        }
-        
-        try:
-            # Update in MongoDB
-            conversations_collection.update_one(
-                {"_id": ObjectId(conversation_id)},
-                {
-                    "$push": {"messages": {"$each": [user_message, ai_message]}},
-                    "$set": {"updated_at": datetime.datetime.utcnow()}
-                }
-            )
-        except Exception as e:
-            logger.error(f"Error updating conversation in MongoDB: {e}")
-            # Update in-memory fallback
-            for conv in conversations_memory:
-                if conv.get("id") == conversation_id:
-                    conv["messages"].extend([user_message, ai_message])
-                    conv["updated_at"] = datetime.datetime.utcnow()
-                    break
+        save_exchange(conversation_id, user_message, ai_message)
         
         return jsonify({
             "data": {
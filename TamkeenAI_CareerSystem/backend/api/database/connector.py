@@ -9,7 +9,7 @@ import logging
 from typing import Dict, List, Optional, Union, Any
 from pymongo import MongoClient
 from pymongo.server_api import ServerApi
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError, ConfigurationError
 from dotenv import load_dotenv
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
@@ -59,101 +59,34 @@ MONGO_TLS = os.getenv('MONGO_TLS', None)
 TLS_CERT_PATH = os.getenv('TLS_CERT_PATH', None)
 PYMONGO_TLS_INSECURE = os.getenv('PYMONGO_TLS_INSECURE_SKIP_VERIFY', 'false').lower() == 'true'
 
-# Mock collection for testing or when MongoDB is not available
-class MockCollection:
-    def __init__(self, name):
-        self.name = name
-        self.data = {}
-        self._id = 0
-
-    def insert_one(self, document):
-        self._id += 1
-        _id = document.get("_id", self._id)
-        document["_id"] = _id
-        self.data[_id] = document
-        return InsertOneResult(_id, True)
-
-    def find_one(self, query=None, *args, **kwargs):
-        if query is None:
-            query = {}
-
-        if "_id" in query:
-            _id = query["_id"]
-            return self.data.get(_id)
-
-        for doc in self.data.values():
-            match = True
-            for key, value in query.items():
-                if key not in doc or doc[key] != value:
-                    match = False
-                    break
-            if match:
-                return doc
-        return None
-
-    def find(self, query=None, *args, **kwargs):
-        if query is None:
-            query = {}
-
-        result = []
-        for doc in self.data.values():
-            match = True
-            for key, value in query.items():
-                if key not in doc or doc[key] != value:
-                    match = False
-                    break
-            if match:
-                result.append(doc)
-        return MockCursor(result)
-    
-    def update_one(self, query, update, *args, **kwargs):
-        doc = self.find_one(query)
-        if doc is not None:
-            _id = doc["_id"]
-            if "$set" in update:
-                for key, value in update["$set"].items():
-                    doc[key] = value
-            self.data[_id] = doc
-            return UpdateResult(True, 1)
-        return UpdateResult(True, 0)
-    
-    def delete_one(self, query):
-        doc = self.find_one(query)
-        if doc is not None:
-            _id = doc["_id"]
-            del self.data[_id]
-            return DeleteResult(True, 1)
-        return DeleteResult(True, 0)
-
-class MockCursor:
-    def __init__(self, data):
-        self.data = data
-        self.current = 0
-
-    def __iter__(self):
-        return self
-
-    def __next__(self):
-        if self.current < len(self.data):
-            doc = self.data[self.current]
-            self.current += 1
-            return doc
-        raise StopIteration
-
-class InsertOneResult:
-    def __init__(self, inserted_id, acknowledged):
-        self.inserted_id = inserted_id
-        self.acknowledged = acknowledged
-
-class UpdateResult:
-    def __init__(self, acknowledged, modified_count):
-        self.acknowledged = acknowledged
-        self.modified_count = modified_count
-
-class DeleteResult:
-    def __init__(self, acknowledged, deleted_count):
-        self.acknowledged = acknowledged
-        self.deleted_count = deleted_count
+# Local document store for testing or when MongoDB is not available
+from .mock_store import MockCollection
+
+# Directory for the mock collections' append-only logs (unset: memory only)
+MOCK_DB_DIR = os.getenv('MOCK_DB_DIR', None)
+
+# Indexes of mock collections, besides _id and user_id: (field or key list, unique)
+MOCK_INDEXES = {
+    'users': [('email', True)],
+    'jobs': [('title', False)],
+    'applications': [([('user_id', 1), ('job_id', 1)], True), ('job_id', False)],
+    'skills': [('name', True)],
+    'user_activities': [('timestamp', False)],
+    'interview_sessions': [('session_id', False), ('timestamp', False)],
+    'emotion_analysis': [('session_id', False)],
+    'confidence_metrics': [('timestamp', False)],
+}
+
+_mock_collections = {}
+
+def get_mock_collection(name):
+    """Get the mock collection for name, creating it with its declared indexes."""
+    if name not in _mock_collections:
+        collection = MockCollection(name, log_dir=MOCK_DB_DIR)
+        for keys, unique in MOCK_INDEXES.get(name, []):
+            collection.create_index(keys, unique=unique)
+        _mock_collections[name] = collection
+    return _mock_collections[name]
 
 # MongoDB client
 mongo_client = None
@@ -181,7 +114,7 @@ try:
     mongo_client.admin.command('ping')
     db = mongo_client[MONGO_DB]
     logger.info(f"Successfully connected to MongoDB Atlas")
-except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+except (ConnectionFailure, ServerSelectionTimeoutError, ConfigurationError) as e:
     logger.error(f"Failed to connect to MongoDB Atlas: {e}")
     logger.warning("Using mock database instead")
     db = None
@@ -195,7 +128,7 @@ def get_collection(name):
         collections[name] = db[name]
     else:
         logger.warning(f"Creating mock collection for {name}")
-        collections[name] = MockCollection(name)
+        collections[name] = get_mock_collection(name)
     
     return collections[name]
 
@@ -203,12 +136,12 @@ def get_collection(name):
 def create_mock_collections():
     logger.info("Using mock database collections")
     print("Using mock database collections")
-    user_collection = MockCollection('users')
-    resume_collection = MockCollection('resumes')
-    job_collection = MockCollection('jobs')
-    application_collection = MockCollection('applications')
-    skill_collection = MockCollection('skills')
-    activity_collection = MockCollection('user_activities')
+    user_collection = get_mock_collection('users')
+    resume_collection = get_mock_collection('resumes')
+    job_collection = get_mock_collection('jobs')
+    application_collection = get_mock_collection('applications')
+    skill_collection = get_mock_collection('skills')
+    activity_collection = get_mock_collection('user_activities')
     return (
         user_collection, resume_collection, job_collection,
         application_collection, skill_collection, activity_collection
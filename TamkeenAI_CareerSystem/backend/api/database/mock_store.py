@@ -0,0 +1,773 @@
+"""
+In-memory document store for TamkeenAI.
+
+Local stand-in for MongoDB collections, used when Atlas is unreachable or
+USE_MOCK_DB is set. It supports the subset of the pymongo collection API the
+application uses:
+
+- hash indexes on declared fields (plus user_id by default; _id lookups go
+  straight to the document table), kept in sorted key order on demand so
+  $gt/$gte/$lt/$lte ranges and $in lists are answered from the index;
+- queries with equality, $eq/$ne/$in/$nin/$gt/$gte/$lt/$lte/$exists,
+  $and/$or, dotted paths and array fields;
+- cursors with sort/skip/limit and projections;
+- $set/$unset/$inc/$push/$addToSet/$pull updates and upserts;
+- optional persistence to an append-only log per collection, replayed on
+  start and compacted when it grows well beyond the live documents.
+"""
+
+import os
+import copy
+import json
+import bisect
+import logging
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Dict, List, Optional, Union, Any, Iterable, Tuple
+
+try:
+    from bson import ObjectId
+except ImportError:
+    ObjectId = None
+
+try:
+    from pymongo.errors import DuplicateKeyError
+except ImportError:
+    class DuplicateKeyError(Exception):
+        """Raised when a write would duplicate a unique index key"""
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Fields indexed on every collection (besides _id)
+DEFAULT_INDEXES = ("user_id",)
+
+# Log entries always allowed before a log is compacted
+COMPACT_MIN_ENTRIES = 10000
+
+_MISSING = object()
+_RANGE_OPS = ("$gt", "$gte", "$lt", "$lte")
+
+
+def _get_path(doc: Dict[str, Any], path: str) -> Any:
+    """Value at a dotted path; paths through arrays collect a list of values"""
+    value = doc
+    for part in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(part, _MISSING)
+        elif isinstance(value, list):
+            if part.isdigit():
+                index = int(part)
+                value = value[index] if index < len(value) else _MISSING
+            else:
+                value = [item[part] for item in value if isinstance(item, dict) and part in item]
+                if not value:
+                    return _MISSING
+        else:
+            return _MISSING
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+def _set_path(doc: Dict[str, Any], path: str, value: Any) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset_path(doc: Dict[str, Any], path: str) -> bool:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return False
+    return doc.pop(parts[-1], _MISSING) is not _MISSING
+
+
+def _sort_key(value: Any) -> tuple:
+    """Key ordering values of any type, by type first as MongoDB does"""
+    if value is None or value is _MISSING:
+        return (0,)
+    if isinstance(value, bool):
+        return (8, value)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    if isinstance(value, dict):
+        return (3, json.dumps(value, sort_keys=True, default=str))
+    if isinstance(value, (list, tuple)):
+        return (4, [_sort_key(item) for item in value])
+    if isinstance(value, datetime):
+        return (9, value)
+    # ObjectId and other types order by their string form
+    return (7, type(value).__name__, str(value))
+
+
+def _compare(value: Any, op: str, bound: Any) -> bool:
+    """Range comparison, only between values of the same type bracket"""
+    value_key, bound_key = _sort_key(value), _sort_key(bound)
+    if value_key[0] != bound_key[0]:
+        return False
+    if op == "$gt":
+        return value_key > bound_key
+    if op == "$gte":
+        return value_key >= bound_key
+    if op == "$lt":
+        return value_key < bound_key
+    return value_key <= bound_key
+
+
+def _values(value: Any) -> list:
+    """A value and, for arrays, each of its elements"""
+    if isinstance(value, list):
+        return value + [value]
+    return [value]
+
+
+def _matches_condition(value: Any, condition: Any) -> bool:
+    """Whether a field value satisfies a query condition"""
+    if isinstance(condition, dict) and condition and all(key.startswith("$") for key in condition):
+        for op, operand in condition.items():
+            if op == "$eq":
+                if not _matches_condition(value, operand):
+                    return False
+            elif op == "$ne":
+                if _matches_condition(value, operand):
+                    return False
+            elif op == "$in":
+                if not any(_matches_condition(value, item) for item in operand):
+                    return False
+            elif op == "$nin":
+                if any(_matches_condition(value, item) for item in operand):
+                    return False
+            elif op in _RANGE_OPS:
+                if value is _MISSING or not any(_compare(item, op, operand) for item in _values(value)):
+                    return False
+            elif op == "$exists":
+                if (value is not _MISSING) != bool(operand):
+                    return False
+            else:
+                raise ValueError(f"Unsupported query operator: {op}")
+        return True
+
+    if value is _MISSING:
+        return condition is None
+    return value == condition or (isinstance(value, list) and condition in value)
+
+
+def matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """Whether a document matches a query"""
+    for field, condition in query.items():
+        if field == "$and":
+            if not all(matches(doc, sub_query) for sub_query in condition):
+                return False
+        elif field == "$or":
+            if not any(matches(doc, sub_query) for sub_query in condition):
+                return False
+        elif not _matches_condition(_get_path(doc, field), condition):
+            return False
+    return True
+
+
+def _is_operator_condition(condition: Any) -> bool:
+    return isinstance(condition, dict) and bool(condition) and all(key.startswith("$") for key in condition)
+
+
+def _copy(value: Any) -> Any:
+    """Copy of a document value: nested dicts and lists are copied, scalars shared"""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, (set, bytearray)):
+        return copy.copy(value)
+    return value
+
+
+def _project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Copy of a document with a projection applied"""
+    if not projection:
+        return _copy(doc)
+    include = {field.split(".")[0] for field, keep in projection.items() if keep and field != "_id"}
+    if include:
+        result = {field: _copy(doc[field]) for field in include if field in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            result["_id"] = doc["_id"]
+        return result
+    exclude = {field for field, keep in projection.items() if not keep}
+    return {field: _copy(value) for field, value in doc.items() if field not in exclude}
+
+
+def _encode(value: Any) -> Any:
+    """JSON fallback for values stored in the log"""
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    if ObjectId is not None and isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if "$date" in obj:
+            return datetime.fromisoformat(obj["$date"])
+        if "$oid" in obj and ObjectId is not None:
+            return ObjectId(obj["$oid"])
+    return obj
+
+
+class _FieldIndex:
+    """Hash index over one field (or several, for compound equality lookups)"""
+
+    def __init__(self, fields: Tuple[str, ...], unique: bool = False):
+        self.fields = fields
+        self.unique = unique
+        self.buckets = {}       # key -> {_id: None}, in insertion order
+        self.unindexed = {}     # _ids whose value cannot be hashed; always candidates
+        self._sorted_keys = []  # _sort_key of bucket keys, ascending
+        self._sorted_values = []
+        self._unsorted = []     # bucket keys added since the last sort
+        self._stale = 0         # sorted keys whose bucket has been emptied
+
+    def keys_for(self, doc: Dict[str, Any]) -> Optional[list]:
+        """Index keys of a document, or None if its value cannot be indexed"""
+        values = [_get_path(doc, field) for field in self.fields]
+        values = [None if value is _MISSING else value for value in values]
+        try:
+            if len(self.fields) == 1:
+                value = values[0]
+                # Array fields are indexed by each element (multikey)
+                keys = list(dict.fromkeys(value)) if isinstance(value, list) else [value]
+            else:
+                keys = [tuple(values)]
+            for key in keys:
+                hash(key)
+            return keys
+        except TypeError:
+            return None
+
+    def check(self, _id: Any, doc: Dict[str, Any]) -> None:
+        """Raise DuplicateKeyError if a unique key of doc belongs to another document"""
+        if not self.unique:
+            return
+        for key in self.keys_for(doc) or []:
+            bucket = self.buckets.get(key)
+            if bucket and any(other != _id for other in bucket):
+                raise DuplicateKeyError(f"Duplicate key for index {'_'.join(self.fields)}: {key!r}")
+
+    def add(self, _id: Any, doc: Dict[str, Any]) -> None:
+        keys = self.keys_for(doc)
+        if keys is None:
+            self.unindexed[_id] = None
+            return
+        for key in keys:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = {}
+                self._unsorted.append(key)
+            bucket[_id] = None
+
+    def remove(self, _id: Any, doc: Dict[str, Any]) -> None:
+        keys = self.keys_for(doc)
+        if keys is None:
+            self.unindexed.pop(_id, None)
+            return
+        for key in keys:
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.pop(_id, None)
+                if not bucket:
+                    del self.buckets[key]
+                    self._stale += 1
+
+    def _sort(self) -> None:
+        """Bring the sorted key list up to date"""
+        if not self._unsorted and self._stale <= len(self.buckets):
+            return
+        if len(self._unsorted) > len(self._sorted_keys) // 8 or self._stale > len(self.buckets):
+            keys = sorted(self.buckets, key=_sort_key)
+            self._sorted_keys = [_sort_key(key) for key in keys]
+            self._sorted_values = keys
+            self._stale = 0
+        else:
+            for key in self._unsorted:
+                if key in self.buckets:
+                    sort_key = _sort_key(key)
+                    position = bisect.bisect_left(self._sorted_keys, sort_key)
+                    self._sorted_keys.insert(position, sort_key)
+                    self._sorted_values.insert(position, key)
+        self._unsorted = []
+
+    def _range(self, condition: Dict[str, Any]) -> list:
+        """Ids with keys in the range given by $gt/$gte/$lt/$lte, in key order"""
+        self._sort()
+        lower = upper = None
+        for op in ("$gt", "$gte"):
+            if op in condition:
+                lower = (_sort_key(condition[op]), op == "$gte")
+        for op in ("$lt", "$lte"):
+            if op in condition:
+                upper = (_sort_key(condition[op]), op == "$lte")
+
+        # Ranges stay within the type bracket of their bounds
+        bracket = (lower or upper)[0][0]
+        if lower is None:
+            start = bisect.bisect_left(self._sorted_keys, (bracket,))
+        elif lower[1]:
+            start = bisect.bisect_left(self._sorted_keys, lower[0])
+        else:
+            start = bisect.bisect_right(self._sorted_keys, lower[0])
+        if upper is None:
+            end = bisect.bisect_left(self._sorted_keys, (bracket + 1,))
+        elif upper[1]:
+            end = bisect.bisect_right(self._sorted_keys, upper[0])
+        else:
+            end = bisect.bisect_left(self._sorted_keys, upper[0])
+
+        ids = {}
+        for key in self._sorted_values[start:end]:
+            ids.update(self.buckets.get(key, ()))
+        return list(ids)
+
+    def candidates(self, query: Dict[str, Any]) -> Optional[list]:
+        """
+        Ids of the documents that may match query, or None if this index cannot
+        narrow it down
+        """
+        if len(self.fields) > 1:
+            values = []
+            for field in self.fields:
+                condition = query.get(field, _MISSING)
+                if condition is _MISSING or _is_operator_condition(condition):
+                    return None
+                values.append(condition)
+            try:
+                ids = list(self.buckets.get(tuple(values), ()))
+            except TypeError:
+                return None
+            return ids + list(self.unindexed)
+
+        condition = query.get(self.fields[0], _MISSING)
+        if condition is _MISSING:
+            return None
+        try:
+            if not _is_operator_condition(condition):
+                ids = list(self.buckets.get(condition, ()))
+            elif "$eq" in condition:
+                ids = list(self.buckets.get(condition["$eq"], ()))
+            elif "$in" in condition:
+                ids = {}
+                for value in sorted(condition["$in"], key=_sort_key):
+                    ids.update(self.buckets.get(value, ()))
+                ids = list(ids)
+            elif any(op in condition for op in _RANGE_OPS):
+                ids = self._range(condition)
+            else:
+                return None
+        except TypeError:
+            # Unhashable operand (e.g. an embedded document)
+            return None
+        return ids + list(self.unindexed)
+
+
+class MockCursor:
+    """Cursor over query results, with sort/skip/limit applied when iterated"""
+
+    def __init__(self, data: Iterable[Dict[str, Any]], projection: Optional[Dict[str, Any]] = None):
+        self.data = data
+        self.projection = projection
+        self._sort = []
+        self._skip = 0
+        self._limit = 0
+        self._iterator = None
+
+    def sort(self, key_or_list: Union[str, List[Tuple[str, int]]], direction: int = 1) -> "MockCursor":
+        if isinstance(key_or_list, str):
+            self._sort = [(key_or_list, direction)]
+        else:
+            self._sort = list(key_or_list)
+        return self
+
+    def skip(self, count: int) -> "MockCursor":
+        self._skip = count
+        return self
+
+    def limit(self, count: int) -> "MockCursor":
+        self._limit = count
+        return self
+
+    def _results(self):
+        docs = self.data
+        if self._sort:
+            docs = list(docs)
+            # Stable sorts, least significant key first
+            for field, direction in reversed(self._sort):
+                docs.sort(key=lambda doc: _sort_key(_get_path(doc, field)), reverse=direction < 0)
+        end = self._skip + self._limit if self._limit else None
+        for doc in islice(docs, self._skip, end):
+            yield _project(doc, self.projection)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._iterator is None:
+            self._iterator = self._results()
+        return next(self._iterator)
+
+
+class InsertOneResult:
+    def __init__(self, inserted_id, acknowledged):
+        self.inserted_id = inserted_id
+        self.acknowledged = acknowledged
+
+
+class InsertManyResult:
+    def __init__(self, inserted_ids, acknowledged):
+        self.inserted_ids = inserted_ids
+        self.acknowledged = acknowledged
+
+
+class UpdateResult:
+    def __init__(self, acknowledged, modified_count, matched_count=None, upserted_id=None):
+        self.acknowledged = acknowledged
+        self.modified_count = modified_count
+        self.matched_count = modified_count if matched_count is None else matched_count
+        self.upserted_id = upserted_id
+
+
+class DeleteResult:
+    def __init__(self, acknowledged, deleted_count):
+        self.acknowledged = acknowledged
+        self.deleted_count = deleted_count
+
+
+class MockCollection:
+    """Indexed in-memory collection with an optional append-only log"""
+
+    def __init__(self, name: str, indexes: Optional[Iterable[str]] = None, log_dir: Optional[str] = None):
+        """
+        Initialize the collection
+
+        Args:
+            name: Collection name
+            indexes: Fields to index in addition to DEFAULT_INDEXES
+            log_dir: Directory for the collection's append-only log (None keeps
+                the collection in memory only)
+        """
+        self.name = name
+        self.data = {}
+        self._id = 0
+        self._indexes = {}
+        self._lock = threading.RLock()
+        self._log = None
+        self._log_entries = 0
+        self.log_file = os.path.join(log_dir, f"{name}.jsonl") if log_dir else None
+
+        for field in list(DEFAULT_INDEXES) + list(indexes or []):
+            self.create_index(field)
+
+        if self.log_file:
+            os.makedirs(log_dir, exist_ok=True)
+            self._replay()
+            self._log = open(self.log_file, "a", encoding="utf-8")
+
+    # ===== Indexes =====
+
+    def create_index(self, keys: Union[str, List[Tuple[str, int]]], unique: bool = False, **kwargs) -> str:
+        """Create a hash index on one field or a compound equality index on several"""
+        fields = (keys,) if isinstance(keys, str) else tuple(field for field, _ in keys)
+        name = "_".join(f"{field}_1" for field in fields)
+        with self._lock:
+            index = self._indexes.get(fields)
+            if index is not None:
+                index.unique = index.unique or unique
+                return name
+            index = _FieldIndex(fields, unique)
+            for _id, doc in self.data.items():
+                index.check(_id, doc)
+                index.add(_id, doc)
+            self._indexes[fields] = index
+        return name
+
+    def index_information(self) -> Dict[str, Any]:
+        info = {"_id_": {"key": [("_id", 1)]}}
+        for fields, index in self._indexes.items():
+            info["_".join(f"{field}_1" for field in fields)] = {
+                "key": [(field, 1) for field in fields], "unique": index.unique}
+        return info
+
+    def _candidate_ids(self, query: Dict[str, Any]) -> Optional[list]:
+        """Smallest list of ids an index narrows query to, or None for a full scan"""
+        if "_id" in query:
+            condition = query["_id"]
+            try:
+                if not _is_operator_condition(condition):
+                    return [condition] if condition in self.data else []
+                if "$eq" in condition:
+                    return [condition["$eq"]] if condition["$eq"] in self.data else []
+                if "$in" in condition:
+                    return [_id for _id in dict.fromkeys(condition["$in"]) if _id in self.data]
+            except TypeError:
+                pass
+
+        best = None
+        for index in self._indexes.values():
+            ids = index.candidates(query)
+            if ids is not None and (best is None or len(ids) < len(best)):
+                best = ids
+                if not best:
+                    break
+        return best
+
+    def _iter_matches(self, query: Optional[Dict[str, Any]]):
+        """
+        Iterator over the documents matching query. Candidates are taken now;
+        updates replace documents rather than changing them, so the iterator
+        can be consumed later without holding the lock.
+        """
+        query = query or {}
+        ids = self._candidate_ids(query)
+        if ids is None:
+            docs = list(self.data.values())
+        else:
+            docs = [self.data[_id] for _id in ids if _id in self.data]
+        return (doc for doc in docs if matches(doc, query))
+
+    def _index_doc(self, _id: Any, doc: Dict[str, Any]) -> None:
+        for index in self._indexes.values():
+            index.add(_id, doc)
+
+    def _unindex_doc(self, _id: Any, doc: Dict[str, Any]) -> None:
+        for index in self._indexes.values():
+            index.remove(_id, doc)
+
+    # ===== Reads =====
+
+    def find(self, query=None, projection=None, *args, sort=None, skip=0, limit=0, **kwargs):
+        with self._lock:
+            cursor = MockCursor(list(self._iter_matches(query)) if sort else self._iter_matches(query), projection)
+        if sort:
+            cursor.sort(sort)
+        return cursor.skip(skip).limit(limit)
+
+    def find_one(self, query=None, projection=None, *args, sort=None, **kwargs):
+        if query is not None and not isinstance(query, dict):
+            query = {"_id": query}
+        with self._lock:
+            if sort:
+                docs = list(MockCursor(list(self._iter_matches(query)), projection).sort(sort).limit(1))
+                return docs[0] if docs else None
+            doc = next(self._iter_matches(query), None)
+            return _project(doc, projection) if doc is not None else None
+
+    def count_documents(self, query=None, **kwargs) -> int:
+        with self._lock:
+            if not query:
+                return len(self.data)
+            return sum(1 for _ in self._iter_matches(query))
+
+    def estimated_document_count(self, **kwargs) -> int:
+        return len(self.data)
+
+    # ===== Writes =====
+
+    def insert_one(self, document, *args, **kwargs):
+        with self._lock:
+            self._id += 1
+            _id = document.get("_id", self._id)
+            document["_id"] = _id
+            if _id in self.data:
+                raise DuplicateKeyError(f"Duplicate key for index _id_: {_id!r}")
+            doc = _copy(document)
+            for index in self._indexes.values():
+                index.check(_id, doc)
+            self.data[_id] = doc
+            self._index_doc(_id, doc)
+            self._log_put(doc)
+        return InsertOneResult(_id, True)
+
+    def insert_many(self, documents, *args, **kwargs):
+        inserted_ids = [self.insert_one(document).inserted_id for document in documents]
+        return InsertManyResult(inserted_ids, True)
+
+    def _update_docs(self, query, update, upsert, many):
+        if not update or not all(op.startswith("$") for op in update):
+            raise ValueError("update only works with $ operators")
+
+        with self._lock:
+            matched = list(self._iter_matches(query))
+            if not many:
+                matched = matched[:1]
+
+            if not matched and upsert:
+                document = {field: value for field, value in (query or {}).items()
+                            if not field.startswith("$") and not _is_operator_condition(value)}
+                self._apply_update(document, update)
+                return UpdateResult(True, 0, 0, self.insert_one(document).inserted_id)
+
+            modified = 0
+            for doc in matched:
+                _id = doc["_id"]
+                updated = _copy(doc)
+                if not self._apply_update(updated, update):
+                    continue
+                for index in self._indexes.values():
+                    index.check(_id, updated)
+                self._unindex_doc(_id, doc)
+                self.data[_id] = updated
+                self._index_doc(_id, updated)
+                self._log_put(updated)
+                modified += 1
+            return UpdateResult(True, modified, len(matched))
+
+    def update_one(self, query, update, *args, upsert=False, **kwargs):
+        return self._update_docs(query, update, upsert, many=False)
+
+    def update_many(self, query, update, *args, upsert=False, **kwargs):
+        return self._update_docs(query, update, upsert, many=True)
+
+    @staticmethod
+    def _apply_update(doc: Dict[str, Any], update: Dict[str, Any]) -> bool:
+        """Apply update operators to doc in place; returns whether it changed"""
+        changed = False
+        for op, fields in update.items():
+            for path, value in fields.items():
+                current = _get_path(doc, path)
+                if op == "$set":
+                    if current is _MISSING or current != value:
+                        _set_path(doc, path, _copy(value))
+                        changed = True
+                elif op == "$unset":
+                    changed = _unset_path(doc, path) or changed
+                elif op == "$inc":
+                    if current is _MISSING:
+                        _set_path(doc, path, value)
+                        changed = True
+                    elif not isinstance(current, (int, float)) or isinstance(current, bool):
+                        raise ValueError(f"Cannot apply $inc to non-numeric field {path}")
+                    elif value:
+                        _set_path(doc, path, current + value)
+                        changed = True
+                elif op in ("$push", "$addToSet"):
+                    if current is _MISSING:
+                        current = []
+                        _set_path(doc, path, current)
+                    elif not isinstance(current, list):
+                        raise ValueError(f"Cannot apply {op} to non-array field {path}")
+                    items = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+                    for item in items:
+                        if op == "$push" or item not in current:
+                            current.append(_copy(item))
+                            changed = True
+                elif op == "$pull":
+                    if isinstance(current, list):
+                        kept = [item for item in current if not _matches_condition(item, value)]
+                        if len(kept) != len(current):
+                            current[:] = kept
+                            changed = True
+                else:
+                    raise ValueError(f"Unsupported update operator: {op}")
+        return changed
+
+    def delete_one(self, query):
+        return self._delete_docs(query, many=False)
+
+    def delete_many(self, query):
+        return self._delete_docs(query, many=True)
+
+    def _delete_docs(self, query, many):
+        with self._lock:
+            matched = list(self._iter_matches(query))
+            if not many:
+                matched = matched[:1]
+            for doc in matched:
+                _id = doc["_id"]
+                self._unindex_doc(_id, doc)
+                del self.data[_id]
+                self._log_delete(_id)
+            return DeleteResult(True, len(matched))
+
+    def drop(self) -> None:
+        with self._lock:
+            self.data.clear()
+            for index in self._indexes.values():
+                index.__init__(index.fields, index.unique)
+            if self._log:
+                self.compact()
+
+    # ===== Persistence =====
+
+    def _write_log(self, entry: Dict[str, Any]) -> None:
+        if self._log is None:
+            return
+        self._log.write(json.dumps(entry, default=_encode) + "\n")
+        self._log.flush()
+        self._log_entries += 1
+        if self._log_entries > max(COMPACT_MIN_ENTRIES, 2 * len(self.data)):
+            self.compact()
+
+    def _log_put(self, doc: Dict[str, Any]) -> None:
+        self._write_log({"op": "put", "doc": doc})
+
+    def _log_delete(self, _id: Any) -> None:
+        self._write_log({"op": "del", "_id": _id})
+
+    def _replay(self) -> None:
+        """Load the documents recorded in the log"""
+        if not os.path.exists(self.log_file):
+            return
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line, object_hook=_decode)
+                except json.JSONDecodeError:
+                    # A write interrupted mid-line; everything before it is intact
+                    logger.warning(f"Ignoring unreadable entry {line_number} of {self.log_file}")
+                    continue
+                self._log_entries += 1
+                if entry["op"] == "put":
+                    doc = entry["doc"]
+                    _id = doc["_id"]
+                    previous = self.data.get(_id)
+                    if previous is not None:
+                        self._unindex_doc(_id, previous)
+                    self.data[_id] = doc
+                    self._index_doc(_id, doc)
+                else:
+                    previous = self.data.pop(entry["_id"], None)
+                    if previous is not None:
+                        self._unindex_doc(entry["_id"], previous)
+
+        self._id = max((_id for _id in self.data if isinstance(_id, int) and not isinstance(_id, bool)),
+                       default=0)
+        logger.info(f"Loaded {len(self.data)} documents into mock collection {self.name}")
+
+    def compact(self) -> None:
+        """Rewrite the log with one entry per live document"""
+        if not self.log_file:
+            return
+        with self._lock:
+            temp_file = f"{self.log_file}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                for doc in self.data.values():
+                    f.write(json.dumps({"op": "put", "doc": doc}, default=_encode) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            if self._log is not None:
+                self._log.close()
+            os.replace(temp_file, self.log_file)
+            self._log = open(self.log_file, "a", encoding="utf-8")
+            self._log_entries = len(self.data)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
@@ -14,6 +14,12 @@ import xgboost as xgb
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from .model_registry import get_model_registry, INTERVIEW_MODELS_FILE
+except ImportError:
+    # Run directly as a script
+    from model_registry import get_model_registry, INTERVIEW_MODELS_FILE
+
 # Initialize GPU availability flag
 use_gpu = False
 GPU_AVAILABLE = False
@@ -900,12 +906,13 @@ def predict_with_models(data, model_package=None, verbose=True):
     Make predictions using trained models
 
     Args:
-        data: DataFrame with features
+        data: DataFrame with features, one row per answer
         model_package: Dictionary with trained models and scaler
+            (default: the registry's warm copy of interview_evaluation_models.pkl)
         verbose: Whether to print progress information
 
     Returns:
-        Dictionary of predictions
+        Dictionary of predictions, one value per row
     """
     if verbose:
         print("Starting prediction process...")
@@ -913,11 +920,11 @@ def predict_with_models(data, model_package=None, verbose=True):
     # Load models if not provided
     if model_package is None:
         if verbose:
-            print("No model package provided, attempting to load from file...")
+            print("No model package provided, using the model registry...")
         try:
-            model_package = joblib.load("interview_evaluation_models.pkl")
+            model_package = get_model_registry().get(INTERVIEW_MODELS_FILE)
             if verbose:
-                print("Successfully loaded models from interview_evaluation_models.pkl")
+                print(f"Using models from {INTERVIEW_MODELS_FILE}")
         except Exception as e:
             print(f"Error loading models: {e}")
             return None
@@ -999,22 +1006,24 @@ def predict_with_models(data, model_package=None, verbose=True):
     # Apply additional sentiment-based adjustment
     # Penalize inappropriate responses more heavily based on sentiment
     if 'feature_10' in data.columns:  # Check if sentiment feature exists
-        sentiment_score = data['feature_10'].values[0]
-        minimal_words = data['feature_0'].values[0] < 5  # Check if response is too short
+        sentiment_score = data['feature_10'].values
+        minimal_words = data['feature_0'].values < 5  # Check if response is too short
 
         # Detect extremely negative or inappropriate responses
         # Lower sentiment with few words indicates potential inappropriate response
-        if minimal_words and sentiment_score < 0.4:
-            # Apply stronger penalty to all scores
+        penalized = minimal_words & (sentiment_score < 0.4)
+        if penalized.any():
+            # Apply stronger penalty to all scores of those answers
             penalty_factor = 0.3
             for key in predictions:
                 if key != 'category':  # Don't penalize the category
-                    predictions[key] = np.array([max(20, score * penalty_factor) for score in predictions[key]])
+                    scores = np.asarray(predictions[key], dtype=float)
+                    predictions[key] = np.where(penalized, np.maximum(20, scores * penalty_factor), scores)
 
     # Ensure all scores are within valid range (0-100)
     for key in predictions:
         if key != 'category':  # Don't adjust the category
-            predictions[key] = np.array([max(0, min(100, score)) for score in predictions[key]])
+            predictions[key] = np.clip(np.asarray(predictions[key], dtype=float), 0, 100)
 
     return predictions
 
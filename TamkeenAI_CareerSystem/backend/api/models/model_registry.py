@@ -0,0 +1,225 @@
+"""
+Model Registry
+
+Keeps the interview evaluation model packages (the scaler, XGBoost and
+sklearn models written by Model_training.train_evaluation_models) loaded
+once per process. Each package is versioned by the SHA256 of its file: a
+cheap stat on every lookup notices when the file was replaced, and the
+package is reloaded only if its hash changed.
+
+Packages can be memory-mapped (joblib mmap_mode) so that worker processes
+share the pages of large numpy arrays; this only applies to arrays stored
+uncompressed. preload() warms the registry in a background thread at app
+start and sets the readiness flag when it is done.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Iterable
+
+import joblib
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Default model package, relative to the working directory as before
+INTERVIEW_MODELS_FILE = os.environ.get('INTERVIEW_MODELS_FILE', 'interview_evaluation_models.pkl')
+
+# joblib mmap_mode for loading packages ("r", "c" or unset for a plain load)
+MODEL_MMAP_MODE = os.environ.get('MODEL_MMAP_MODE') or None
+
+
+class _LoadedPackage:
+    """A loaded model package and the file state it was loaded from"""
+
+    __slots__ = ("package", "version", "stat_key", "loaded_at")
+
+    def __init__(self, package: Dict[str, Any], version: str, stat_key: tuple):
+        self.package = package
+        self.version = version
+        self.stat_key = stat_key
+        self.loaded_at = time.time()
+
+
+def _stat_key(path: str) -> tuple:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _file_hash(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class ModelRegistry:
+    """Process-wide cache of model packages, reloaded when their file changes"""
+
+    def __init__(self, mmap_mode: Optional[str] = MODEL_MMAP_MODE):
+        """
+        Initialize the registry
+
+        Args:
+            mmap_mode: joblib mmap_mode used to load packages (None to load into memory)
+        """
+        self.mmap_mode = mmap_mode
+        self._packages = {}  # absolute path -> _LoadedPackage
+        self._lock = threading.Lock()
+        self._path_locks = {}
+        self._ready = threading.Event()
+        self._preload_thread = None
+        self._preload_errors = {}
+
+    def _path_lock(self, path: str) -> threading.Lock:
+        with self._lock:
+            return self._path_locks.setdefault(path, threading.Lock())
+
+    def get(self, path: str = INTERVIEW_MODELS_FILE) -> Dict[str, Any]:
+        """
+        Get a model package, loading it on first use or after the file changed
+
+        Args:
+            path: Model package file
+
+        Returns:
+            The model package dictionary
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        path = os.path.abspath(path)
+        stat_key = _stat_key(path)
+        loaded = self._packages.get(path)
+        if loaded is not None and loaded.stat_key == stat_key:
+            return loaded.package
+
+        with self._path_lock(path):
+            # Another thread may have reloaded it while we waited
+            stat_key = _stat_key(path)
+            loaded = self._packages.get(path)
+            if loaded is not None and loaded.stat_key == stat_key:
+                return loaded.package
+
+            version = _file_hash(path)
+            if loaded is not None and loaded.version == version:
+                # Touched or copied over with identical content
+                loaded.stat_key = stat_key
+                return loaded.package
+
+            start = time.perf_counter()
+            package = joblib.load(path, mmap_mode=self.mmap_mode)
+            self._packages[path] = _LoadedPackage(package, version, stat_key)
+            logger.info(f"Loaded model package {path} (version {version[:12]}) "
+                        f"in {time.perf_counter() - start:.2f}s")
+            return package
+
+    def version(self, path: str = INTERVIEW_MODELS_FILE) -> Optional[str]:
+        """SHA256 of the loaded version of a package, or None if it is not loaded"""
+        loaded = self._packages.get(os.path.abspath(path))
+        return loaded.version if loaded else None
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop one loaded package (or all of them) so the next get() reloads it"""
+        with self._lock:
+            if path is None:
+                self._packages.clear()
+            else:
+                self._packages.pop(os.path.abspath(path), None)
+
+    def preload(self, paths: Optional[Iterable[str]] = None, background: bool = True) -> None:
+        """
+        Load model packages ahead of the first request
+
+        Args:
+            paths: Package files (default: the interview evaluation package)
+            background: Load in a daemon thread instead of blocking
+
+        Missing or unreadable packages are logged and skipped; the registry
+        is marked ready once every package has been attempted.
+        """
+        paths = list(paths) if paths is not None else [INTERVIEW_MODELS_FILE]
+
+        def _load_all():
+            for path in paths:
+                try:
+                    self.get(path)
+                except FileNotFoundError:
+                    logger.warning(f"Model package {path} not found; it will be loaded when it exists")
+                    self._preload_errors[path] = "not found"
+                except Exception as e:
+                    logger.error(f"Error preloading model package {path}: {str(e)}")
+                    self._preload_errors[path] = str(e)
+            self._ready.set()
+
+        if not background:
+            _load_all()
+            return
+        with self._lock:
+            if self._preload_thread is not None and self._preload_thread.is_alive():
+                return
+            self._preload_thread = threading.Thread(target=_load_all, name="model-preload", daemon=True)
+            self._preload_thread.start()
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether preloading has finished"""
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until preloading has finished; returns is_ready"""
+        return self._ready.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness and loaded package versions, e.g. for a health check"""
+        return {
+            "ready": self.is_ready,
+            "packages": {path: {"version": loaded.version, "loaded_at": loaded.loaded_at}
+                         for path, loaded in list(self._packages.items())},
+            "errors": dict(self._preload_errors)
+        }
+
+    def predict_batch(self, answers: List[Dict[str, Any]], path: str = INTERVIEW_MODELS_FILE) -> List[Dict[str, Any]]:
+        """
+        Score many interview answers with one pass through each model
+
+        Args:
+            answers: Feature dictionaries (feature_0, feature_1, ...), one per answer
+            path: Model package file
+
+        Returns:
+            One prediction dictionary per answer (scores per target plus category)
+        """
+        if not answers:
+            return []
+
+        import pandas as pd
+        from .Model_training import predict_with_models
+
+        predictions = predict_with_models(pd.DataFrame(answers), self.get(path), verbose=False)
+        if predictions is None:
+            return [{} for _ in answers]
+
+        results = [{} for _ in answers]
+        for key, values in predictions.items():
+            for result, value in zip(results, values):
+                result[key] = value if key == 'category' else float(value)
+        return results
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Process-wide model registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
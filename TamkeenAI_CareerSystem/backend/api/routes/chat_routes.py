@@ -14,12 +14,16 @@ import re
 # Import utilities
 from api.utils.date_utils import now
 from api.utils.api_utils import api_response, error_response, validate_request
+from api.utils.streaming import wants_stream, stream_response
 
 # Import auth decorators
 from api.utils.auth import auth_required, get_current_user
 
 # Import services
-from api.services.llm_service import query_deepseek, get_chatbot_response, query_llm_provider
+from api.services.llm_service import (
+    query_deepseek, get_chatbot_response, query_llm_provider, stream_deepseek, stream_llm_provider
+)
+from api.services.llm_client import ProviderError
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -189,6 +193,19 @@ def send_message():
         # Log the request
         logger.info(f"Chat request from user {user_id}: {message[:50]}...")
         
+        # Stream the answer as it is generated if the client accepts it
+        if wants_stream(data):
+            if os.getenv('ENABLE_DEEPSEEK', 'false').lower() == 'true' and os.getenv('DEEPSEEK_API_KEY'):
+                chunks = stream_deepseek(message, language)
+            else:
+                chunks = iter([get_chatbot_response(message, language)])
+            
+            def finish_message(response_text):
+                logger.info(f"Chat response to user {user_id}: {response_text[:50]}...")
+                return {"response": response_text, "timestamp": now()}
+            
+            return stream_response(chunks, on_complete=finish_message)
+        
         # Choose the language model based on availability
         if os.getenv('ENABLE_DEEPSEEK', 'false').lower() == 'true' and os.getenv('DEEPSEEK_API_KEY'):
             # Use DeepSeek model
@@ -252,6 +269,29 @@ def improve_resume():
                 user_prompt += f"Against the following job description:\n\n{job_description}\n\n"
             user_prompt += "Provide a comprehensive analysis and suggestions for improvement organized by sections."
         
+        # Stream the suggestions as they are generated if the client accepts it
+        if wants_stream(data):
+            try:
+                return stream_response(
+                    stream_llm_provider(
+                        [
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt}
+                        ],
+                        provider='openai',
+                        model="gpt-3.5-turbo",
+                        temperature=0.7,
+                        max_tokens=1500
+                    ),
+                    on_complete=lambda suggestions: {
+                        "suggestions": parse_suggestions(suggestions),
+                        "raw_suggestions": suggestions,
+                        "timestamp": now()
+                    }
+                )
+            except ProviderError as e:
+                logger.warning(f"Streaming unavailable, sending a single response: {str(e)}")
+        
         try:
             # Use OpenAI to analyze the resume
             response = client.chat.completions.create(
@@ -343,6 +383,25 @@ def generate_cover_letter():
             system_prompt = "You are a professional writer specializing in cover letters. You will be given user profile information and a job description. Write a persuasive, personalized cover letter that demonstrates the candidate's fit for the position."
             user_prompt = f"Write a cover letter for {company_name} based on the following user profile:\n\n{json.dumps(user_profile)}\n\nAnd the following job description:\n\n{job_description}\n\nThe letter should highlight relevant skills and experiences and focus on the candidate's match with the job requirements."
         
+        # Stream the cover letter as it is generated if the client accepts it
+        if wants_stream(data):
+            try:
+                return stream_response(
+                    stream_llm_provider(
+                        [
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt}
+                        ],
+                        provider='openai',
+                        model="gpt-3.5-turbo",
+                        temperature=0.7,
+                        max_tokens=1500
+                    ),
+                    on_complete=lambda cover_letter: {"cover_letter": cover_letter, "timestamp": now()}
+                )
+            except ProviderError as e:
+                logger.warning(f"Streaming unavailable, sending a single response: {str(e)}")
+        
         try:
             # Use OpenAI to generate the cover letter
             response = client.chat.completions.create(
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 import logging
 from api.middleware.auth_middleware import token_required
+from core.leaderboard import ALL_TIME, weekly_board
+from core.gamification import get_xp_leaderboard
 from datetime import datetime, timedelta
 import random
 import json
@@ -254,6 +256,19 @@ def check_achievements(user_id, achievement_type, count=1):
         
         level_up = new_level["level"] > old_level["level"]
         
+        # Move the user on the all-time and weekly leaderboards; USER_STATS only
+        # holds this process's XP, so only the gain is added to the stored score
+        try:
+            get_xp_leaderboard().add_xp(
+                user_id,
+                xp_gained + sum(badge["xp_reward"] for badge in new_badges),
+                level=new_level["level"],
+                level_name=new_level["name"],
+                streak_days=USER_STATS[user_id]["streak_days"]
+            )
+        except Exception as e:
+            logger.error(f"Error updating leaderboard: {str(e)}")
+        
         return {
             "achievement": new_achievement,
             "xp_gained": xp_gained,
@@ -679,46 +694,43 @@ def record_login(user_id):
 
 @gamification_bp.route('/leaderboard', methods=['GET'])
 def get_leaderboard():
-    """Get user leaderboard based on XP"""
+    """Get user leaderboard based on XP (all time, or XP gained this week with ?window=weekly)"""
     # Get pagination parameters
-    page = int(request.args.get('page', 1))
-    limit = int(request.args.get('limit', 10))
-    
-    # Create leaderboard entries
-    leaderboard = []
-    
-    for user_id, stats in USER_STATS.items():
-        level = get_level_from_xp(stats["xp"])
-        leaderboard.append({
-            "user_id": user_id,
-            "xp": stats["xp"],
-            "level": level["level"],
-            "level_name": level["name"],
-            "streak_days": stats["streak_days"]
+    page = max(1, int(request.args.get('page', 1)))
+    limit = max(1, int(request.args.get('limit', 10)))
+    board = weekly_board() if request.args.get('window') == 'weekly' else ALL_TIME
+    
+    leaderboard_service = get_xp_leaderboard()
+    
+    # Fetch only the requested page (levels are those recorded with the user's total XP)
+    paginated_leaderboard = []
+    for entry in leaderboard_service.get_page((page - 1) * limit, limit, board):
+        paginated_leaderboard.append({
+            "user_id": entry["user_id"],
+            "xp": entry["xp"],
+            "level": entry.get("level", 1),
+            "level_name": entry.get("level_name", CAREER_LEVELS[0]["name"]),
+            "streak_days": entry.get("streak_days", 0),
+            "rank": entry["rank"]
         })
     
-    # Sort by XP (descending)
-    leaderboard.sort(key=lambda x: x["xp"], reverse=True)
-    
-    # Add rank
-    for i, entry in enumerate(leaderboard):
-        entry["rank"] = i + 1
+    total = leaderboard_service.count(board)
     
-    # Paginate
-    total = len(leaderboard)
-    start_index = (page - 1) * limit
-    end_index = start_index + limit
-    
-    paginated_leaderboard = leaderboard[start_index:end_index]
-    
-    return jsonify({
+    response = {
         "success": True,
         "leaderboard": paginated_leaderboard,
         "total": total,
         "page": page,
         "limit": limit,
         "total_pages": (total + limit - 1) // limit  # Ceiling division
-    }), 200
+    }
+    
+    # Rank of a given user, wherever they are on the board
+    user_id = request.args.get('user_id')
+    if user_id:
+        response["user_rank"] = leaderboard_service.get_rank(user_id, board)
+    
+    return jsonify(response), 200
 
 @gamification_bp.route('/events/<user_id>', methods=['GET'])
 def get_upcoming_events(user_id):
@@ -6,26 +6,205 @@ analytics, and integration with the gamification system.
 """
 
 import os
+import re
 import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple, Union
 import random
 import math
 
-from ...core.gamification import GamificationEngine, get_user_gamification_status
+from ...core.gamification import GamificationEngine, get_user_gamification_status, get_xp_leaderboard
 from ..utils.ai_service import generate_career_insights
-from ..database import get_user_data, save_user_data, get_resume_data, get_job_application_data
+from ..database import get_user_data, save_user_data, get_resume_data
 from config.settings import BASE_DIR
 
 # Define paths for dashboard data
 DASHBOARD_DIR = os.path.join(BASE_DIR, 'data', 'dashboard')
 MARKET_DATA_DIR = os.path.join(DASHBOARD_DIR, 'market_data')
 CAREER_PATHS_DIR = os.path.join(DASHBOARD_DIR, 'career_paths')
+SNAPSHOT_DIR = os.path.join(DASHBOARD_DIR, 'snapshots')
 
 # Create directories if they don't exist
-for directory in [DASHBOARD_DIR, MARKET_DATA_DIR, CAREER_PATHS_DIR]:
+for directory in [DASHBOARD_DIR, MARKET_DATA_DIR, CAREER_PATHS_DIR, SNAPSHOT_DIR]:
     os.makedirs(directory, exist_ok=True)
 
+# Seconds a snapshot is served before it is rebuilt, even without an update
+# (XP from other features does not invalidate it)
+SNAPSHOT_TTL = int(os.environ.get('DASHBOARD_SNAPSHOT_TTL', 300))
+
+# Worker threads shared by all dashboard builds
+DASHBOARD_WORKERS = int(os.environ.get('DASHBOARD_WORKERS', 16))
+
+# Time budget of each dashboard section in seconds, counted from when the
+# section's batch is started
+SECTION_TIMEOUTS = {
+    "user_data": 5.0,
+    "resume_data": 3.0,
+    "gamification": 3.0,
+    "leaderboard_position": 2.0,
+    "career_paths": 3.0,
+    "market_insights": 5.0,
+    "career_prediction": 8.0
+}
+
+_executor = ThreadPoolExecutor(max_workers=DASHBOARD_WORKERS, thread_name_prefix="dashboard")
+
+
+class DashboardSnapshots:
+    """
+    Materialised per-user dashboards
+
+    Each snapshot is kept as a JSON file in SNAPSHOT_DIR (shared by worker
+    processes) with an in-memory copy that is reused while the file is
+    unchanged. Updates invalidate a user's snapshot; a build that started
+    before an invalidation is not stored, whichever process invalidated it:
+    invalidation counts are kept in a SQLite table next to the snapshots,
+    and snapshot files are only written or removed inside a write
+    transaction on it.
+    """
+
+    def __init__(self, snapshot_dir: str, ttl: int):
+        self.snapshot_dir = snapshot_dir
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._cache = {}  # user_id -> (file mtime, snapshot)
+
+        self._conn = sqlite3.connect(os.path.join(snapshot_dir, 'generations.db'),
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS generations (
+                user_id TEXT PRIMARY KEY,
+                generation INTEGER NOT NULL
+            )
+        """)
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction; holds the lock shared by all processes"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _generation(self, user_id: str) -> int:
+        row = self._conn.execute("SELECT generation FROM generations WHERE user_id = ?",
+                                 (str(user_id),)).fetchone()
+        return row[0] if row else 0
+
+    def _path(self, user_id: str) -> str:
+        safe_id = re.sub(r'[^A-Za-z0-9_.-]', '_', str(user_id))
+        return os.path.join(self.snapshot_dir, f"{safe_id}.json")
+
+    def generation(self, user_id: str) -> int:
+        """Invalidation counter to pass to put()"""
+        with self._lock:
+            return self._generation(user_id)
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Current snapshot of a user's dashboard
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Dict with "dashboard", "etag" and "built_at", or None if there is
+            no snapshot or it is older than the TTL
+        """
+        path = self._path(user_id)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock:
+                self._cache.pop(str(user_id), None)
+            return None
+
+        with self._lock:
+            cached = self._cache.get(str(user_id))
+        if cached and cached[0] == mtime:
+            snapshot = cached[1]
+        else:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error loading dashboard snapshot: {e}")
+                return None
+            with self._lock:
+                self._cache[str(user_id)] = (mtime, snapshot)
+
+        if time.time() - snapshot.get("built_at", 0) > self.ttl:
+            return None
+        return snapshot
+
+    def put(self, user_id: str, dashboard: Dict[str, Any], generation: int) -> Dict[str, Any]:
+        """
+        Store a freshly built dashboard
+
+        Args:
+            user_id: User identifier
+            dashboard: Complete dashboard data
+            generation: generation() taken before the build started
+
+        Returns:
+            The snapshot (stored unless the user was invalidated meanwhile)
+        """
+        body = json.dumps(dashboard, sort_keys=True, default=str)
+        snapshot = {
+            "dashboard": json.loads(body),
+            "etag": f'"{hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]}"',
+            "built_at": time.time()
+        }
+
+        path = self._path(user_id)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with self._transaction():
+                if self._generation(user_id) != generation:
+                    return snapshot
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, path)
+                self._cache[str(user_id)] = (os.stat(path).st_mtime_ns, snapshot)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error saving dashboard snapshot: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return snapshot
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's snapshot so the next load rebuilds it"""
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    "INSERT INTO generations (user_id, generation) VALUES (?, 1) "
+                    "ON CONFLICT(user_id) DO UPDATE SET generation = generation + 1",
+                    (str(user_id),)
+                )
+                self._cache.pop(str(user_id), None)
+                try:
+                    os.remove(self._path(user_id))
+                except FileNotFoundError:
+                    pass
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error removing dashboard snapshot: {e}")
+
+
+dashboard_snapshots = DashboardSnapshots(SNAPSHOT_DIR, SNAPSHOT_TTL)
+
 class DashboardService:
     """Service for dashboard functionality"""
     
@@ -370,45 +549,66 @@ class DashboardService:
         }
     
     def get_complete_dashboard(self, user_id: str) -> Dict[str, Any]:
-        """Get complete dashboard data for a user"""
-        # Get user data
-        user_data = get_user_data(user_id)
+        """
+        Get complete dashboard data for a user
+        
+        The independent loads run concurrently on the shared dashboard executor:
+        user data, resume data, gamification status and leaderboard position
+        first, then the sections computed from user data. A section that fails
+        or exceeds its SECTION_TIMEOUTS budget is replaced by its default and
+        listed in "partial_sections".
+        """
+        partial_sections = []
+        
+        # Loads that only need the user ID
+        loads = self._submit_sections({
+            "user_data": lambda: get_user_data(user_id),
+            "resume_data": lambda: get_resume_data(user_id),
+            "gamification": lambda: get_user_gamification_status(user_id),
+            "leaderboard_position": lambda: GamificationEngine(user_id).get_leaderboard_position()
+        })
+        
+        # Nothing can be built without user data, so it has no default
+        user_data = loads["user_data"][0].result(timeout=SECTION_TIMEOUTS["user_data"])
         if not user_data:
             raise ValueError(f"User data not found for user ID: {user_id}")
-            
-        # Get resume data
-        resume_data = get_resume_data(user_id)
-        
-        # Get job application data
-        job_application_data = get_job_application_data(user_id)
-        
-        # Get gamification data
-        gamification = GamificationEngine(user_id)
-        gamification_data = get_user_gamification_status(user_id)
         
-        # Get resume scores
-        resume_scores = self._get_resume_scores(user_id, resume_data)
-        
-        # Get skill progress
-        skill_progress = self._get_skill_progress(user_id, user_data)
+        # Sections computed from user data
+        sections = self._submit_sections({
+            "career_paths": lambda: self._get_personalized_career_paths(user_id, user_data),
+            "market_insights": lambda: self._get_market_insights(user_id, user_data),
+            "career_prediction": lambda: self._generate_career_prediction(user_id, user_data)
+        })
         
-        # Get career paths
-        career_paths = self._get_career_paths(user_id, user_data)
+        # Cheap and local, so built while the other sections load
+        skill_progress = self._format_skill_progress(self._get_skill_progress(user_id, user_data), user_data)
+        
+        results = self._collect_sections(loads, {
+            "resume_data": None,
+            "gamification": {},
+            "leaderboard_position": None
+        }, partial_sections)
+        results.update(self._collect_sections(sections, {
+            "career_paths": {
+                "career_paths": self.career_paths,
+                "learning_paths": [],
+                "current_role": user_data.get("current_role", "Not specified"),
+                "target_role": user_data.get("target_role", "Not specified")
+            },
+            "market_insights": {
+                "salary_data": self.market_data.get("salary_data", []),
+                "regional_demand": self.market_data.get("regional_demand", []),
+                "skill_demand": self.market_data.get("skill_demand", []),
+                "industry_trends": self.market_data.get("industry_trends", {})
+            },
+            "career_prediction": self._default_career_prediction()
+        }, partial_sections))
         
-        # Get market insights
-        market_insights = self._get_market_insights(user_id, user_data)
+        gamification_data = results["gamification"] or {}
         
         # Get activity log
         activity_log = gamification_data.get("activity_log", [])
         
-        # Generate career prediction
-        career_prediction = self._generate_career_prediction(user_id, user_data)
-        
-        # Get leaderboard position
-        leaderboard = gamification.get_leaderboard(count=100)
-        leaderboard_position = next((entry.get("rank") for entry in leaderboard 
-                                   if entry.get("user_id") == user_id), None)
-        
         # Compile user progress data
         user_progress = {
             "level": gamification_data.get("current_level", 1),
@@ -424,18 +624,80 @@ class DashboardService:
         # Compile complete dashboard response
         dashboard_data = {
             "user_progress": user_progress,
-            "resume_scores": resume_scores,
+            "resume_scores": self._format_resume_scores(results["resume_data"]),
             "badges": [badge for badge in gamification_data.get("badges", {}).values()],
             "skill_progress": skill_progress,
-            "career_paths": career_paths,
-            "market_insights": market_insights,
+            "career_paths": results["career_paths"],
+            "market_insights": results["market_insights"],
             "activity_log": activity_log[:20],  # Only most recent 20 activities
-            "leaderboard_position": leaderboard_position,
-            "career_prediction": career_prediction
+            "leaderboard_position": results["leaderboard_position"],
+            "career_prediction": results["career_prediction"],
+            "partial_sections": partial_sections
         }
         
         return dashboard_data
     
+    def get_dashboard_snapshot(self, user_id: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Get complete dashboard data for a user from their materialised snapshot
+        
+        The snapshot is rebuilt when it is missing, older than SNAPSHOT_TTL or
+        was invalidated by an update. Partial dashboards are returned but not
+        stored.
+        
+        Args:
+            user_id: User identifier
+            
+        Returns:
+            Tuple of (dashboard data, ETag), the ETag being None for a partial dashboard
+        """
+        snapshot = dashboard_snapshots.get(user_id)
+        if snapshot is not None:
+            return snapshot["dashboard"], snapshot["etag"]
+        
+        generation = dashboard_snapshots.generation(user_id)
+        dashboard_data = self.get_complete_dashboard(user_id)
+        if dashboard_data["partial_sections"]:
+            return dashboard_data, None
+        
+        snapshot = dashboard_snapshots.put(user_id, dashboard_data, generation)
+        return snapshot["dashboard"], snapshot["etag"]
+    
+    def _submit_sections(self, calls: Dict[str, Any]) -> Dict[str, Tuple[Future, float]]:
+        """Start dashboard sections on the executor; returns name -> (future, deadline)"""
+        now = time.monotonic()
+        return {name: (_executor.submit(call), now + SECTION_TIMEOUTS[name])
+                for name, call in calls.items()}
+    
+    def _collect_sections(self, futures: Dict[str, Tuple[Future, float]], defaults: Dict[str, Any],
+                          partial_sections: List[str]) -> Dict[str, Any]:
+        """Wait for sections up to their deadlines, using defaults for failed or late ones"""
+        results = {}
+        for name, default in defaults.items():
+            future, deadline = futures[name]
+            try:
+                results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                print(f"Dashboard section {name} timed out")
+                future.cancel()
+                results[name] = default
+                partial_sections.append(name)
+            except Exception as e:
+                print(f"Error loading dashboard section {name}: {e}")
+                results[name] = default
+                partial_sections.append(name)
+        return results
+    
+    def _get_skill_progress(self, user_id: str, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Get tracked skill levels (set by update_skill_progress) from user data"""
+        skill_progress = {}
+        for category, skills in (user_data or {}).get("skills", {}).items():
+            tracked = {skill: details for skill, details in skills.items()
+                       if isinstance(details, (int, float)) or (isinstance(details, dict) and "current" in details)}
+            if tracked:
+                skill_progress[category] = tracked
+        return skill_progress
+    
     def _format_resume_scores(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
         """Format resume scores for dashboard display"""
         if not resume_data or "versions" not in resume_data:
@@ -797,10 +1059,9 @@ class DashboardService:
         
         return insights
     
-    def _generate_career_prediction(self, user_id: str, user_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate AI-powered career trajectory prediction"""
-        # Default prediction data
-        prediction = {
+    def _default_career_prediction(self) -> Dict[str, Any]:
+        """Career prediction used without (or before) the AI prediction"""
+        return {
             "predicted_roles": [
                 {"role": "Junior Data Analyst", "timeline": "Current", "probability": 95, "skill_match": 85},
                 {"role": "Data Analyst", "timeline": "0-1 years", "probability": 85, "skill_match": 80},
@@ -824,6 +1085,11 @@ class DashboardService:
             "skill_gaps": ["Deep Learning", "Cloud Platforms", "Production ML Systems"],
             "career_velocity": 7.5  # Career progression speed on scale of 1-10
         }
+    
+    def _generate_career_prediction(self, user_id: str, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate AI-powered career trajectory prediction"""
+        # Default prediction data
+        prediction = self._default_career_prediction()
         
         # Try to use AI for more personalized prediction if available
         try:
@@ -856,6 +1122,7 @@ class DashboardService:
         
         xp_amount = xp_values.get(activity_type, 5)
         gamification.add_experience_points(user_id, xp_amount, f"Dashboard: {description}")
+        dashboard_snapshots.invalidate(user_id)
         
         # Update dashboard-specific stats if provided
         if "dashboard_stats" in activity_data:
@@ -941,6 +1208,8 @@ class DashboardService:
             # Check for skill-related achievements
             self._check_skill_achievements(user_id, user_data["skills"])
         
+        dashboard_snapshots.invalidate(user_id)
+        
         return {
             "category": category,
             "skill_name": skill_name,
@@ -1010,12 +1279,19 @@ class DashboardService:
     
     def get_leaderboard(self, count: int = 10) -> Dict[str, Any]:
         """Get global leaderboard"""
-        gamification = GamificationEngine()
-        leaderboard_entries = gamification.get_leaderboard(count=count)
+        leaderboard = get_xp_leaderboard()
+        leaderboard_entries = [{
+            "rank": entry["rank"],
+            "user_id": entry["user_id"],
+            "display_name": entry.get("username", entry["user_id"]),
+            "level": entry.get("level", 1),
+            "xp": entry["xp"],
+            "badges_count": entry.get("badges", 0)
+        } for entry in leaderboard.get_page(0, count)]
         
         return {
             "entries": leaderboard_entries,
-            "total_users": len(leaderboard_entries)
+            "total_users": leaderboard.count()
         }
     
     def get_career_prediction(self, user_id: str) -> Dict[str, Any]:
@@ -1102,4 +1378,6 @@ class DashboardService:
             "dashboard_stats": user_data["dashboard_stats"]
         })
         
+        dashboard_snapshots.invalidate(user_id)
+        
         return user_data["dashboard_stats"]
\ No newline at end of file
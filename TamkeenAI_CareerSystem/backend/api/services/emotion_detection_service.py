@@ -23,7 +23,7 @@ from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
 from tensorflow.keras.optimizers import Adam
 
 from ..utils.dataset_utils import load_emotion_dataset, prepare_data_from_dataframe
-from ..config.emotion_detection_config import EMOTION_LABELS, MODEL_PATH, MODEL_INPUT_SIZE
+from ..config.emotion_detection_config import EMOTION_LABELS, MODEL_PATH, MODEL_INPUT_SIZE, VIDEO_BATCH_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -221,53 +221,124 @@ class EmotionDetectionService:
             logger.error("Failed to load image")
             return [] if not return_faces else ([], [])
         
-        # Convert to grayscale
+        # Detect faces
+        gray, faces = self._detect_faces(img)
+        
+        # Classify all faces in a single forward pass
+        cropped_faces = [self._crop_face(gray, bbox) for bbox in faces]
+        results = []
+        
+        if cropped_faces:
+            preds = self._predict_faces(cropped_faces)
+            results = [self._build_result(bbox, face_preds) for bbox, face_preds in zip(faces, preds)]
+        
+        if return_faces:
+            return results, cropped_faces
+        return results
+    
+    def _detect_faces(self, img):
+        """
+        Convert an image to grayscale and detect faces in it
+        
+        Args:
+            img: Image as numpy array
+            
+        Returns:
+            Tuple of (grayscale image, face bounding boxes)
+        """
         if len(img.shape) == 3:
             gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         else:
             gray = img
         
-        # Detect faces
         faces = self.face_cascade.detectMultiScale(gray, 1.1, 4)
+        return gray, faces
+    
+    def _crop_face(self, gray, bbox):
+        """Extract a face region and resize it to the model input size"""
+        x, y, w, h = bbox
+        return cv2.resize(gray[y:y+h, x:x+w], MODEL_INPUT_SIZE)
+    
+    def _predict_faces(self, faces):
+        """
+        Predict emotions for a stack of face crops in one forward pass
         
-        results = []
-        cropped_faces = []
-        
-        # Process each face
-        for (x, y, w, h) in faces:
-            # Extract face ROI
-            face_roi = gray[y:y+h, x:x+w]
-            
-            # Resize to model input size
-            resized_face = cv2.resize(face_roi, MODEL_INPUT_SIZE)
+        Args:
+            faces: List of resized grayscale face crops
             
-            # Normalize
-            normalized_face = resized_face / 255.0
+        Returns:
+            Array of shape (number of faces, number of emotions) with probabilities
+        """
+        batch = np.stack(faces).astype(np.float32) / 255.0
+        batch = batch.reshape(-1, MODEL_INPUT_SIZE[0], MODEL_INPUT_SIZE[1], 1)
+        return np.asarray(self.model.predict_on_batch(batch))
+    
+    def _build_result(self, bbox, preds):
+        """Build the result dictionary for one face from its emotion probabilities"""
+        x, y, w, h = bbox
+        emotion_idx = np.argmax(preds)
+        
+        return {
+            'bbox': (x, y, w, h),
+            'emotion': EMOTION_LABELS[emotion_idx],
+            'confidence': float(preds[emotion_idx]),
+            'all_emotions': {EMOTION_LABELS[i]: float(preds[i]) for i in range(len(EMOTION_LABELS))}
+        }
+    
+    def detect_emotions_in_frames(self, frames, batch_size=VIDEO_BATCH_SIZE):
+        """
+        Detect emotions in a sequence of frames using batched inference
+        
+        Faces are detected frame by frame and their crops queued. Every time
+        batch_size crops are pending they are classified in one forward pass
+        and the results are scattered back to the frames they came from.
+        
+        Args:
+            frames: Sequence of image frames (any format accepted by detect_emotion_from_image)
+            batch_size: Number of face crops per forward pass
             
-            # Reshape for model input
-            input_face = normalized_face.reshape(1, MODEL_INPUT_SIZE[0], MODEL_INPUT_SIZE[1], 1)
+        Returns:
+            List with one list of results per frame, in the format of detect_emotion_from_image
+        """
+        if self.model is None:
+            logger.error("No emotion detection model available")
+            return [[] for _ in frames]
+        
+        batch_size = max(1, int(batch_size))
+        frame_results = []
+        pending_faces = []
+        pending_owners = []
+        
+        def classify_pending(final=False):
+            # Fixed-size batches avoid retracing the model for every shape
+            while len(pending_faces) >= batch_size or (final and pending_faces):
+                faces = pending_faces[:batch_size]
+                owners = pending_owners[:batch_size]
+                del pending_faces[:batch_size]
+                del pending_owners[:batch_size]
+                
+                preds = self._predict_faces(faces)
+                for (frame_idx, bbox), face_preds in zip(owners, preds):
+                    frame_results[frame_idx].append(self._build_result(bbox, face_preds))
+        
+        for frame in frames:
+            frame_idx = len(frame_results)
+            frame_results.append([])
             
-            # Predict emotion
-            preds = self.model.predict(input_face, verbose=0)[0]
-            emotion_idx = np.argmax(preds)
-            emotion = EMOTION_LABELS[emotion_idx]
-            confidence = preds[emotion_idx]
+            img = self._load_image(frame)
+            if img is None:
+                logger.error("Failed to load image")
+                continue
             
-            # Store result
-            result = {
-                'bbox': (x, y, w, h),
-                'emotion': emotion,
-                'confidence': float(confidence),
-                'all_emotions': {EMOTION_LABELS[i]: float(preds[i]) for i in range(len(EMOTION_LABELS))}
-            }
-            results.append(result)
+            gray, faces = self._detect_faces(img)
+            for bbox in faces:
+                pending_faces.append(self._crop_face(gray, bbox))
+                pending_owners.append((frame_idx, bbox))
             
-            if return_faces:
-                cropped_faces.append(resized_face)
+            classify_pending()
         
-        if return_faces:
-            return results, cropped_faces
-        return results
+        classify_pending(final=True)
+        return frame_results
     
     def _load_image(self, image_data):
         """
@@ -320,13 +391,14 @@ class EmotionDetectionService:
             logger.error(f"Error loading image: {str(e)}")
             return None
     
-    def analyze_video_emotions(self, video_frames, sampling_rate=1):
+    def analyze_video_emotions(self, video_frames, sampling_rate=1, batch_size=VIDEO_BATCH_SIZE):
         """
         Analyze emotions in a video stream (series of frames)
         
         Args:
             video_frames: List of image frames (numpy arrays)
             sampling_rate: Process every Nth frame (for performance)
+            batch_size: Number of face crops classified per forward pass
             
         Returns:
             Dictionary with emotion analysis results
@@ -341,15 +413,14 @@ class EmotionDetectionService:
         emotion_timeline = []
         processed_frames = []
         
+        # Skip frames based on sampling rate
+        sampled_frames = [(i, frame) for i, frame in enumerate(video_frames) if i % sampling_rate == 0]
+        
+        # Detect emotions in all sampled frames with batched inference
+        frame_results = self.detect_emotions_in_frames([frame for _, frame in sampled_frames], batch_size)
+        
         # Process frames
-        for i, frame in enumerate(video_frames):
-            # Skip frames based on sampling rate
-            if i % sampling_rate != 0:
-                continue
-                
-            # Detect emotions in this frame
-            results = self.detect_emotion_from_image(frame)
-            
+        for (i, frame), results in zip(sampled_frames, frame_results):
             # Record timestamp and emotions
             frame_emotions = {r['emotion']: r['confidence'] for r in results} if results else {}
             emotion_timeline.append((frame_count, frame_emotions))
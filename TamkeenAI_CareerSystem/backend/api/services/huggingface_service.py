@@ -1,16 +1,30 @@
 import os
 from typing import Dict, List, Any, Optional
 import requests
-from transformers import pipeline
 from ..utils.huggingface_utils import setup_huggingface_api
-from ..config.env import HF_TOKEN
+from ..config.env import HF_TOKEN, HF_LOCAL_INFERENCE
+from .local_pipelines import get_pipeline_cache, get_batcher
 
 class HuggingFaceService:
     """Service for interacting with Hugging Face models"""
     
-    def __init__(self):
-        # Initialize with API token setup
-        self.api_token = setup_huggingface_api()
+    def __init__(self, use_local: Optional[bool] = None):
+        """
+        Initialize the service
+        
+        Args:
+            use_local: Run text classification and summarization with local
+                pipelines instead of the inference API (default: HF_LOCAL_INFERENCE)
+        """
+        self.use_local = HF_LOCAL_INFERENCE if use_local is None else use_local
+        
+        # Initialize with API token setup (local inference works without a token or Hub access)
+        try:
+            self.api_token = setup_huggingface_api()
+        except Exception:
+            if not self.use_local:
+                raise
+            self.api_token = None
         self.api_url = "https://api-inference.huggingface.co/models"
     
     def query_model(self, model: str, inputs: Any, task: Optional[str] = None) -> Any:
@@ -53,6 +67,8 @@ class HuggingFaceService:
         Returns:
             List of classification results with labels and scores
         """
+        if self.use_local:
+            return get_batcher()("text-classification", model, text)
         return self.query_model(model, text, task="text-classification")
     
     def summarization(self, text: str, model: str = "facebook/bart-large-cnn") -> str:
@@ -66,7 +82,10 @@ class HuggingFaceService:
         Returns:
             Summarized text
         """
-        result = self.query_model(model, text, task="summarization")
+        if self.use_local:
+            result = get_batcher()("summarization", model, text)
+        else:
+            result = self.query_model(model, text, task="summarization")
         return result[0]["summary_text"] if result and isinstance(result, list) else ""
     
     def question_answering(self, question: str, context: str, model: str = "deepset/roberta-base-squad2") -> Dict[str, Any]:
@@ -88,6 +107,8 @@ class HuggingFaceService:
         Run a local pipeline using Hugging Face transformers
         This is useful when you want to run inference locally instead of using the API
         
+        Pipelines are loaded once and kept in the shared pipeline cache.
+        
         Args:
             task: Task to perform (e.g., "sentiment-analysis", "summarization")
             model: Model to use
@@ -96,5 +117,4 @@ class HuggingFaceService:
         Returns:
             Pipeline results
         """
-        pipe = pipeline(task, model=model)
-        return pipe(inputs) 
\ No newline at end of file
+        return get_pipeline_cache()(task, model, inputs) 
\ No newline at end of file
@@ -1,12 +1,13 @@
-import os
 import logging
 import random
-import json
 import uuid
 from datetime import datetime
 from collections import defaultdict
 from typing import List, Dict, Any, Optional
-from ..config.emotion_detection_config import ROLES, DEFAULT_NUM_QUESTIONS, DEFAULT_ANSWER_TIME
+from ..config.emotion_detection_config import (
+    ROLES, DEFAULT_NUM_QUESTIONS, DEFAULT_ANSWER_TIME, INTERVIEW_SESSION_CACHE_SIZE
+)
+from .interview_store import InterviewSessionStore
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +17,8 @@ class InterviewService:
     def __init__(self):
         """Initialize the interview service"""
         self._load_questions()
-        self.active_sessions = {}
         self.session_directory = "interview_sessions"
-        os.makedirs(self.session_directory, exist_ok=True)
+        self.session_store = InterviewSessionStore(self.session_directory, INTERVIEW_SESSION_CACHE_SIZE)
         
         # Load UAE cultural context data
         self._load_uae_cultural_data()
@@ -330,7 +330,6 @@ class InterviewService:
         }
         
         # Store the session
-        self.active_sessions[session_id] = session
         self._save_session(session_id, session)
         
         return {
@@ -456,8 +455,9 @@ class InterviewService:
             session["completed"] = True
             session["end_time"] = datetime.now().isoformat()
         
-        # Save updated session
-        self._save_session(session_id, session)
+        # Save the answer
+        if not self.session_store.append_answer(session):
+            return {"error": "Answer could not be saved, please try again"}
         
         # Return next question or completion status
         if is_complete:
@@ -608,62 +608,26 @@ class InterviewService:
         Returns:
             List of session summaries
         """
-        sessions = []
-        
         try:
-            # List all session files
-            for filename in os.listdir(self.session_directory):
-                if filename.endswith('.json'):
-                    filepath = os.path.join(self.session_directory, filename)
-                    with open(filepath, 'r') as f:
-                        session = json.load(f)
-                        
-                        # Filter by user_id
-                        if session.get("user_id") == user_id:
-                            # Create a summary
-                            summary = {
-                                "session_id": session.get("session_id"),
-                                "role": session.get("role"),
-                                "start_time": session.get("start_time"),
-                                "end_time": session.get("end_time"),
-                                "completed": session.get("completed", False),
-                                "num_questions": len(session.get("questions", [])),
-                                "num_answers": len(session.get("answers", []))
-                            }
-                            sessions.append(summary)
-        
+            return self.session_store.list_for_user(user_id)
         except Exception as e:
             logger.error(f"Error listing interview sessions: {str(e)}")
-        
-        return sessions
+            return []
     
     def _get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get interview session data"""
-        # Check active sessions first
-        if session_id in self.active_sessions:
-            return self.active_sessions[session_id]
-        
-        # Otherwise load from disk
         try:
-            filepath = os.path.join(self.session_directory, f"{session_id}.json")
-            if os.path.exists(filepath):
-                with open(filepath, 'r') as f:
-                    session = json.load(f)
-                    # Add back to active sessions
-                    self.active_sessions[session_id] = session
-                    return session
+            return self.session_store.get(session_id)
         except Exception as e:
             logger.error(f"Error loading interview session {session_id}: {str(e)}")
         
         return None
     
     def _save_session(self, session_id: str, session: Dict[str, Any]) -> bool:
-        """Save interview session data to disk"""
+        """Save a new interview session to the session store"""
         try:
-            filepath = os.path.join(self.session_directory, f"{session_id}.json")
-            with open(filepath, 'w') as f:
-                json.dump(session, f, indent=2)
+            self.session_store.create(session)
             return True
         except Exception as e:
             logger.error(f"Error saving interview session {session_id}: {str(e)}")
-            return False 
\ No newline at end of file
+            return False
@@ -0,0 +1,322 @@
+"""
+Interview Session Store
+
+Storage behind InterviewService. Sessions live in one SQLite database in the
+session directory, shared by every worker process:
+
+    sessions.db     sessions (session_id, user_id, start_time, counters, record)
+                    answers  (session_id, position, answer, emotion_analysis)
+
+A session row holds its listing fields as columns, indexed by user, plus the
+rest of the session (questions, greeting, ...) as JSON written once when the
+session starts. Each submitted answer is one appended answers row and an
+update of the session's counters, instead of a rewrite of the whole session.
+
+Recently used sessions are kept in a bounded LRU cache. A cached session is
+checked against its row's answer count before use, so an answer recorded
+by another worker is picked up by reading only the missing answer rows.
+Session JSON files written before the store existed are imported once.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterator
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+DATABASE_FILENAME = "sessions.db"
+
+# Session fields stored in their own columns or tables rather than in the record
+COLUMN_FIELDS = ["session_id", "user_id", "role", "start_time", "end_time",
+                 "completed", "current_question", "answers", "emotion_analyses"]
+
+
+class InterviewSessionStore:
+    """SQLite-backed interview sessions with a per-user index and an LRU cache"""
+
+    def __init__(self, session_directory: str, cache_size: int = 256):
+        """
+        Open (or create) the store in a session directory
+
+        Args:
+            session_directory: Directory holding the session database
+            cache_size: Maximum number of sessions kept in memory
+        """
+        self.session_directory = session_directory
+        self.cache_size = cache_size
+        os.makedirs(session_directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._cache = OrderedDict()
+        self._conn = sqlite3.connect(os.path.join(session_directory, DATABASE_FILENAME),
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                user_id TEXT,
+                role TEXT,
+                start_time TEXT,
+                end_time TEXT,
+                completed INTEGER DEFAULT 0,
+                current_question INTEGER DEFAULT 0,
+                num_questions INTEGER DEFAULT 0,
+                num_answers INTEGER DEFAULT 0,
+                record TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS answers (
+                session_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                answer TEXT NOT NULL,
+                emotion_analysis TEXT,
+                PRIMARY KEY (session_id, position)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user_start ON sessions(user_id, start_time)")
+        # Session JSON files already imported
+        self._conn.execute("CREATE TABLE IF NOT EXISTS legacy_imports (filename TEXT PRIMARY KEY)")
+        self._import_legacy_files()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction holding the database write lock"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # ===== Cache =====
+
+    def _cache_put(self, session: Dict[str, Any]) -> None:
+        self._cache[session["session_id"]] = session
+        self._cache.move_to_end(session["session_id"])
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def evict(self, session_id: str) -> None:
+        """Drop a session from the cache; the next get reloads it"""
+        with self._lock:
+            self._cache.pop(session_id, None)
+
+    # ===== Reads =====
+
+    @staticmethod
+    def _load_answers(conn: sqlite3.Connection, session: Dict[str, Any], start: int) -> None:
+        """Append the session's answer rows from position start onwards"""
+        rows = conn.execute(
+            "SELECT answer, emotion_analysis FROM answers WHERE session_id = ? AND position >= ? ORDER BY position",
+            (session["session_id"], start)
+        )
+        for row in rows:
+            session["answers"].append(json.loads(row["answer"]))
+            session["emotion_analyses"].append(json.loads(row["emotion_analysis"]))
+
+    @staticmethod
+    def _apply_row(session: Dict[str, Any], row: sqlite3.Row) -> None:
+        session["current_question"] = row["current_question"]
+        session["completed"] = bool(row["completed"])
+        if row["end_time"]:
+            session["end_time"] = row["end_time"]
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a session, with its answers
+
+        Args:
+            session_id: ID of the interview session
+
+        Returns:
+            Session dictionary (shared with the cache) or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                self._cache.pop(session_id, None)
+                return None
+
+            session = self._cache.get(session_id)
+            if session is not None and len(session["answers"]) <= row["num_answers"]:
+                # Catch up with answers recorded by other workers
+                if len(session["answers"]) < row["num_answers"]:
+                    self._load_answers(self._conn, session, len(session["answers"]))
+                    self._apply_row(session, row)
+                self._cache.move_to_end(session_id)
+                return session
+
+            session = json.loads(row["record"])
+            session.update({
+                "session_id": row["session_id"],
+                "user_id": row["user_id"],
+                "role": row["role"],
+                "start_time": row["start_time"],
+                "answers": [],
+                "emotion_analyses": []
+            })
+            self._apply_row(session, row)
+            self._load_answers(self._conn, session, 0)
+            self._cache_put(session)
+            return session
+
+    def list_for_user(self, user_id: str) -> List[Dict[str, Any]]:
+        """
+        List a user's session summaries, oldest first
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            List of session summaries
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT session_id, role, start_time, end_time, completed, num_questions, num_answers "
+                "FROM sessions WHERE user_id = ? ORDER BY start_time",
+                (user_id,)
+            ).fetchall()
+        return [
+            {
+                "session_id": row["session_id"],
+                "role": row["role"],
+                "start_time": row["start_time"],
+                "end_time": row["end_time"],
+                "completed": bool(row["completed"]),
+                "num_questions": row["num_questions"],
+                "num_answers": row["num_answers"]
+            }
+            for row in rows
+        ]
+
+    # ===== Writes =====
+
+    @staticmethod
+    def _insert_session(conn: sqlite3.Connection, session: Dict[str, Any]) -> None:
+        """Insert a session and its answers (replacing any existing copy)"""
+        record = {key: value for key, value in session.items() if key not in COLUMN_FIELDS}
+        answers = session.get("answers", [])
+        analyses = session.get("emotion_analyses", [])
+        conn.execute("DELETE FROM answers WHERE session_id = ?", (session["session_id"],))
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (session_id, user_id, role, start_time, end_time, completed, "
+            "current_question, num_questions, num_answers, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (session["session_id"], session.get("user_id"), session.get("role"), session.get("start_time"),
+             session.get("end_time"), int(bool(session.get("completed"))), session.get("current_question", 0),
+             len(session.get("questions", [])), len(answers), json.dumps(record))
+        )
+        conn.executemany(
+            "INSERT INTO answers (session_id, position, answer, emotion_analysis) VALUES (?, ?, ?, ?)",
+            [(session["session_id"], position, json.dumps(answer),
+              json.dumps(analyses[position] if position < len(analyses) else None))
+             for position, answer in enumerate(answers)]
+        )
+
+    def create(self, session: Dict[str, Any]) -> None:
+        """
+        Store a new session
+
+        Args:
+            session: Session dictionary, with session_id and user_id
+        """
+        with self._transaction() as conn:
+            self._insert_session(conn, session)
+            self._cache_put(session)
+
+    def append_answer(self, session: Dict[str, Any]) -> bool:
+        """
+        Record the last answer of a session, along with its updated progress
+
+        The caller has appended the answer (and its emotion analysis) to the
+        session dictionary. The write only succeeds if the stored session has
+        exactly the answers before it.
+
+        Args:
+            session: Session dictionary returned by get
+
+        Returns:
+            True if recorded, False if another worker recorded an answer first
+        """
+        session_id = session["session_id"]
+        position = len(session["answers"]) - 1
+        try:
+            with self._transaction() as conn:
+                updated = conn.execute(
+                    "UPDATE sessions SET num_answers = ?, current_question = ?, completed = ?, end_time = ? "
+                    "WHERE session_id = ? AND num_answers = ?",
+                    (position + 1, session["current_question"], int(bool(session["completed"])),
+                     session.get("end_time"), session_id, position)
+                ).rowcount
+                if not updated:
+                    raise _StaleSession()
+                conn.execute(
+                    "INSERT INTO answers (session_id, position, answer, emotion_analysis) VALUES (?, ?, ?, ?)",
+                    (session_id, position, json.dumps(session["answers"][position]),
+                     json.dumps(session["emotion_analyses"][position]))
+                )
+        except _StaleSession:
+            logger.warning(f"Interview session {session_id} was updated by another worker")
+            self.evict(session_id)
+            return False
+        except Exception as e:
+            logger.error(f"Error saving answer for interview session {session_id}: {str(e)}")
+            self.evict(session_id)
+            return False
+        return True
+
+    # ===== Legacy files =====
+
+    def _import_legacy_files(self) -> None:
+        """Import session JSON files not imported yet"""
+        try:
+            filenames = [name for name in os.listdir(self.session_directory) if name.endswith(".json")]
+        except OSError:
+            return
+        if not filenames:
+            return
+
+        imported = {row[0] for row in self._conn.execute("SELECT filename FROM legacy_imports")}
+        pending = [name for name in filenames if name not in imported]
+        if not pending:
+            return
+
+        count = 0
+        with self._transaction() as conn:
+            for filename in pending:
+                try:
+                    with open(os.path.join(self.session_directory, filename), 'r') as f:
+                        session = json.load(f)
+                    if session.get("session_id"):
+                        exists = conn.execute(
+                            "SELECT 1 FROM sessions WHERE session_id = ?", (session["session_id"],)
+                        ).fetchone()
+                        if not exists:
+                            self._insert_session(conn, session)
+                            count += 1
+                except Exception as e:
+                    logger.error(f"Error importing interview session file {filename}: {str(e)}")
+                conn.execute("INSERT OR IGNORE INTO legacy_imports (filename) VALUES (?)", (filename,))
+        if count:
+            logger.info(f"Imported {count} interview session files into {DATABASE_FILENAME}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _StaleSession(Exception):
+    """Raised inside append_answer to roll back a write based on an outdated session"""
@@ -0,0 +1,606 @@
+"""
+LLM Provider Client
+
+This module provides the shared HTTP client layer used for chat completion
+providers (OpenAI, DeepSeek, OpenRouter, Groq and local OpenAI-compatible
+servers). Each provider gets a pooled keep-alive session with connect and read
+timeouts, bounded retries with jittered backoff, a concurrency limit and a
+circuit breaker. An asyncio variant applies the same policies, and chat
+completions can also be streamed token by token.
+"""
+
+import os
+import ssl
+import json
+import time
+import random
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Dict, Any, List, Optional, Tuple, Union, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Try to import optional dependencies
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    logging.warning("aiohttp not installed. Async LLM calls will run in worker threads. Install with: pip install aiohttp")
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Request policy, overridable through the environment
+CONNECT_TIMEOUT = float(os.environ.get('LLM_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.environ.get('LLM_READ_TIMEOUT', '60'))
+MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', '2'))
+BACKOFF_BASE = float(os.environ.get('LLM_BACKOFF_BASE', '0.5'))
+BACKOFF_MAX = float(os.environ.get('LLM_BACKOFF_MAX', '8'))
+MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', '8'))
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('LLM_BREAKER_FAILURES', '5'))
+BREAKER_RESET_TIMEOUT = float(os.environ.get('LLM_BREAKER_RESET_SECONDS', '30'))
+
+# Rate limiting and transient server errors are worth retrying
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# Provider endpoints; base URLs can be overridden (e.g. to point at a test server)
+PROVIDER_ENDPOINTS = {
+    'openai': {
+        'label': 'OpenAI',
+        'base_url': os.environ.get('OPENAI_BASE_URL', 'https://api.openai.com/v1'),
+        'api_key_env': 'OPENAI_API_KEY'
+    },
+    'deepseek': {
+        'label': 'DeepSeek',
+        'base_url': os.environ.get('DEEPSEEK_BASE_URL', 'https://api.deepseek.com/v1'),
+        'api_key_env': 'DEEPSEEK_API_KEY'
+    },
+    'openrouter': {
+        'label': 'OpenRouter',
+        'base_url': os.environ.get('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1'),
+        'api_key_env': 'OPENROUTER_API_KEY',
+        'headers': {
+            "HTTP-Referer": os.environ.get('APP_DOMAIN', 'https://tamkeen-ai.com'),
+            "X-Title": "Tamkeen AI Career System"
+        }
+    },
+    'groq': {
+        'label': 'Groq',
+        'base_url': os.environ.get('GROQ_BASE_URL', 'https://api.groq.com/openai/v1'),
+        'api_key_env': 'GROQ_API_KEY'
+    },
+    'local': {
+        'label': 'Local LLM',
+        'base_url': f"{os.environ.get('LOCAL_LLM_URL', 'http://localhost:8000')}/v1",
+        'api_key_env': 'LOCAL_LLM_API_KEY'
+    }
+}
+
+
+class ProviderError(Exception):
+    """LLM provider request error"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+
+class ProviderUnavailableError(ProviderError):
+    """Raised without sending a request while a provider's circuit is open"""
+
+    def __init__(self, message: str):
+        super().__init__(message, retryable=True)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a provider
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    are rejected for reset_timeout seconds. A single trial call is then let
+    through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT, name: str = "provider"):
+        """
+        Initialize circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to wait before allowing a trial call
+            name: Name used in log messages
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open"""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may be attempted
+
+        Returns:
+            bool: True if the call may proceed
+        """
+        with self._lock:
+            state = self._state()
+
+            if state == "closed":
+                return True
+
+            if state == "half_open" and not self._trial_in_progress:
+                self._trial_in_progress = True
+                return True
+
+            return False
+
+    def record_success(self):
+        """Record a successful call"""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        """Record a failed call"""
+        with self._lock:
+            self.failures += 1
+
+            if self._trial_in_progress or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self._trial_in_progress:
+                    logger.warning(f"{self.name} circuit opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+
+            self._trial_in_progress = False
+
+    def release_trial(self):
+        """Release a trial call that ended without an outcome (e.g. cancelled)"""
+        with self._lock:
+            self._trial_in_progress = False
+
+
+class ProviderClient:
+    """Pooled HTTP client for one OpenAI-compatible chat completion provider"""
+
+    def __init__(self, name: str, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT,
+                 max_retries: int = MAX_RETRIES, backoff_base: float = BACKOFF_BASE,
+                 backoff_max: float = BACKOFF_MAX, max_concurrency: int = MAX_CONCURRENCY,
+                 breaker: Optional[CircuitBreaker] = None, verify: Union[bool, str] = True):
+        """
+        Initialize provider client
+
+        Args:
+            name: Provider name (key of PROVIDER_ENDPOINTS)
+            base_url: API base URL (provider default if None)
+            api_key: API key (read from the provider's environment variable if None)
+            headers: Extra request headers
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Seconds to wait for response data
+            max_retries: Retries after the first attempt for transient failures
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Maximum delay in seconds between attempts
+            max_concurrency: Maximum concurrent requests to the provider
+            breaker: Circuit breaker (a new one if None)
+            verify: Verify TLS certificates, or path to a CA bundle (e.g. for a self-hosted provider)
+        """
+        endpoint = PROVIDER_ENDPOINTS.get(name, {})
+
+        self.name = name
+        self.label = endpoint.get('label', name)
+        self.base_url = (base_url or endpoint.get('base_url', '')).rstrip('/')
+        self.api_key = api_key if api_key is not None else os.environ.get(endpoint.get('api_key_env', ''), '')
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker or CircuitBreaker(name=self.label)
+
+        self.headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            self.headers["Authorization"] = f"Bearer {self.api_key}"
+        self.headers.update(endpoint.get('headers', {}))
+        self.headers.update(headers or {})
+
+        # Keep-alive connection pool sized to the concurrency limit; retries are handled here
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.verify = verify
+
+        # aiohttp sessions and semaphores belong to an event loop
+        self._async_state = weakref.WeakKeyDictionary()
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before the next attempt: full jitter, or the server's Retry-After"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+        if retry_after:
+            try:
+                delay = max(delay, min(self.backoff_max, float(retry_after)))
+            except ValueError:
+                pass
+
+        return delay
+
+    def _status_error(self, status_code: int, text: str) -> ProviderError:
+        """Build the error for a non-200 response"""
+        return ProviderError(
+            f"{self.label} API error: {text}",
+            status_code=status_code,
+            retryable=status_code in RETRY_STATUS_CODES
+        )
+
+    def _parse_json(self, body) -> Dict[str, Any]:
+        """Parse a response body (text, or a callable returning parsed JSON)"""
+        try:
+            return body() if callable(body) else json.loads(body)
+        except ValueError:
+            raise ProviderError(f"{self.label} API error: invalid JSON response")
+
+    def _check_circuit(self):
+        """Reject the call while the provider's circuit is open"""
+        if not self.breaker.allow_request():
+            raise ProviderUnavailableError(f"{self.label} is unavailable (circuit open)")
+
+    def _record(self, error: Optional[ProviderError]):
+        """Update the circuit breaker with a call outcome"""
+        # Client errors (bad request, auth) mean the provider itself is up
+        if error is None or not error.retryable:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST a JSON payload to the provider
+
+        Args:
+            path: Endpoint path (e.g. "/chat/completions")
+            payload: JSON payload
+
+        Returns:
+            dict: Parsed JSON response
+
+        Raises:
+            ProviderUnavailableError: If the circuit is open
+            ProviderError: If the request fails after retries
+        """
+        if not self._semaphore.acquire(timeout=self.read_timeout):
+            raise ProviderError(f"{self.label} concurrency limit reached", retryable=True)
+
+        try:
+            self._check_circuit()
+            result = self._post_with_retries(f"{self.base_url}{path}", payload)
+        except ProviderUnavailableError:
+            raise
+        except ProviderError as e:
+            self._record(e)
+            raise
+        except BaseException:
+            self.breaker.release_trial()
+            raise
+        finally:
+            self._semaphore.release()
+
+        self._record(None)
+        return result
+
+    def stream(self, path: str, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        POST a JSON payload and iterate over the server-sent events of the response
+
+        Failures before the response starts are retried like post(); a stream
+        that breaks off midway is not.
+
+        Args:
+            path: Endpoint path (e.g. "/chat/completions")
+            payload: JSON payload
+
+        Yields:
+            dict: Parsed JSON of each event
+
+        Raises:
+            ProviderUnavailableError: If the circuit is open
+            ProviderError: If the request fails after retries or the stream is interrupted
+        """
+        if not self._semaphore.acquire(timeout=self.read_timeout):
+            raise ProviderError(f"{self.label} concurrency limit reached", retryable=True)
+
+        try:
+            try:
+                self._check_circuit()
+                response = self._post_with_retries(f"{self.base_url}{path}", payload, stream=True)
+            except ProviderUnavailableError:
+                raise
+            except ProviderError as e:
+                self._record(e)
+                raise
+            except BaseException:
+                self.breaker.release_trial()
+                raise
+
+            self._record(None)
+
+            with response:
+                # text/event-stream is UTF-8 even without a charset
+                response.encoding = 'utf-8'
+                try:
+                    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                        if not line.startswith('data:'):
+                            continue
+                        data = line[5:].strip()
+                        if data == '[DONE]':
+                            break
+                        yield self._parse_json(data)
+                except requests.RequestException as e:
+                    self.breaker.record_failure()
+                    raise ProviderError(f"{self.label} stream interrupted: {str(e)}", retryable=True)
+        finally:
+            self._semaphore.release()
+
+    def _post_with_retries(self, url: str, payload: Dict[str, Any], stream: bool = False):
+        """Send a request, retrying transient failures with backoff
+
+        Returns the parsed JSON response, or the open response when streaming
+        """
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+
+            try:
+                response = self.session.post(url, json=payload, verify=self.verify, stream=stream,
+                                             timeout=(self.connect_timeout, self.read_timeout))
+
+                if response.status_code == 200:
+                    return response if stream else self._parse_json(response.json)
+
+                error = self._status_error(response.status_code, response.text)
+                retry_after = response.headers.get('Retry-After')
+                response.close()
+
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = ProviderError(f"{self.label} request failed: {str(e)}", retryable=True)
+
+            if not error.retryable or attempt == self.max_retries:
+                raise error
+
+            delay = self._backoff(attempt, retry_after)
+            logger.warning(f"{self.label} request failed ({str(error)[:200]}), retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+    def _ssl_option(self):
+        """TLS verification setting for aiohttp, matching the requests session"""
+        if isinstance(self.verify, str):
+            return ssl.create_default_context(cafile=self.verify)
+        return None if self.verify else False
+
+    def _get_async_state(self) -> Tuple[Any, asyncio.Semaphore]:
+        """Get the aiohttp session and semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        state = self._async_state.get(loop)
+
+        if state is None or state[0].closed:
+            session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, ssl=self._ssl_option()),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+            )
+            state = (session, asyncio.Semaphore(self.max_concurrency))
+            self._async_state[loop] = state
+
+        return state
+
+    async def apost(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST a JSON payload to the provider from asyncio code
+
+        Args:
+            path: Endpoint path (e.g. "/chat/completions")
+            payload: JSON payload
+
+        Returns:
+            dict: Parsed JSON response
+
+        Raises:
+            ProviderUnavailableError: If the circuit is open
+            ProviderError: If the request fails after retries
+        """
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.to_thread(self.post, path, payload)
+
+        session, semaphore = self._get_async_state()
+
+        async with semaphore:
+            self._check_circuit()
+
+            try:
+                result = await self._apost_with_retries(session, f"{self.base_url}{path}", payload)
+            except ProviderError as e:
+                self._record(e)
+                raise
+            except BaseException:
+                # Cancelled calls must not leave a half-open trial pending
+                self.breaker.release_trial()
+                raise
+
+        self._record(None)
+        return result
+
+    async def _apost_with_retries(self, session, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a request from asyncio code, retrying transient failures with backoff"""
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+
+            try:
+                async with session.post(url, json=payload) as response:
+                    if response.status == 200:
+                        return self._parse_json(await response.text())
+
+                    error = self._status_error(response.status, await response.text())
+                    retry_after = response.headers.get('Retry-After')
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = ProviderError(f"{self.label} request failed: {str(e) or type(e).__name__}", retryable=True)
+
+            if not error.retryable or attempt == self.max_retries:
+                raise error
+
+            delay = self._backoff(attempt, retry_after)
+            logger.warning(f"{self.label} request failed ({str(error)[:200]}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def chat_completion(self, model: str, messages: List[Dict[str, str]],
+                        temperature: float = 0.7, max_tokens: int = 1000, **kwargs) -> Dict[str, Any]:
+        """
+        Request a chat completion
+
+        Args:
+            model: Model name
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in the response
+            **kwargs: Additional request parameters
+
+        Returns:
+            dict: Provider response
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs
+        }
+        return self.post("/chat/completions", payload)
+
+    async def achat_completion(self, model: str, messages: List[Dict[str, str]],
+                               temperature: float = 0.7, max_tokens: int = 1000, **kwargs) -> Dict[str, Any]:
+        """
+        Request a chat completion from asyncio code
+
+        Args:
+            model: Model name
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in the response
+            **kwargs: Additional request parameters
+
+        Returns:
+            dict: Provider response
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs
+        }
+        return await self.apost("/chat/completions", payload)
+
+    def stream_chat_completion(self, model: str, messages: List[Dict[str, str]],
+                               temperature: float = 0.7, max_tokens: int = 1000, **kwargs) -> Iterator[str]:
+        """
+        Stream a chat completion
+
+        Args:
+            model: Model name
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in the response
+            **kwargs: Additional request parameters
+
+        Yields:
+            str: Text chunks of the response as they are generated
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs,
+            "stream": True
+        }
+
+        for event in self.stream("/chat/completions", payload):
+            choices = event.get("choices") or [{}]
+            content = (choices[0].get("delta") or {}).get("content")
+            if content:
+                yield content
+
+    async def aclose(self):
+        """Close the aiohttp session of the running event loop"""
+        state = self._async_state.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state[0].close()
+
+    def close(self):
+        """Close the pooled session"""
+        self.session.close()
+
+
+# Process-wide clients, one per provider
+_clients: Dict[str, ProviderClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_provider_client(provider: str) -> ProviderClient:
+    """
+    Get the shared client for a provider
+
+    Args:
+        provider: Provider name (key of PROVIDER_ENDPOINTS)
+
+    Returns:
+        ProviderClient: Provider client
+    """
+    client = _clients.get(provider)
+
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(provider)
+            if client is None:
+                client = _clients[provider] = ProviderClient(provider)
+
+    return client
+
+
+def get_provider_status() -> Dict[str, Dict[str, Any]]:
+    """
+    Get the circuit state of every provider client in use
+
+    Returns:
+        dict: Circuit state and consecutive failures by provider
+    """
+    return {
+        name: {"state": client.breaker.state, "failures": client.breaker.failures}
+        for name, client in list(_clients.items())
+    }
@@ -1,7 +1,9 @@
 import os
-import requests
-import json
-from typing import Optional, Dict, Any, List
+import re
+from typing import Optional, Dict, Any, List, Tuple, Iterator
+
+from .llm_client import get_provider_client, ProviderError
+from .predict_api.mock_provider import MockDataProvider
 
 # Get API keys from environment variables
 DEEPSEEK_API_KEY = os.environ.get('DEEPSEEK_API_KEY', '')
@@ -9,13 +11,91 @@ OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
 OPENROUTER_API_KEY = os.environ.get('OPENROUTER_API_KEY', '')
 GROQ_API_KEY = os.environ.get('GROQ_API_KEY', '')
 
+# Mock providers used when a provider is down, one per provider name
+_mock_providers: Dict[str, MockDataProvider] = {}
+
+def _resolve_provider(provider: str, model: Optional[str]) -> Tuple[Optional[str], str, Optional[str]]:
+    """
+    Map a requested provider to its client, default model and configuration error.
+    
+    Returns:
+    - Tuple of (client name, model, error message or None)
+    """
+    # OpenAI (GPT-3.5 or GPT-4)
+    if provider == 'openai':
+        if not OPENAI_API_KEY:
+            return None, model, "OpenAI API key not configured"
+        return 'openai', model or "gpt-3.5-turbo", None
+    
+    # DeepSeek models
+    elif provider == 'deepseek':
+        if not DEEPSEEK_API_KEY:
+            return None, model, "DeepSeek API key not configured"
+        return 'deepseek', model or "deepseek-chat", None
+    
+    # Llama3 or other models via OpenRouter
+    elif provider == 'openrouter' or provider == 'llama3':
+        if not OPENROUTER_API_KEY:
+            return None, model, "OpenRouter API key not configured"
+        default_model = "meta-llama/llama-3-8b-instruct" if provider == 'llama3' else "deepseek-ai/deepseek-coder"
+        return 'openrouter', model or default_model, None
+    
+    # Groq API for fast responses
+    elif provider == 'groq':
+        if not GROQ_API_KEY:
+            return None, model, "Groq API key not configured"
+        return 'groq', model or "llama3-8b-8192", None
+    
+    # Local Flask or Python server (assuming it follows OpenAI-like API)
+    elif provider == 'local':
+        return 'local', model or "local-model", None
+    
+    # Unknown provider
+    return None, model, f"Unknown provider: {provider}"
+
+def _mock_failover(provider: str, model: str, messages: List[Dict[str, str]], error: ProviderError) -> Dict[Any, Any]:
+    """Answer from the mock provider while a provider is down."""
+    mock_provider = _mock_providers.get(provider)
+    if mock_provider is None:
+        mock_provider = _mock_providers[provider] = MockDataProvider(provider=provider, simulate_latency=False)
+    
+    mock_response = mock_provider.get_mock_response('chat', {'messages': messages, 'model': model})
+    
+    return {
+        "content": mock_response["content"],
+        "provider": mock_response["provider"],
+        "model": model,
+        "success": True,
+        "mock_used": True,
+        "failover_reason": str(error)
+    }
+
+def _mock_stream(provider: str, model: str, messages: List[Dict[str, str]], error: ProviderError) -> Iterator[str]:
+    """Stream the mock provider's answer word by word while a provider is down."""
+    content = _mock_failover(provider, model, messages, error)["content"]
+    for word in re.findall(r'\S+\s*', content):
+        yield word
+
+def _completion_result(result: Dict[str, Any], provider: str, model: str) -> Dict[Any, Any]:
+    """Format a provider response."""
+    return {
+        "content": result["choices"][0]["message"]["content"],
+        "provider": provider,
+        "model": model,
+        "success": True
+    }
+
 def query_llm_provider(messages: List[Dict[str, str]], provider: str = 'openai', model: str = None, temperature: float = 0.7, max_tokens: int = 1000) -> Dict[Any, Any]:
     """
     Query different LLM providers based on the specified provider parameter.
     
+    Requests go through the shared provider clients (pooled connections,
+    timeouts, retries and a circuit breaker). When a provider is down the
+    answer comes from the mock provider instead.
+    
     Parameters:
     - messages: List of message dictionaries with 'role' and 'content' fields
-    - provider: Which AI provider to use ('openai', 'deepseek', 'llama3', 'local')
+    - provider: Which AI provider to use ('openai', 'deepseek', 'openrouter', 'llama3', 'groq', 'local')
     - model: Specific model to use (optional, provider-dependent)
     - temperature: Creativity parameter (0.0 to 1.0)
     - max_tokens: Maximum tokens in the response
@@ -33,185 +113,96 @@ def query_llm_provider(messages: List[Dict[str, str]], provider: str = 'openai',
         "error": "Failed to connect to AI provider"
     }
     
+    client_name, model, config_error = _resolve_provider(provider, model)
+    if config_error:
+        return {**default_response, "error": config_error}
+    
     try:
-        # OpenAI (GPT-3.5 or GPT-4)
-        if provider == 'openai':
-            # Default model if not specified
-            if not model:
-                model = "gpt-3.5-turbo"
-                
-            if not OPENAI_API_KEY:
-                return {**default_response, "error": "OpenAI API key not configured"}
-                
-            # Use direct API if we have the key
-            url = "https://api.openai.com/v1/chat/completions"
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {OPENAI_API_KEY}"
-            }
-            payload = {
-                "model": model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens
-            }
-            
-            response = requests.post(url, headers=headers, json=payload)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "content": result["choices"][0]["message"]["content"],
-                    "provider": "openai",
-                    "model": model,
-                    "success": True
-                }
-            else:
-                return {**default_response, "error": f"OpenAI API error: {response.text}"}
-        
-        # DeepSeek models
-        elif provider == 'deepseek':
-            if not model:
-                model = "deepseek-chat"
-                
-            if not DEEPSEEK_API_KEY:
-                return {**default_response, "error": "DeepSeek API key not configured"}
-                
-            url = "https://api.deepseek.com/v1/chat/completions"
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {DEEPSEEK_API_KEY}"
-            }
-            payload = {
-                "model": model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens
-            }
-            
-            response = requests.post(url, headers=headers, json=payload)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "content": result["choices"][0]["message"]["content"],
-                    "provider": "deepseek",
-                    "model": model,
-                    "success": True
-                }
-            else:
-                return {**default_response, "error": f"DeepSeek API error: {response.text}"}
-        
-        # Llama3 or other models via OpenRouter
-        elif provider == 'openrouter' or provider == 'llama3':
-            # Default model if not specified
-            if not model:
-                model = "meta-llama/llama-3-8b-instruct" if provider == 'llama3' else "deepseek-ai/deepseek-coder"
-                
-            if not OPENROUTER_API_KEY:
-                return {**default_response, "error": "OpenRouter API key not configured"}
-                
-            url = "https://openrouter.ai/api/v1/chat/completions"
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                "HTTP-Referer": os.environ.get('APP_DOMAIN', 'https://tamkeen-ai.com'),
-                "X-Title": "Tamkeen AI Career System"
-            }
-            payload = {
-                "model": model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens
-            }
-            
-            response = requests.post(url, headers=headers, json=payload)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "content": result["choices"][0]["message"]["content"],
-                    "provider": "openrouter",
-                    "model": model,
-                    "success": True
-                }
-            else:
-                return {**default_response, "error": f"OpenRouter API error: {response.text}"}
-        
-        # Groq API for fast responses
-        elif provider == 'groq':
-            # Default model if not specified
-            if not model:
-                model = "llama3-8b-8192"
-                
-            if not GROQ_API_KEY:
-                return {**default_response, "error": "Groq API key not configured"}
-                
-            url = "https://api.groq.com/openai/v1/chat/completions"
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {GROQ_API_KEY}"
-            }
-            payload = {
-                "model": model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens
-            }
-            
-            response = requests.post(url, headers=headers, json=payload)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "content": result["choices"][0]["message"]["content"],
-                    "provider": "groq",
-                    "model": model,
-                    "success": True
-                }
-            else:
-                return {**default_response, "error": f"Groq API error: {response.text}"}
+        client = get_provider_client(client_name)
+        result = client.chat_completion(model, messages, temperature=temperature, max_tokens=max_tokens)
+        return _completion_result(result, client_name, model)
         
-        # Local Flask or Python server (assuming it follows OpenAI-like API)
-        elif provider == 'local':
-            local_url = os.environ.get('LOCAL_LLM_URL', 'http://localhost:8000')
-            url = f"{local_url}/v1/chat/completions"
-            
-            # Determine if we need authentication
-            local_api_key = os.environ.get('LOCAL_LLM_API_KEY', '')
-            headers = {"Content-Type": "application/json"}
-            if local_api_key:
-                headers["Authorization"] = f"Bearer {local_api_key}"
-                
-            payload = {
-                "model": model or "local-model",
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens
-            }
-            
-            response = requests.post(url, headers=headers, json=payload)
+    except ProviderError as e:
+        # Provider down (circuit open, timeouts, server errors): fail over to mock data
+        if e.retryable:
+            return _mock_failover(client_name, model, messages, e)
+        return {**default_response, "error": str(e)}
             
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "content": result["choices"][0]["message"]["content"],
-                    "provider": "local",
-                    "model": model or "local-model",
-                    "success": True
-                }
-            else:
-                return {**default_response, "error": f"Local LLM API error: {response.text}"}
+    except Exception as e:
+        return {**default_response, "error": str(e)}
+
+async def aquery_llm_provider(messages: List[Dict[str, str]], provider: str = 'openai', model: str = None, temperature: float = 0.7, max_tokens: int = 1000) -> Dict[Any, Any]:
+    """
+    Asyncio variant of query_llm_provider.
+    
+    Parameters and return value are the same as query_llm_provider.
+    """
+    provider = provider.lower()
+    
+    # Default response for errors
+    default_response = {
+        "content": "I'm sorry, I couldn't process your request due to a technical issue.",
+        "provider": provider,
+        "success": False,
+        "error": "Failed to connect to AI provider"
+    }
+    
+    client_name, model, config_error = _resolve_provider(provider, model)
+    if config_error:
+        return {**default_response, "error": config_error}
+    
+    try:
+        client = get_provider_client(client_name)
+        result = await client.achat_completion(model, messages, temperature=temperature, max_tokens=max_tokens)
+        return _completion_result(result, client_name, model)
         
-        # Unknown provider
-        else:
-            return {**default_response, "error": f"Unknown provider: {provider}"}
+    except ProviderError as e:
+        # Provider down (circuit open, timeouts, server errors): fail over to mock data
+        if e.retryable:
+            return _mock_failover(client_name, model, messages, e)
+        return {**default_response, "error": str(e)}
             
     except Exception as e:
         return {**default_response, "error": str(e)}
 
-def query_deepseek(query: str, lang: str = 'en') -> str:
-    """Query the DeepSeek API for advanced career guidance"""
+def stream_llm_provider(messages: List[Dict[str, str]], provider: str = 'openai', model: str = None, temperature: float = 0.7, max_tokens: int = 1000) -> Iterator[str]:
+    """
+    Stream a completion from an LLM provider as it is generated.
+    
+    Uses the same providers as query_llm_provider. When the provider is down
+    before the first token arrives, the mock provider's answer is streamed
+    instead.
+    
+    Parameters are the same as query_llm_provider.
+    
+    Yields:
+    - Text chunks of the response
+    
+    Raises:
+    - ProviderError: If the provider is not configured, rejects the request,
+      or the stream breaks off after it started
+    """
+    provider = provider.lower()
+    
+    client_name, model, config_error = _resolve_provider(provider, model)
+    if config_error:
+        raise ProviderError(config_error)
+    
+    started = False
+    try:
+        client = get_provider_client(client_name)
+        for chunk in client.stream_chat_completion(model, messages, temperature=temperature, max_tokens=max_tokens):
+            started = True
+            yield chunk
+            
+    except ProviderError as e:
+        # Provider down before anything was sent: fail over to mock data
+        if started or not e.retryable:
+            raise
+        yield from _mock_stream(client_name, model, messages, e)
+
+def _deepseek_messages(query: str, lang: str) -> List[Dict[str, str]]:
+    """Build the career guidance prompt sent to DeepSeek"""
     # System prompts tailored to specific career guidance
     if lang == 'ar':
         system_msg = """أنت مستشار مهني خبير باللغة العربية يدعى حصة المازمي. قدم إجابات دقيقة ومفيدة عن المسارات المهنية والمهارات المطلوبة والتعليم.
@@ -229,64 +220,45 @@ def query_deepseek(query: str, lang: str = 'en') -> str:
         user_prompt = f"Career question: {query}. Provide a detailed and helpful answer focused on practical steps."
 
     # Prepare the messages in the format expected by query_llm_provider
-    messages = [
+    return [
         {"role": "system", "content": system_msg},
         {"role": "user", "content": user_prompt}
     ]
+
+def _deepseek_unavailable_message(lang: str) -> str:
+    """General guidance given when DeepSeek cannot answer"""
+    if lang == 'en':
+        return "I'm sorry, I couldn't retrieve detailed information about that career path at the moment. Let me provide some general guidance instead: The most important skills in any career are adaptability, continuous learning, and effective communication. Consider researching industry certifications, relevant online courses, and networking opportunities in your desired field."
+    else:
+        return "عذرًا، لم أتمكن من استرجاع معلومات مفصلة حول هذا المسار المهني في الوقت الحالي. دعني أقدم بعض الإرشادات العامة بدلاً من ذلك: أهم المهارات في أي مهنة هي القدرة على التكيف، والتعلم المستمر، والتواصل الفعال. ابحث عن الشهادات المهنية، والدورات الإلكترونية ذات الصلة، وفرص التواصل المهني في المجال الذي ترغب فيه."
+
+def query_deepseek(query: str, lang: str = 'en') -> str:
+    """Query the DeepSeek API for advanced career guidance"""
+    messages = _deepseek_messages(query, lang)
     
-    # Try to use the multi-provider function first
+    # Query through the shared provider client (retries and mock failover included)
     try:
         result = query_llm_provider(messages, provider="deepseek")
         if result["success"]:
             return result["content"]
     except Exception as e:
         print(f"Error using query_llm_provider: {e}")
-        # Fall back to original implementation
-        pass
-
-    # Original implementation as fallback
-    # API endpoint
-    url = "https://api.deepseek.com/v1/chat/completions"
-
-    # Prepare the payload
-    payload = {
-        "model": "deepseek-chat",
-        "messages": [
-            {"role": "system", "content": system_msg},
-            {"role": "user", "content": user_prompt}
-        ],
-        "temperature": 0.7,
-        "max_tokens": 1000
-    }
 
-    # Set up headers with API key
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {DEEPSEEK_API_KEY}"
-    }
+    # Provider unavailable and no mock answer: give general guidance
+    return _deepseek_unavailable_message(lang)
 
+def stream_deepseek(query: str, lang: str = 'en') -> Iterator[str]:
+    """Stream DeepSeek career guidance as it is generated (see query_deepseek)"""
+    started = False
     try:
-        # Make the API request
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
-
-        # Check if the request was successful
-        if response.status_code == 200:
-            # Parse the response
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
-        else:
-            # Handle API errors
-            if lang == 'en':
-                return "I'm sorry, I couldn't retrieve detailed information about that career path at the moment. Let me provide some general guidance instead: The most important skills in any career are adaptability, continuous learning, and effective communication. Consider researching industry certifications, relevant online courses, and networking opportunities in your desired field."
-            else:
-                return "عذرًا، لم أتمكن من استرجاع معلومات مفصلة حول هذا المسار المهني في الوقت الحالي. دعني أقدم بعض الإرشادات العامة بدلاً من ذلك: أهم المهارات في أي مهنة هي القدرة على التكيف، والتعلم المستمر، والتواصل الفعال. ابحث عن الشهادات المهنية، والدورات الإلكترونية ذات الصلة، وفرص التواصل المهني في المجال الذي ترغب فيه."
-
-    except Exception as e:
-        # Handle exceptions
-        if lang == 'en':
-            return "I'm experiencing connectivity issues. Here's some general advice: 1) Research the specific skills and qualifications needed in your field, 2) Connect with professionals through LinkedIn and industry events, 3) Look for internships or volunteer opportunities to gain experience, 4) Consider relevant certifications or advanced degrees if applicable."
-        else:
-            return "أواجه مشاكل في الاتصال. إليك بعض النصائح العامة: 1) ابحث عن المهارات والمؤهلات المطلوبة في مجالك، 2) تواصل مع المحترفين من خلال LinkedIn والفعاليات المهنية، 3) ابحث عن فرص التدريب أو التطوع لاكتساب الخبرة، 4) فكر في الحصول على شهادات مهنية أو درجات علمية متقدمة إذا كان ذلك مناسبًا."
+        for chunk in stream_llm_provider(_deepseek_messages(query, lang), provider="deepseek"):
+            started = True
+            yield chunk
+    except ProviderError as e:
+        if started:
+            raise
+        print(f"Error using stream_llm_provider: {e}")
+        yield _deepseek_unavailable_message(lang)
 
 def get_chatbot_response(query: str, lang: str = 'en') -> str:
     """Enhanced career-aware chatbot function with DeepSeek fallback for ANY career field"""
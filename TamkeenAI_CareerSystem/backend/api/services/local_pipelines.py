@@ -0,0 +1,248 @@
+"""
+Local Pipelines
+
+Shared state for running Hugging Face models in-process:
+
+- PipelineCache keeps loaded transformers pipelines keyed by (task, model)
+  and evicts the least recently used ones once their combined parameter
+  memory exceeds a budget. Concurrent first requests for the same model
+  load it once.
+- MicroBatcher collects concurrent single-text requests for the same
+  pipeline for a few milliseconds and runs them as one batched forward
+  pass. The first request of a batch waits for the others and runs it;
+  every caller gets the same result a pipe(text) call would give.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, Callable
+
+from ..config.env import HF_PIPELINE_CACHE_MB, HF_BATCH_WAIT_MS, HF_MAX_BATCH_SIZE
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Footprint assumed for pipelines whose model size cannot be measured
+DEFAULT_PIPELINE_BYTES = 500 * 1024 * 1024
+
+
+def pipeline_nbytes(pipe: Any) -> int:
+    """Parameter and buffer memory of a pipeline's model"""
+    model = getattr(pipe, "model", None)
+    try:
+        if hasattr(model, "parameters"):
+            # PyTorch
+            tensors = list(model.parameters()) + list(model.buffers())
+            return sum(t.numel() * t.element_size() for t in tensors)
+        if hasattr(model, "count_params"):
+            # TensorFlow (float32 weights)
+            return model.count_params() * 4
+    except Exception as e:
+        logger.debug(f"Could not measure pipeline size: {str(e)}")
+    return DEFAULT_PIPELINE_BYTES
+
+
+class _CachedPipeline:
+    """A loaded pipeline; the lock serialises calls, as tokenizers are not thread-safe"""
+
+    __slots__ = ("pipe", "nbytes", "lock")
+
+    def __init__(self, pipe: Any, nbytes: int):
+        self.pipe = pipe
+        self.nbytes = nbytes
+        self.lock = threading.Lock()
+
+
+class PipelineCache:
+    """Bounded LRU cache of loaded pipelines, sized by model memory"""
+
+    def __init__(self, max_bytes: int = HF_PIPELINE_CACHE_MB * 1024 * 1024,
+                 loader: Optional[Callable[..., Any]] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Memory budget of all cached pipelines (the most recently
+                used pipeline is kept even if it alone exceeds it)
+            loader: Pipeline factory, called as loader(task, model=model)
+                (default: transformers.pipeline)
+        """
+        self.max_bytes = max_bytes
+        self._loader = loader
+        self._entries = OrderedDict()  # (task, model) -> _CachedPipeline
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._loading = {}  # (task, model) -> lock held while loading
+
+    def _load(self, task: str, model: str) -> Any:
+        loader = self._loader
+        if loader is None:
+            from transformers import pipeline as loader
+        return loader(task, model=model)
+
+    def entry(self, task: str, model: str) -> _CachedPipeline:
+        """Cached pipeline entry for (task, model), loading it on a miss"""
+        key = (task, model)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                cached = self._entries.get(key)
+                if cached is not None:
+                    self._entries.move_to_end(key)
+                    return cached
+
+            pipe = self._load(task, model)
+            cached = _CachedPipeline(pipe, pipeline_nbytes(pipe))
+            logger.info(f"Loaded {task} pipeline for {model} ({cached.nbytes / 1e6:.0f} MB)")
+
+            with self._lock:
+                self._entries[key] = cached
+                self._total_bytes += cached.nbytes
+                self._loading.pop(key, None)
+                while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                    evicted_key, evicted = self._entries.popitem(last=False)
+                    self._total_bytes -= evicted.nbytes
+                    logger.info(f"Evicted {evicted_key[0]} pipeline for {evicted_key[1]} from the pipeline cache")
+            return cached
+
+    def get(self, task: str, model: str) -> Any:
+        """Loaded pipeline for (task, model)"""
+        return self.entry(task, model).pipe
+
+    def __call__(self, task: str, model: str, inputs: Any, **kwargs) -> Any:
+        """Run a cached pipeline on inputs"""
+        cached = self.entry(task, model)
+        with cached.lock:
+            return cached.pipe(inputs, **kwargs)
+
+    def clear(self) -> None:
+        """Drop every cached pipeline"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Cached pipelines and their memory use"""
+        with self._lock:
+            return {
+                "pipelines": [{"task": task, "model": model, "bytes": cached.nbytes}
+                              for (task, model), cached in self._entries.items()],
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+
+class _PendingBatch:
+    """Requests collected for one batched call"""
+
+    __slots__ = ("inputs", "futures", "closed")
+
+    def __init__(self):
+        self.inputs = []
+        self.futures = []
+        self.closed = threading.Event()
+
+
+class MicroBatcher:
+    """Runs concurrent single-text requests for the same pipeline as one batch"""
+
+    def __init__(self, cache: PipelineCache, max_wait_ms: float = HF_BATCH_WAIT_MS,
+                 max_batch_size: int = HF_MAX_BATCH_SIZE):
+        """
+        Initialize the batcher
+
+        Args:
+            cache: Pipeline cache to run batches on
+            max_wait_ms: How long the first request of a batch waits for more
+            max_batch_size: Batch size that is run without waiting further
+        """
+        self.cache = cache
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._pending = {}  # (task, model, kwargs) -> _PendingBatch
+        self._lock = threading.Lock()
+
+    def __call__(self, task: str, model: str, text: str, **kwargs) -> Any:
+        """
+        Run a pipeline on one text as part of a batch
+
+        Args:
+            task: Pipeline task (e.g. "text-classification", "summarization")
+            model: Model name or local path
+            text: Input text
+            **kwargs: Pipeline call arguments (requests only share a batch
+                when these are equal)
+
+        Returns:
+            The same result as pipe(text)
+        """
+        key = (task, model, repr(sorted(kwargs.items())))
+        future = Future()
+        with self._lock:
+            batch = self._pending.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._pending[key] = _PendingBatch()
+            batch.inputs.append(text)
+            batch.futures.append(future)
+            if len(batch.inputs) >= self.max_batch_size:
+                del self._pending[key]
+                batch.closed.set()
+
+        if leader:
+            batch.closed.wait(self.max_wait)
+            with self._lock:
+                if self._pending.get(key) is batch:
+                    del self._pending[key]
+            self._run(task, model, batch, kwargs)
+
+        return future.result()
+
+    def _run(self, task: str, model: str, batch: _PendingBatch, kwargs: Dict[str, Any]) -> None:
+        """Run a closed batch and hand each caller its result"""
+        try:
+            cached = self.cache.entry(task, model)
+            with cached.lock:
+                outputs = cached.pipe(list(batch.inputs), batch_size=len(batch.inputs), **kwargs)
+        except Exception as e:
+            for future in batch.futures:
+                future.set_exception(e)
+            return
+
+        for future, output in zip(batch.futures, outputs):
+            # pipe(text) wraps a single result in a list
+            future.set_result(output if isinstance(output, list) else [output])
+
+
+_pipeline_cache = None
+_batcher = None
+_state_lock = threading.Lock()
+
+
+def get_pipeline_cache() -> PipelineCache:
+    """Process-wide pipeline cache"""
+    global _pipeline_cache
+    if _pipeline_cache is None:
+        with _state_lock:
+            if _pipeline_cache is None:
+                _pipeline_cache = PipelineCache()
+    return _pipeline_cache
+
+
+def get_batcher() -> MicroBatcher:
+    """Process-wide micro-batcher on the shared pipeline cache"""
+    global _batcher
+    if _batcher is None:
+        cache = get_pipeline_cache()
+        with _state_lock:
+            if _batcher is None:
+                _batcher = MicroBatcher(cache)
+    return _batcher
@@ -8,5 +8,6 @@ fallback to mock data when API keys are not available or when API calls fail.
 from .deepseek_client import DeepSeekClient
 from .predict_client import PredictClient
 from .mock_provider import MockDataProvider
+from .response_cache import ResponseCache
 
-__all__ = ['DeepSeekClient', 'PredictClient', 'MockDataProvider'] 
\ No newline at end of file
+__all__ = ['DeepSeekClient', 'PredictClient', 'MockDataProvider', 'ResponseCache'] 
\ No newline at end of file
@@ -111,7 +111,8 @@ Provide a comprehensive analysis including:
             model=self.models['small'] if not detailed else self.models['default'],
             temperature=0.3,  # Lower temperature for more consistent analysis
             max_tokens=1500 if detailed else 500,
-            mock_endpoint='resume_analysis'
+            mock_endpoint='resume_analysis',
+            use_cache=True  # The same resume and job should get the same analysis
         )
         
         # Process response into structured format
@@ -200,7 +201,8 @@ For each job, provide:
             model=self.models['default'],
             temperature=0.3,
             max_tokens=1500,
-            mock_endpoint='job_matching'
+            mock_endpoint='job_matching',
+            use_cache=True
         )
         
         # Return raw response for now - in a real implementation, we would parse this
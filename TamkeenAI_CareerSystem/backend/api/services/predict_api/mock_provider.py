@@ -24,14 +24,16 @@ class MockDataProvider:
     without requiring actual API keys.
     """
     
-    def __init__(self, provider: str = 'deepseek'):
+    def __init__(self, provider: str = 'deepseek', simulate_latency: bool = True):
         """
         Initialize the mock data provider.
         
         Args:
             provider: Provider name to mimic ('deepseek', 'openai', etc.)
+            simulate_latency: Whether to delay chat responses like a real API call
         """
         self.provider = provider.lower()
+        self.simulate_latency = simulate_latency
         logger.info(f"Initialized mock data provider for {provider}")
         
         # Track usage metrics
@@ -93,7 +95,8 @@ class MockDataProvider:
             response_content = "I don't have enough context to provide a meaningful response. Could you please provide more details?"
         
         # Add small random delay to simulate API call
-        time.sleep(random.uniform(0.5, 1.5))
+        if self.simulate_latency:
+            time.sleep(random.uniform(0.5, 1.5))
         
         return {
             'content': response_content,
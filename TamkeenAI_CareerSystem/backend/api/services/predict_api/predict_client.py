@@ -12,6 +12,7 @@ import json
 import time
 
 from .mock_provider import MockDataProvider
+from .response_cache import ResponseCache, get_response_cache
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -30,7 +31,8 @@ class PredictClient:
         provider: str = 'deepseek',
         mock_data_enabled: Optional[bool] = None,
         mock_data_provider: Optional[MockDataProvider] = None,
-        base_url: Optional[str] = None
+        base_url: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None
     ):
         """
         Initialize the PredictClient.
@@ -41,6 +43,7 @@ class PredictClient:
             mock_data_enabled: Whether to enable mock data fallback (if None, determined by environment)
             mock_data_provider: Mock data provider instance (created if None)
             base_url: Base URL for API calls (provider-specific default if None)
+            response_cache: Cache for API responses (shared process-wide cache if None)
         """
         self.provider = provider.lower()
         self.api_key = api_key or self._get_api_key_from_env()
@@ -57,6 +60,9 @@ class PredictClient:
         # Set up provider-specific client
         self.api_client = self._initialize_api_client(base_url)
         
+        # Cache of successful API responses
+        self.response_cache = response_cache or get_response_cache()
+        
         # Track API usage metrics
         self.metrics = {
             'total_calls': 0,
@@ -64,7 +70,13 @@ class PredictClient:
             'failed_calls': 0,
             'mock_fallbacks': 0,
             'last_call_time': None,
-            'total_tokens': 0
+            'total_tokens': 0,
+            'cache_hits': 0,
+            'cache_similar_hits': 0,
+            'cache_misses': 0,
+            'cache_bypassed': 0,
+            'tokens_saved': 0,
+            'latency_saved_ms': 0.0
         }
         
         # Log initialization status
@@ -172,17 +184,24 @@ class PredictClient:
         temperature: float = 0.7,
         max_tokens: int = 1000,
         mock_endpoint: str = 'chat',
+        use_cache: Optional[bool] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
         Get chat completion from API with mock fallback.
         
+        Successful API responses are cached. By default only requests within
+        the cache's temperature threshold use the cache; callers whose prompts
+        should give one answer (analyses, scoring) opt in with use_cache=True.
+        
         Args:
             messages: List of message dictionaries with 'role' and 'content'
             model: Model name to use (provider-specific default if None)
             temperature: Temperature parameter for generation
             max_tokens: Maximum tokens to generate
             mock_endpoint: Mock endpoint to use for fallback
+            use_cache: True to cache at any temperature, False to bypass the
+                cache, None to cache only within the temperature threshold
             **kwargs: Additional provider-specific parameters
             
         Returns:
@@ -197,8 +216,23 @@ class PredictClient:
         
         # Try to use API client if available
         if self.api_client and not self.mock_data_enabled:
+            cache_key = None
+            if self.response_cache and use_cache is not False and self.provider in ('deepseek', 'openai'):
+                if use_cache or self.response_cache.is_cacheable(temperature):
+                    lookup_start = time.perf_counter()
+                    cache_key = self.response_cache.make_key(
+                        self.provider, model, messages, temperature, max_tokens, **kwargs
+                    )
+                    cached = self.response_cache.get(*cache_key)
+                    if cached is not None:
+                        return self._cached_response(cached, time.perf_counter() - lookup_start)
+                    self.metrics['cache_misses'] += 1
+                else:
+                    self.metrics['cache_bypassed'] += 1
+            
             try:
                 if self.provider in ('deepseek', 'openai'):
+                    call_start = time.perf_counter()
                     response = self.api_client.chat.completions.create(
                         model=model,
                         messages=messages,
@@ -206,13 +240,16 @@ class PredictClient:
                         max_tokens=max_tokens,
                         **kwargs
                     )
+                    latency = time.perf_counter() - call_start
                     
                     self.metrics['successful_calls'] += 1
-                    # Estimate token usage (rough approximation)
-                    self.metrics['total_tokens'] += max_tokens
+                    # Use reported token usage, otherwise estimate (rough approximation)
+                    usage = getattr(response, 'usage', None)
+                    tokens = getattr(usage, 'total_tokens', None) or max_tokens
+                    self.metrics['total_tokens'] += tokens
                     
                     # Format response for consistent structure
-                    return {
+                    result = {
                         'content': response.choices[0].message.content,
                         'model': model,
                         'provider': self.provider,
@@ -220,6 +257,11 @@ class PredictClient:
                         'mock_used': False,
                         'success': True
                     }
+                    
+                    if cache_key is not None:
+                        self.response_cache.set(*cache_key, response=result, tokens=tokens, latency=latency)
+                    
+                    return {**result, 'cached': False}
                 else:
                     logger.warning(f"Chat completion not implemented for {self.provider}")
             except Exception as e:
@@ -274,9 +316,29 @@ class PredictClient:
         }
         return defaults.get(self.provider, 'default-model')
     
+    def _cached_response(self, cached: Dict[str, Any], lookup_time: float) -> Dict[str, Any]:
+        """Record a cache hit and format the cached response."""
+        self.metrics['cache_hits'] += 1
+        if cached['match'] == 'similar':
+            self.metrics['cache_similar_hits'] += 1
+        self.metrics['tokens_saved'] += cached['tokens']
+        self.metrics['latency_saved_ms'] += max(cached['latency'] - lookup_time, 0.0) * 1000
+        
+        return {
+            **cached['response'],
+            'cached': True,
+            'cache_match': cached['match'],
+            'cache_similarity': round(cached['similarity'], 4)
+        }
+    
     def get_metrics(self) -> Dict[str, Any]:
-        """Get API usage metrics."""
-        return self.metrics
+        """Get API usage metrics, including response cache hit rate and savings."""
+        lookups = self.metrics['cache_hits'] + self.metrics['cache_misses']
+        return {
+            **self.metrics,
+            'cache_hit_rate': self.metrics['cache_hits'] / lookups if lookups else 0.0,
+            'cache_enabled': self.response_cache is not None
+        }
     
     def is_using_mock(self) -> bool:
         """Check if the client is using mock data."""
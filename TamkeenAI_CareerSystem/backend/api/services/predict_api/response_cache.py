@@ -0,0 +1,452 @@
+"""
+ResponseCache - Cache for LLM chat completion responses
+
+This module caches successful chat completions so that repeated
+deterministic prompts, and prompts whose callers opt in (analyses that
+should give one answer per input), are not sent to the provider again. Entries are keyed on a normalised hash of the provider,
+model, messages and generation parameters, kept in a bounded in-memory LRU
+in front of a bounded SQLite file, and expire after a TTL.
+
+An optional near-duplicate lookup matches prompts whose earlier messages are
+identical and whose last user message is TF-IDF similar to a cached one.
+"""
+
+import os
+import re
+import json
+import math
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Same data directory as config.settings.DATA_DIR
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+# Cache settings (overridable via environment)
+CACHE_ENABLED = os.environ.get("PREDICT_CACHE_ENABLED", "true").lower() in ('true', '1', 't', 'yes')
+CACHE_FILE = os.environ.get("PREDICT_CACHE_FILE", os.path.join(DATA_DIR, "llm_response_cache.db"))
+CACHE_TTL = int(os.environ.get("PREDICT_CACHE_TTL", "86400"))
+CACHE_MAX_MEMORY_ENTRIES = int(os.environ.get("PREDICT_CACHE_MAX_MEMORY_ENTRIES", "512"))
+CACHE_MAX_DISK_ENTRIES = int(os.environ.get("PREDICT_CACHE_MAX_DISK_ENTRIES", "10000"))
+# Requests sampled above this temperature are expected to vary and are not cached;
+# the default only caches deterministic (temperature 0) requests
+CACHE_MAX_TEMPERATURE = float(os.environ.get("PREDICT_CACHE_MAX_TEMPERATURE", "0"))
+# Cosine similarity needed for a near-duplicate hit (0 disables the lookup)
+CACHE_SIMILARITY_THRESHOLD = float(os.environ.get("PREDICT_CACHE_SIMILARITY_THRESHOLD", "0"))
+
+# Disk pruning runs once per this many writes
+PRUNE_INTERVAL = 32
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _normalize_text(text: Any) -> str:
+    """Collapse whitespace in message content; structured content is serialized"""
+    if not isinstance(text, str):
+        text = json.dumps(text, sort_keys=True, ensure_ascii=False)
+    return " ".join(text.split())
+
+
+def _hash(data: Dict[str, Any]) -> str:
+    """Stable hash of a JSON-serializable structure"""
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier (memory LRU + SQLite) cache of chat completion responses.
+
+    Thread-safe; one instance is normally shared by every PredictClient in
+    the process (see get_response_cache).
+    """
+
+    def __init__(
+        self,
+        cache_file: Optional[str] = CACHE_FILE,
+        ttl: int = CACHE_TTL,
+        max_memory_entries: int = CACHE_MAX_MEMORY_ENTRIES,
+        max_disk_entries: int = CACHE_MAX_DISK_ENTRIES,
+        max_temperature: float = CACHE_MAX_TEMPERATURE,
+        similarity_threshold: float = CACHE_SIMILARITY_THRESHOLD
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_file: SQLite file for the disk tier (memory only if None)
+            ttl: Seconds an entry stays valid
+            max_memory_entries: Entries kept in the in-memory LRU
+            max_disk_entries: Entries kept in the SQLite file
+            max_temperature: Requests with a higher temperature bypass the cache
+            similarity_threshold: Cosine similarity for near-duplicate hits (0 disables)
+        """
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.max_temperature = max_temperature
+        self.similarity_threshold = similarity_threshold
+
+        self._lock = threading.RLock()
+        self._memory = OrderedDict()
+        self._writes = 0
+
+        # Near-duplicate index: scope -> {key: term counts}, plus document frequencies per scope
+        self._scopes = {}
+        self._document_frequencies = {}
+        self._key_scopes = {}
+
+        self._conn = None
+        if cache_file:
+            try:
+                self._conn = self._connect(cache_file)
+                self._load_index()
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache file unavailable ({e}), caching in memory only")
+                self._conn = None
+
+    def _connect(self, cache_file: str) -> sqlite3.Connection:
+        """Open the cache file and create its table"""
+        os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+        conn = sqlite3.connect(cache_file, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                scope TEXT NOT NULL,
+                query_text TEXT,
+                response TEXT NOT NULL,
+                tokens INTEGER DEFAULT 0,
+                latency REAL DEFAULT 0,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses(expires_at)")
+        return conn
+
+    def _load_index(self) -> None:
+        """Rebuild the near-duplicate index from unexpired rows on disk"""
+        if self.similarity_threshold <= 0:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, scope, query_text FROM responses WHERE expires_at > ?", (time.time(),)
+        ).fetchall()
+        for key, scope, query_text in rows:
+            self._index(key, scope, query_text)
+
+    def is_cacheable(self, temperature: Optional[float]) -> bool:
+        """Whether a request with this temperature may use the cache"""
+        # No temperature means the provider's default, which samples
+        return temperature is not None and temperature <= self.max_temperature
+
+    def make_key(
+        self,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        **params
+    ) -> Tuple[str, str, str]:
+        """
+        Build the cache key for a request.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            messages: Chat messages
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **params: Other generation parameters that affect the output
+
+        Returns:
+            Tuple of (exact key, scope key, query text). The scope covers
+            everything except the last user message, which is the query text
+            compared for near-duplicates.
+        """
+        normalized = [
+            {'role': str(message.get('role', '')).lower(), 'content': _normalize_text(message.get('content', ''))}
+            for message in messages
+        ]
+
+        query_index = None
+        for i in range(len(normalized) - 1, -1, -1):
+            if normalized[i]['role'] == 'user':
+                query_index = i
+                break
+
+        request = {
+            'provider': provider.lower(),
+            'model': model,
+            'temperature': round(temperature, 2) if temperature is not None else None,
+            'max_tokens': max_tokens,
+            'params': params
+        }
+        key = _hash({**request, 'messages': normalized})
+
+        query_text = ""
+        if query_index is not None:
+            query_text = normalized[query_index]['content']
+            normalized[query_index] = {'role': 'user', 'content': None}
+        scope = _hash({**request, 'messages': normalized})
+
+        return key, scope, query_text
+
+    def get(self, key: str, scope: Optional[str] = None, query_text: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Exact key from make_key
+            scope: Scope key from make_key (needed for near-duplicate lookup)
+            query_text: Query text from make_key (needed for near-duplicate lookup)
+
+        Returns:
+            Entry with 'response', 'tokens', 'latency', 'match' ('exact' or
+            'similar') and 'similarity', or None on a miss
+        """
+        entry = self._get_exact(key)
+        if entry is not None:
+            return {**entry, 'match': 'exact', 'similarity': 1.0}
+
+        if self.similarity_threshold > 0 and scope and query_text:
+            similar_key, similarity = self._find_similar(scope, query_text)
+            if similar_key is not None:
+                entry = self._get_exact(similar_key)
+                if entry is not None:
+                    return {**entry, 'match': 'similar', 'similarity': similarity}
+
+        return None
+
+    def set(
+        self,
+        key: str,
+        scope: str,
+        query_text: str,
+        response: Dict[str, Any],
+        tokens: int = 0,
+        latency: float = 0.0
+    ) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Exact key from make_key
+            scope: Scope key from make_key
+            query_text: Query text from make_key
+            response: Response dictionary to cache
+            tokens: Tokens the provider call used
+            latency: Seconds the provider call took
+        """
+        now = time.time()
+        entry = {
+            'response': response,
+            'tokens': tokens,
+            'latency': latency,
+            'expires_at': now + self.ttl
+        }
+
+        with self._lock:
+            self._remember(key, entry)
+            self._index(key, scope, query_text)
+
+            if self._conn is None:
+                return
+
+            try:
+                self._conn.execute(
+                    "INSERT INTO responses (key, scope, query_text, response, tokens, latency, expires_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET response = excluded.response, tokens = excluded.tokens, "
+                    "latency = excluded.latency, expires_at = excluded.expires_at, last_used = excluded.last_used",
+                    (key, scope, query_text, json.dumps(response, ensure_ascii=False, default=str),
+                     tokens, latency, entry['expires_at'], now)
+                )
+                self._writes += 1
+                if self._writes % PRUNE_INTERVAL == 0:
+                    self._prune()
+            except sqlite3.Error as e:
+                logger.warning(f"Error writing response cache entry: {str(e)}")
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        with self._lock:
+            self._memory.clear()
+            self._scopes.clear()
+            self._document_frequencies.clear()
+            self._key_scopes.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+
+    def size(self) -> Dict[str, int]:
+        """Number of entries in each tier"""
+        with self._lock:
+            disk = 0
+            if self._conn is not None:
+                disk = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {'memory': len(self._memory), 'disk': disk}
+
+    def close(self) -> None:
+        """Close the cache file"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _get_exact(self, key: str) -> Optional[Dict[str, Any]]:
+        """Memory tier first, then the disk tier (promoting hits to memory)"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry['expires_at'] > now:
+                    self._memory.move_to_end(key)
+                    return entry
+                del self._memory[key]
+
+            if self._conn is None:
+                self._forget(key)
+                return None
+
+            try:
+                row = self._conn.execute(
+                    "SELECT response, tokens, latency, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or row[3] <= now:
+                    self._forget(key)
+                    return None
+
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            except sqlite3.Error as e:
+                logger.warning(f"Error reading response cache entry: {str(e)}")
+                return None
+
+            entry = {
+                'response': json.loads(row[0]),
+                'tokens': row[1],
+                'latency': row[2],
+                'expires_at': row[3]
+            }
+            self._remember(key, entry)
+            return entry
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        """Insert into the memory LRU, evicting the least recently used entries"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            evicted, _ = self._memory.popitem(last=False)
+            if self._conn is None:
+                self._forget(evicted)
+
+    def _prune(self) -> None:
+        """Drop expired rows and the least recently used rows over the size limit"""
+        now = time.time()
+        expired = self._conn.execute("SELECT key FROM responses WHERE expires_at <= ?", (now,)).fetchall()
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        overflow = []
+        if count > self.max_disk_entries:
+            overflow = self._conn.execute(
+                "SELECT key FROM responses ORDER BY last_used LIMIT ?", (count - self.max_disk_entries,)
+            ).fetchall()
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", overflow)
+
+        for (key,) in expired + overflow:
+            self._memory.pop(key, None)
+            self._forget(key)
+
+    def _terms(self, text: str) -> Counter:
+        """Term counts used for near-duplicate matching"""
+        return Counter(TOKEN_PATTERN.findall(text.lower()))
+
+    def _index(self, key: str, scope: str, query_text: str) -> None:
+        """Add a query to the near-duplicate index"""
+        if self.similarity_threshold <= 0 or not query_text or key in self._key_scopes:
+            return
+
+        terms = self._terms(query_text)
+        self._scopes.setdefault(scope, {})[key] = terms
+        self._document_frequencies.setdefault(scope, Counter()).update(terms.keys())
+        self._key_scopes[key] = scope
+
+    def _forget(self, key: str) -> None:
+        """Remove a query from the near-duplicate index"""
+        scope = self._key_scopes.pop(key, None)
+        if scope is None:
+            return
+
+        terms = self._scopes[scope].pop(key)
+        frequencies = self._document_frequencies[scope]
+        frequencies.subtract(terms.keys())
+        if not self._scopes[scope]:
+            del self._scopes[scope]
+            del self._document_frequencies[scope]
+
+    def _find_similar(self, scope: str, query_text: str) -> Tuple[Optional[str], float]:
+        """Most TF-IDF similar cached query in the same scope, if above the threshold"""
+        with self._lock:
+            candidates = self._scopes.get(scope)
+            if not candidates:
+                return None, 0.0
+
+            frequencies = self._document_frequencies[scope]
+            documents = len(candidates) + 1
+
+            def weights(terms: Counter) -> Dict[str, float]:
+                # Smoothed IDF over the scope's queries plus the incoming one
+                vector = {
+                    term: count * (math.log(documents / (1 + frequencies.get(term, 0))) + 1)
+                    for term, count in terms.items()
+                }
+                norm = math.sqrt(sum(value * value for value in vector.values())) or 1.0
+                return {term: value / norm for term, value in vector.items()}
+
+            query = weights(self._terms(query_text))
+            best_key, best_similarity = None, 0.0
+            for key, terms in candidates.items():
+                candidate = weights(terms)
+                similarity = sum(value * candidate.get(term, 0.0) for term, value in query.items())
+                if similarity > best_similarity:
+                    best_key, best_similarity = key, similarity
+
+        if best_similarity >= self.similarity_threshold:
+            return best_key, best_similarity
+        return None, best_similarity
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache.
+
+    Returns:
+        Shared ResponseCache, or None when PREDICT_CACHE_ENABLED is off
+    """
+    global _default_cache
+
+    if not CACHE_ENABLED:
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
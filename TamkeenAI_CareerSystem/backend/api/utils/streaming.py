@@ -0,0 +1,110 @@
+"""
+Streaming Response Utilities
+
+Helpers for sending LLM output to the client as Server-Sent Events while it
+is generated. A stream consists of "token" events carrying text chunks,
+followed by one "done" event with the full content (and any extra fields the
+endpoint adds once the text is complete), or an "error" event if generation
+breaks off.
+"""
+
+import json
+import logging
+from typing import Dict, Any, Iterator, Optional, Callable
+
+from flask import Response, request, stream_with_context
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+def wants_stream(data: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Check whether the client asked for a streamed response.
+
+    Args:
+        data: Parsed JSON body of the request
+
+    Returns:
+        True if the request accepts text/event-stream or sets stream=true
+        (in the query string or JSON body)
+    """
+    if 'text/event-stream' in request.headers.get('Accept', ''):
+        return True
+
+    if request.args.get('stream', '').lower() in ('true', '1', 'yes'):
+        return True
+
+    return bool(data and data.get('stream') is True)
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """
+    Format a Server-Sent Event.
+
+    Args:
+        event: Event name
+        data: JSON-serializable event payload
+
+    Returns:
+        Encoded event
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def stream_response(chunks: Iterator[str],
+                    on_complete: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None) -> Response:
+    """
+    Stream text chunks to the client as Server-Sent Events.
+
+    The first chunk is read before the response starts, so errors raised
+    while the stream is being opened propagate to the caller, which can
+    still answer with a regular response.
+
+    Args:
+        chunks: Iterator of text chunks
+        on_complete: Called with the full text when the stream finishes
+            (e.g. to persist it); returned fields are added to the done event
+
+    Returns:
+        Streaming Flask response
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+
+    def generate():
+        parts = []
+        try:
+            if first is not None:
+                parts.append(first)
+                yield sse_event('token', {'content': first})
+
+            for chunk in chunks:
+                parts.append(chunk)
+                yield sse_event('token', {'content': chunk})
+
+            content = ''.join(parts)
+            extra = on_complete(content) if on_complete else None
+            yield sse_event('done', {'content': content, **(extra or {})})
+
+        except GeneratorExit:
+            # Client disconnected
+            logger.info("Client closed the stream before it finished")
+            raise
+        except Exception as e:
+            logger.error(f"Error while streaming response: {str(e)}")
+            yield sse_event('error', {'error': str(e), 'partial_content': ''.join(parts)})
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close:
+                close()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            # Stop reverse proxies (nginx) from buffering the stream
+            'X-Accel-Buffering': 'no'
+        }
+    )
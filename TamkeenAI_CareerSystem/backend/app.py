@@ -125,6 +125,13 @@ def create_app():
     app.register_blueprint(interview_coach_bp, url_prefix='/api/interviews', name='interview_coach')
     app.register_blueprint(ats_bp)
     
+    # Warm the interview evaluation models in the background
+    try:
+        from api.models.model_registry import get_model_registry
+        get_model_registry().preload()
+    except ImportError as e:
+        logger.warning(f"Model registry unavailable, models will load on first use: {e}")
+    
     # Add a route handler for user profile by ID
     @app.route('/api/user/profile/<user_id>', methods=['GET', 'OPTIONS'])
     def get_user_profile_by_id(user_id):
@@ -159,11 +166,19 @@ def create_app():
         from api.database.connector import db
         mongo_status = "connected" if db is not None else "disconnected (using mock)"
         
+        # Interview evaluation models finished preloading
+        try:
+            from api.models.model_registry import get_model_registry
+            models_ready = get_model_registry().is_ready
+        except ImportError:
+            models_ready = False
+        
         return jsonify({
             "status": "success",
             "message": "API is running",
             "version": "1.0.0",
-            "mongodb": mongo_status
+            "mongodb": mongo_status,
+            "models_ready": models_ready
         })
     
     # Simple health check at root path - useful for some monitoring systems
@@ -0,0 +1,3 @@
+# Benchmarks package
+
+# Standalone performance benchmarks, run with: python -m backend.benchmarks.<name>
@@ -0,0 +1,173 @@
+"""
+Analytics Store Benchmark
+
+Generates a year of synthetic analytics events as daily JSONL segments and
+compares dashboard queries (one user's 30/90-day activity, 30/365-day system
+usage):
+- the previous implementation, which lists and JSON-parses every file in the
+  window and, for per-user queries, every user's events;
+- AnalyticsTracker on the store after compaction, which reads one user's
+  slice of each columnar day segment and the daily rollups.
+Results of both are compared for equality.
+
+Usage (from the backend directory):
+    python -m benchmarks.analytics_store --users 2000 --events-per-day 3000
+"""
+
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+
+from core.analytics_engine import AnalyticsTracker
+from core.analytics_store import get_analytics_store
+
+USER_EVENTS = ["user_login", "user_resume_upload", "user_job_match", "user_profile_update",
+               "user_career_assessment", "user_interview_practice", "user_skill_update"]
+SYSTEM_EVENTS = ["system_api_call", "system_error", "system_job_sync"]
+
+
+def generate(analytics_dir: str, days: int, users: int, per_day: int, rng: random.Random):
+    """Write days of events ending today, including a partial today"""
+    now = datetime.now()
+    for subdir in ["user_events", "system_events"]:
+        os.makedirs(os.path.join(analytics_dir, subdir), exist_ok=True)
+
+    for offset in range(days, -1, -1):
+        day = datetime(now.year, now.month, now.day) - timedelta(days=offset)
+        seconds = 86400 if offset else int((now - day).total_seconds())
+        files = {}
+        for _ in range(per_day if offset else per_day * seconds // 86400):
+            event_time = day + timedelta(seconds=rng.randrange(max(seconds, 1)))
+            if rng.random() < 0.85:
+                event_type, subdir = rng.choice(USER_EVENTS), "user_events"
+                event = {"timestamp": event_time.isoformat(), "event_id": f"{offset}-{rng.random()}",
+                         "event_type": event_type, "data": {"source": "web"},
+                         # Skewed activity: a few users are much more active
+                         "user_id": f"user-{int(rng.paretovariate(1.2)) % users}"}
+            else:
+                event_type, subdir = rng.choice(SYSTEM_EVENTS), "system_events"
+                event = {"timestamp": event_time.isoformat(), "event_id": f"{offset}-{rng.random()}",
+                         "event_type": event_type, "data": {"latency_ms": rng.randrange(500)}}
+            files.setdefault((subdir, event_type), []).append(json.dumps(event))
+
+        for (subdir, event_type), lines in files.items():
+            path = os.path.join(analytics_dir, subdir, f"{day.strftime('%Y%m%d')}_{event_type}.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+
+def legacy_events(analytics_dir: str, subdirs, days: int, user_id=None):
+    """Previous read path: list every file in the window and parse every line"""
+    cutoff_date = datetime.now() - timedelta(days=days)
+    events = []
+    for subdir in subdirs:
+        events_dir = os.path.join(analytics_dir, subdir)
+        for filename in os.listdir(events_dir):
+            if not filename.endswith(".jsonl"):
+                continue
+            if datetime.strptime(filename.split("_")[0], "%Y%m%d") < cutoff_date:
+                continue
+            with open(os.path.join(events_dir, filename), "r", encoding="utf-8") as f:
+                for line in f:
+                    event = json.loads(line.strip())
+                    if user_id is None or event.get("user_id") == user_id:
+                        events.append(event)
+    return events
+
+
+def legacy_user_activity(analytics_dir: str, user_id: str, days: int):
+    """Previous get_user_activity aggregation"""
+    events = legacy_events(analytics_dir, ["user_events"], days, user_id)
+    return {
+        "total_events": len(events),
+        "event_counts": dict(Counter(e["event_type"] for e in events)),
+        "usage_by_day": dict(Counter(datetime.fromisoformat(e["timestamp"]).strftime("%Y-%m-%d") for e in events)),
+        "last_activity": max((e["timestamp"] for e in events), default=None)
+    }
+
+
+def legacy_system_usage(analytics_dir: str, days: int):
+    """Previous get_system_usage aggregation"""
+    events = legacy_events(analytics_dir, ["user_events", "system_events"], days)
+    now = datetime.now()
+    active = {}
+    for window, window_days in [("active_1_day", 1), ("active_7_days", 7), ("active_30_days", 30)]:
+        start = now - timedelta(days=window_days)
+        active[window] = len({e["user_id"] for e in events
+                              if "user_id" in e and datetime.fromisoformat(e["timestamp"]) >= start})
+    return {
+        "total_events": len(events),
+        "unique_users": len({e["user_id"] for e in events if "user_id" in e}),
+        "events_by_type": dict(Counter(e["event_type"] for e in events)),
+        "events_by_day": dict(Counter(datetime.fromisoformat(e["timestamp"]).strftime("%Y-%m-%d") for e in events)),
+        "user_retention": active
+    }
+
+
+def timed(func, repeat: int):
+    """Average milliseconds per call, and the last result"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--events-per-day", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as analytics_dir:
+        start = time.perf_counter()
+        generate(analytics_dir, args.days, args.users, args.events_per_day, rng)
+        print(f"generated {args.days} days x {args.events_per_day} events in {time.perf_counter() - start:.1f} s")
+
+        # Trackers normally use data/analytics; point one at the synthetic data
+        user_id = "user-42"
+        store = get_analytics_store(analytics_dir, start_compactor=False)
+        tracker = AnalyticsTracker(user_id)
+        tracker.analytics_dir = analytics_dir
+        tracker.store = store
+
+        # Legacy results are computed before compaction moves the JSONL files
+        legacy = {}
+        for name, func in [
+            ("user activity, 30 days", lambda: legacy_user_activity(analytics_dir, user_id, 30)),
+            ("user activity, 90 days", lambda: legacy_user_activity(analytics_dir, user_id, 90)),
+            ("system usage, 30 days", lambda: legacy_system_usage(analytics_dir, 30)),
+            ("system usage, 365 days", lambda: legacy_system_usage(analytics_dir, 365)),
+        ]:
+            legacy[name] = timed(func, args.repeat)
+
+        start = time.perf_counter()
+        compacted = store.compact()
+        print(f"compacted {len(compacted)} closed days in {time.perf_counter() - start:.1f} s")
+
+        keys = ["total_events", "event_counts", "usage_by_day", "last_activity"]
+        system_keys = ["total_events", "unique_users", "events_by_type", "events_by_day", "user_retention"]
+        for name, func, compare in [
+            ("user activity, 30 days", lambda: tracker.get_user_activity(30), keys),
+            ("user activity, 90 days", lambda: tracker.get_user_activity(90), keys),
+            ("system usage, 30 days", lambda: tracker.get_system_usage(30), system_keys),
+            ("system usage, 365 days", lambda: tracker.get_system_usage(365), system_keys),
+        ]:
+            legacy_time, legacy_result = legacy[name]
+            store_time, result = timed(func, args.repeat)
+            same = all(result[key] == legacy_result[key] for key in compare)
+            print(f"{name:24s} previous {legacy_time:8.1f} ms   compacted {store_time:7.2f} ms  "
+                  f"({legacy_time / store_time:5.0f}x)  same result: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Database Write Throughput Benchmark
+
+Measures activity-log write throughput from concurrent threads for:
+- the previous connector: one shared connection, rollback journal, commit per row;
+- per-thread WAL connections with a commit per row;
+- per-thread WAL connections with queued, batched inserts.
+
+Usage:
+    python -m backend.benchmarks.db_writes --threads 8 --rows 2000
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import argparse
+import tempfile
+import threading
+
+from backend.database.connector import Database
+
+
+def create_schema(db_file: str, threads: int):
+    """Create the tables and one user per thread (activity rows reference users)"""
+    db = Database(db_file=db_file)
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    db.bulk_insert("users", [{
+        "id": f"user-{t}",
+        "email": f"user-{t}@example.com",
+        "password": "x",
+        "name": f"User {t}",
+        "created_at": timestamp,
+        "updated_at": timestamp
+    } for t in range(threads)])
+    db.close()
+
+
+def make_row(thread_id: int, i: int):
+    """Build one activity row"""
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": f"user-{thread_id}",
+        "activity_type": "job_view",
+        "activity_data": json.dumps({"job_id": f"job-{i}", "source": "benchmark"}),
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def run_threads(threads: int, target):
+    """Run target(thread_id) on several threads and return elapsed seconds"""
+    workers = [threading.Thread(target=target, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def bench_legacy(db_file: str, threads: int, rows: int) -> float:
+    """Previous connector behaviour: shared connection, commit after every insert"""
+    connection = sqlite3.connect(db_file, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode = DELETE")
+    connection.execute("PRAGMA foreign_keys = ON")
+    lock = threading.Lock()
+
+    def worker(thread_id):
+        for i in range(rows):
+            row = make_row(thread_id, i)
+            with lock:
+                connection.execute(
+                    "INSERT INTO user_activity (id, user_id, activity_type, activity_data, created_at) VALUES (?, ?, ?, ?, ?)",
+                    list(row.values())
+                )
+                connection.commit()
+
+    elapsed = run_threads(threads, worker)
+    connection.close()
+    return elapsed
+
+
+def bench_wal(db_file: str, threads: int, rows: int) -> float:
+    """Per-thread WAL connections, one autocommitted insert per row"""
+    db = Database(db_file=db_file)
+
+    def worker(thread_id):
+        for i in range(rows):
+            db.insert("user_activity", make_row(thread_id, i))
+
+    elapsed = run_threads(threads, worker)
+    db.close()
+    return elapsed
+
+
+def bench_batched(db_file: str, threads: int, rows: int) -> float:
+    """Per-thread WAL connections with queued inserts written in batches"""
+    db = Database(db_file=db_file)
+
+    def worker(thread_id):
+        for i in range(rows):
+            db.queue_insert("user_activity", make_row(thread_id, i))
+
+    start = time.perf_counter()
+    run_threads(threads, worker)
+    db.flush()
+    elapsed = time.perf_counter() - start
+
+    db.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=2000, help="Rows per thread")
+    parser.add_argument("--dir", default=None, help="Directory for the database files (use real disk to include fsync cost)")
+    args = parser.parse_args()
+
+    total = args.threads * args.rows
+    print(f"threads={args.threads} rows={total}")
+
+    for name, bench in [("legacy (shared, commit/row)", bench_legacy),
+                        ("WAL per-thread (commit/row)", bench_wal),
+                        ("WAL per-thread (batched)", bench_batched)]:
+        with tempfile.TemporaryDirectory(dir=args.dir) as tmp_dir:
+            db_file = os.path.join(tmp_dir, "bench.db")
+            create_schema(db_file, args.threads)
+            elapsed = bench(db_file, args.threads, args.rows)
+        print(f"{name:32s} {elapsed:7.2f} s  {total / elapsed:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
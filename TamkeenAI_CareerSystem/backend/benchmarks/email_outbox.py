@@ -0,0 +1,179 @@
+"""
+Email Outbox Benchmark
+
+Starts a local SMTP sink that records every message and adds a fixed delay
+to connection setup (greeting, EHLO, AUTH), as a remote server over TLS
+would. Compares:
+- the previous send_template_email: build, connect, login, send and quit
+  inside the calling request;
+- the outbox: the request only renders and queues; the background sender
+  delivers over one reused connection.
+Also checks that every queued message reaches the sink once, and that
+temporary (4xx) rejections are retried and permanent (5xx) ones are
+dead-lettered.
+
+Usage:
+    python -m backend.benchmarks.email_outbox --messages 200 --setup-ms 150
+"""
+
+import os
+import time
+import logging
+import argparse
+import tempfile
+import threading
+import statistics
+import socketserver
+from string import Template
+
+from backend.utils import email_utils
+from backend.utils.email_utils import EmailSender
+from backend.utils.email_outbox import STATUS_SENT, STATUS_DEAD
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Minimal SMTP server keeping received messages in memory"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, setup_delay: float):
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.setup_delay = setup_delay
+        self.messages = []
+        self.connections = 0
+        # Recipient -> reply codes to give for it, in order (then 250)
+        self.scripted = {}
+        self.lock = threading.Lock()
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        sink = self.server
+        with sink.lock:
+            sink.connections += 1
+        time.sleep(sink.setup_delay / 3)
+        self.reply("220 sink ready")
+        recipients = []
+        while True:
+            line = self.rfile.readline().decode().rstrip("\r\n")
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in ("EHLO", "HELO"):
+                time.sleep(sink.setup_delay / 3)
+                self.reply("250-sink")
+                self.reply("250 AUTH PLAIN")
+            elif command == "AUTH":
+                time.sleep(sink.setup_delay / 3)
+                self.reply("235 authenticated")
+            elif command == "MAIL":
+                recipients = []
+                self.reply("250 ok")
+            elif command == "RCPT":
+                address = line.split(":", 1)[1].strip().strip("<>")
+                with sink.lock:
+                    codes = sink.scripted.get(address)
+                    code = codes.pop(0) if codes else 250
+                if code == 250:
+                    recipients.append(address)
+                self.reply(f"{code} recipient {address}")
+            elif command == "DATA":
+                self.reply("354 go ahead")
+                data = []
+                while True:
+                    data_line = self.rfile.readline().decode()
+                    if data_line in (".\r\n", ""):
+                        break
+                    data.append(data_line)
+                with sink.lock:
+                    sink.messages.append((recipients, "".join(data)))
+                self.reply("250 queued")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                # RSET, NOOP
+                self.reply("250 ok")
+
+
+def make_sender(sink: SMTPSink, outbox_file: str, use_outbox: bool, rate_limit: float) -> EmailSender:
+    sender = EmailSender()
+    sender.config = dict(sender.config, enabled=True, server="127.0.0.1", port=sink.server_address[1],
+                         use_tls=False, use_ssl=False, username="tamkeen", password="secret",
+                         use_outbox=use_outbox, outbox_file=outbox_file, outbox_rate_limit=rate_limit,
+                         outbox_retry_backoff=0.05, outbox_max_attempts=3)
+    sender.templates = {"welcome_email_html": Template("<p>Welcome $username to $app_name</p>")}
+    return sender
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--setup-ms", type=float, default=150)
+    parser.add_argument("--rate-limit", type=float, default=0, help="Outbox messages per second (0: no limit)")
+    args = parser.parse_args()
+
+    sink = SMTPSink(args.setup_ms / 1000)
+    threading.Thread(target=sink.serve_forever, daemon=True).start()
+    context = {"username": "Mariam", "app_name": "Tamkeen AI"}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Previous behaviour: one connection per message, inside the request
+        direct = make_sender(sink, os.path.join(temp_dir, "unused.db"), use_outbox=False, rate_limit=0)
+        direct_count = min(args.messages, 20)
+        samples = []
+        for i in range(direct_count):
+            start = time.perf_counter()
+            ok, error = direct.send_template_email(f"user{i}@example.com", "welcome_email_html", context, "Welcome")
+            samples.append((time.perf_counter() - start) * 1e3)
+            assert ok, error
+        print(f"previous  per request {statistics.median(samples):8.2f} ms   "
+              f"connections {sink.connections} for {direct_count} messages")
+
+        sink.messages.clear()
+        sink.connections = 0
+        queued = make_sender(sink, os.path.join(temp_dir, "outbox.db"), use_outbox=True,
+                             rate_limit=args.rate_limit)
+        samples = []
+        message_ids = []
+        start_all = time.perf_counter()
+        for i in range(args.messages):
+            start = time.perf_counter()
+            message_ids.append(queued.queue_template_email(f"user{i}@example.com", "welcome_email_html",
+                                                           context, "Welcome"))
+            samples.append((time.perf_counter() - start) * 1e3)
+        queued.outbox.flush(timeout=120)
+        total_s = time.perf_counter() - start_all
+        delivered = sorted(recipients[0] for recipients, _ in sink.messages)
+        print(f"outbox    per request {statistics.median(samples):8.2f} ms   "
+              f"connections {sink.connections} for {args.messages} messages, all delivered in {total_s:.2f}s")
+        statuses = {queued.get_email_status(message_id)["status"] for message_id in message_ids}
+        print(f"each message delivered once: "
+              f"{delivered == sorted(f'user{i}@example.com' for i in range(args.messages))}, statuses {statuses}")
+
+        # Temporary failures are retried, permanent ones dead-lettered
+        sink.scripted = {"busy@example.com": [451, 451], "gone@example.com": [550]}
+        busy = queued.queue_email("busy@example.com", "Retry", "<p>retry</p>")
+        gone = queued.queue_email("gone@example.com", "Dead", "<p>dead</p>")
+        deadline = time.time() + 10
+        while time.time() < deadline and (queued.get_email_status(busy)["status"] != STATUS_SENT
+                                          or queued.get_email_status(gone)["status"] != STATUS_DEAD):
+            time.sleep(0.05)
+        busy_status, gone_status = queued.get_email_status(busy), queued.get_email_status(gone)
+        print(f"451 twice: {busy_status['status']} after {busy_status['attempts']} attempts; "
+              f"550: {gone_status['status']} ({gone_status['last_error']})")
+        queued.outbox.close()
+
+    sink.shutdown()
+
+
+if __name__ == "__main__":
+    # Keep retry and dead-letter log lines out of the results
+    email_utils.logger.disabled = True
+    logging.getLogger("backend.utils.email_outbox").disabled = True
+    main()
@@ -0,0 +1,105 @@
+"""
+Video Emotion Analysis Benchmark
+
+Measures frames per second on CPU for video emotion analysis with:
+- the previous per-frame path: one model.predict call per detected face;
+- the batched path: face crops from many frames classified per forward pass.
+
+The emotion model is freshly initialised (weights do not affect speed). With
+--video the real Haar cascade runs on the clip's frames; otherwise synthetic
+frames with fixed face boxes are used so that the timing isolates inference.
+
+Usage (from the backend directory, where the api package lives):
+    python -m benchmarks.emotion_video --frames 600 --faces 1 --batch-size 64
+    python -m benchmarks.emotion_video --video interview.mp4
+"""
+
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+from api.services.emotion_detection_service import EmotionDetectionService
+from api.config.emotion_detection_config import MODEL_INPUT_SIZE
+
+
+class FixedFaceDetector:
+    """Stand-in for the cascade that reports the same face boxes in every frame"""
+
+    def __init__(self, faces: int, size: int = 120):
+        self.boxes = np.array([[40 + i * (size + 20), 60, size, size] for i in range(faces)], dtype=np.int32)
+
+    def detectMultiScale(self, gray, *args):
+        return self.boxes
+
+
+def read_video(path: str, max_frames: int):
+    """Read up to max_frames frames from a video file"""
+    capture = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def per_face_path(service: EmotionDetectionService, frames):
+    """Previous implementation: one predict call per face, frames processed serially"""
+    results = []
+    for frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        frame_results = []
+        for (x, y, w, h) in service.face_cascade.detectMultiScale(gray, 1.1, 4):
+            face = cv2.resize(gray[y:y+h, x:x+w], MODEL_INPUT_SIZE) / 255.0
+            preds = service.model.predict(face.reshape(1, MODEL_INPUT_SIZE[0], MODEL_INPUT_SIZE[1], 1), verbose=0)[0]
+            frame_results.append(int(np.argmax(preds)))
+        results.append(frame_results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600, help="Frames to analyze (60 s at 10 fps)")
+    parser.add_argument("--faces", type=int, default=1, help="Faces per synthetic frame")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--model", choices=["deep", "shallow"], default="deep")
+    parser.add_argument("--video", default=None, help="Video file to analyze with the real face detector")
+    args = parser.parse_args()
+
+    service = EmotionDetectionService(model_path="")
+    service.model = service.create_emotion_model(args.model)
+
+    if args.video:
+        frames = read_video(args.video, args.frames)
+    else:
+        rng = np.random.default_rng(7)
+        frames = [rng.integers(0, 256, (480, 640, 3), dtype=np.uint8) for _ in range(args.frames)]
+        service.face_cascade = FixedFaceDetector(args.faces)
+
+    # Warm up both paths so graph tracing is not timed
+    per_face_path(service, frames[:2])
+    service.detect_emotions_in_frames(frames[:args.batch_size], args.batch_size)
+
+    start = time.perf_counter()
+    baseline = per_face_path(service, frames)
+    baseline_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = service.detect_emotions_in_frames(frames, args.batch_size)
+    batched_time = time.perf_counter() - start
+
+    batched_labels = [[int(np.argmax(list(r["all_emotions"].values()))) for r in frame] for frame in batched]
+    faces = sum(len(frame) for frame in batched)
+
+    print(f"frames={len(frames)} faces={faces} batch_size={args.batch_size} model={args.model}")
+    print(f"per-face predict:  {len(frames) / baseline_time:8.1f} frames/s")
+    print(f"batched predict:   {len(frames) / batched_time:8.1f} frames/s  ({baseline_time / batched_time:.1f}x)")
+    print(f"labels match:      {batched_labels == baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Interview Sessions Benchmark
+
+Writes synthetic interview sessions (10 answers each, with emotion analyses)
+both as the previous one-JSON-file-per-session directory and into the
+session store, then compares:
+- listing one user's sessions: open and parse every file vs the user index;
+- recording an answer: rewrite the pretty-printed session vs append a row;
+- loading a session another worker has not cached vs a cached one.
+Listings and loaded sessions are checked against the JSON files.
+
+Usage (from the backend directory):
+    python -m benchmarks.interview_sessions --sessions 20000 --users 2000
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+
+from api.services.interview_store import InterviewSessionStore
+
+
+def make_session(rng: random.Random, user_id: str, start: datetime, num_questions: int) -> dict:
+    answers, analyses = [], []
+    for index in range(num_questions):
+        answers.append({
+            "question_index": index,
+            "question": f"Question {index}: tell us about a project you are proud of.",
+            "answer_text": " ".join(rng.choice(["team", "deadline", "python", "customer", "design"])
+                                    for _ in range(80)),
+            "timestamp": (start + timedelta(minutes=index)).isoformat()
+        })
+        analyses.append({
+            "confidence_score": rng.random(),
+            "engagement_score": rng.random(),
+            "emotion_counts": {emotion: rng.randrange(30) for emotion in ["Happy", "Neutral", "Sad", "Fear"]},
+            "emotion_percentages": {"Happy": 0.4, "Neutral": 0.5, "Sad": 0.05, "Fear": 0.05}
+        })
+    return {
+        "session_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "user_id": user_id,
+        "role": "Data Scientist",
+        "questions": [answer["question"] for answer in answers],
+        "current_question": num_questions,
+        "answers": answers,
+        "emotion_analyses": analyses,
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(minutes=num_questions)).isoformat(),
+        "completed": True,
+        "coach_persona": "zayd",
+        "sector_context": None,
+        "greeting": "Marhaba! Ready to ace your interview today?"
+    }
+
+
+def legacy_list(directory: str, user_id: str) -> list:
+    """The previous InterviewService.list_interview_sessions"""
+    sessions = []
+    for filename in os.listdir(directory):
+        if filename.endswith('.json'):
+            with open(os.path.join(directory, filename), 'r') as f:
+                session = json.load(f)
+            if session.get("user_id") == user_id:
+                sessions.append({
+                    "session_id": session.get("session_id"),
+                    "role": session.get("role"),
+                    "start_time": session.get("start_time"),
+                    "end_time": session.get("end_time"),
+                    "completed": session.get("completed", False),
+                    "num_questions": len(session.get("questions", [])),
+                    "num_answers": len(session.get("answers", []))
+                })
+    return sessions
+
+
+def per_call_ms(func, args_list):
+    """Median milliseconds per call over args_list"""
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start_date = datetime(2024, 1, 1)
+    with tempfile.TemporaryDirectory() as legacy_dir, tempfile.TemporaryDirectory() as store_dir:
+        store = InterviewSessionStore(store_dir)
+        sessions = []
+        for _ in range(args.sessions):
+            session = make_session(rng, f"user-{rng.randrange(args.users)}",
+                                   start_date + timedelta(minutes=rng.randrange(500000)), args.questions)
+            with open(os.path.join(legacy_dir, f"{session['session_id']}.json"), 'w') as f:
+                json.dump(session, f, indent=2)
+            store.create(json.loads(json.dumps(session)))
+            sessions.append(session)
+        print(f"{args.sessions} sessions, {args.users} users, {args.questions} answers each")
+
+        users = [(f"user-{rng.randrange(args.users)}",) for _ in range(args.queries)]
+        legacy_ms = per_call_ms(lambda user_id: legacy_list(legacy_dir, user_id), users[:5])
+        store_ms = per_call_ms(store.list_for_user, users)
+        print(f"list a user's sessions       previous {legacy_ms:9.2f} ms   store {store_ms:7.3f} ms")
+
+        # Recording the last answer of a session (previous: full pretty-printed rewrite)
+        samples = rng.sample(sessions, args.queries)
+
+        def legacy_save(session):
+            with open(os.path.join(legacy_dir, f"{session['session_id']}.json"), 'w') as f:
+                json.dump(session, f, indent=2)
+
+        def store_append(session):
+            cached = store.get(session["session_id"])
+            cached["answers"].append(session["answers"][-1])
+            cached["emotion_analyses"].append(session["emotion_analyses"][-1])
+            store.append_answer(cached)
+
+        legacy_ms = per_call_ms(legacy_save, [(session,) for session in samples])
+        for session in samples:
+            # Drop the last answer so it can be appended again
+            store.create(dict(session, answers=session["answers"][:-1],
+                              emotion_analyses=session["emotion_analyses"][:-1]))
+        store_ms = per_call_ms(store_append, [(session,) for session in samples])
+        print(f"record an answer             previous {legacy_ms:9.2f} ms   store {store_ms:7.3f} ms")
+
+        cold = InterviewSessionStore(store_dir)
+        cold_ms = per_call_ms(cold.get, [(session["session_id"],) for session in samples])
+        warm_ms = per_call_ms(cold.get, [(session["session_id"],) for session in samples])
+        print(f"load a session               uncached {cold_ms:9.3f} ms   cached {warm_ms:6.3f} ms")
+
+        same = all(
+            sorted(legacy_list(legacy_dir, user_id), key=lambda s: s["session_id"]) ==
+            sorted(store.list_for_user(user_id), key=lambda s: s["session_id"])
+            for (user_id,) in users[:3]
+        ) and all(
+            cold.get(session["session_id"]) == session
+            for session in samples
+        )
+        print(f"listings and sessions match the JSON files: {same}")
+
+
+if __name__ == "__main__":
+    main()
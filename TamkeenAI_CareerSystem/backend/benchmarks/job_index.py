@@ -0,0 +1,113 @@
+"""
+Job Index Benchmark
+
+Compares per-request TF-IDF refitting (the previous content-based
+recommendation path) against querying the persistent job vector index, and
+times single and batched index updates.
+
+Usage:
+    python -m backend.benchmarks.job_index --jobs 100000 --queries 200
+"""
+
+import time
+import random
+import argparse
+import tempfile
+from typing import Dict, List, Any
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from backend.core.job_index import JobVectorIndex, VECTORIZER_PARAMS, job_to_text
+
+TITLES = ["software engineer", "data scientist", "product manager", "designer", "devops engineer",
+          "data analyst", "accountant", "sales manager", "hr specialist", "marketing lead"]
+SKILLS = ["python", "java", "sql", "react", "docker", "kubernetes", "excel", "tableau", "figma",
+          "aws", "azure", "machine learning", "communication", "leadership", "negotiation"]
+WORDS = ["team", "build", "customers", "platform", "growth", "reports", "design", "deliver",
+         "quality", "stakeholders", "analysis", "roadmap", "systems", "pipeline", "insights"]
+CITIES = ["dubai", "abu dhabi", "sharjah", "riyadh", "doha", "remote"]
+
+
+def build_jobs(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """Generate a synthetic job catalogue"""
+    jobs = []
+    for i in range(count):
+        jobs.append({
+            "id": f"job-{i}",
+            "title": rng.choice(TITLES),
+            "description": " ".join(rng.choice(WORDS) for _ in range(60)),
+            "skills": rng.sample(SKILLS, 5),
+            "company": f"company {rng.randrange(2000)}",
+            "location": rng.choice(CITIES),
+            "status": "active"
+        })
+    return jobs
+
+
+def refit_query(jobs: List[Dict[str, Any]], user_text: str, limit: int):
+    """Previous implementation: refit the vectorizer on every request"""
+    vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+    matrix = vectorizer.fit_transform([job_to_text(job) for job in jobs] + [user_text])
+    scores = cosine_similarity(matrix[-1], matrix[:-1]).flatten()
+    return scores.argsort()[-limit:][::-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = build_jobs(args.jobs, rng)
+    queries = [f"{rng.choice(TITLES)} {' '.join(rng.sample(SKILLS, 4))}" for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        index = JobVectorIndex(index_dir=index_dir)
+
+        start = time.perf_counter()
+        index.fit(jobs)
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reloaded = JobVectorIndex(index_dir=index_dir)
+        reloaded.load()
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for query in queries:
+            reloaded.query(query, args.limit)
+        query_time = (time.perf_counter() - start) / len(queries)
+
+        start = time.perf_counter()
+        for job in jobs[:1000]:
+            reloaded.upsert_job(dict(job, title=rng.choice(TITLES)))
+        update_time = (time.perf_counter() - start) / 1000
+
+        start = time.perf_counter()
+        reloaded.upsert_jobs(dict(job, title=rng.choice(TITLES)) for job in jobs[1000:11000])
+        reloaded.save()
+        batch_time = (time.perf_counter() - start) / 10000
+
+    # Refitting is slow enough that only a few requests are timed
+    refit_samples = min(3, len(queries))
+    start = time.perf_counter()
+    for query in queries[:refit_samples]:
+        refit_query(jobs, query, args.limit)
+    refit_time = (time.perf_counter() - start) / refit_samples
+
+    print(f"jobs={len(jobs)} terms={len(index.vocabulary)}")
+    print(f"index fit + save:        {fit_time:.2f} s")
+    print(f"index load:              {load_time * 1000:.1f} ms")
+    print(f"index query:             {query_time * 1000:.2f} ms/request")
+    print(f"index update:            {update_time * 1000:.2f} ms/job")
+    print(f"batched update + save:   {batch_time * 1000:.3f} ms/job")
+    print(f"refit per request:       {refit_time * 1000:.1f} ms/request")
+    print(f"speedup:                 {refit_time / query_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Job Matching Benchmark
+
+Compares the previous JobMatcher.match_jobs loop (score and match factors
+for every job, then a full sort) against the vectorised match engine
+(catalogue encoded once, scores for all jobs in array operations, top-k by
+argpartition, match factors only for the returned jobs). Engine scores are
+checked against _calculate_match_score for every job of a smaller catalogue,
+and the returned matches are checked against the previous loop.
+
+Usage:
+    python -m backend.benchmarks.job_matching --jobs 100000 --profiles 20
+"""
+
+import time
+import random
+import argparse
+import statistics
+
+from backend.core.job_matching import JobMatcher
+
+SKILLS = ["python", "java", "javascript", "sql", "postgresql", "react", "react native", "docker",
+          "kubernetes", "aws", "azure", "machine learning", "deep learning", "excel", "tableau",
+          "power bi", "figma", "communication", "leadership", "project management", "go", "c++"]
+TITLES = ["software engineer", "senior software engineer", "data scientist", "data analyst",
+          "product manager", "designer", "devops engineer", "accountant", "sales manager",
+          "machine learning engineer", "frontend developer", "backend developer"]
+INDUSTRIES = ["technology", "software", "finance", "banking", "healthcare", "education",
+              "retail", "media", "government", ""]
+DEGREES = ["", "none", "Bachelor's degree", "Master of Science", "PhD", "High school diploma", "MBA"]
+
+
+def make_job(rng: random.Random, i: int) -> dict:
+    job = {
+        "id": f"job-{i}",
+        "title": f"{rng.choice(['', 'Senior ', 'Junior ', 'Lead '])}{rng.choice(TITLES)}".title(),
+        "industry": rng.choice(INDUSTRIES),
+        "min_experience": rng.choice([0, 0, 1, 2, 3, 5, 8]),
+        "required_degree": rng.choice(DEGREES),
+        "skills": [skill.title() for skill in rng.sample(SKILLS, rng.randrange(2, 9))]
+    }
+    if rng.random() < 0.03:
+        # No skill list: skills come from the description
+        job["description"] = f"We need someone with {' and '.join(job.pop('skills'))} experience."
+    return job
+
+
+def make_profile(rng: random.Random) -> dict:
+    return {
+        "skills": [skill.upper() if rng.random() < 0.2 else skill
+                   for skill in rng.sample(SKILLS + ["sql server", "js", "ml"], rng.randrange(0, 10))],
+        "current_role": rng.choice(TITLES + [""]),
+        "target_role": rng.choice(["", "engineer", "data", "lead product manager"]),
+        "years_experience": rng.choice([0, 1, 2, 4, 6, 10]),
+        "education": [{"degree": rng.choice(DEGREES[2:])}] if rng.random() < 0.8 else [],
+        "experience": [{"industry": rng.choice(INDUSTRIES[:-1])} for _ in range(rng.randrange(0, 3))]
+    }
+
+
+def legacy_match_jobs(matcher: JobMatcher, user_profile: dict, jobs: list, limit: int) -> list:
+    """The previous match_jobs loop"""
+    scored_jobs = []
+    for job in jobs:
+        score = matcher._calculate_match_score(user_profile, job)
+        scored_jobs.append({
+            "job": job,
+            "match_score": score,
+            "match_factors": matcher._get_match_factors(user_profile, job, score)
+        })
+    scored_jobs.sort(key=lambda x: x["match_score"], reverse=True)
+    return scored_jobs[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--profiles", type=int, default=20)
+    parser.add_argument("--legacy-profiles", type=int, default=2, help="Profiles timed with the previous loop")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = [make_job(rng, i) for i in range(args.jobs)]
+    profiles = [make_profile(rng) for _ in range(args.profiles)]
+    matcher = JobMatcher()
+
+    # Every score of a smaller catalogue matches the per-job formula
+    check = JobMatcher()
+    check.index_jobs(jobs[:5000])
+    scores_match = all(
+        abs(score - check._calculate_match_score(profile, job)) < 1e-9
+        for profile in profiles
+        for job, score in zip(jobs[:5000], check._match_engine.score(profile))
+    )
+
+    legacy, legacy_results = [], []
+    for profile in profiles[:args.legacy_profiles]:
+        start = time.perf_counter()
+        legacy_results.append(legacy_match_jobs(matcher, profile, jobs, args.limit))
+        legacy.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    matcher.index_jobs(jobs)
+    encode_s = time.perf_counter() - start
+
+    engine, engine_results = [], []
+    for profile in profiles:
+        start = time.perf_counter()
+        engine_results.append(matcher.match_jobs(profile, jobs, args.limit))
+        engine.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    filtered = matcher.match_jobs(profiles[0], jobs, args.limit, filters={"industry": ["finance", "banking"]})
+    filtered_s = time.perf_counter() - start
+
+    same = all(
+        [(m["job"]["id"], m["match_score"], m["match_factors"]) for m in old] ==
+        [(m["job"]["id"], m["match_score"], m["match_factors"]) for m in new]
+        for old, new in zip(legacy_results, engine_results)
+    )
+
+    print(f"{len(jobs)} jobs, {len(profiles)} profiles, top {args.limit}")
+    print(f"previous loop:        {statistics.median(legacy) * 1000:9.1f} ms/profile")
+    print(f"engine encode:        {encode_s * 1000:9.1f} ms once")
+    print(f"engine match:         {statistics.median(engine) * 1000:9.1f} ms/profile")
+    print(f"engine with filters:  {filtered_s * 1000:9.1f} ms ({len(filtered)} matches)")
+    print(f"scores match formula: {scores_match}   top matches identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Job Search Benchmark
+
+Compares job search latency for:
+- the LIKE scan over title/description/company/location (no FTS5);
+- the BM25-ranked FTS5 index kept in sync with the jobs table;
+and filter lookups (jobs by status, applications by user) with and without
+the secondary indexes.
+
+Usage:
+    python -m backend.benchmarks.job_search --jobs 200000 --queries 50
+"""
+
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+
+from backend.database.connector import Database
+
+TITLES = ["software engineer", "data scientist", "product manager", "designer", "devops engineer",
+          "data analyst", "accountant", "sales manager", "hr specialist", "marketing lead"]
+SKILLS = ["python", "java", "sql", "react", "docker", "kubernetes", "excel", "tableau", "figma",
+          "aws", "azure", "machine learning", "communication", "leadership", "negotiation"]
+WORDS = ["team", "build", "customers", "platform", "growth", "reports", "design", "deliver",
+         "quality", "stakeholders", "analysis", "roadmap", "systems", "pipeline", "insights"]
+CITIES = ["dubai", "abu dhabi", "sharjah", "riyadh", "doha", "remote"]
+
+
+def populate(db: Database, jobs: int, users: int, rng: random.Random):
+    """Insert synthetic users, jobs and applications"""
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    db.bulk_insert("users", [{
+        "id": f"user-{u}",
+        "email": f"user-{u}@example.com",
+        "password": "x",
+        "name": f"User {u}",
+        "created_at": timestamp,
+        "updated_at": timestamp
+    } for u in range(users)])
+
+    db.bulk_insert("jobs", [{
+        "id": f"job-{i}",
+        "title": rng.choice(TITLES),
+        "company": f"company {rng.randrange(2000)}",
+        "location": rng.choice(CITIES),
+        "description": " ".join(rng.choice(WORDS) for _ in range(60)) + f" ref{i}",
+        "skills": json.dumps(rng.sample(SKILLS, 5)),
+        "status": "active" if rng.random() < 0.9 else "closed",
+        "created_at": timestamp,
+        "updated_at": timestamp
+    } for i in range(jobs)])
+
+    db.bulk_insert("job_applications", [{
+        "id": f"application-{i}",
+        "user_id": f"user-{rng.randrange(users)}",
+        "job_id": f"job-{rng.randrange(jobs)}",
+        "status": "applied",
+        "created_at": timestamp,
+        "updated_at": timestamp
+    } for i in range(jobs)])
+
+
+def timed(func, args_list) -> float:
+    """Average milliseconds per call"""
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - start) * 1000 / len(args_list)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    fields = ["title", "description", "company", "location"]
+
+    # Rare terms (a single job reference) and common terms (many matches)
+    queries = [f"ref{rng.randrange(args.jobs)}" for _ in range(args.queries // 2)]
+    queries += [f"{rng.choice(TITLES).split()[0]} {rng.choice(CITIES).split()[0]}"
+                for _ in range(args.queries - len(queries))]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(db_file=os.path.join(tmp_dir, "bench.db"))
+
+        start = time.perf_counter()
+        populate(db, args.jobs, args.users, rng)
+        load_time = time.perf_counter() - start
+        db.execute("ANALYZE")
+
+        # The LIKE scan matches substrings; FTS5 matches every word
+        like_time = timed(lambda q: db.search("jobs", fields, q, {"status": "active"}, 20, 0),
+                          [(q.split()[0],) for q in queries])
+        fts_time = timed(lambda q: db.full_text_search("jobs", q, {"status": "active"}, 20, 0),
+                         [(q,) for q in queries])
+        fts_page_time = timed(lambda q: db.full_text_search("jobs", q, {"status": "active"}, 20, 100),
+                              [(q,) for q in queries])
+
+        users = [(f"user-{rng.randrange(args.users)}",) for _ in range(args.queries)]
+        indexed_user_time = timed(lambda u: db.find_by_field("job_applications", "user_id", u), users)
+        indexed_status_time = timed(lambda s: db.find_by_field("jobs", "status", s), [("closed",)] * 5)
+
+        db.execute("DROP INDEX idx_job_applications_user")
+        db.execute("DROP INDEX idx_jobs_status")
+        db.execute("ANALYZE")
+
+        scan_user_time = timed(lambda u: db.find_by_field("job_applications", "user_id", u), users)
+        scan_status_time = timed(lambda s: db.find_by_field("jobs", "status", s), [("closed",)] * 5)
+
+        db.close()
+
+    print(f"jobs={args.jobs} applications={args.jobs} load={load_time:.1f} s (including index and FTS maintenance)")
+    print(f"search LIKE scan:             {like_time:8.2f} ms/query")
+    print(f"search FTS5 + BM25:           {fts_time:8.2f} ms/query  ({like_time / fts_time:.0f}x)")
+    print(f"search FTS5 + BM25 (page 6):  {fts_page_time:8.2f} ms/query")
+    print(f"applications by user, scan:   {scan_user_time:8.2f} ms")
+    print(f"applications by user, index:  {indexed_user_time:8.2f} ms  ({scan_user_time / indexed_user_time:.0f}x)")
+    print(f"closed jobs, scan:            {scan_status_time:8.2f} ms")
+    print(f"closed jobs, index:           {indexed_status_time:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Job Search Fan-out Benchmark
+
+Replaces JobSearch's board adapters with local fakes that sleep for a
+board-specific latency (one of them hangs past the deadline, one raises)
+and compares:
+- the previous search_jobs: boards queried one after another;
+- search_jobs_with_sources: boards queried concurrently, slow boards cut off
+  at the per-board timeout / search deadline and reported in sources_failed;
+- stream_jobs: time until the first board's jobs are available.
+Jobs listed on several boards are checked to be returned once.
+
+Usage (from the backend directory):
+    python -m benchmarks.job_search_fanout --boards 6 --latency 0.3
+"""
+
+import time
+import random
+import argparse
+
+from core.job_workflow import JobSearch
+
+TITLES = ("Data Analyst", "Software Engineer", "Product Manager", "DevOps Engineer", "UX Designer")
+COMPANIES = ("Emirates Digital", "Gulf Analytics", "Falcon Systems", "Desert Cloud")
+
+
+def fake_board(name: str, latency: float, shared: list, count: int, fail: bool = False):
+    """Board adapter returning count jobs (plus the shared listings) after latency seconds"""
+    def search(query, location, filters):
+        time.sleep(latency)
+        if fail:
+            raise ConnectionError(f"{name} is unavailable")
+        rng = random.Random(name)
+        jobs = [{"id": f"{name}-{i}", "title": f"{rng.choice(TITLES)} {name} {i}",
+                 "company": rng.choice(COMPANIES), "location": location, "date_posted": "2024-01-01"}
+                for i in range(count)]
+        # The same listing as other boards, formatted slightly differently
+        jobs += [{"id": f"{name}-{job['id']}", "title": job["title"].upper() + ",",
+                  "company": f" {job['company']}", "location": job["location"].lower()} for job in shared]
+        return jobs
+    return search
+
+
+def sequential_search(search: JobSearch, query: str, location: str, boards: list) -> list:
+    """The previous search_jobs loop"""
+    results = []
+    for board in boards:
+        try:
+            results.extend(search.board_adapters[board](query, location, {}))
+        except Exception:
+            pass
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--boards", type=int, default=6)
+    parser.add_argument("--latency", type=float, default=0.3, help="Mean board latency in seconds")
+    parser.add_argument("--jobs", type=int, default=25, help="Jobs per board")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    shared = [{"id": f"shared-{i}", "title": f"Data Scientist {i}", "company": "Tamkeen Labs",
+               "location": "Abu Dhabi, AE"} for i in range(5)]
+    adapters = {f"board_{i}": fake_board(f"board_{i}", rng.uniform(0.5, 1.5) * args.latency, shared, args.jobs)
+                for i in range(args.boards)}
+    adapters["hanging_board"] = fake_board("hanging_board", args.latency * 20, shared, args.jobs)
+    adapters["broken_board"] = fake_board("broken_board", args.latency / 2, shared, args.jobs, fail=True)
+    boards = list(adapters)
+
+    search = JobSearch(board_adapters=adapters, board_timeout=args.latency * 3, search_deadline=args.latency * 4)
+
+    start = time.perf_counter()
+    sequential = sequential_search(search, "data", "Abu Dhabi, AE", boards)
+    sequential_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = search.search_jobs_with_sources("data", "Abu Dhabi, AE", job_boards=boards, limit=1000)
+    concurrent_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stream = search.stream_jobs("data", "Abu Dhabi, AE", job_boards=boards)
+    first = next(batch for batch in stream if batch["jobs"])
+    first_s = time.perf_counter() - start
+    streamed = len(first["jobs"]) + sum(len(batch["jobs"]) for batch in stream)
+    stream_s = time.perf_counter() - start
+
+    expected = args.boards * args.jobs + len(shared)
+    print(f"{len(boards)} boards ({args.boards} at ~{args.latency * 1000:.0f} ms, one hanging, one failing), "
+          f"timeout {search.board_timeout * 1000:.0f} ms, deadline {search.search_deadline * 1000:.0f} ms")
+    print(f"sequential:            {sequential_s * 1000:8.0f} ms   {len(sequential)} jobs (with duplicates)")
+    print(f"concurrent:            {concurrent_s * 1000:8.0f} ms   {len(result['jobs'])} jobs "
+          f"(expected {expected}), failed: {result['sources_failed']}")
+    print(f"stream, first board:   {first_s * 1000:8.0f} ms   ({first['source']}, {len(first['jobs'])} jobs)")
+    print(f"stream, all boards:    {stream_s * 1000:8.0f} ms   {streamed} jobs")
+    print(f"deduplicated: {len(result['jobs']) == expected and streamed == expected}")
+
+
+if __name__ == "__main__":
+    main()
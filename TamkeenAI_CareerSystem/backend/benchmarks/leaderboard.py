@@ -0,0 +1,106 @@
+"""
+Leaderboard Benchmark
+
+Loads a board of synthetic users (1M by default) into a temporary leaderboard
+database and compares:
+- the previous /leaderboard route: build an entry per user, sort all of them
+  and slice one page, on every request (and the dashboard's "top 100, then
+  search for the user" rank lookup, which misses anyone below 100);
+- the Leaderboard service: XP updates (persisted), rank lookups and page
+  fetches on the order-statistic structure.
+Ranks and pages are checked against a full sort.
+
+Usage (from the backend directory):
+    python -m benchmarks.leaderboard --users 1000000
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+from core import leaderboard as leaderboard_module
+from core.leaderboard import Leaderboard, weekly_board
+
+
+def per_call_us(func, args_list):
+    """Median microseconds per call over args_list"""
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000000)
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--no-sortedcontainers", action="store_true", help="Use the bisect fallback")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.no_sortedcontainers:
+        leaderboard_module.SORTEDCONTAINERS_AVAILABLE = False
+
+    rng = random.Random(args.seed)
+    stats = {f"user-{i}": {"xp": int(rng.paretovariate(1.5) * 100), "streak_days": rng.randrange(30)}
+             for i in range(args.users)}
+
+    # Previous route: sort every user on each request
+    start = time.perf_counter()
+    entries = [{"user_id": user_id, "xp": s["xp"], "streak_days": s["streak_days"]} for user_id, s in stats.items()]
+    entries.sort(key=lambda x: x["xp"], reverse=True)
+    entries = entries[0:10]
+    legacy_ms = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        board = Leaderboard(os.path.join(tmp_dir, "leaderboard.db"))
+
+        start = time.perf_counter()
+        board.import_scores((user_id, s["xp"], {"streak_days": s["streak_days"]}) for user_id, s in stats.items())
+        import_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        board.count()
+        load_s = time.perf_counter() - start
+
+        users = list(stats)
+        sample = [rng.choice(users) for _ in range(args.operations)]
+
+        update_us = per_call_us(lambda user_id, amount: board.add_xp(user_id, amount,
+                                                                    total_xp=stats[user_id]["xp"] + amount),
+                                [(user_id, rng.randrange(5, 200)) for user_id in sample])
+        for user_id in sample:
+            stats[user_id]["xp"] = board.get_entry(user_id)["xp"]
+
+        rank_us = per_call_us(board.get_rank, [(user_id,) for user_id in sample])
+        top_us = per_call_us(board.get_page, [(0, 10)] * args.operations)
+        deep_us = per_call_us(board.get_page, [(rng.randrange(args.users - 50), 50) for _ in range(args.operations)])
+        weekly_us = per_call_us(board.get_page, [(0, 10, weekly_board())] * args.operations)
+
+        # Oracle: full sort with the same tie-break (user ID)
+        order = sorted(stats, key=lambda user_id: (-stats[user_id]["xp"], user_id))
+        expected_rank = {user_id: i + 1 for i, user_id in enumerate(order)}
+        ranks_ok = all(board.get_rank(user_id) == expected_rank[user_id] for user_id in sample[:500])
+        offset = args.users // 2
+        page_ok = [e["user_id"] for e in board.get_page(offset, 20)] == order[offset:offset + 20]
+
+        print(f"users: {args.users}  order structure: "
+              f"{'SortedList' if leaderboard_module.SORTEDCONTAINERS_AVAILABLE else 'bisect list'}")
+        print(f"previous route, sort per request:   {legacy_ms:9.1f} ms/request")
+        print(f"bulk import / first load:           {import_s:9.1f} s / {load_s:.1f} s")
+        print(f"add_xp (persisted, both boards):    {update_us:9.1f} us")
+        print(f"rank lookup (any user):             {rank_us:9.1f} us")
+        print(f"top 10 page:                        {top_us:9.1f} us")
+        print(f"page of 50 at a random offset:      {deep_us:9.1f} us")
+        print(f"weekly top 10 ({board.count(weekly_board())} users this week): {weekly_us:9.1f} us")
+        print(f"ranks match full sort: {ranks_ok}   pages match full sort: {page_ok}")
+        board.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+LLM Response Cache Benchmark
+
+Replays a workload of ATS analyses, interview-question generations and
+career-advice prompts, where popular prompts recur (some with whitespace or
+wording variations), through PredictClient against a stub provider with a
+fixed latency. Reports provider calls, hit rate, and tokens and latency
+saved, with the cache off, exact-match only, and with near-duplicate lookup.
+The caches use the default settings: ATS analyses opt in with use_cache=True,
+as DeepSeekClient does, and sampled prompts go to the provider. The run exits
+non-zero if DeepSeekClient.analyze_resume does not hit the cache on a repeat.
+
+Usage (from the backend directory, where the api package lives):
+    python -m benchmarks.llm_cache --requests 300 --latency 0.05
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from types import SimpleNamespace
+
+from api.services.predict_api import DeepSeekClient, PredictClient, ResponseCache, response_cache
+
+# Only the caches created here are used, never the shared one on disk
+response_cache.CACHE_ENABLED = False
+
+SYSTEM_PROMPTS = {
+    'ats': "You are an expert ATS analyzer. Analyze the resume against the job description.",
+    'interview': "You are an interviewer. Generate five interview questions for the role.",
+    'advice': "You are a career coach. Give concise career advice."
+}
+ROLES = ["software engineer", "data scientist", "product manager", "accountant", "hr specialist",
+         "marketing lead", "devops engineer", "designer", "sales manager", "data analyst"]
+
+
+class StubCompletions:
+    """OpenAI-style chat.completions with a fixed latency"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def create(self, model, messages, temperature, max_tokens, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        content = f"answer for: {messages[-1]['content'][:40]}"
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(total_tokens=400 + len(messages[-1]['content']) // 4)
+        )
+
+
+def build_workload(count: int, rng: random.Random):
+    """Requests drawn from a skewed set of popular prompts, some lightly varied"""
+    prompts = []
+    for role in ROLES:
+        prompts.append(('ats', f"Resume: {role} with 5 years experience.\nJob description: senior {role}.", 0.3))
+        prompts.append(('interview', f"Job title: {role}. Level: mid. Focus: technical and behavioral.", 0.7))
+        prompts.append(('advice', f"I am a {role}. How do I move into a leadership role in the UAE?", 0.7))
+        prompts.append(('advice', f"Brainstorm unusual side projects for a {role}.", 1.0))
+
+    weights = [1 / (i + 1) for i in range(len(prompts))]
+    workload = []
+    for _ in range(count):
+        kind, text, temperature = rng.choices(prompts, weights)[0]
+        variation = rng.random()
+        if variation < 0.15:
+            text = "  " + text.replace(" ", "  ") + "\n"
+        elif variation < 0.25:
+            text = text.replace("How do I", "How can I").replace("Level: mid.", "Level: mid-level.")
+        # Analyses opt in to the cache like DeepSeekClient.analyze_resume
+        workload.append(([{"role": "system", "content": SYSTEM_PROMPTS[kind]},
+                          {"role": "user", "content": text}], temperature, True if kind == 'ats' else None))
+    return workload
+
+
+def run(workload, latency: float, cache):
+    """Send the workload through a PredictClient, returning (seconds, provider calls, metrics)"""
+    client = PredictClient(api_key="test", provider="deepseek", mock_data_enabled=False, response_cache=cache)
+    completions = StubCompletions(latency)
+    client.api_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    start = time.perf_counter()
+    for messages, temperature, use_cache in workload:
+        client.chat_completion(messages, temperature=temperature, max_tokens=1000, use_cache=use_cache)
+    return time.perf_counter() - start, completions.calls, client.get_metrics()
+
+
+def resume_analysis_calls(cache) -> int:
+    """Provider calls made by two identical DeepSeekClient.analyze_resume requests"""
+    client = DeepSeekClient(api_key="test", mock_data_enabled=False)
+    client.response_cache = cache
+    completions = StubCompletions(0)
+    client.api_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    for _ in range(2):
+        client.analyze_resume("Data analyst, 5 years of SQL and Tableau.", "Senior data analyst.")
+    return completions.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub provider latency in seconds")
+    parser.add_argument("--similarity", type=float, default=0.85)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    workload = build_workload(args.requests, random.Random(args.seed))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        configs = [
+            ("no cache", None),
+            ("exact", ResponseCache(cache_file=os.path.join(tmp_dir, "exact.db"))),
+            (f"near-duplicate >= {args.similarity}", ResponseCache(cache_file=os.path.join(tmp_dir, "similar.db"),
+                                                                    similarity_threshold=args.similarity))
+        ]
+
+        print(f"requests={len(workload)} provider_latency={args.latency * 1000:.0f} ms")
+        for name, cache in configs:
+            elapsed, calls, metrics = run(workload, args.latency, cache)
+            print(f"{name}:")
+            print(f"  provider calls:   {calls:5d}   wall time {elapsed:6.2f} s")
+            print(f"  hit rate:         {metrics['cache_hit_rate']:6.1%}  "
+                  f"(similar {metrics['cache_similar_hits']}, bypassed {metrics['cache_bypassed']})")
+            print(f"  tokens saved:     {metrics['tokens_saved']:6d}   latency saved {metrics['latency_saved_ms'] / 1000:6.2f} s")
+
+        # A restarted worker still hits the disk tier
+        restarted = ResponseCache(cache_file=os.path.join(tmp_dir, "exact.db"))
+        _, calls, metrics = run(workload, args.latency, restarted)
+        print(f"exact, after restart (disk tier): provider calls {calls}, hit rate {metrics['cache_hit_rate']:.1%}")
+
+        analysis_cache = ResponseCache(cache_file=os.path.join(tmp_dir, "analysis.db"))
+        analysis_calls = resume_analysis_calls(analysis_cache)
+        print(f"repeated analyze_resume, default cache settings: provider calls {analysis_calls}")
+
+        for _, cache in configs[1:]:
+            cache.close()
+        restarted.close()
+        analysis_cache.close()
+
+    if analysis_calls != 1:
+        sys.exit("FAILED: a repeated resume analysis did not hit the cache")
+
+
+if __name__ == "__main__":
+    main()
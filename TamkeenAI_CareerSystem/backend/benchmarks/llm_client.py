@@ -0,0 +1,174 @@
+"""
+LLM Provider Client Benchmark
+
+Runs the provider client against a local stub OpenAI-compatible server and
+reports:
+- request latency with a bare requests.post per call vs the pooled keep-alive
+  session (sync) and the aiohttp variant under concurrency;
+- behaviour with a hanging provider (read timeout) and a failing provider
+  (retries, circuit breaker opening, mock failover).
+
+With --tls the stub serves HTTPS with a throwaway self-signed certificate
+(requires the openssl CLI), which is where reusing connections pays off.
+
+Usage (from the backend directory, where the api package lives):
+    python -m benchmarks.llm_client --requests 200 --concurrency 8 --tls
+"""
+
+import os
+import ssl
+import json
+import time
+import tempfile
+import subprocess
+import asyncio
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from api.services import llm_client, llm_service
+from api.services.llm_client import ProviderClient, CircuitBreaker, ProviderError
+
+COMPLETION = json.dumps({
+    "choices": [{"message": {"role": "assistant", "content": "stub answer"}}]
+}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible stub: /ok answers, /slow hangs, /fail returns 503"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if self.path.startswith("/slow"):
+            time.sleep(5)
+
+        if self.path.startswith("/fail"):
+            self.server.failures += 1
+            body, status = b'{"error": "unavailable"}', 503
+        else:
+            body, status = COMPLETION, 200
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_certificate(directory: str):
+    """Create a self-signed certificate for 127.0.0.1"""
+    cert_file = os.path.join(directory, "stub.crt")
+    key_file = os.path.join(directory, "stub.key")
+    subprocess.run([
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+        "-keyout", key_file, "-out", cert_file, "-subj", "/CN=127.0.0.1",
+        "-addext", "subjectAltName=IP:127.0.0.1"
+    ], check=True, capture_output=True)
+    return cert_file, key_file
+
+
+def start_server(certificate=None):
+    """Start the stub server on a free local port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.failures = 0
+
+    scheme = "http"
+    if certificate:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(*certificate)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}"
+
+
+def run_threads(threads: int, count: int, call):
+    """Run call() count times across threads, returning seconds elapsed"""
+    per_thread = count // threads
+    workers = [threading.Thread(target=lambda: [call() for _ in range(per_thread)]) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--tls", action="store_true", help="Serve the stub over HTTPS")
+    args = parser.parse_args()
+
+    cert_dir = tempfile.TemporaryDirectory()
+    certificate = make_certificate(cert_dir.name) if args.tls else None
+    server, base_url = start_server(certificate)
+    verify = certificate[0] if certificate else True
+    messages = [{"role": "user", "content": "hello"}]
+    payload = {"model": "stub", "messages": messages}
+
+    # Previous behaviour: a new connection per request
+    bare_time = run_threads(args.concurrency, args.requests,
+                            lambda: requests.post(f"{base_url}/ok/chat/completions", json=payload, verify=verify).json())
+
+    client = ProviderClient("openai", base_url=f"{base_url}/ok", api_key="test",
+                            max_concurrency=args.concurrency, verify=verify)
+    pooled_time = run_threads(args.concurrency, args.requests,
+                              lambda: client.chat_completion("stub", messages))
+
+    async def run_async():
+        async_client = ProviderClient("openai", base_url=f"{base_url}/ok", api_key="test",
+                                      max_concurrency=args.concurrency, verify=verify)
+        start = time.perf_counter()
+        await asyncio.gather(*[async_client.achat_completion("stub", messages) for _ in range(args.requests)])
+        elapsed = time.perf_counter() - start
+        await async_client.aclose()
+        return elapsed
+
+    async_time = asyncio.run(run_async())
+
+    print(f"requests={args.requests} concurrency={args.concurrency} tls={args.tls}")
+    print(f"bare requests.post:     {bare_time / args.requests * 1000:6.2f} ms/request")
+    print(f"pooled session:         {pooled_time / args.requests * 1000:6.2f} ms/request")
+    print(f"aiohttp:                {async_time / args.requests * 1000:6.2f} ms/request")
+
+    # A hanging provider is cut off by the read timeout instead of blocking the worker
+    slow = ProviderClient("openai", base_url=f"{base_url}/slow", api_key="test",
+                          read_timeout=0.5, max_retries=0, verify=verify)
+    start = time.perf_counter()
+    try:
+        slow.chat_completion("stub", messages)
+    except ProviderError as e:
+        print(f"hanging provider:       failed after {time.perf_counter() - start:.2f} s ({type(e).__name__})")
+
+    # A failing provider opens the circuit, after which calls fail over immediately
+    failing = ProviderClient("deepseek", base_url=f"{base_url}/fail", api_key="test", max_retries=2,
+                             backoff_base=0.01, breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60),
+                             verify=verify)
+    llm_client._clients["deepseek"] = failing
+    llm_service.DEEPSEEK_API_KEY = "test"
+
+    for i in range(5):
+        start = time.perf_counter()
+        result = llm_service.query_llm_provider(messages, provider="deepseek")
+        print(f"failing provider call {i + 1}: {(time.perf_counter() - start) * 1000:6.1f} ms "
+              f"mock_used={result.get('mock_used', False)} circuit={failing.breaker.state} "
+              f"upstream_requests={server.failures}")
+
+    server.shutdown()
+    cert_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+LLM Streaming Benchmark
+
+Measures time to first token and total time for the chat and interview
+coach endpoints, one-shot vs streamed (Server-Sent Events), fully offline:
+the provider is the mock OpenAI-compatible endpoint of predict_api_server,
+which streams mock tokens with a simulated first-token delay and per-token
+delay. Also checks that a streamed interview reply is saved to the
+conversation once the stream finishes.
+
+Usage (from the backend directory, where the api package lives):
+    python -m benchmarks.llm_streaming --requests 5 --first-token-delay 0.5 --token-delay 0.05
+"""
+
+import json
+import time
+import argparse
+import threading
+import statistics
+
+import requests
+from flask import Flask
+from werkzeug.serving import make_server
+
+import predict_api_server
+from api.services import llm_client, llm_service
+from api.services.llm_client import ProviderClient
+from api.routes import chat_routes
+from api.controllers import interview_controller
+
+
+def serve(app):
+    """Serve a Flask app on a free local port in a background thread"""
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def timed_request(url: str, payload, stream: bool):
+    """POST and return (seconds to first content, total seconds, final payload)"""
+    headers = {"Accept": "text/event-stream"} if stream else {}
+    start = time.perf_counter()
+    first = None
+    final = None
+
+    with requests.post(url, json=payload, headers=headers, stream=True) as response:
+        if not stream:
+            final = response.json()
+            first = time.perf_counter() - start
+        else:
+            event = None
+            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    if event == "token" and first is None:
+                        first = time.perf_counter() - start
+                    elif event in ("done", "error"):
+                        final = json.loads(line[5:])
+
+    return first, time.perf_counter() - start, final
+
+
+def measure(url: str, payload, stream: bool, count: int):
+    """Median time to first content and total time over count requests"""
+    results = [timed_request(url, payload, stream) for _ in range(count)]
+    return (statistics.median(r[0] for r in results),
+            statistics.median(r[1] for r in results),
+            results[-1][2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--first-token-delay", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    predict_api_server.MOCK_FIRST_TOKEN_DELAY = args.first_token_delay
+    predict_api_server.MOCK_TOKEN_DELAY = args.token_delay
+    stub, stub_url = serve(predict_api_server.app)
+
+    # Point the shared OpenAI client, the SDK client and the interview coach at the stub
+    llm_service.OPENAI_API_KEY = "test"
+    llm_client._clients["openai"] = ProviderClient("openai", base_url=f"{stub_url}/v1", api_key="test")
+    from openai import OpenAI
+    chat_routes.client = OpenAI(base_url=f"{stub_url}/v1", api_key="test")
+    interview_controller.openai_api_key = "test"
+
+    app = Flask(__name__)
+    app.register_blueprint(chat_routes.chat_bp, url_prefix="/api/chatgpt")
+    app.register_blueprint(interview_controller.interview_bp)
+    backend, backend_url = serve(app)
+
+    resume_payload = {"resume_content": "Data analyst, 3 years of SQL and Tableau.", "job_description": "Senior data analyst"}
+
+    print(f"provider: first token {args.first_token_delay * 1000:.0f} ms, {args.token_delay * 1000:.0f} ms/token; "
+          f"median of {args.requests} requests")
+
+    url = f"{backend_url}/api/chatgpt/resume/improve"
+    one_shot = measure(url, resume_payload, stream=False, count=args.requests)
+    streamed = measure(url, resume_payload, stream=True, count=args.requests)
+    print("/resume/improve:")
+    print(f"  one-shot JSON:   first content {one_shot[0] * 1000:7.0f} ms   total {one_shot[1] * 1000:7.0f} ms")
+    print(f"  streamed (SSE):  first token   {streamed[0] * 1000:7.0f} ms   total {streamed[1] * 1000:7.0f} ms")
+    print(f"  same text:       {one_shot[2]['data']['raw_suggestions'] == streamed[2]['raw_suggestions']}")
+
+    # The in-memory conversation store is used when MongoDB is not reachable
+    conversation_id = "benchmark-conversation"
+    if interview_controller.USING_MOCK_DATA:
+        interview_controller.conversations_memory.append({"id": conversation_id, "messages": []})
+
+    url = f"{backend_url}/api/interviews/message"
+    coach_payload = {"conversationId": conversation_id, "message": "How do I prepare for an interview?"}
+    streamed = measure(url, coach_payload, stream=True, count=args.requests)
+    print("/api/interviews/message:")
+    print(f"  streamed (SSE):  first token   {streamed[0] * 1000:7.0f} ms   total {streamed[1] * 1000:7.0f} ms")
+
+    if interview_controller.USING_MOCK_DATA:
+        saved = interview_controller.conversations_memory[-1]["messages"]
+        print(f"  saved messages:  {len(saved)} (last reply matches stream: "
+              f"{saved[-1]['content'] == streamed[2]['data']['content']})")
+
+    backend.shutdown()
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
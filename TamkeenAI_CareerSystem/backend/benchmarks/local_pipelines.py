@@ -0,0 +1,143 @@
+"""
+Local Pipelines Benchmark
+
+Writes tiny randomly initialised text-classification (BERT) and
+summarization (BART) models to a temporary directory and runs them through
+HuggingFaceService in local mode. Compares:
+- the previous run_local_pipeline: transformers.pipeline() built per call;
+- the pipeline cache: one load, then per-call inference;
+- the micro-batcher: concurrent text_classification / summarization
+  requests collected into batched forward passes.
+Batched results are checked against per-text pipeline calls, and the cache
+budget is checked to evict the least recently used pipeline; the run exits
+non-zero if either check fails.
+
+Usage (from the backend directory):
+    python -m benchmarks.local_pipelines --requests 64 --hidden 256
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from transformers import (BertConfig, BertForSequenceClassification, BertTokenizerFast,
+                          BartConfig, BartForConditionalGeneration, pipeline)
+
+from api.services import local_pipelines
+from api.services.local_pipelines import PipelineCache, MicroBatcher
+from api.services.huggingface_service import HuggingFaceService
+
+WORDS = ("python sql leadership analytics cloud agile stakeholder dashboard forecasting "
+         "kubernetes reporting budgeting mentoring negotiation research design").split()
+
+
+def write_tokenizer(path: str) -> BertTokenizerFast:
+    vocab_file = os.path.join(path, "vocab.txt")
+    with open(vocab_file, 'w') as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS))
+    tokenizer = BertTokenizerFast(vocab_file)
+    tokenizer.save_pretrained(path)
+    return tokenizer
+
+
+def build_fixtures(root: str, hidden: int):
+    """Tiny classifier and summarizer directories"""
+    classifier_dir = os.path.join(root, "tiny-classifier")
+    summarizer_dir = os.path.join(root, "tiny-summarizer")
+    for path in (classifier_dir, summarizer_dir):
+        os.makedirs(path)
+    tokenizer = write_tokenizer(classifier_dir)
+    write_tokenizer(summarizer_dir)
+
+    BertForSequenceClassification(BertConfig(
+        vocab_size=tokenizer.vocab_size, hidden_size=hidden, num_hidden_layers=4,
+        num_attention_heads=4, intermediate_size=hidden * 4, num_labels=2,
+        id2label={0: "NEGATIVE", 1: "POSITIVE"}, label2id={"NEGATIVE": 0, "POSITIVE": 1}
+    )).save_pretrained(classifier_dir)
+
+    BartForConditionalGeneration(BartConfig(
+        vocab_size=tokenizer.vocab_size, d_model=hidden // 2, encoder_layers=2, decoder_layers=2,
+        encoder_attention_heads=4, decoder_attention_heads=4, encoder_ffn_dim=hidden, decoder_ffn_dim=hidden,
+        pad_token_id=0, bos_token_id=2, eos_token_id=3, decoder_start_token_id=2, forced_eos_token_id=3,
+        max_position_embeddings=1024
+    )).save_pretrained(summarizer_dir)
+    return classifier_dir, summarizer_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--hidden", type=int, default=256)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [" ".join(rng.choice(WORDS) for _ in range(rng.randrange(8, 40))) for _ in range(args.requests)]
+
+    with tempfile.TemporaryDirectory() as root:
+        classifier_dir, summarizer_dir = build_fixtures(root, args.hidden)
+        local_pipelines._pipeline_cache = PipelineCache()
+        local_pipelines._batcher = MicroBatcher(local_pipelines._pipeline_cache)
+        service = HuggingFaceService(use_local=True)
+
+        # Previous path: construct the pipeline on every call
+        start = time.perf_counter()
+        for text in texts[:10]:
+            pipeline("text-classification", model=classifier_dir)(text)
+        uncached_ms = (time.perf_counter() - start) / 10 * 1000
+
+        service.run_local_pipeline("text-classification", classifier_dir, texts[0])
+        start = time.perf_counter()
+        expected = [service.run_local_pipeline("text-classification", classifier_dir, text) for text in texts]
+        cached_ms = (time.perf_counter() - start) / len(texts) * 1000
+
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            start = time.perf_counter()
+            batched = list(executor.map(service.text_classification, texts, [classifier_dir] * len(texts)))
+            batched_ms = (time.perf_counter() - start) / len(texts) * 1000
+
+            service.run_local_pipeline("summarization", summarizer_dir, texts[0])
+            start = time.perf_counter()
+            summaries_expected = [service.run_local_pipeline("summarization", summarizer_dir, text)[0]["summary_text"]
+                                  for text in texts[:args.threads]]
+            summary_sequential_ms = (time.perf_counter() - start) / args.threads * 1000
+            start = time.perf_counter()
+            summaries = list(executor.map(service.summarization, texts[:args.threads],
+                                          [summarizer_dir] * args.threads))
+            summary_ms = (time.perf_counter() - start) / args.threads * 1000
+
+        same_labels = all(a[0]["label"] == b[0]["label"] and abs(a[0]["score"] - b[0]["score"]) < 1e-4
+                          for a, b in zip(expected, batched))
+        same_summaries = summaries == summaries_expected
+
+        # Eviction: a budget that fits only one of the two models
+        sizes = {task: cached.nbytes for (task, _), cached in local_pipelines._pipeline_cache._entries.items()}
+        small = PipelineCache(max_bytes=max(sizes.values()) + 1)
+        small.get("text-classification", classifier_dir)
+        small.get("summarization", summarizer_dir)
+        evicted = [p["task"] for p in small.stats()["pipelines"]] == ["summarization"]
+
+        print(f"classifier {sizes['text-classification'] / 1e6:.1f} MB, "
+              f"summarizer {sizes['summarization'] / 1e6:.1f} MB, {len(texts)} requests")
+        print(f"pipeline built per call:          {uncached_ms:8.1f} ms/request")
+        print(f"cached pipeline, sequential:      {cached_ms:8.1f} ms/request")
+        print(f"micro-batched, {args.threads} threads:        {batched_ms:8.1f} ms/request")
+        print(f"summarization, sequential:        {summary_sequential_ms:8.1f} ms/request")
+        print(f"summarization, micro-batched:     {summary_ms:8.1f} ms/request")
+        print(f"batched == per-call: classification {same_labels}, summarization {same_summaries}; "
+              f"LRU eviction by size: {evicted}")
+
+        failures = [name for name, passed in (("batched classification", same_labels),
+                                              ("batched summarization", same_summaries),
+                                              ("LRU eviction", evicted)) if not passed]
+        if failures:
+            sys.exit(f"FAILED: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    main()
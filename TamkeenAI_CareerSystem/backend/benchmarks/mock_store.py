@@ -0,0 +1,163 @@
+"""
+Mock Store Benchmark
+
+Fills the previous MockCollection (a dict scanned on every query) and the
+indexed in-memory document store with activity-like documents and times, at
+each collection size:
+- find_one by user_id;
+- find by user_id, sorted by timestamp, limit 10;
+- a one-day timestamp range ($gte/$lt);
+- session_id $in lookups;
+- $inc/$push updates by user_id.
+The previous collection supports only equality, so ranges are timed as the
+scan they required. Query results are checked against the scan, and a 100k
+document append-only log is replayed to time restarts.
+
+Usage (from the backend directory):
+    python -m benchmarks.mock_store --sizes 10000,100000,1000000
+"""
+
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+
+from api.database.mock_store import MockCollection
+
+
+class LegacyMockCollection:
+    """The previous connector.MockCollection"""
+
+    def __init__(self, name):
+        self.name = name
+        self.data = {}
+        self._id = 0
+
+    def insert_one(self, document):
+        self._id += 1
+        _id = document.get("_id", self._id)
+        document["_id"] = _id
+        self.data[_id] = document
+
+    def find_one(self, query=None):
+        query = query or {}
+        if "_id" in query:
+            return self.data.get(query["_id"])
+        for doc in self.data.values():
+            if all(key in doc and doc[key] == value for key, value in query.items()):
+                return doc
+        return None
+
+    def find(self, query=None):
+        query = query or {}
+        return [doc for doc in self.data.values()
+                if all(key in doc and doc[key] == value for key, value in query.items())]
+
+    def update_one(self, query, update):
+        doc = self.find_one(query)
+        if doc is not None:
+            for key, value in update.get("$set", {}).items():
+                doc[key] = value
+
+
+def make_doc(rng: random.Random, users: int, start: datetime) -> dict:
+    return {
+        "user_id": f"user-{rng.randrange(users)}",
+        "session_id": f"session-{rng.randrange(users * 4)}",
+        "timestamp": (start + timedelta(minutes=rng.randrange(365 * 24 * 60))).isoformat(),
+        "activity_type": rng.choice(["login", "resume_upload", "interview", "job_view", "chat"]),
+        "score": rng.randrange(100),
+        "tags": []
+    }
+
+
+def timed(fn, args_list) -> float:
+    """Median microseconds per call"""
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--legacy-queries", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    start_date = datetime(2024, 1, 1)
+    print(f"{'docs':>9} {'query':<28} {'previous':>12} {'indexed':>12}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        rng = random.Random(args.seed)
+        users = max(100, size // 50)
+        store = MockCollection("user_activities", indexes=["session_id", "timestamp"])
+        legacy = LegacyMockCollection("user_activities")
+        for _ in range(size):
+            doc = make_doc(rng, users, start_date)
+            legacy.insert_one(dict(doc))
+            store.insert_one(doc)
+
+        user_ids = [(f"user-{rng.randrange(users)}",) for _ in range(args.queries)]
+        sessions = [([f"session-{rng.randrange(users * 4)}" for _ in range(5)],) for _ in range(args.queries)]
+        days = [((start_date + timedelta(days=rng.randrange(365))).isoformat(),) for _ in range(args.queries)]
+
+        def day_range(day):
+            return {"timestamp": {"$gte": day, "$lt": (datetime.fromisoformat(day) + timedelta(days=1)).isoformat()}}
+
+        def legacy_range(day):
+            bounds = day_range(day)["timestamp"]
+            return [doc for doc in legacy.data.values() if bounds["$gte"] <= doc["timestamp"] < bounds["$lt"]]
+
+        def legacy_latest(user_id):
+            return sorted(legacy.find({"user_id": user_id}), key=lambda doc: doc["timestamp"], reverse=True)[:10]
+
+        def legacy_sessions(ids):
+            return [doc for doc in legacy.data.values() if doc["session_id"] in ids]
+
+        cases = [
+            ("find_one user_id", lambda u: legacy.find_one({"user_id": u}),
+             lambda u: store.find_one({"user_id": u}), user_ids),
+            ("user_id sort timestamp", legacy_latest,
+             lambda u: list(store.find({"user_id": u}).sort("timestamp", -1).limit(10)), user_ids),
+            ("one-day timestamp range", legacy_range, lambda d: list(store.find(day_range(d))), days),
+            ("session_id $in (5)", legacy_sessions,
+             lambda ids: list(store.find({"session_id": {"$in": ids}})), sessions),
+            ("update_one $inc/$push", lambda u: legacy.update_one({"user_id": u}, {"$set": {"score": 1}}),
+             lambda u: store.update_one({"user_id": u}, {"$inc": {"score": 1}, "$push": {"tags": "seen"}}),
+             user_ids),
+        ]
+        for label, legacy_fn, store_fn, arguments in cases:
+            legacy_us = timed(legacy_fn, arguments[:args.legacy_queries])
+            store_us = timed(store_fn, arguments)
+            print(f"{size:>9} {label:<28} {legacy_us:>10.0f}us {store_us:>10.1f}us")
+
+        same = all(
+            sorted(doc["_id"] for doc in legacy_range(day)) == sorted(doc["_id"] for doc in store.find(day_range(day)))
+            and [doc["_id"] for doc in legacy_latest(user_id)] ==
+            [doc["_id"] for doc in store.find({"user_id": user_id}).sort("timestamp", -1).limit(10)]
+            and sorted(doc["_id"] for doc in legacy_sessions(ids)) ==
+            sorted(doc["_id"] for doc in store.find({"session_id": {"$in": ids}}))
+            for (day,), (user_id,), (ids,) in list(zip(days, user_ids, sessions))[:args.legacy_queries]
+        )
+        print(f"{size:>9} results match the scan: {same}")
+
+    # Restart from the append-only log
+    with tempfile.TemporaryDirectory() as log_dir:
+        rng = random.Random(args.seed)
+        store = MockCollection("user_activities", indexes=["timestamp"], log_dir=log_dir)
+        store.insert_many(make_doc(rng, 2000, start_date) for _ in range(100000))
+        store.close()
+        start = time.perf_counter()
+        reloaded = MockCollection("user_activities", indexes=["timestamp"], log_dir=log_dir)
+        replay_s = time.perf_counter() - start
+        print(f"replayed {len(reloaded.data)} documents from the log in {replay_s:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Model Registry Benchmark
+
+Builds an interview evaluation model package shaped like the one written by
+train_evaluation_models (scaler, XGBoost boosters per score, a random forest
+classifier) and compares per-answer latency:
+- cold: joblib.load of the package on every evaluation (the previous
+  predict_with_models path);
+- warm: predict_with_models through the model registry;
+- batch: ModelRegistry.predict_batch over many answers at once.
+Batch results are checked against per-answer predictions.
+
+Usage (from the backend directory):
+    python -m benchmarks.model_registry --answers 200
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import statistics
+
+import numpy as np
+import pandas as pd
+import joblib
+import xgboost as xgb
+from sklearn.preprocessing import StandardScaler
+from sklearn.ensemble import RandomForestClassifier
+
+from api.models.model_registry import ModelRegistry
+from api.models import model_registry as registry_module
+from api.models.Model_training import predict_with_models
+
+TARGETS = ['technical', 'communication', 'problem_solving', 'cultural_fit', 'overall']
+
+
+def build_package(rng: np.random.Generator, n_features: int, rounds: int) -> dict:
+    """Train a model package on synthetic answers"""
+    feature_columns = [f'feature_{i}' for i in range(n_features)]
+    X = rng.normal(size=(5000, n_features))
+    scaler = StandardScaler().fit(X)
+    X_scaled = scaler.transform(X)
+
+    models = {}
+    for i, target in enumerate(TARGETS):
+        y = 50 + 10 * X[:, i % n_features] + 5 * X[:, (i + 1) % n_features]
+        models[target] = xgb.train({'max_depth': 6, 'eta': 0.1}, xgb.DMatrix(X_scaled, label=y), rounds)
+    labels = np.digitize(X[:, 0] + X[:, 1], [-1, 1])
+    models['classifier'] = RandomForestClassifier(n_estimators=200, random_state=0).fit(X_scaled, labels)
+    models['classifier_type'] = 'sklearn'
+
+    return {'models': models, 'scaler': scaler, 'feature_columns': feature_columns, 'target_columns': TARGETS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--answers", type=int, default=200)
+    parser.add_argument("--features", type=int, default=15)
+    parser.add_argument("--rounds", type=int, default=300, help="Boosting rounds per score model")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    answers = [{f'feature_{i}': float(v) for i, v in enumerate(row)}
+               for row in rng.normal(size=(args.answers, args.features))]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "interview_evaluation_models.pkl")
+        joblib.dump(build_package(rng, args.features, args.rounds), path)
+        registry_module.INTERVIEW_MODELS_FILE = path
+        registry = ModelRegistry()
+        registry_module._registry = registry
+
+        cold, cold_results = [], []
+        for answer in answers[:50]:
+            start = time.perf_counter()
+            package = joblib.load(path)
+            cold_results.append(predict_with_models(pd.DataFrame([answer]), package, verbose=False))
+            cold.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        registry.preload([path], background=False)
+        preload_s = time.perf_counter() - start
+
+        warm, warm_results = [], []
+        for answer in answers:
+            start = time.perf_counter()
+            warm_results.append(registry.predict_batch([answer], path)[0])
+            warm.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batch_results = registry.predict_batch(answers, path)
+        batch_s = time.perf_counter() - start
+
+        same = all(
+            abs(warm[key] - batch[key]) < 1e-6 if key != 'category' else warm[key] == batch[key]
+            for warm, batch in zip(warm_results, batch_results) for key in warm
+        ) and all(
+            abs(float(cold[key][0]) - warm[key]) < 1e-6 if key != 'category' else cold[key][0] == warm[key]
+            for cold, warm in zip(cold_results, warm_results) for key in warm
+        )
+
+        print(f"package: {len(TARGETS)} boosters x {args.rounds} rounds + 200-tree forest, "
+              f"{os.path.getsize(path) / 1e6:.1f} MB")
+        print(f"cold (load per answer):   {statistics.median(cold) * 1000:8.1f} ms/answer")
+        print(f"registry preload:         {preload_s * 1000:8.1f} ms once")
+        print(f"warm (registry):          {statistics.median(warm) * 1000:8.1f} ms/answer")
+        print(f"batch of {len(answers):<5}           {batch_s / len(answers) * 1000:8.2f} ms/answer "
+              f"({batch_s * 1000:.1f} ms total)")
+        print(f"predictions identical: {same}   version: {registry.version(path)[:12]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Report Charts Benchmark
+
+Builds custom PDF reports with several charts each (bar, pie and radar) and
+measures reports per second for:
+- the previous chart path: a pyplot figure per chart, saved to the shared
+  temp/ directory and read back by ReportLab, one chart after another;
+- the chart renderer: object-oriented Agg renders in worker processes while
+  the report is laid out, embedded from memory;
+- the chart renderer again on the same report data (cached PNGs), as when a
+  user downloads a report they generated before.
+Rendered charts are checked to be identical to in-process renders.
+
+Usage (from the backend directory):
+    python -m benchmarks.report_charts --reports 12 --charts 4 --workers 4
+"""
+
+import os
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from reportlab.platypus import Image
+
+from core import report_generator
+from core.report_generator import ReportGenerator
+from core.chart_renderer import ChartRenderer, render_chart
+
+
+class LegacyReportGenerator(ReportGenerator):
+    """ReportGenerator with the previous pyplot/temp-file chart path"""
+
+    def _chart(self, chart_data, chart_type, after=None):
+        plt.figure(figsize=(6, 4))
+        if chart_type == "bar":
+            plt.bar(chart_data["labels"], chart_data["values"], color=chart_data.get("colors", "skyblue"))
+            plt.title(chart_data.get("title", ""))
+            plt.xticks(rotation=45, ha="right")
+            plt.tight_layout()
+        elif chart_type == "pie":
+            plt.pie(chart_data["values"], labels=chart_data["labels"], autopct='%1.1f%%', startangle=90)
+            plt.axis('equal')
+            plt.title(chart_data.get("title", ""))
+        else:
+            categories, values = chart_data["categories"], list(chart_data["values"])
+            angles = [n / float(len(categories)) * 2 * np.pi for n in range(len(categories))]
+            angles += angles[:1]
+            values += values[:1]
+            ax = plt.subplot(111, polar=True)
+            plt.xticks(angles[:-1], categories, color='grey', size=10)
+            ax.set_rlabel_position(0)
+            plt.yticks([20, 40, 60, 80, 100], ["20", "40", "60", "80", "100"], color="grey", size=8)
+            plt.ylim(0, 100)
+            ax.plot(angles, values, linewidth=1, linestyle='solid')
+            ax.fill(angles, values, 'skyblue', alpha=0.4)
+            plt.title(chart_data.get("title", ""), size=15, y=1.1)
+
+        temp_dir = os.path.join(self.report_folder, 'temp')
+        os.makedirs(temp_dir, exist_ok=True)
+        image_path = os.path.join(temp_dir, f"chart_{chart_type}_{len(os.listdir(temp_dir))}.png")
+        plt.savefig(image_path, dpi=100, bbox_inches='tight')
+        plt.close()
+        return Image(image_path, width=400, height=300)
+
+
+def make_report(rng: random.Random, charts: int) -> dict:
+    skills = ["Python", "SQL", "Leadership", "Arabic", "Cloud", "Statistics", "Design", "Sales"]
+    report = {"Summary": "Career readiness overview for the last quarter."}
+    for index in range(charts):
+        chart_type = ("bar", "pie", "radar")[index % 3]
+        labels = rng.sample(skills, 6)
+        values = [rng.randint(10, 100) for _ in labels]
+        if chart_type == "radar":
+            chart = {"categories": labels, "values": values, "title": f"Readiness {index}"}
+        else:
+            chart = {"labels": labels, "values": values, "title": f"Skills {index}"}
+        report[f"Chart {index}"] = {"chart": chart, "chart_type": chart_type}
+        report[f"Notes {index}"] = [f"Improve {label}" for label in labels[:3]]
+    return report
+
+
+def reports_per_second(generator, reports) -> float:
+    start = time.perf_counter()
+    for report in reports:
+        assert generator.generate_custom_report(report, "Benchmark Report")
+    return len(reports) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reports", type=int, default=12)
+    parser.add_argument("--charts", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    reports = [make_report(rng, args.charts) for _ in range(args.reports)]
+    report_folder = tempfile.mkdtemp()
+    try:
+        legacy = LegacyReportGenerator()
+        legacy.report_folder = legacy.user_report_folder = report_folder
+        legacy_rate = reports_per_second(legacy, reports)
+
+        renderer = ChartRenderer(workers=args.workers)
+        report_generator._chart_renderer = renderer
+        # Start the worker processes outside the timed runs
+        for index in range(args.workers):
+            renderer.render(make_report(random.Random(-index), 1)["Chart 0"]["chart"], "bar")
+
+        generator = ReportGenerator()
+        generator.report_folder = generator.user_report_folder = report_folder
+        cold_rate = reports_per_second(generator, reports)
+        warm_rate = reports_per_second(generator, reports)
+
+        print(f"{args.reports} reports x {args.charts} charts, {args.workers} workers, {os.cpu_count()} CPUs")
+        print(f"previous (pyplot, temp files)   {legacy_rate:6.2f} reports/s")
+        print(f"renderer (process pool)         {cold_rate:6.2f} reports/s")
+        print(f"renderer (cached charts)        {warm_rate:6.2f} reports/s")
+        print(f"renderer stats: {renderer.stats}")
+
+        chart = reports[0]["Chart 2"]["chart"]
+        print(f"pool render equals in-process render: {renderer.render(chart, 'radar') == render_chart(chart, 'radar')}")
+        renderer.shutdown()
+    finally:
+        shutil.rmtree(report_folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Resume Store Benchmark
+
+Uploads a workload of resumes (some re-uploads of the same file, some files
+shared between users, e.g. a common template) and compares:
+- the previous storage path: per-user resume_index.json re-read and
+  rewritten on every store, linear duplicate scan, a full pretty-printed JSON
+  copy (with text_content) and a file copy per version;
+- ResumeManager on the SQLite index and content-addressed blob store.
+Reports store, list and get latency and bytes on disk.
+
+Usage (from the backend directory):
+    python -m benchmarks.resume_store --users 20 --versions 100
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import shutil
+import hashlib
+import argparse
+import tempfile
+from datetime import datetime
+
+from core.nlp_resume_manager import ResumeManager
+
+WORDS = ("python sql leadership analytics cloud agile stakeholder dashboard forecasting "
+         "kubernetes reporting budgeting mentoring negotiation research design").split()
+
+
+class LegacyStore:
+    """Storage steps of the previous ResumeManager (extraction excluded)"""
+
+    def __init__(self, storage_dir: str):
+        self.storage_dir = storage_dir
+
+    def _index(self, user_id):
+        index_file = os.path.join(self.storage_dir, user_id, "resume_index.json")
+        if os.path.exists(index_file):
+            with open(index_file, 'r') as f:
+                return json.load(f).get("versions", [])
+        return []
+
+    def store(self, user_id, file_path, text_content, structure):
+        user_dir = os.path.join(self.storage_dir, user_id)
+        os.makedirs(user_dir, exist_ok=True)
+        with open(file_path, 'rb') as f:
+            file_hash = hashlib.sha256(f.read()).hexdigest()
+
+        versions = self._index(user_id)
+        for version in versions:
+            if version.get("file_hash") == file_hash:
+                return None
+
+        version_id = str(uuid.uuid4())
+        storage_filename = f"{version_id}.txt"
+        shutil.copy2(file_path, os.path.join(user_dir, storage_filename))
+        version = {"version_id": version_id, "user_id": user_id, "storage_filename": storage_filename,
+                   "file_hash": file_hash, "version_name": f"Version {len(versions) + 1}",
+                   "created_at": datetime.now().isoformat(), "file_type": "txt",
+                   "text_content": text_content, "structure": structure, "metadata": {}}
+        with open(os.path.join(user_dir, f"{version_id}.json"), 'w') as f:
+            json.dump(version, f, indent=2)
+
+        versions.append({k: version[k] for k in ["version_id", "version_name", "created_at", "file_type",
+                                                 "storage_filename", "file_hash"]})
+        versions.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        with open(os.path.join(user_dir, "resume_index.json"), 'w') as f:
+            json.dump({"user_id": user_id, "last_updated": datetime.now().isoformat(), "versions": versions},
+                      f, indent=2)
+        return version_id
+
+    def list(self, user_id):
+        return self._index(user_id)
+
+    def get(self, user_id, version_id):
+        with open(os.path.join(self.storage_dir, user_id, f"{version_id}.json"), 'r') as f:
+            return json.load(f)
+
+
+def build_workload(users: int, versions: int, rng: random.Random, work_dir: str):
+    """(user_id, file_path) uploads; about 15% re-uploads and 10% shared files"""
+    shared = []
+    for i in range(20):
+        path = os.path.join(work_dir, f"shared_{i}.txt")
+        with open(path, 'w') as f:
+            f.write(" ".join(rng.choice(WORDS) for _ in range(1000)))
+        shared.append(path)
+
+    uploads = []
+    for u in range(users):
+        user_id = f"user-{u}"
+        own = []
+        for v in range(versions):
+            roll = rng.random()
+            if roll < 0.15 and own:
+                uploads.append((user_id, rng.choice(own)))
+            elif roll < 0.25:
+                uploads.append((user_id, rng.choice(shared)))
+            else:
+                path = os.path.join(work_dir, f"{user_id}_{v}.txt")
+                with open(path, 'w') as f:
+                    f.write(" ".join(rng.choice(WORDS) for _ in range(1000)))
+                own.append(path)
+                uploads.append((user_id, path))
+    return uploads
+
+
+def disk_usage(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--versions", type=int, default=100, help="Uploads per user")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        uploads = build_workload(args.users, args.versions, random.Random(args.seed), work_dir)
+        manager = ResumeManager(storage_dir=os.path.join(work_dir, "indexed"),
+                                max_versions=args.versions, auto_backup=False)
+        legacy = LegacyStore(os.path.join(work_dir, "legacy"))
+
+        # Same extraction for both, so only storage is compared
+        start = time.perf_counter()
+        for user_id, path in uploads:
+            text = manager._extract_text(path)
+            legacy.store(user_id, path, text, manager._extract_resume_structure(path, text))
+        legacy_store = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for user_id, path in uploads:
+            manager.store_resume(user_id, path)
+        indexed_store = time.perf_counter() - start
+
+        user_ids = sorted({user_id for user_id, _ in uploads})
+        start = time.perf_counter()
+        legacy_versions = {u: legacy.list(u) for u in user_ids}
+        legacy_list = time.perf_counter() - start
+        start = time.perf_counter()
+        indexed_versions = {u: manager._get_user_resume_versions(u) for u in user_ids}
+        indexed_list = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for u in user_ids:
+            for version in legacy_versions[u]:
+                legacy.get(u, version["version_id"])
+        legacy_get = time.perf_counter() - start
+        start = time.perf_counter()
+        for u in user_ids:
+            for version in indexed_versions[u]:
+                manager.get_resume(u, version["version_id"])
+        indexed_get = time.perf_counter() - start
+
+        count = sum(len(v) for v in indexed_versions.values())
+        same = all(len(legacy_versions[u]) == len(indexed_versions[u]) for u in user_ids)
+        print(f"{len(uploads)} uploads, {count} versions stored (same count: {same})")
+        print(f"store:  previous {legacy_store / len(uploads) * 1000:6.2f} ms/upload   "
+              f"indexed {indexed_store / len(uploads) * 1000:6.2f} ms/upload")
+        print(f"list:   previous {legacy_list / len(user_ids) * 1000:6.2f} ms/user     "
+              f"indexed {indexed_list / len(user_ids) * 1000:6.2f} ms/user")
+        print(f"get:    previous {legacy_get / count * 1000:6.2f} ms/version  "
+              f"indexed {indexed_get / count * 1000:6.2f} ms/version")
+        print(f"disk:   previous {disk_usage(legacy.storage_dir) / 1e6:6.1f} MB         "
+              f"indexed {disk_usage(manager.storage_dir) / 1e6:6.1f} MB")
+        manager.store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Sentiment Batch Benchmark
+
+Scores interview transcripts (dozens of answers, some repeated) with
+SentimentAnalyzer and compares:
+- the previous path: analyze_sentiment per answer with one
+  sentiment_<key>.json cache file per text;
+- analyze_batch: dedup, one cache lookup, batched transformer passes and
+  VADER/TextBlob on a thread pool.
+Cold (empty cache) and warm (all cached) transcripts are timed, and batch
+results are checked against per-answer results.
+
+The analyzer's Hub models are replaced by tiny randomly initialised local
+BERT models (sentiment and 28-label emotion) so the benchmark runs offline.
+
+Usage (from the backend directory):
+    python -m benchmarks.sentiment_batch --transcripts 10 --answers 40
+"""
+
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+
+from transformers import BertConfig, BertForSequenceClassification
+
+from benchmarks.local_pipelines import write_tokenizer
+from core.sentiment_analyzer import SentimentAnalyzer
+
+PHRASES = ("I led the migration of our reporting stack", "um I guess I am not sure",
+           "we delivered the project ahead of schedule", "I was nervous but prepared a clear plan",
+           "honestly the team lacked direction", "I am confident in my python and sql skills",
+           "I don't know", "the result was a measurable improvement for customers",
+           "I think maybe I could have communicated better", "I mentored two junior analysts")
+
+
+class LegacyCacheAnalyzer(SentimentAnalyzer):
+    """SentimentAnalyzer with the previous one-JSON-file-per-text cache"""
+
+    def _check_cache(self, cache_key):
+        cache_file = os.path.join(self.cache_dir, f"sentiment_{cache_key}.json")
+        if os.path.exists(cache_file):
+            with open(cache_file, 'r') as f:
+                cached = json.load(f)
+            if time.time() - cached.get("timestamp", 0) < self.cache_ttl:
+                return cached.get("result")
+        return None
+
+    def _cache_result(self, cache_key, result):
+        with open(os.path.join(self.cache_dir, f"sentiment_{cache_key}.json"), 'w') as f:
+            json.dump({"timestamp": time.time(), "result": result}, f)
+
+
+def attach_models(analyzer: SentimentAnalyzer, model_dir: str, hidden: int) -> None:
+    """Give the analyzer tiny local sentiment and emotion models"""
+    tokenizer = write_tokenizer(model_dir)
+    config = dict(vocab_size=tokenizer.vocab_size, hidden_size=hidden, num_hidden_layers=4,
+                  num_attention_heads=4, intermediate_size=hidden * 4)
+    analyzer.tokenizer = analyzer.emotion_tokenizer = tokenizer
+    analyzer.model = BertForSequenceClassification(BertConfig(num_labels=2, **config)).eval()
+    analyzer.emotion_model = BertForSequenceClassification(BertConfig(num_labels=28, **config)).eval()
+    analyzer.emotion_mapping = {i: name for i, name in enumerate(
+        "admiration amusement anger annoyance approval caring confusion curiosity desire disappointment "
+        "disapproval disgust embarrassment excitement fear gratitude grief joy love nervousness optimism "
+        "pride realization relief remorse sadness surprise neutral".split())}
+    for engine in ("transformers", "emotion_transformer"):
+        if engine not in analyzer.available_engines:
+            analyzer.available_engines.append(engine)
+    analyzer.engine_weights.setdefault("transformers", 0.7)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--transcripts", type=int, default=10)
+    parser.add_argument("--answers", type=int, default=40)
+    parser.add_argument("--hidden", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    transcripts = []
+    for t in range(args.transcripts):
+        answers = []
+        for a in range(args.answers):
+            if rng.random() < 0.2:
+                answers.append("I don't know")
+            else:
+                answers.append(". ".join(rng.sample(PHRASES, rng.randrange(2, 6))) + f" (answer {t}-{a})")
+        transcripts.append(answers)
+
+    with tempfile.TemporaryDirectory() as root:
+        legacy = LegacyCacheAnalyzer(cache_dir=os.path.join(root, "legacy"), domain="interview")
+        batched = SentimentAnalyzer(cache_dir=os.path.join(root, "indexed"), domain="interview")
+        attach_models(legacy, root, args.hidden)
+        attach_models(batched, root, args.hidden)
+        batched.model, batched.emotion_model = legacy.model, legacy.emotion_model
+
+        # analyze_sentiment's lru_cache is bypassed so repeats hit the disk cache
+        analyze_one = SentimentAnalyzer.analyze_sentiment.__wrapped__
+
+        def run_legacy():
+            return [[analyze_one(legacy, answer, True) for answer in answers] for answers in transcripts]
+
+        def run_batched():
+            return [batched.analyze_batch(answers, include_emotions=True) for answers in transcripts]
+
+        timings = {}
+        for label, run in (("legacy", run_legacy), ("batched", run_batched)):
+            start = time.perf_counter()
+            results = run()
+            timings[(label, "cold")] = (time.perf_counter() - start) / len(transcripts) * 1000
+            start = time.perf_counter()
+            run()
+            timings[(label, "warm")] = (time.perf_counter() - start) / len(transcripts) * 1000
+            timings[label] = results
+
+        same = all(
+            a["sentiment"] == b["sentiment"] and abs(a["compound"] - b["compound"]) < 1e-4
+            and a["emotions"]["primary"].keys() == b["emotions"]["primary"].keys()
+            for la, lb in zip(timings["legacy"], timings["batched"]) for a, b in zip(la, lb)
+        )
+
+        print(f"{len(transcripts)} transcripts x {args.answers} answers, engines: "
+              f"{', '.join(batched.available_engines)}")
+        print(f"cold transcript:  per-answer {timings[('legacy', 'cold')]:8.1f} ms   "
+              f"analyze_batch {timings[('batched', 'cold')]:8.1f} ms")
+        print(f"warm transcript:  per-answer {timings[('legacy', 'warm')]:8.1f} ms   "
+              f"analyze_batch {timings[('batched', 'warm')]:8.1f} ms")
+        print(f"cache files: {len(os.listdir(os.path.join(root, 'legacy')))} JSON files vs "
+              f"{len(os.listdir(os.path.join(root, 'indexed')))} SQLite files;  results match: {same}")
+
+
+if __name__ == "__main__":
+    main()
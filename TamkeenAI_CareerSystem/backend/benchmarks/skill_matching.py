@@ -0,0 +1,99 @@
+"""
+Skill Matching Benchmark
+
+Compares the compiled skill matcher against the previous per-skill regex loop
+on a synthetic skills taxonomy and a batch of synthetic resumes.
+
+Usage:
+    python -m backend.benchmarks.skill_matching --resumes 10000 --skills 3000
+"""
+
+import re
+import time
+import random
+import argparse
+from typing import List
+
+from backend.utils.preprocess import clean_text
+from backend.utils.skill_matcher import SkillMatcher
+
+BASE_SKILLS = [
+    "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "sql",
+    "machine learning", "deep learning", "data analysis", "project management",
+    "react", "node.js", "docker", "kubernetes", "amazon web services", "azure",
+    "natural language processing", "computer vision", "public speaking", "excel"
+]
+
+FILLER_WORDS = [
+    "team", "delivered", "built", "led", "improved", "customer", "platform", "reports",
+    "years", "experience", "responsible", "designed", "stakeholders", "quality",
+    "process", "analysis", "performance", "system", "managed", "developed"
+]
+
+
+def build_skills(count: int, rng: random.Random) -> List[str]:
+    """Generate a taxonomy of single and multi-word skills"""
+    skills = list(BASE_SKILLS)
+    while len(skills) < count:
+        words = rng.sample(FILLER_WORDS, rng.choice([1, 2, 3]))
+        skills.append(" ".join(words) + f" {len(skills)}")
+    return skills[:count]
+
+
+def build_resumes(count: int, skills: List[str], rng: random.Random) -> List[str]:
+    """Generate resumes of ~400 words mentioning a handful of skills"""
+    resumes = []
+    for _ in range(count):
+        words = [rng.choice(FILLER_WORDS) for _ in range(400)]
+        for skill in rng.sample(skills, 12):
+            words.insert(rng.randrange(len(words)), skill)
+        resumes.append(" ".join(words))
+    return resumes
+
+
+def regex_loop(skills: List[str], text: str) -> List[str]:
+    """Previous implementation: one regex search per skill"""
+    found = []
+    for skill in skills:
+        skill_pattern = r'\b' + re.escape(skill.lower()) + r'\b'
+        if re.search(skill_pattern, text):
+            found.append(skill)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=10000)
+    parser.add_argument("--skills", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    skills = build_skills(args.skills, rng)
+    resumes = [clean_text(resume) for resume in build_resumes(args.resumes, skills, rng)]
+
+    start = time.perf_counter()
+    matcher = SkillMatcher(skills)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for resume in resumes:
+        matcher.find_all(resume)
+    matcher_time = time.perf_counter() - start
+
+    # The regex loop is slow enough that a sample is timed and extrapolated
+    sample = resumes[:max(1, min(len(resumes), 100))]
+    start = time.perf_counter()
+    for resume in sample:
+        regex_loop(skills, resume)
+    regex_time = (time.perf_counter() - start) * len(resumes) / len(sample)
+
+    print(f"skills={len(skills)} resumes={len(resumes)}")
+    print(f"matcher build:      {build_time * 1000:.1f} ms")
+    print(f"matcher scan:       {matcher_time:.2f} s ({len(resumes) / matcher_time:.0f} resumes/s)")
+    print(f"regex loop (est.):  {regex_time:.2f} s ({len(resumes) / regex_time:.0f} resumes/s)")
+    print(f"speedup:            {regex_time / matcher_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
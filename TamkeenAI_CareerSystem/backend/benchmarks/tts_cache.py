@@ -0,0 +1,243 @@
+"""
+TTS Cache Benchmark
+
+Runs TTSModule with a stand-in engine that returns WAV audio after a delay
+proportional to the text length, as a cloud TTS call would, and compares:
+- synthesizing interview prompts built from a shared bank of sentences
+  whole vs sentence by sentence, reusing cached fragments;
+- serving a cached clip: the previous exists check and read vs the index;
+- sending a cached clip to a socket: read and sendall vs sendfile;
+- cleaning a full cache: stat every file and sort vs the LRU index.
+Stitched prompts are checked to match whole-text synthesis.
+
+Usage (from the backend directory):
+    python -m benchmarks.tts_cache --prompts 200 --files 20000
+"""
+
+import os
+import io
+import time
+import wave
+import random
+import socket
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+import statistics
+
+from core.tts_engine import TTSModule
+from core.tts_cache import split_sentences
+
+SAMPLE_RATE = 16000
+
+OPENINGS = [
+    "Welcome back to your practice interview.",
+    "Let's move on to the next question.",
+    "Thank you, that was a clear answer.",
+    "Take a moment to think before you answer.",
+]
+QUESTIONS = [
+    f"Tell me about a time you {verb} {thing}."
+    for verb in ("led", "rescued", "simplified", "planned", "rebuilt")
+    for thing in ("a project", "a team", "a release", "a customer account", "a data pipeline", "a process")
+]
+CLOSINGS = [
+    "You have two minutes.",
+    "Please be specific about your own role.",
+    "Mention the outcome and what you learned.",
+]
+
+
+class BenchmarkTTS(TTSModule):
+    """TTSModule with a deterministic engine that costs time per character"""
+
+    def __init__(self, cache_dir: str, delay_per_char: float, **kwargs):
+        super().__init__(engine="auto", cache_dir=cache_dir, **kwargs)
+        self.engine = "benchmark"
+        self.initialized = True
+        self.delay_per_char = delay_per_char
+        self.calls = 0
+
+    def _synthesize(self, text, ssml=False):
+        self.calls += 1
+        time.sleep(self.delay_per_char * len(text))
+        # Same samples for a sentence alone or inside a longer text
+        frames = b"".join(self._sentence_frames(sentence) for sentence in split_sentences(text))
+        output = io.BytesIO()
+        with wave.open(output, 'wb') as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(SAMPLE_RATE)
+            writer.writeframes(frames)
+        return output.getvalue()
+
+    @staticmethod
+    def _sentence_frames(sentence):
+        seed = hashlib.sha256(sentence.encode()).digest()
+        # About 60 ms of audio per character
+        return (seed * (len(sentence) * SAMPLE_RATE * 2 * 60 // 1000 // len(seed) + 1))
+
+
+def make_prompts(rng: random.Random, count: int):
+    return [" ".join([rng.choice(OPENINGS), rng.choice(QUESTIONS), rng.choice(CLOSINGS)])
+            for _ in range(count)]
+
+
+def legacy_cleanup(cache_dir: str, max_size_mb: int, max_age_days: int):
+    """The previous cleanup_cache: stat every file, then sort by modification time"""
+    now = time.time()
+    max_age_seconds = max_age_days * 24 * 60 * 60
+    max_size_bytes = max_size_mb * 1024 * 1024
+    files = []
+    for filename in os.listdir(cache_dir):
+        file_path = os.path.join(cache_dir, filename)
+        if os.path.isfile(file_path):
+            stat = os.stat(file_path)
+            files.append((file_path, stat.st_mtime, stat.st_size))
+    files.sort(key=lambda x: x[1])
+    total_size = sum(f[2] for f in files)
+    for file_path, mtime, _ in files:
+        if now - mtime > max_age_seconds or total_size > max_size_bytes:
+            total_size -= os.path.getsize(file_path)
+            os.remove(file_path)
+
+
+def median_us(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def socket_throughput(send, size: int, repeat: int) -> float:
+    """MB/s of send(sock) into a socket drained by another thread"""
+    rates = []
+    for _ in range(repeat):
+        left, right = socket.socketpair()
+
+        def drain():
+            received = 0
+            while received < size:
+                chunk = right.recv(1 << 20)
+                if not chunk:
+                    break
+                received += len(chunk)
+
+        reader = threading.Thread(target=drain)
+        reader.start()
+        start = time.perf_counter()
+        send(left)
+        reader.join()
+        rates.append(size / (time.perf_counter() - start) / 1e6)
+        left.close()
+        right.close()
+    return statistics.median(rates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--prompts", type=int, default=200)
+    parser.add_argument("--files", type=int, default=20000, help="Files in the cleanup test")
+    parser.add_argument("--delay-us", type=float, default=300, help="Engine time per character")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    prompts = make_prompts(rng, args.prompts)
+    delay = args.delay_us / 1e6
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Synthesis of distinct prompts sharing sentences
+        whole = BenchmarkTTS(os.path.join(temp_dir, "whole"), delay, sentence_cache=False)
+        start = time.perf_counter()
+        whole_audio = [whole.text_to_speech(prompt) for prompt in prompts]
+        whole_s = time.perf_counter() - start
+
+        fragments = BenchmarkTTS(os.path.join(temp_dir, "fragments"), delay)
+        start = time.perf_counter()
+        fragment_audio = [fragments.text_to_speech(prompt) for prompt in prompts]
+        fragments_s = time.perf_counter() - start
+
+        distinct = len(set(prompts))
+        print(f"{args.prompts} prompts ({distinct} distinct), {args.delay_us:.0f} us engine time per character")
+        print(f"whole texts      {whole_s:7.2f} s   engine calls {whole.calls}")
+        print(f"sentence cache   {fragments_s:7.2f} s   engine calls {fragments.calls}")
+        print(f"stitched audio equals whole-text audio: {fragment_audio == whole_audio}")
+
+        # Serving a cached clip
+        prompt = prompts[0]
+        key = fragments._text_cache_key(prompt, False)
+        cached_path = fragments.cache.path(key)
+        output_path = os.path.join(temp_dir, "out.wav")
+
+        # The previous path also hashed the request into a key on every call
+        def legacy_hit():
+            cached_path = os.path.join(fragments.cache_dir, f"{fragments._text_cache_key(prompt, False)}.mp3")
+            if os.path.exists(cached_path):
+                with open(cached_path, 'rb') as f:
+                    return f.read()
+
+        def legacy_copy():
+            cached_path = os.path.join(fragments.cache_dir, f"{fragments._text_cache_key(prompt, False)}.mp3")
+            if os.path.exists(cached_path):
+                with open(cached_path, 'rb') as src_file:
+                    with open(output_path, 'wb') as dst_file:
+                        dst_file.write(src_file.read())
+
+        print(f"cached clip {os.path.getsize(cached_path) / 1024:.0f} KiB")
+        print(f"bytes hit     previous {median_us(legacy_hit, 500):8.1f} us   "
+              f"index {median_us(lambda: fragments.text_to_speech(prompt), 500):8.1f} us")
+        print(f"file output   previous {median_us(legacy_copy, 500):8.1f} us   "
+              f"sendfile {median_us(lambda: fragments.text_to_speech(prompt, output_path), 500):8.1f} us")
+
+        # Streaming a long clip to a client
+        long_text = " ".join(OPENINGS + QUESTIONS + CLOSINGS) * 4
+        fragments.cache.put("long", fragments._synthesize(long_text))
+        long_path = fragments.cache.path("long")
+        long_size = os.path.getsize(long_path)
+
+        def legacy_send(sock):
+            with open(long_path, 'rb') as f:
+                sock.sendall(f.read())
+
+        print(f"socket, {long_size / 1e6:.1f} MB clip   previous {socket_throughput(legacy_send, long_size, 20):8.0f} MB/s   "
+              f"sendfile {socket_throughput(lambda sock: fragments.cache.send('long', sock), long_size, 20):8.0f} MB/s")
+
+        # Cleanup of a full cache
+        for name in ("legacy", "indexed"):
+            cache_dir = os.path.join(temp_dir, name)
+            os.makedirs(cache_dir)
+            for index in range(args.files):
+                with open(os.path.join(cache_dir, f"{index:032x}.mp3"), 'wb') as f:
+                    f.write(b"\0" * 4096)
+
+        start = time.perf_counter()
+        legacy_cleanup(os.path.join(temp_dir, "legacy"), max_size_mb=60, max_age_days=30)
+        legacy_ms = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        indexed = BenchmarkTTS(os.path.join(temp_dir, "indexed"), delay, cache_max_mb=1000)
+        open_ms = (time.perf_counter() - start) * 1e3
+        start = time.perf_counter()
+        indexed.cleanup_cache(max_size_mb=60, max_age_days=30)
+        indexed_ms = (time.perf_counter() - start) * 1e3
+        # Nothing left to remove: the steady-state cost of a periodic cleanup
+        start = time.perf_counter()
+        indexed.cleanup_cache(max_size_mb=60, max_age_days=30)
+        again_ms = (time.perf_counter() - start) * 1e3
+
+        remaining = len(os.listdir(os.path.join(temp_dir, "indexed")))
+        print(f"cleanup of {args.files} files to 60 MB   previous {legacy_ms:8.1f} ms   "
+              f"index {indexed_ms:8.1f} ms (open {open_ms:.1f} ms, repeat {again_ms:.3f} ms)")
+        print(f"files left: previous {len(os.listdir(os.path.join(temp_dir, 'legacy')))}, "
+              f"index {remaining} ({indexed.cache.total_bytes / 1024 / 1024:.1f} MB indexed)")
+
+
+if __name__ == "__main__":
+    # The stand-in engine replaces the missing ones; keep their warning out of the results
+    logging.getLogger("core.tts_engine").disabled = True
+    main()
@@ -0,0 +1,131 @@
+"""
+Voice Feature Extraction Benchmark
+
+Measures voice analysis time per minute of interview audio for:
+- the previous feature extraction, where every librosa feature recomputed
+  its own STFT/mel spectrogram (and the combined method ran it twice);
+- the shared-spectrogram pipeline, serially and with the segment process pool.
+
+Audio is synthetic: a voiced signal with a drifting pitch, harmonics,
+syllable-like amplitude envelope and background noise, split into segments.
+
+Usage:
+    python -m backend.benchmarks.voice_features --minutes 3 --segment-seconds 10
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import librosa
+import soundfile as sf
+
+from backend.core import voice_emotion
+from backend.core.voice_emotion import VoiceEmotionAnalyzer
+
+SAMPLE_RATE = 22050
+
+
+def synthesize_speech(seconds: float, rng: np.random.Generator) -> np.ndarray:
+    """Generate a speech-like test signal"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.3 * t + rng.uniform(0, np.pi))
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 2
+    signal = 0.3 * envelope * voiced + 0.01 * rng.standard_normal(t.shape)
+    return signal.astype(np.float32)
+
+
+def legacy_acoustic_features(y: np.ndarray, sr: int):
+    """Previous acoustic feature calls, each computing its own spectrogram"""
+    pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
+    rms = librosa.feature.rms(y=y)[0]
+    onsets = librosa.onset.onset_detect(y=y, sr=sr)
+    bandwidth = np.mean(librosa.feature.spectral_bandwidth(y=y, sr=sr))
+    contrast = np.mean(librosa.feature.spectral_contrast(y=y, sr=sr))
+    mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+    return pitches, rms, onsets, bandwidth, contrast, mfccs
+
+
+def legacy_ml_features(y: np.ndarray, sr: int):
+    """Previous ML feature calls"""
+    mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+    chroma = librosa.feature.chroma_stft(y=y, sr=sr)
+    contrast = librosa.feature.spectral_contrast(y=y, sr=sr)
+    return mfccs, chroma, contrast
+
+
+def legacy_analysis(paths, method: str):
+    """Previous per-segment work: acoustic once, or twice plus ML features when combined"""
+    for path in paths:
+        y, sr = librosa.load(path, sr=None)
+        legacy_acoustic_features(y, sr)
+        if method == "combined":
+            legacy_ml_features(y, sr)
+            legacy_acoustic_features(y, sr)
+
+
+def make_analyzer(method: str) -> VoiceEmotionAnalyzer:
+    """Create an analyzer for the method, without speech recognition"""
+    analyzer = VoiceEmotionAnalyzer(analysis_method="acoustic")
+    analyzer.recognizer = None
+    if method == "combined":
+        # The ML branch only needs a model to be present; its scores are placeholders
+        analyzer.analysis_method = "combined"
+        analyzer.model = object()
+    return analyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=3)
+    parser.add_argument("--segment-seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    voice_emotion.SEGMENT_WORKERS = args.workers
+
+    rng = np.random.default_rng(7)
+    segments = int(args.minutes * 60 / args.segment_seconds)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i in range(segments):
+            path = os.path.join(tmp_dir, f"segment-{i}.wav")
+            sf.write(path, synthesize_speech(args.segment_seconds, rng), SAMPLE_RATE)
+            paths.append(path)
+
+        # Warm up librosa's compiled kernels
+        legacy_analysis(paths[:1], "acoustic")
+        make_analyzer("acoustic").analyze_interview_audio(paths[:1], max_workers=1)
+
+        print(f"audio={args.minutes:.1f} min segments={segments} cpus={os.cpu_count()}")
+
+        for method in ["acoustic", "combined"]:
+            analyzer = make_analyzer(method)
+
+            start = time.perf_counter()
+            legacy_analysis(paths, method)
+            legacy_time = (time.perf_counter() - start) / args.minutes
+
+            start = time.perf_counter()
+            analyzer.analyze_interview_audio(paths, max_workers=1)
+            shared_time = (time.perf_counter() - start) / args.minutes
+
+            print(f"{method}:")
+            print(f"  previous features:         {legacy_time:6.2f} s per audio minute")
+            print(f"  shared spectrogram:        {shared_time:6.2f} s per audio minute  ({legacy_time / shared_time:.1f}x)")
+
+            if args.workers > 1 and method == "acoustic":
+                # The first call starts the worker pool; time a warm pool
+                analyzer.analyze_interview_audio(paths[:args.workers], max_workers=args.workers)
+                start = time.perf_counter()
+                analyzer.analyze_interview_audio(paths, max_workers=args.workers)
+                pool_time = (time.perf_counter() - start) / args.minutes
+                print(f"  shared + {args.workers} processes:     {pool_time:6.2f} s per audio minute  ({legacy_time / pool_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
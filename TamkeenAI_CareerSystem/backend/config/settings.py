@@ -58,7 +58,17 @@ PASSWORD_REQUIRE_SPECIAL = True
 DB_TYPE = os.environ.get("TAMKEEN_DB_TYPE", "sqlite")
 DB_CONFIG = {
     "sqlite": {
-        "db_file": os.environ.get("TAMKEEN_SQLITE_FILE", os.path.join(DATA_DIR, "tamkeen.db"))
+        "db_file": os.environ.get("TAMKEEN_SQLITE_FILE", os.path.join(DATA_DIR, "tamkeen.db")),
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -20000,  # Negative values are KiB, i.e. ~20 MB per connection
+            "busy_timeout": 5000,
+            "temp_store": "MEMORY",
+            "foreign_keys": "ON"
+        },
+        "batch_size": int(os.environ.get("TAMKEEN_SQLITE_BATCH_SIZE", 500)),
+        "flush_interval": float(os.environ.get("TAMKEEN_SQLITE_FLUSH_INTERVAL", 0.5))
     },
     "mysql": {
         "host": os.environ.get("TAMKEEN_MYSQL_HOST", "localhost"),
@@ -80,6 +90,13 @@ DB_CONFIG = {
     }
 }
 
+# Cache settings
+CACHE_CONFIG = {
+    "memory_max_entries": int(os.environ.get("TAMKEEN_CACHE_MEMORY_MAX_ENTRIES", 10000)),
+    "memory_max_ttl": int(os.environ.get("TAMKEEN_CACHE_MEMORY_MAX_TTL", 300)),
+    "purge_interval": int(os.environ.get("TAMKEEN_CACHE_PURGE_INTERVAL", 600))
+}
+
 # External APIs
 EXTERNAL_APIS = {
     "job_market": {
@@ -118,7 +135,27 @@ EMAIL_CONFIG = {
     "password": os.environ.get("TAMKEEN_EMAIL_PASSWORD", ""),
     "use_tls": os.environ.get("TAMKEEN_EMAIL_TLS", "1") == "1",
     "from_email": os.environ.get("TAMKEEN_EMAIL_FROM", "noreply@tamkeen.ai"),
-    "from_name": os.environ.get("TAMKEEN_EMAIL_FROM_NAME", "Tamkeen AI")
+    "from_name": os.environ.get("TAMKEEN_EMAIL_FROM_NAME", "Tamkeen AI"),
+    "use_ssl": os.environ.get("TAMKEEN_EMAIL_SSL", "0") == "1",
+    "template_dir": os.environ.get("TAMKEEN_EMAIL_TEMPLATE_DIR", os.path.join(DATA_DIR, "email_templates")),
+    # Queue mail in a persistent outbox and deliver it from a background sender
+    "use_outbox": os.environ.get("TAMKEEN_EMAIL_OUTBOX", "1") == "1",
+    "outbox_file": os.environ.get("TAMKEEN_EMAIL_OUTBOX_FILE", os.path.join(DATA_DIR, "email_outbox.db")),
+    "outbox_batch_size": int(os.environ.get("TAMKEEN_EMAIL_BATCH_SIZE", 50)),
+    "outbox_rate_limit": float(os.environ.get("TAMKEEN_EMAIL_RATE_LIMIT", 10)),  # Messages per second
+    "outbox_max_attempts": int(os.environ.get("TAMKEEN_EMAIL_MAX_ATTEMPTS", 5)),
+    "outbox_retry_backoff": float(os.environ.get("TAMKEEN_EMAIL_RETRY_BACKOFF", 30)),
+    "smtp_idle_timeout": float(os.environ.get("TAMKEEN_EMAIL_IDLE_TIMEOUT", 60))
+}
+
+# Reports
+REPORT_FOLDER = os.environ.get("TAMKEEN_REPORT_FOLDER", os.path.join(DATA_DIR, "reports"))
+REPORT_CONFIG = {
+    # Chart rendering processes (0 renders in the request thread)
+    "chart_workers": int(os.environ.get("TAMKEEN_CHART_WORKERS", min(4, os.cpu_count() or 1))),
+    "chart_cache_mb": int(os.environ.get("TAMKEEN_CHART_CACHE_MB", 64)),
+    # Optional directory sharing rendered charts between processes and restarts
+    "chart_cache_dir": os.environ.get("TAMKEEN_CHART_CACHE_DIR", "")
 }
 
 # Model paths
@@ -129,6 +166,9 @@ MODEL_PATHS = {
     "data": os.path.join(DATA_DIR, "reference")
 }
 
+# Skills taxonomy used for skill extraction
+SKILLS_FILE = os.environ.get("TAMKEEN_SKILLS_FILE", os.path.join(MODEL_PATHS["data"], "skills.json"))
+
 # Resume parser configuration
 PARSER_CONFIG = {
     "use_spacy": True,
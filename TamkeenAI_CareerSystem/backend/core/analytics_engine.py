@@ -15,6 +15,8 @@ import uuid
 # Import settings
 from config.settings import BASE_DIR
 
+from .analytics_store import get_analytics_store
+
 # Try importing data analysis libraries
 try:
     import pandas as pd
@@ -42,6 +44,9 @@ class AnalyticsTracker:
         # Create subdirectories for different analytics
         for subdir in ['user_events', 'system_events', 'user_trends', 'usage_reports']:
             os.makedirs(os.path.join(self.analytics_dir, subdir), exist_ok=True)
+        
+        # Event storage: daily segments, compacted in the background once closed
+        self.store = get_analytics_store(self.analytics_dir)
     
     def track_event(self, event_type: str, event_data: Dict[str, Any]) -> bool:
         """
@@ -64,24 +69,8 @@ class AnalyticsTracker:
         if self.user_id:
             event["user_id"] = self.user_id
         
-        # Determine directory based on event type
-        if event_type.startswith("user_"):
-            subdir = "user_events"
-        else:
-            subdir = "system_events"
-        
-        # Create the event file
-        date_str = datetime.now().strftime("%Y%m%d")
-        filename = f"{date_str}_{event_type}.jsonl"
-        filepath = os.path.join(self.analytics_dir, subdir, filename)
-        
-        try:
-            with open(filepath, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(event) + '\n')
-            return True
-        except IOError as e:
-            print(f"Error tracking event: {e}")
-            return False
+        # Appended to the day's user_events or system_events segment
+        return self.store.append(event)
     
     def get_user_activity(self, days: int = 30) -> Dict[str, Any]:
         """
@@ -108,52 +97,14 @@ class AnalyticsTracker:
             "last_activity": None
         }
         
-        # Look through user events directory
-        events_dir = os.path.join(self.analytics_dir, 'user_events')
+        # Only this user's slice of each compacted day is read
         cutoff_date = datetime.now() - timedelta(days=days)
+        user_events = self.store.user_activity(self.user_id, cutoff_date)
         
-        all_events = []
-        try:
-            for filename in os.listdir(events_dir):
-                if not filename.endswith('.jsonl'):
-                    continue
-                
-                file_date_str = filename.split('_')[0]
-                try:
-                    file_date = datetime.strptime(file_date_str, "%Y%m%d")
-                    if file_date < cutoff_date:
-                        continue
-                except ValueError:
-                    continue
-                
-                # Read events from file
-                with open(os.path.join(events_dir, filename), 'r', encoding='utf-8') as f:
-                    for line in f:
-                        try:
-                            event = json.loads(line.strip())
-                            if event.get("user_id") == self.user_id:
-                                all_events.append(event)
-                        except json.JSONDecodeError:
-                            continue
-        except (FileNotFoundError, OSError) as e:
-            print(f"Error reading user events: {e}")
-        
-        # Process events
-        if all_events:
-            activity["total_events"] = len(all_events)
-            
-            # Count events by type
-            for event in all_events:
-                event_type = event.get("event_type", "unknown")
-                activity["event_counts"][event_type] = activity["event_counts"].get(event_type, 0) + 1
-            
-            # Activity by day
-            for event in all_events:
-                try:
-                    event_date = datetime.fromisoformat(event.get("timestamp", "")).strftime("%Y-%m-%d")
-                    activity["usage_by_day"][event_date] = activity["usage_by_day"].get(event_date, 0) + 1
-                except (ValueError, TypeError):
-                    continue
+        if user_events["total_events"]:
+            activity["total_events"] = user_events["total_events"]
+            activity["event_counts"] = user_events["event_counts"]
+            activity["usage_by_day"] = user_events["usage_by_day"]
             
             # Most used features
             activity["most_used_features"] = sorted(
@@ -163,9 +114,7 @@ class AnalyticsTracker:
             )[:5]
             
             # Last activity timestamp
-            timestamps = [event.get("timestamp") for event in all_events if "timestamp" in event]
-            if timestamps:
-                activity["last_activity"] = max(timestamps, key=lambda x: x)
+            activity["last_activity"] = user_events["last_activity"]
         
         return activity
     
@@ -195,57 +144,15 @@ class AnalyticsTracker:
             }
         }
         
-        # Go through both user and system event directories
-        all_events = []
-        unique_users = set()
+        # Compacted days are answered from their daily rollups
+        cutoff_date = datetime.now() - timedelta(days=days)
+        events = self.store.system_usage(cutoff_date)
         
-        for subdir in ['user_events', 'system_events']:
-            events_dir = os.path.join(self.analytics_dir, subdir)
-            cutoff_date = datetime.now() - timedelta(days=days)
-            
-            try:
-                for filename in os.listdir(events_dir):
-                    if not filename.endswith('.jsonl'):
-                        continue
-                    
-                    file_date_str = filename.split('_')[0]
-                    try:
-                        file_date = datetime.strptime(file_date_str, "%Y%m%d")
-                        if file_date < cutoff_date:
-                            continue
-                    except ValueError:
-                        continue
-                    
-                    # Read events from file
-                    with open(os.path.join(events_dir, filename), 'r', encoding='utf-8') as f:
-                        for line in f:
-                            try:
-                                event = json.loads(line.strip())
-                                all_events.append(event)
-                                if "user_id" in event:
-                                    unique_users.add(event["user_id"])
-                            except json.JSONDecodeError:
-                                continue
-            except (FileNotFoundError, OSError) as e:
-                print(f"Error reading events from {subdir}: {e}")
-        
-        # Process events
-        if all_events:
-            usage["total_events"] = len(all_events)
-            usage["unique_users"] = len(unique_users)
-            
-            # Events by type
-            for event in all_events:
-                event_type = event.get("event_type", "unknown")
-                usage["events_by_type"][event_type] = usage["events_by_type"].get(event_type, 0) + 1
-            
-            # Events by day
-            for event in all_events:
-                try:
-                    event_date = datetime.fromisoformat(event.get("timestamp", "")).strftime("%Y-%m-%d")
-                    usage["events_by_day"][event_date] = usage["events_by_day"].get(event_date, 0) + 1
-                except (ValueError, TypeError):
-                    continue
+        if events["total_events"]:
+            usage["total_events"] = events["total_events"]
+            usage["unique_users"] = events["unique_users"]
+            usage["events_by_type"] = events["events_by_type"]
+            usage["events_by_day"] = events["events_by_day"]
             
             # Popular features (only count user events for features)
             user_features = {k: v for k, v in usage["events_by_type"].items() if k.startswith("user_")}
@@ -256,40 +163,10 @@ class AnalyticsTracker:
             )[:10]
             
             # User retention
-            now = datetime.now()
-            last_day = now - timedelta(days=1)
-            last_week = now - timedelta(days=7)
-            last_month = now - timedelta(days=30)
-            
-            active_users = {
-                "1_day": set(),
-                "7_days": set(),
-                "30_days": set()
-            }
-            
-            for event in all_events:
-                if "user_id" not in event or "timestamp" not in event:
-                    continue
-                
-                try:
-                    event_time = datetime.fromisoformat(event["timestamp"])
-                    user_id = event["user_id"]
-                    
-                    if event_time >= last_day:
-                        active_users["1_day"].add(user_id)
-                    
-                    if event_time >= last_week:
-                        active_users["7_days"].add(user_id)
-                    
-                    if event_time >= last_month:
-                        active_users["30_days"].add(user_id)
-                except (ValueError, TypeError):
-                    continue
-            
             usage["user_retention"] = {
-                "active_1_day": len(active_users["1_day"]),
-                "active_7_days": len(active_users["7_days"]),
-                "active_30_days": len(active_users["30_days"])
+                "active_1_day": events["active_users"]["1_day"],
+                "active_7_days": events["active_users"]["7_days"],
+                "active_30_days": events["active_users"]["30_days"]
             }
         
         return usage
@@ -0,0 +1,520 @@
+"""
+Analytics Event Store
+
+Storage engine behind AnalyticsTracker. Events are appended to cheap daily
+JSONL segments (user_events/ and system_events/, one file per day and event
+type). Once a day is closed, a background compactor rewrites it into a
+columnar segment:
+
+    segments/YYYYMMDD/
+        users.npy       sorted user IDs ("" for events without a user)
+        offsets.npy     per-user offset index into the event columns
+        timestamps.npy  event times, grouped by user
+        types.npy       event type codes, grouped by user
+        user_last.npy   last event time per user (daily rollup)
+        rollup.json     event types, total and counts by type (daily rollup)
+
+and moves the day's JSONL files to archive/YYYYMMDD/. Per-user queries
+binary-search the user in each segment of the window and read only that
+user's slice; system-wide queries read only the rollups. Days that are not
+compacted yet (normally just today) are read from their JSONL files.
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Set
+
+# Try importing numpy for the columnar segments
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logging.warning("numpy not installed. Analytics events will not be compacted. Install with: pip install numpy")
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+EVENT_SUBDIRS = ['user_events', 'system_events']
+DATE_FORMAT = "%Y%m%d"
+
+# Seconds between compaction passes of the background compactor
+COMPACT_INTERVAL = int(os.environ.get("ANALYTICS_COMPACT_INTERVAL", "3600"))
+# A day is closed this long after midnight (late appends for it may still land)
+COMPACT_GRACE = timedelta(minutes=5)
+# Compacted segments kept open (memory-mapped) per store
+SEGMENT_CACHE_SIZE = 400
+
+RETENTION_WINDOWS = {"1_day": 1, "7_days": 7, "30_days": 30}
+
+
+def _window_start(cutoff: datetime) -> datetime:
+    """First day whose segment falls in a window starting at cutoff"""
+    start = datetime(cutoff.year, cutoff.month, cutoff.day)
+    return start if start >= cutoff else start + timedelta(days=1)
+
+
+class DaySegment:
+    """Columnar events and rollups of one compacted day"""
+
+    def __init__(self, path: str, day: str):
+        """
+        Open a compacted segment
+
+        Args:
+            path: Segment directory
+            day: Day in YYYYMMDD format
+        """
+        self.day = datetime.strptime(day, DATE_FORMAT).strftime("%Y-%m-%d")
+
+        with open(os.path.join(path, 'rollup.json'), 'r', encoding='utf-8') as f:
+            rollup = json.load(f)
+
+        self.event_types = rollup['event_types']
+        self.by_type = rollup['by_type']
+        self.total_events = rollup['total_events']
+        self.user_type_codes = np.array([t.startswith('user_') for t in self.event_types], dtype=bool)
+
+        # Memory-map the columns so queries only page in what they touch (empty files cannot be mapped)
+        mmap_mode = 'r' if self.total_events else None
+        self.users = np.load(os.path.join(path, 'users.npy'), mmap_mode=mmap_mode)
+        self.offsets = np.load(os.path.join(path, 'offsets.npy'), mmap_mode=mmap_mode)
+        self.timestamps = np.load(os.path.join(path, 'timestamps.npy'), mmap_mode=mmap_mode)
+        self.types = np.load(os.path.join(path, 'types.npy'), mmap_mode=mmap_mode)
+        self.user_last = np.load(os.path.join(path, 'user_last.npy'), mmap_mode=mmap_mode)
+
+    def user_events(self, user_id: str):
+        """
+        Get one user's events
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Tuple of (timestamps, type codes) arrays, or None if the user has no events
+        """
+        i = int(np.searchsorted(self.users, user_id))
+        if i >= len(self.users) or self.users[i] != user_id:
+            return None
+
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self.timestamps[start:end], self.types[start:end]
+
+    def active_users(self, since: datetime):
+        """Users with an event at or after since (array, may include "")"""
+        return self.users[self.user_last >= np.datetime64(since, 'us')]
+
+
+class AnalyticsStore:
+    """Daily JSONL segments compacted into columnar segments with rollups"""
+
+    def __init__(self, analytics_dir: str):
+        """
+        Initialize analytics store
+
+        Args:
+            analytics_dir: Analytics data directory
+        """
+        self.analytics_dir = analytics_dir
+        self.segments_dir = os.path.join(analytics_dir, 'segments')
+        self.archive_dir = os.path.join(analytics_dir, 'archive')
+
+        for subdir in EVENT_SUBDIRS:
+            os.makedirs(os.path.join(analytics_dir, subdir), exist_ok=True)
+
+        self._segments = OrderedDict()
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._compactor = None
+
+    def append(self, event: Dict[str, Any]) -> bool:
+        """
+        Append an event to its daily JSONL segment
+
+        Args:
+            event: Event with timestamp, event_type and optional user_id
+
+        Returns:
+            bool: Success status
+        """
+        subdir = "user_events" if event["event_type"].startswith("user_") else "system_events"
+        date_str = datetime.now().strftime(DATE_FORMAT)
+        filepath = os.path.join(self.analytics_dir, subdir, f"{date_str}_{event['event_type']}.jsonl")
+
+        try:
+            with open(filepath, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(event) + '\n')
+            return True
+        except IOError as e:
+            print(f"Error tracking event: {e}")
+            return False
+
+    def start_compactor(self) -> None:
+        """Start the background compactor thread (once per store)"""
+        if not NUMPY_AVAILABLE:
+            return
+
+        with self._lock:
+            if self._compactor is not None:
+                return
+            self._compactor = threading.Thread(target=self._compact_loop, name="analytics-compactor", daemon=True)
+            self._compactor.start()
+
+    def _compact_loop(self) -> None:
+        """Compact closed days periodically"""
+        while True:
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"Error compacting analytics events: {e}")
+            time.sleep(COMPACT_INTERVAL)
+
+    def _raw_files(self) -> Dict[str, Dict[str, List[str]]]:
+        """JSONL files still in the event directories, by day and subdirectory"""
+        files = {}
+        for subdir in EVENT_SUBDIRS:
+            events_dir = os.path.join(self.analytics_dir, subdir)
+            try:
+                filenames = os.listdir(events_dir)
+            except (FileNotFoundError, OSError):
+                continue
+
+            for filename in filenames:
+                if not filename.endswith('.jsonl'):
+                    continue
+                day = filename.split('_')[0]
+                files.setdefault(day, {}).setdefault(subdir, []).append(os.path.join(events_dir, filename))
+
+        return files
+
+    def compact(self, now: Optional[datetime] = None) -> List[str]:
+        """
+        Compact every closed day that still has JSONL files
+
+        Args:
+            now: Current time (defaults to now)
+
+        Returns:
+            list: Days compacted
+        """
+        if not NUMPY_AVAILABLE:
+            return []
+
+        now = now or datetime.now()
+        compacted = []
+
+        with self._compact_lock:
+            for day, subdirs in sorted(self._raw_files().items()):
+                try:
+                    closed = datetime.strptime(day, DATE_FORMAT) + timedelta(days=1) + COMPACT_GRACE <= now
+                except ValueError:
+                    continue
+                if not closed:
+                    continue
+
+                # A segment may already exist if an earlier pass stopped before archiving
+                if not os.path.isdir(os.path.join(self.segments_dir, day)):
+                    self._write_segment(day, [path for paths in subdirs.values() for path in paths])
+                    compacted.append(day)
+                self._archive(day, subdirs)
+
+        if compacted:
+            logger.info(f"Compacted analytics events for {len(compacted)} day(s)")
+        return compacted
+
+    def _write_segment(self, day: str, paths: List[str]) -> None:
+        """Build the columnar segment and rollups of one day"""
+        midnight = np.datetime64(datetime.strptime(day, DATE_FORMAT), 'us')
+        users, timestamps, event_types = [], [], []
+
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line.strip())
+                    except json.JSONDecodeError:
+                        continue
+
+                    try:
+                        timestamp = np.datetime64(event.get("timestamp"), 'us')
+                    except (ValueError, TypeError):
+                        timestamp = midnight
+
+                    users.append(str(event.get("user_id") or ""))
+                    timestamps.append(timestamp)
+                    event_types.append(event.get("event_type", "unknown"))
+
+        unique_users, user_codes = np.unique(np.array(users, dtype=str), return_inverse=True)
+        types, type_codes = np.unique(np.array(event_types, dtype=str), return_inverse=True)
+        timestamps = np.array(timestamps, dtype='datetime64[us]')
+
+        # Group events by user, in time order within each user
+        order = np.lexsort((timestamps, user_codes))
+        user_codes = user_codes[order]
+        timestamps = timestamps[order]
+        type_codes = type_codes[order].astype(np.int32)
+
+        offsets = np.zeros(len(unique_users) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(user_codes, minlength=len(unique_users)), out=offsets[1:])
+        user_last = timestamps[offsets[1:] - 1]
+
+        rollup = {
+            "event_types": types.tolist(),
+            "total_events": int(len(timestamps)),
+            "by_type": {t: int(c) for t, c in zip(types.tolist(), np.bincount(type_codes, minlength=len(types)))}
+        }
+
+        os.makedirs(self.segments_dir, exist_ok=True)
+        tmp_dir = os.path.join(self.segments_dir, f".{day}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        np.save(os.path.join(tmp_dir, 'users.npy'), unique_users)
+        np.save(os.path.join(tmp_dir, 'offsets.npy'), offsets)
+        np.save(os.path.join(tmp_dir, 'timestamps.npy'), timestamps)
+        np.save(os.path.join(tmp_dir, 'types.npy'), type_codes)
+        np.save(os.path.join(tmp_dir, 'user_last.npy'), user_last)
+        with open(os.path.join(tmp_dir, 'rollup.json'), 'w', encoding='utf-8') as f:
+            json.dump(rollup, f)
+
+        # Publish atomically; another process may have compacted the day first
+        try:
+            os.rename(tmp_dir, os.path.join(self.segments_dir, day))
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _archive(self, day: str, subdirs: Dict[str, List[str]]) -> None:
+        """Move a compacted day's JSONL files out of the event directories"""
+        for subdir, paths in subdirs.items():
+            archive_dir = os.path.join(self.archive_dir, day, subdir)
+            os.makedirs(archive_dir, exist_ok=True)
+            for path in paths:
+                try:
+                    os.replace(path, os.path.join(archive_dir, os.path.basename(path)))
+                except FileNotFoundError:
+                    continue
+
+    def _segment(self, day: str) -> Optional[DaySegment]:
+        """Get the compacted segment of a day, if there is one"""
+        with self._lock:
+            segment = self._segments.get(day)
+            if segment is not None:
+                self._segments.move_to_end(day)
+                return segment
+
+        if not NUMPY_AVAILABLE:
+            return None
+
+        path = os.path.join(self.segments_dir, day)
+        if not os.path.isdir(path):
+            return None
+
+        segment = DaySegment(path, day)
+        with self._lock:
+            self._segments[day] = segment
+            while len(self._segments) > SEGMENT_CACHE_SIZE:
+                self._segments.popitem(last=False)
+        return segment
+
+    def _window(self, cutoff: datetime):
+        """
+        Split a window into compacted segments and JSONL files
+
+        Returns:
+            Tuple of (segments, {day: {subdir: paths}}) for days starting at or after cutoff
+        """
+        raw_files = self._raw_files()
+        segments = []
+
+        day = _window_start(cutoff)
+        today = datetime.now()
+        while day <= today:
+            segment = self._segment(day.strftime(DATE_FORMAT))
+            if segment is not None:
+                segments.append(segment)
+            day += timedelta(days=1)
+
+        compacted = {segment.day.replace('-', '') for segment in segments}
+        raw = {}
+        for day_str, subdirs in raw_files.items():
+            try:
+                if datetime.strptime(day_str, DATE_FORMAT) < cutoff or day_str in compacted:
+                    continue
+            except ValueError:
+                continue
+            raw[day_str] = subdirs
+
+        return segments, raw
+
+    def _read_raw(self, paths: List[str]):
+        """Yield the events of JSONL files (files compacted meanwhile are skipped)"""
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            yield json.loads(line.strip())
+                        except json.JSONDecodeError:
+                            continue
+            except FileNotFoundError:
+                continue
+
+    def user_activity(self, user_id: str, cutoff: datetime) -> Dict[str, Any]:
+        """
+        Aggregate one user's events
+
+        Args:
+            user_id: User ID
+            cutoff: Start of the window
+
+        Returns:
+            dict: total_events, event_counts, usage_by_day and last_activity
+        """
+        user_id = str(user_id)
+        event_counts = Counter()
+        usage_by_day = Counter()
+        last_activity = None
+
+        segments, raw = self._window(cutoff)
+
+        for segment in segments:
+            events = segment.user_events(user_id)
+            if events is None:
+                continue
+
+            timestamps, types = events
+            mask = segment.user_type_codes[types]
+            if not mask.any():
+                continue
+
+            counts = np.bincount(types[mask], minlength=len(segment.event_types))
+            for code in np.nonzero(counts)[0]:
+                event_counts[segment.event_types[code]] += int(counts[code])
+            usage_by_day[segment.day] += int(mask.sum())
+
+            last = timestamps[mask].max().astype(datetime).isoformat()
+            if last_activity is None or last > last_activity:
+                last_activity = last
+
+        for subdirs in raw.values():
+            for event in self._read_raw(subdirs.get('user_events', [])):
+                if str(event.get("user_id")) != user_id:
+                    continue
+
+                event_counts[event.get("event_type", "unknown")] += 1
+                try:
+                    event_date = datetime.fromisoformat(event.get("timestamp", "")).strftime("%Y-%m-%d")
+                    usage_by_day[event_date] += 1
+                except (ValueError, TypeError):
+                    pass
+
+                timestamp = event.get("timestamp")
+                if timestamp and (last_activity is None or timestamp > last_activity):
+                    last_activity = timestamp
+
+        return {
+            "total_events": sum(event_counts.values()),
+            "event_counts": dict(event_counts),
+            "usage_by_day": dict(usage_by_day),
+            "last_activity": last_activity
+        }
+
+    def system_usage(self, cutoff: datetime, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Aggregate all events
+
+        Args:
+            cutoff: Start of the window
+            now: Reference time for user retention (defaults to now)
+
+        Returns:
+            dict: total_events, events_by_type, events_by_day, unique_users and
+            active_users (numbers of users active in the last 1, 7 and 30 days)
+        """
+        now = now or datetime.now()
+        since = {window: now - timedelta(days=days) for window, days in RETENTION_WINDOWS.items()}
+
+        events_by_type = Counter()
+        events_by_day = Counter()
+        unique_users = set()
+        active_users = {window: set() for window in RETENTION_WINDOWS}
+        segment_users = []
+        segment_active = {window: [] for window in RETENTION_WINDOWS}
+
+        segments, raw = self._window(cutoff)
+
+        # Compacted days: rollups only
+        for segment in segments:
+            events_by_type.update(segment.by_type)
+            events_by_day[segment.day] += segment.total_events
+            segment_users.append(segment.users)
+            for window, start in since.items():
+                segment_active[window].append(segment.active_users(start))
+
+        for subdirs in raw.values():
+            for subdir in EVENT_SUBDIRS:
+                for event in self._read_raw(subdirs.get(subdir, [])):
+                    events_by_type[event.get("event_type", "unknown")] += 1
+                    if "user_id" in event:
+                        unique_users.add(str(event["user_id"]))
+
+                    try:
+                        event_time = datetime.fromisoformat(event.get("timestamp", ""))
+                    except (ValueError, TypeError):
+                        continue
+                    events_by_day[event_time.strftime("%Y-%m-%d")] += 1
+
+                    if "user_id" in event:
+                        for window, start in since.items():
+                            if event_time >= start:
+                                active_users[window].add(str(event["user_id"]))
+
+        return {
+            "total_events": sum(events_by_type.values()),
+            "events_by_type": dict(events_by_type),
+            "events_by_day": dict(events_by_day),
+            "unique_users": self._count_users(segment_users, unique_users),
+            "active_users": {
+                window: self._count_users(segment_active[window], active_users[window])
+                for window in RETENTION_WINDOWS
+            }
+        }
+
+    def _count_users(self, arrays: List[Any], users: Set[str]) -> int:
+        """Number of distinct users across segment user arrays and a set of user IDs"""
+        if not arrays:
+            return len(users)
+
+        combined = np.unique(np.concatenate(arrays + [np.array(sorted(users), dtype=str)]))
+        return int(np.count_nonzero(combined != ""))
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_analytics_store(analytics_dir: str, start_compactor: bool = True) -> AnalyticsStore:
+    """
+    Get the shared store for an analytics directory
+
+    Args:
+        analytics_dir: Analytics data directory
+        start_compactor: Start the background compactor if it is not running
+
+    Returns:
+        AnalyticsStore: Store shared by every tracker in the process
+    """
+    with _stores_lock:
+        store = _stores.get(analytics_dir)
+        if store is None:
+            store = _stores[analytics_dir] = AnalyticsStore(analytics_dir)
+
+    if start_compactor:
+        store.start_compactor()
+    return store
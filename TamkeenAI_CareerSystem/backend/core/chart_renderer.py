@@ -0,0 +1,340 @@
+"""
+Chart Renderer Module
+
+Renders the charts of PDF reports to PNG bytes:
+
+- render_chart draws one chart on its own Figure with matplotlib's
+  object-oriented Agg API, so no pyplot state is shared between renders;
+- ChartRenderer runs renders in a pool of worker processes, so the charts of
+  a report are drawn in parallel while the report is being laid out, and
+  keeps rendered PNGs in an LRU cache keyed by a hash of the chart type and
+  data (optionally also in a directory shared by all processes). Concurrent
+  requests for the same chart share one render.
+
+Rendered charts are returned as bytes, for ReportLab to read from memory
+instead of temporary files.
+"""
+
+import os
+import io
+import json
+import uuid
+import hashlib
+import logging
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional
+
+# Try importing matplotlib for chart rendering
+try:
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.artist import setp
+    import numpy as np
+    MATPLOTLIB_AVAILABLE = True
+except ImportError:
+    MATPLOTLIB_AVAILABLE = False
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+CHART_TYPES = ("bar", "pie", "radar")
+
+
+def chart_key(chart_data: Dict[str, Any], chart_type: str, figsize=(6, 4), dpi: int = 100) -> str:
+    """
+    Cache key of a chart: a hash of everything that affects its pixels
+
+    Args:
+        chart_data: Data for chart
+        chart_type: Type of chart
+        figsize: Figure size in inches
+        dpi: Resolution
+
+    Returns:
+        str: Hex digest
+    """
+    payload = json.dumps([chart_type, chart_data, list(figsize), dpi], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_chart(chart_data: Dict[str, Any], chart_type: str, figsize=(6, 4), dpi: int = 100) -> Optional[bytes]:
+    """
+    Render a chart to PNG
+
+    Args:
+        chart_data: Data for chart
+        chart_type: Type of chart (bar, pie, radar)
+        figsize: Figure size in inches
+        dpi: Resolution
+
+    Returns:
+        bytes or None: PNG image, or None if the data does not fit the chart type
+    """
+    if not MATPLOTLIB_AVAILABLE:
+        return None
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+
+    if chart_type == "bar":
+        labels = chart_data.get("labels", [])
+        values = chart_data.get("values", [])
+
+        if not labels or not values or len(labels) != len(values):
+            return None
+
+        ax = fig.add_subplot(111)
+        ax.bar(labels, values, color=chart_data.get("colors", "skyblue"))
+        ax.set_xlabel(chart_data.get("x_label", ""))
+        ax.set_ylabel(chart_data.get("y_label", ""))
+        ax.set_title(chart_data.get("title", ""))
+        setp(ax.get_xticklabels(), rotation=45, ha="right")
+        fig.tight_layout()
+
+    elif chart_type == "pie":
+        labels = chart_data.get("labels", [])
+        values = chart_data.get("values", [])
+
+        if not labels or not values or len(labels) != len(values):
+            return None
+
+        ax = fig.add_subplot(111)
+        ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90,
+               colors=chart_data.get("colors", None))
+        ax.axis('equal')
+        ax.set_title(chart_data.get("title", ""))
+
+    elif chart_type == "radar":
+        categories = chart_data.get("categories", [])
+        values = list(chart_data.get("values", []))
+
+        if not categories or not values or len(categories) != len(values):
+            return None
+
+        # Angle of each axis, closing the loop
+        N = len(categories)
+        angles = [n / float(N) * 2 * np.pi for n in range(N)]
+        angles += angles[:1]
+        values += values[:1]
+
+        ax = fig.add_subplot(111, polar=True)
+        ax.set_xticks(angles[:-1])
+        ax.set_xticklabels(categories, color='grey', size=10)
+        ax.set_rlabel_position(0)
+        ax.set_yticks([20, 40, 60, 80, 100])
+        ax.set_yticklabels(["20", "40", "60", "80", "100"], color="grey", size=8)
+        ax.set_ylim(0, 100)
+
+        ax.plot(angles, values, linewidth=1, linestyle='solid')
+        ax.fill(angles, values, 'skyblue', alpha=0.4)
+        ax.set_title(chart_data.get("title", ""), size=15, y=1.1)
+
+    else:
+        return None
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def _render_safely(chart_data: Dict[str, Any], chart_type: str, figsize, dpi: int) -> Optional[bytes]:
+    """render_chart for worker processes: failures become None"""
+    try:
+        return render_chart(chart_data, chart_type, figsize, dpi)
+    except Exception as e:
+        logger.error(f"Error rendering {chart_type} chart: {str(e)}")
+        return None
+
+
+class ChartRenderer:
+    """Process pool of chart renders with a PNG cache"""
+
+    def __init__(self, workers: int = 2, cache_bytes: int = 64 * 1024 * 1024,
+                 cache_dir: Optional[str] = None, figsize=(6, 4), dpi: int = 100):
+        """
+        Initialize chart renderer
+
+        Args:
+            workers: Worker processes (0 renders in the calling thread)
+            cache_bytes: Memory budget of cached PNGs
+            cache_dir: Optional directory for PNGs shared between processes and restarts
+            figsize: Figure size in inches
+            dpi: Resolution
+        """
+        self.workers = workers
+        self.cache_bytes = cache_bytes
+        self.cache_dir = cache_dir
+        self.figsize = tuple(figsize)
+        self.dpi = dpi
+
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self._pending = {}
+        self._pool = None
+        self.stats = {"hits": 0, "renders": 0, "evictions": 0}
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # ===== Cache =====
+
+    def _cache_get(self, key: str) -> Optional[bytes]:
+        png = self._cache.get(key)
+        if png is not None:
+            self._cache.move_to_end(key)
+        return png
+
+    def _cache_put(self, key: str, png: bytes) -> None:
+        if key in self._cache or len(png) > self.cache_bytes:
+            return
+        self._cache[key] = png
+        self._cached_bytes += len(png)
+        while self._cached_bytes > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+            self.stats["evictions"] += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.png")
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _disk_put(self, key: str, png: bytes) -> None:
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(png)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write chart cache file {path}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # ===== Rendering =====
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._pool is None:
+            # Spawned workers do not inherit the threads and locks of a forked web worker
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def submit(self, chart_data: Dict[str, Any], chart_type: str) -> "Future[Optional[bytes]]":
+        """
+        Start rendering a chart
+
+        Args:
+            chart_data: Data for chart
+            chart_type: Type of chart (bar, pie, radar)
+
+        Returns:
+            Future: Resolves to the PNG bytes, or None if the chart could not be rendered
+        """
+        key = chart_key(chart_data, chart_type, self.figsize, self.dpi)
+        with self._lock:
+            png = self._cache_get(key)
+            if png is not None:
+                self.stats["hits"] += 1
+                return self._done(png)
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.stats["hits"] += 1
+                return pending
+
+        png = self._disk_get(key)
+        if png is not None:
+            with self._lock:
+                self.stats["hits"] += 1
+                self._cache_put(key, png)
+            return self._done(png)
+
+        if chart_type not in CHART_TYPES or not MATPLOTLIB_AVAILABLE:
+            return self._done(None)
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                return pending
+            self.stats["renders"] += 1
+            try:
+                pool = self._get_pool()
+                future = pool.submit(_render_safely, chart_data, chart_type, self.figsize, self.dpi) \
+                    if pool is not None else None
+            except (BrokenProcessPool, RuntimeError, OSError) as e:
+                logger.warning(f"Chart worker pool unavailable, rendering in process: {str(e)}")
+                self._pool = None
+                future = None
+            in_process = future is None
+            if in_process:
+                # Claimed now, rendered below without holding the lock
+                future = Future()
+            self._pending[key] = future
+        future.add_done_callback(lambda done: self._finish(key, done))
+        if in_process:
+            future.set_result(_render_safely(chart_data, chart_type, self.figsize, self.dpi))
+        return future
+
+    def _finish(self, key: str, future: Future) -> None:
+        """Cache a finished render"""
+        try:
+            png = future.result()
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next render
+            with self._lock:
+                self._pool = None
+            png = None
+        except Exception as e:
+            logger.error(f"Error rendering chart: {str(e)}")
+            png = None
+
+        with self._lock:
+            self._pending.pop(key, None)
+            if png is not None:
+                self._cache_put(key, png)
+        if png is not None:
+            self._disk_put(key, png)
+
+    @staticmethod
+    def _done(png: Optional[bytes]) -> Future:
+        future = Future()
+        future.set_result(png)
+        return future
+
+    def render(self, chart_data: Dict[str, Any], chart_type: str,
+               timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Render a chart and wait for it
+
+        Returns:
+            bytes or None: PNG image, or None if the chart could not be rendered
+        """
+        try:
+            return self.submit(chart_data, chart_type).result(timeout)
+        except Exception as e:
+            logger.error(f"Error rendering chart: {str(e)}")
+            return None
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
@@ -15,6 +15,8 @@ from datetime import datetime
 # Import settings
 from config.settings import BASE_DIR
 
+from .leaderboard import ALL_TIME, weekly_board, get_leaderboard as get_leaderboard_service
+
 # Define paths for gamification data
 BADGES_DIR = os.path.join(BASE_DIR, 'data', 'gamification', 'badges')
 LEVELS_DIR = os.path.join(BASE_DIR, 'data', 'gamification', 'levels')
@@ -320,6 +322,13 @@ class GamificationEngine:
         # Save XP data
         self._save_xp_data()
         
+        # Move the user on the all-time and weekly leaderboards
+        try:
+            get_xp_leaderboard().add_xp(self.user_id, amount, total_xp=self.xp_data["total_xp"],
+                                                 **self._leaderboard_info())
+        except Exception as e:
+            print(f"Error updating leaderboard: {e}")
+        
         # Return updated information
         result = {
             "success": True,
@@ -525,55 +534,40 @@ class GamificationEngine:
         
         return progress
     
-    def get_leaderboard(self, count: int = 10) -> List[Dict[str, Any]]:
+    def _leaderboard_info(self) -> Dict[str, Any]:
+        """Fields shown in the user's leaderboard entries"""
+        return {
+            "level": self.xp_data["current_level"],
+            "badges": len([b for b in self.badges.values() if b.get("earned", False)])
+        }
+    
+    def get_leaderboard(self, count: int = 10, offset: int = 0, weekly: bool = False) -> List[Dict[str, Any]]:
         """
-        Get leaderboard of users with highest XP (mock implementation)
+        Get leaderboard of users with highest XP
         
         Args:
             count: Number of users to include
+            offset: Number of top users to skip (for paging)
+            weekly: Rank by XP gained this week instead of total XP
+            
+        Returns:
+            list: Leaderboard entries (rank, user_id, xp, level, badges)
+        """
+        board = weekly_board() if weekly else ALL_TIME
+        return get_xp_leaderboard().get_page(offset, count, board)
+    
+    def get_leaderboard_position(self, weekly: bool = False) -> Optional[int]:
+        """
+        Get the user's rank on the leaderboard
+        
+        Args:
+            weekly: Rank by XP gained this week instead of total XP
             
         Returns:
-            list: Leaderboard entries
+            int: 1-based rank, or None if the user has no XP yet
         """
-        # In a real implementation, this would query the database for top users
-        # This is a mock implementation with fake data
-        
-        leaderboard = [
-            {"user_id": self.user_id, "username": "Current User", "xp": self.xp_data["total_xp"], 
-             "level": self.xp_data["current_level"], "badges": len([b for b in self.badges.values() if b.get("earned", False)])}
-        ]
-        
-        # Add mock users if current user's XP is not enough to populate leaderboard
-        mock_users = [
-            {"user_id": "u123", "username": "CareerMaster", "xp": 9800, "level": 9, "badges": 15},
-            {"user_id": "u456", "username": "ResumeWizard", "xp": 8500, "level": 9, "badges": 12},
-            {"user_id": "u789", "username": "JobHunterPro", "xp": 7200, "level": 8, "badges": 14},
-            {"user_id": "u101", "username": "SkillsGuru", "xp": 6500, "level": 8, "badges": 10},
-            {"user_id": "u202", "username": "InterviewAce", "xp": 5800, "level": 7, "badges": 9},
-            {"user_id": "u303", "username": "TechTalent", "xp": 4900, "level": 7, "badges": 8},
-            {"user_id": "u404", "username": "CareerClimber", "xp": 4200, "level": 6, "badges": 7},
-            {"user_id": "u505", "username": "PathFinder", "xp": 3600, "level": 6, "badges": 6},
-            {"user_id": "u606", "username": "AchievementHunter", "xp": 3000, "level": 5, "badges": 8},
-            {"user_id": "u707", "username": "ProgressPro", "xp": 2500, "level": 5, "badges": 5},
-            {"user_id": "u808", "username": "GoalSetter", "xp": 2000, "level": 4, "badges": 4},
-            {"user_id": "u909", "username": "FutureFocus", "xp": 1500, "level": 4, "badges": 3},
-            {"user_id": "u111", "username": "CareerExplorer", "xp": 1000, "level": 3, "badges": 3},
-            {"user_id": "u222", "username": "NewGraduate", "xp": 500, "level": 2, "badges": 2}
-        ]
-        
-        # Add mock users to leaderboard
-        for user in mock_users:
-            leaderboard.append(user)
-        
-        # Sort by XP descending
-        leaderboard = sorted(leaderboard, key=lambda u: u["xp"], reverse=True)
-        
-        # Add rank
-        for i, entry in enumerate(leaderboard):
-            entry["rank"] = i + 1
-        
-        # Return limited number of top users
-        return leaderboard[:count]
+        board = weekly_board() if weekly else ALL_TIME
+        return get_xp_leaderboard().get_rank(self.user_id, board)
 
     def get_dashboard_badges(self, user_id):
         """Get all dashboard-related badges for display in career dashboard"""
@@ -677,6 +671,41 @@ class GamificationEngine:
             return False
 
 
+_leaderboard_backfilled = False
+
+
+def get_xp_leaderboard():
+    """
+    Get the shared leaderboard, adding users who earned XP before it existed
+    
+    Returns:
+        Leaderboard: Shared leaderboard
+    """
+    global _leaderboard_backfilled
+    leaderboard = get_leaderboard_service()
+    
+    if not _leaderboard_backfilled:
+        _leaderboard_backfilled = True
+        users_dir = os.path.join(BASE_DIR, 'data', 'users')
+        if leaderboard.count() == 0 and os.path.isdir(users_dir):
+            rows = []
+            for filename in os.listdir(users_dir):
+                if not filename.endswith('_xp.json'):
+                    continue
+                try:
+                    with open(os.path.join(users_dir, filename), 'r', encoding='utf-8') as f:
+                        xp_data = json.load(f)
+                    rows.append((filename[:-len('_xp.json')], xp_data.get("total_xp", 0),
+                                 {"level": xp_data.get("current_level", 1)}))
+                except (json.JSONDecodeError, IOError) as e:
+                    print(f"Error reading XP data {filename}: {e}")
+            
+            if rows:
+                leaderboard.import_scores(rows)
+    
+    return leaderboard
+
+
 # Standalone functions that use GamificationEngine
 
 def award_xp_for_action(user_id: str, action: str, xp_amount: int = None) -> Dict[str, Any]:
@@ -780,8 +809,7 @@ def get_user_gamification_status(user_id: str) -> Dict[str, Any]:
             badges_by_category[category]["earned"] += 1
     
     # Get leaderboard position
-    leaderboard = engine.get_leaderboard(count=100)  # Get extended leaderboard
-    user_position = next((entry["rank"] for entry in leaderboard if entry["user_id"] == user_id), None)
+    user_position = engine.get_leaderboard_position()
     
     # Add additional data to progress
     progress["badges_by_category"] = badges_by_category
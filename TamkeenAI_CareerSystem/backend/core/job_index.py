@@ -0,0 +1,622 @@
+"""
+Job Vector Index Module
+
+This module provides a persistent TF-IDF index over the job catalogue. The index
+is fitted once, stored on disk as a sparse matrix plus vocabulary, and kept up to
+date as jobs are created, edited or closed, so recommendation requests only need
+to vectorize the query and run a single sparse matrix-vector product.
+
+Changes are saved a few seconds after they are made, on an explicit save()
+and at exit. Processes
+sharing the index directory save under a file lock, and replay their pending
+changes onto any newer index another process saved, so no process overwrites
+another's updates.
+"""
+
+import os
+import json
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+# Import settings
+from backend.config.settings import DATA_DIR
+
+# Try to import optional dependencies
+try:
+    import numpy as np
+    import scipy.sparse as sp
+    from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+    from sklearn.preprocessing import normalize
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+    logging.warning("scikit-learn not installed. Job vector index will be unavailable. Install with: pip install scikit-learn")
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Default index location
+JOB_INDEX_DIR = os.path.join(DATA_DIR, "job_index")
+
+# Vectorizer settings shared by fitting and incremental updates
+VECTORIZER_PARAMS = {
+    "stop_words": "english",
+    "min_df": 2,
+    "max_df": 0.85,
+    "ngram_range": (1, 2)
+}
+
+
+def job_to_text(job: Dict[str, Any]) -> str:
+    """
+    Build the text representation of a job used for vectorization
+
+    Args:
+        job: Job data
+
+    Returns:
+        str: Job text
+    """
+    job_text = f"{job.get('title', '')} {job.get('description', '')} "
+    job_text += f"{' '.join(job.get('skills', []) or [])} "
+    job_text += f"{job.get('company', '')} {job.get('location', '')}"
+    return job_text.lower()
+
+
+class JobVectorIndex:
+    """Persistent, incrementally updated TF-IDF index of jobs"""
+
+    def __init__(self, index_dir: str = JOB_INDEX_DIR, autosave_interval: float = 5.0):
+        """
+        Initialize job vector index
+
+        Args:
+            index_dir: Directory holding the index files
+            autosave_interval: Seconds after a change by which the index is saved
+        """
+        self.index_dir = index_dir
+        self.matrix_file = os.path.join(index_dir, "job_vectors.npz")
+        self.meta_file = os.path.join(index_dir, "job_vectors.json")
+        self.lock_file = os.path.join(index_dir, "job_vectors.lock")
+        self.autosave_interval = autosave_interval
+
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = None
+        self.job_ids: List[str] = []
+        self.row_by_id: Dict[str, int] = {}
+        # Job ID -> updated_at of the indexed version
+        self.updated_at: Dict[str, str] = {}
+        # Whether the index has been checked against the job catalogue
+        self.reconciled = False
+
+        self._matrix = None
+        # Row -> still current; over-allocated so appends are amortized O(1)
+        self._active = None
+        self._pending_rows = []
+        self._counter = None
+        # Changes since the last save: job ID -> (text, updated_at), or None if removed
+        self._changes: Dict[str, Optional[Tuple[str, Optional[str]]]] = {}
+        self._dirty = 0
+        self._timer = None
+        self._loaded_mtime = None
+        self._lock = threading.RLock()
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the index has been fitted or loaded"""
+        return SKLEARN_AVAILABLE and self._counter is not None
+
+    def __len__(self) -> int:
+        return len(self.row_by_id)
+
+    def fit(self, jobs: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Fit the index on a full job catalogue, replacing any existing index
+
+        Args:
+            jobs: Active jobs
+
+        Returns:
+            bool: Success status
+        """
+        if not SKLEARN_AVAILABLE:
+            return False
+
+        jobs = [job for job in jobs if job.get("id")]
+        if not jobs:
+            return False
+
+        texts = [job_to_text(job) for job in jobs]
+
+        vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+        try:
+            matrix = vectorizer.fit_transform(texts)
+        except ValueError:
+            # Small catalogues cannot satisfy the document frequency bounds
+            vectorizer = TfidfVectorizer(**dict(VECTORIZER_PARAMS, min_df=1, max_df=1.0))
+            matrix = vectorizer.fit_transform(texts)
+
+        with self._lock:
+            self.vocabulary = {term: int(col) for term, col in vectorizer.vocabulary_.items()}
+            self.idf = vectorizer.idf_.astype(np.float32)
+            self.job_ids = [str(job["id"]) for job in jobs]
+            self.row_by_id = {job_id: row for row, job_id in enumerate(self.job_ids)}
+            self.updated_at = {str(job["id"]): str(job["updated_at"]) for job in jobs if job.get("updated_at")}
+            self._matrix = matrix.tocsr().astype(np.float32)
+            self._active = np.ones(len(self.job_ids), dtype=bool)
+            self._pending_rows = []
+            self._changes = {}
+            self._build_counter()
+            self.reconciled = True
+            # A full fit replaces whatever is on disk
+            self.save(merge=False)
+
+        logger.info(f"Fitted job vector index with {len(self.job_ids)} jobs and {len(self.vocabulary)} terms")
+        return True
+
+    def _build_counter(self):
+        """Create the term counter used to vectorize new texts with the fitted vocabulary"""
+        ngram_range = tuple(VECTORIZER_PARAMS["ngram_range"])
+        self._counter = CountVectorizer(
+            stop_words=VECTORIZER_PARAMS["stop_words"],
+            ngram_range=ngram_range,
+            vocabulary=self.vocabulary
+        )
+
+    def transform(self, texts: List[str]):
+        """
+        Vectorize texts with the fitted vocabulary and IDF weights
+
+        Args:
+            texts: Input texts
+
+        Returns:
+            csr_matrix: L2-normalized TF-IDF vectors
+        """
+        counts = self._counter.transform([text.lower() for text in texts]).astype(np.float32)
+        return normalize(counts.multiply(self.idf).tocsr(), norm="l2", copy=False)
+
+    def _consolidate(self):
+        """Merge pending rows into the main matrix"""
+        if self._pending_rows:
+            self._matrix = sp.vstack([self._matrix] + self._pending_rows, format="csr")
+            self._pending_rows = []
+
+    def upsert_job(self, job: Dict[str, Any]) -> bool:
+        """
+        Add or update a job in the index; inactive jobs are removed
+
+        Args:
+            job: Job data
+
+        Returns:
+            bool: Success status
+        """
+        if not job.get("id"):
+            return False
+
+        return self.upsert_jobs([job])
+
+    def upsert_jobs(self, jobs: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Add or update several jobs with one vectorization pass; inactive jobs are removed
+
+        Args:
+            jobs: Job data
+
+        Returns:
+            bool: Success status
+        """
+        if not self.is_ready:
+            return False
+
+        active = []
+        removed = []
+        for job in jobs:
+            if not job.get("id"):
+                continue
+            if job.get("status", "active") != "active":
+                removed.append(str(job["id"]))
+            else:
+                active.append(job)
+
+        job_ids = [str(job["id"]) for job in active]
+        texts = [job_to_text(job) for job in active]
+        updated_ats = [str(job["updated_at"]) if job.get("updated_at") else None for job in active]
+        vectors = self.transform(texts) if texts else None
+
+        with self._lock:
+            changed = False
+            for job_id in removed:
+                if job_id in self.row_by_id:
+                    self._apply_remove(job_id)
+                    self._changes[job_id] = None
+                    changed = True
+
+            if job_ids:
+                self._apply_upserts(job_ids, vectors, updated_ats)
+                for job_id, text, updated_at in zip(job_ids, texts, updated_ats):
+                    self._changes[job_id] = (text, updated_at)
+                changed = True
+
+            if changed:
+                self._mark_dirty()
+
+        return True
+
+    def remove_job(self, job_id: str) -> bool:
+        """
+        Remove a job from the index
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            bool: Success status
+        """
+        if not self.is_ready:
+            return False
+
+        job_id = str(job_id)
+        with self._lock:
+            if job_id not in self.row_by_id:
+                return True
+
+            self._apply_remove(job_id)
+            self._changes[job_id] = None
+            self._mark_dirty()
+
+        return True
+
+    def _apply_upserts(self, job_ids: List[str], vectors, updated_ats: List[Optional[str]]):
+        """Point jobs at new vectors (one row of vectors per job)"""
+        start = len(self.job_ids)
+        self._reserve_rows(start + len(job_ids))
+
+        # Retire the old rows; the new vectors are appended and compacted on save
+        for row, (job_id, updated_at) in enumerate(zip(job_ids, updated_ats), start):
+            old_row = self.row_by_id.get(job_id)
+            if old_row is not None:
+                self._active[old_row] = False
+
+            self._active[row] = True
+            self.row_by_id[job_id] = row
+            self.job_ids.append(job_id)
+            if updated_at:
+                self.updated_at[job_id] = updated_at
+            else:
+                self.updated_at.pop(job_id, None)
+
+        self._pending_rows.append(vectors)
+
+    def _reserve_rows(self, rows: int):
+        """Grow the active flags geometrically to hold at least this many rows"""
+        capacity = self._active.shape[0]
+        if rows > capacity:
+            active = np.zeros(max(rows, capacity * 2), dtype=bool)
+            active[:capacity] = self._active
+            self._active = active
+
+    def _apply_remove(self, job_id: str):
+        """Retire a job's row"""
+        row = self.row_by_id.pop(job_id, None)
+        if row is not None:
+            self._active[row] = False
+        self.updated_at.pop(job_id, None)
+
+    def _replay_changes(self):
+        """Apply the unsaved changes of this process to a freshly loaded index"""
+        upserts = []
+        for job_id, change in self._changes.items():
+            if change is None:
+                self._apply_remove(job_id)
+            else:
+                upserts.append((job_id,) + change)
+
+        if upserts:
+            job_ids, texts, updated_ats = zip(*upserts)
+            self._apply_upserts(list(job_ids), self.transform(list(texts)), list(updated_ats))
+
+    def _mark_dirty(self):
+        """Record a pending change and schedule a save"""
+        self._dirty += 1
+        if self.autosave_interval and self._timer is None:
+            self._timer = threading.Timer(self.autosave_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> bool:
+        """
+        Save the index if it has unsaved changes
+
+        Returns:
+            bool: Success status
+        """
+        with self._lock:
+            self._timer = None
+            if not self._dirty:
+                return True
+            return self.save()
+
+    def stale_jobs(self, catalogue: Dict[str, str]) -> Tuple[List[str], List[str]]:
+        """
+        Compare the index with the job catalogue
+
+        Args:
+            catalogue: Active job ID -> updated_at
+
+        Returns:
+            tuple: (IDs of jobs missing or outdated in the index, IDs of indexed jobs no longer active)
+        """
+        with self._lock:
+            outdated = [job_id for job_id, updated_at in catalogue.items()
+                        if job_id not in self.row_by_id or self.updated_at.get(job_id) != str(updated_at)]
+            removed = [job_id for job_id in self.row_by_id if job_id not in catalogue]
+        return outdated, removed
+
+    def query_vector(self, vector, limit: int = 10,
+                     exclude_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Find the jobs most similar to a query vector
+
+        Args:
+            vector: 1 x n_terms normalized sparse vector
+            limit: Maximum number of results
+            exclude_ids: Job IDs to leave out of the results
+
+        Returns:
+            list: (job_id, cosine similarity) pairs, best first
+        """
+        with self._lock:
+            self._consolidate()
+            if self._matrix is None or self._matrix.shape[0] == 0:
+                return []
+
+            # Rows are L2-normalized so the dot product is the cosine similarity
+            scores = (self._matrix @ vector.T).toarray().ravel()
+            scores[~self._active[:scores.shape[0]]] = 0.0
+
+            for job_id in exclude_ids or []:
+                row = self.row_by_id.get(str(job_id))
+                if row is not None:
+                    scores[row] = 0.0
+
+            # Partial sort: select the top k, then order only those
+            limit = min(limit, scores.shape[0])
+            if limit <= 0:
+                return []
+
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top])]
+
+            return [(self.job_ids[row], float(scores[row])) for row in top if scores[row] > 0]
+
+    def query(self, text: str, limit: int = 10,
+              exclude_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Find the jobs most similar to a text
+
+        Args:
+            text: Query text (e.g. a user profile)
+            limit: Maximum number of results
+            exclude_ids: Job IDs to leave out of the results
+
+        Returns:
+            list: (job_id, cosine similarity) pairs, best first
+        """
+        if not self.is_ready:
+            return []
+
+        return self.query_vector(self.transform([text]), limit, exclude_ids)
+
+    def similar_to(self, job: Dict[str, Any], limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Find the jobs most similar to a given job
+
+        Args:
+            job: Job data
+            limit: Maximum number of results
+
+        Returns:
+            list: (job_id, cosine similarity) pairs, best first
+        """
+        if not self.is_ready:
+            return []
+
+        job_id = str(job.get("id", ""))
+        with self._lock:
+            self._consolidate()
+            row = self.row_by_id.get(job_id)
+            vector = self._matrix[row] if row is not None else None
+
+        if vector is None:
+            vector = self.transform([job_to_text(job)])
+
+        return self.query_vector(vector, limit, exclude_ids=[job_id])
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold the lock shared by all processes writing this index"""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(self.lock_file, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _disk_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.meta_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def save(self, merge: bool = True) -> bool:
+        """
+        Compact and write the index to disk atomically
+
+        Args:
+            merge: If another process saved a newer index, load it and replay
+                this process's changes onto it before writing
+
+        Returns:
+            bool: Success status
+        """
+        if not self.is_ready:
+            return False
+
+        try:
+            with self._lock, self._file_lock():
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+                mtime = self._disk_mtime()
+                if merge and mtime is not None and mtime != self._loaded_mtime:
+                    self._read_files()
+                    self._replay_changes()
+
+                self._consolidate()
+
+                # Drop retired rows before writing
+                keep = np.flatnonzero(self._active[:len(self.job_ids)])
+                if keep.shape[0] != len(self.job_ids):
+                    self._matrix = self._matrix[keep]
+                    self.job_ids = [self.job_ids[row] for row in keep]
+                    self.row_by_id = {job_id: row for row, job_id in enumerate(self.job_ids)}
+                    self._active = np.ones(len(self.job_ids), dtype=bool)
+
+                os.makedirs(self.index_dir, exist_ok=True)
+
+                matrix_tmp = self.matrix_file + ".tmp.npz"
+                sp.save_npz(matrix_tmp, self._matrix, compressed=False)
+
+                meta_tmp = self.meta_file + ".tmp"
+                with open(meta_tmp, "w") as f:
+                    json.dump({
+                        "vocabulary": self.vocabulary,
+                        "idf": self.idf.tolist(),
+                        "job_ids": self.job_ids,
+                        "updated_at": self.updated_at
+                    }, f)
+
+                os.replace(matrix_tmp, self.matrix_file)
+                os.replace(meta_tmp, self.meta_file)
+
+                self._changes = {}
+                self._dirty = 0
+                self._loaded_mtime = self._disk_mtime()
+
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving job vector index: {str(e)}")
+            return False
+
+    def _read_files(self):
+        """Replace the in-memory index with the one on disk"""
+        mtime = self._disk_mtime()
+        with open(self.meta_file, "r") as f:
+            meta = json.load(f)
+
+        self.vocabulary = meta["vocabulary"]
+        self.idf = np.asarray(meta["idf"], dtype=np.float32)
+        self.job_ids = meta["job_ids"]
+        self.row_by_id = {job_id: row for row, job_id in enumerate(self.job_ids)}
+        self.updated_at = meta.get("updated_at", {})
+        self._matrix = sp.load_npz(self.matrix_file).tocsr()
+        self._active = np.ones(len(self.job_ids), dtype=bool)
+        self._pending_rows = []
+        self._loaded_mtime = mtime
+        self._build_counter()
+
+    def load(self) -> bool:
+        """
+        Load the index from disk, discarding unsaved changes
+
+        Returns:
+            bool: Success status
+        """
+        if not SKLEARN_AVAILABLE or not os.path.exists(self.meta_file) or not os.path.exists(self.matrix_file):
+            return False
+
+        try:
+            with self._lock, self._file_lock():
+                self._read_files()
+                self._changes = {}
+                self._dirty = 0
+
+            return True
+
+        except Exception as e:
+            logger.error(f"Error loading job vector index: {str(e)}")
+            return False
+
+    def refresh(self) -> bool:
+        """
+        Reload the index if another process saved a newer version
+
+        Unsaved changes of this process are replayed onto the reloaded index.
+
+        Returns:
+            bool: Whether the index was reloaded
+        """
+        mtime = self._disk_mtime()
+        if mtime is None or mtime == self._loaded_mtime:
+            return False
+
+        try:
+            # The lock keeps a concurrent save from swapping the files mid-read
+            with self._lock, self._file_lock():
+                if self._disk_mtime() == self._loaded_mtime:
+                    return False
+                self._read_files()
+                self._replay_changes()
+            return True
+
+        except Exception as e:
+            logger.error(f"Error reloading job vector index: {str(e)}")
+            return False
+
+# Process-wide index
+_job_index = None
+_job_index_lock = threading.Lock()
+
+
+def get_job_index() -> Optional[JobVectorIndex]:
+    """
+    Get the shared job vector index, loading it from disk on first use
+
+    Returns:
+        JobVectorIndex: Job index, or None if scikit-learn is unavailable
+    """
+    global _job_index
+
+    if not SKLEARN_AVAILABLE:
+        return None
+
+    if _job_index is None:
+        with _job_index_lock:
+            if _job_index is None:
+                index = JobVectorIndex()
+                index.load()
+                # Save changes still waiting for the autosave timer
+                atexit.register(index.flush)
+                _job_index = index
+    else:
+        _job_index.refresh()
+
+    return _job_index
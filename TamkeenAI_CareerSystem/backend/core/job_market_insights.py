@@ -131,21 +131,26 @@ class JobMarketAnalyzer:
             market_data = JobMarketData(
                 id=str(uuid.uuid4()),
                 data_type=query_type,
-                data=json.dumps(result),
-                created_at=datetime.now().isoformat(),
-                expires_at=(datetime.now() + timedelta(seconds=self.cache_ttl)).isoformat()
+                data_value=result,
+                source="api",
+                timestamp=datetime.now().isoformat()
             )
-            market_data.save()
             
             # Save query
             query = JobMarketQuery(
                 id=str(uuid.uuid4()),
                 query_type=query_type,
-                query_params=json.dumps(query_params),
-                result_id=market_data.id,
-                created_at=datetime.now().isoformat()
+                query_params=query_params,
+                results_summary={"result_id": market_data.id}
             )
-            query.save()
+            
+            # Both rows are written with single-statement upserts in one transaction
+            # save() reports failure by returning False, so raise to roll back
+            with get_db().transaction():
+                if not market_data.save():
+                    raise DatabaseError("Could not save job market data")
+                if not query.save():
+                    raise DatabaseError("Could not save job market query")
             
         except Exception as e:
             logger.error(f"Error saving query result: {str(e)}")
@@ -447,7 +452,6 @@ class JobMarketAnalyzer:
             # Generate synthetic data for demo purposes
             if FEATURES.get('demo_mode', False):
                 import random
-                from datetime import datetime, timedelta
                 
                 dates = []
                 values = []
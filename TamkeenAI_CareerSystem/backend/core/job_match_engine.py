@@ -0,0 +1,291 @@
+"""
+Job Match Engine Module
+
+This module provides a vectorised implementation of JobMatcher's match score.
+A job catalogue is encoded once into numpy arrays (a sparse job x skill
+incidence matrix, minimum experience, and ids into tables of distinct titles,
+industries and required degrees). Scoring a profile then only compares the
+profile against each distinct skill, title, industry and degree, and combines
+the results for every job in a few array operations. Top matches are selected
+with argpartition instead of sorting the whole catalogue.
+"""
+
+import re
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+# Import utilities
+from backend.utils.preprocess import extract_skills
+
+# Try to import optional dependencies
+try:
+    import numpy as np
+    import scipy.sparse as sp
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logging.warning("numpy/scipy not installed. Vectorised job matching will be unavailable. Install with: pip install numpy scipy")
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Separator between strings in a StringTable's search blob
+_SEPARATOR = "\x00"
+
+
+class StringTable:
+    """Distinct strings with ids, searchable for substring relations in both directions"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.strings: List[str] = []
+        self._blob = None
+        self._offsets = None
+        self._max_len = 0
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def add(self, value: str) -> int:
+        """Id of value, adding it if it is new"""
+        string_id = self.index.get(value)
+        if string_id is None:
+            string_id = self.index[value] = len(self.strings)
+            self.strings.append(value)
+            self._blob = None
+        return string_id
+
+    def _freeze(self):
+        offsets = []
+        position = 0
+        for value in self.strings:
+            offsets.append(position)
+            position += len(value) + 1
+        self._blob = _SEPARATOR.join(self.strings)
+        self._offsets = np.array(offsets, dtype=np.int64)
+        self._max_len = max((len(value) for value in self.strings), default=0)
+
+    def related(self, value: str) -> "np.ndarray":
+        """
+        Find the strings that contain value or are contained in it
+
+        Args:
+            value: String to compare against the table
+
+        Returns:
+            Boolean mask over string ids
+        """
+        mask = np.zeros(len(self.strings), dtype=bool)
+        if not self.strings:
+            return mask
+        if not value:
+            # The empty string is contained in every string
+            mask[:] = True
+            return mask
+        if self._blob is None:
+            self._freeze()
+
+        # Strings containing value: one scan of the joined strings
+        if _SEPARATOR in value:
+            mask |= np.fromiter((value in s for s in self.strings), dtype=bool, count=len(self.strings))
+        else:
+            for match in re.finditer(re.escape(value), self._blob):
+                mask[np.searchsorted(self._offsets, match.start(), side="right") - 1] = True
+
+        # Strings contained in value: look up each of its substrings
+        if "" in self.index:
+            mask[self.index[""]] = True
+        for start in range(len(value)):
+            for end in range(start + 1, min(len(value), start + self._max_len) + 1):
+                string_id = self.index.get(value[start:end])
+                if string_id is not None:
+                    mask[string_id] = True
+        return mask
+
+
+class JobMatchEngine:
+    """Job catalogue encoded for vectorised match scoring"""
+
+    def __init__(self, jobs: List[Dict[str, Any]], matcher: Any):
+        """
+        Encode a job catalogue
+
+        Args:
+            jobs: List of job postings
+            matcher: JobMatcher whose education and industry rules are applied
+        """
+        self.jobs = jobs
+        self.matcher = matcher
+        self._rows_by_id = None
+
+        self.skills = StringTable()
+        self.titles = StringTable()
+        self.industries = StringTable()
+        self.degrees = StringTable()
+
+        n_jobs = len(jobs)
+        indptr = np.zeros(n_jobs + 1, dtype=np.int64)
+        skill_ids = []
+        title_ids = np.empty(n_jobs, dtype=np.int64)
+        industry_ids = np.empty(n_jobs, dtype=np.int64)
+        degree_ids = np.empty(n_jobs, dtype=np.int64)
+        min_experience = np.empty(n_jobs, dtype=np.float64)
+
+        for row, job in enumerate(jobs):
+            job_skills = [skill.lower() for skill in job.get("skills", [])]
+            job_description = job.get("description", "").lower()
+            # Add skills from description if not provided
+            if not job_skills and job_description:
+                job_skills = extract_skills(job_description)
+
+            skill_ids.extend(self.skills.add(skill) for skill in job_skills)
+            indptr[row + 1] = len(skill_ids)
+            title_ids[row] = self.titles.add(job.get("title", "").lower())
+            industry_ids[row] = self.industries.add(job.get("industry", "").lower())
+            degree_ids[row] = self.degrees.add(job.get("required_degree", "").lower())
+            min_experience[row] = job.get("min_experience", 0) or 0
+
+        # Repeated skills of a job are separate entries, so they count twice as before
+        self.skill_matrix = sp.csr_matrix(
+            (np.ones(len(skill_ids)), np.array(skill_ids, dtype=np.int64), indptr),
+            shape=(n_jobs, len(self.skills))
+        )
+        self.skill_counts = np.diff(indptr).astype(np.float64)
+        self.title_ids = title_ids
+        self.industry_ids = industry_ids
+        self.degree_ids = degree_ids
+        self.min_experience = min_experience
+
+        logger.info(f"Encoded {n_jobs} jobs for matching ({len(self.skills)} skills, "
+                    f"{len(self.titles)} titles, {len(self.industries)} industries)")
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def rows_for(self, jobs: List[Dict[str, Any]]) -> "np.ndarray":
+        """Rows of jobs (a subset of the catalogue, e.g. after filtering)"""
+        if self._rows_by_id is None:
+            self._rows_by_id = {id(job): row for row, job in enumerate(self.jobs)}
+        return np.array([self._rows_by_id[id(job)] for job in jobs], dtype=np.int64)
+
+    def score(self, user_profile: Dict[str, Any]) -> "np.ndarray":
+        """
+        Calculate the match score of every job, as JobMatcher._calculate_match_score
+
+        Args:
+            user_profile: User profile data
+
+        Returns:
+            Match scores (0-100), one per job
+        """
+        user_skills = [skill.lower() for skill in user_profile.get("skills", [])]
+        user_title = user_profile.get("current_role", "").lower()
+        user_target_role = user_profile.get("target_role", "").lower()
+        user_years_experience = user_profile.get("years_experience", 0)
+        user_degree_level = self.matcher._get_highest_degree_level(user_profile.get("education", []))
+
+        # Skill match: each job skill counts 1 if the first user skill related to it
+        # is an exact match, 0.5 if it is a partial match
+        skill_score = np.zeros(len(self.jobs))
+        if user_skills and len(self.skills):
+            credit = np.zeros(len(self.skills))
+            unassigned = np.ones(len(self.skills), dtype=bool)
+            for user_skill in user_skills:
+                hit = self.skills.related(user_skill) & unassigned
+                if hit.any():
+                    credit[hit] = 0.5
+                    exact = self.skills.index.get(user_skill)
+                    if exact is not None and hit[exact]:
+                        credit[exact] = 1.0
+                    unassigned &= ~hit
+                    if not unassigned.any():
+                        break
+
+            matching_skills = self.skill_matrix @ credit
+            has_skills = self.skill_counts > 0
+            skill_match_percentage = np.zeros(len(self.jobs))
+            skill_match_percentage[has_skills] = (matching_skills[has_skills] / self.skill_counts[has_skills]) * 100
+            skill_score = np.where(has_skills, np.minimum(40, skill_match_percentage * 0.4), 0)
+
+        # Title match
+        title_match = np.zeros(len(self.titles), dtype=bool)
+        if user_title:
+            title_match |= self.titles.related(user_title)
+        if user_target_role:
+            title_match |= self.titles.related(user_target_role)
+        title_score = np.where(title_match, 20, 0)[self.title_ids]
+
+        # Industry match
+        user_industries = set()
+        for exp in user_profile.get("experience", []):
+            exp_industry = exp.get("industry", "").lower()
+            if exp_industry:
+                user_industries.add(exp_industry)
+
+        industry_points = np.zeros(len(self.industries))
+        for industry_id, job_industry in enumerate(self.industries.strings):
+            if not job_industry:
+                continue
+            if job_industry in user_industries:
+                industry_points[industry_id] = 10
+            elif any(self.matcher._are_industries_related(job_industry, ui) for ui in user_industries):
+                industry_points[industry_id] = 5
+        industry_score = industry_points[self.industry_ids]
+
+        # Experience match
+        job_min_experience = self.min_experience
+        experience_score = np.where(
+            user_years_experience >= job_min_experience,
+            np.where(user_years_experience <= job_min_experience + 2, 15, 10),
+            np.where((job_min_experience > 0) & (user_years_experience >= job_min_experience * 0.7), 5, 0)
+        )
+
+        # Education match
+        education_points = np.array([
+            15 if not required_degree or required_degree == "none"
+            or self.matcher._meets_education_requirement(user_degree_level, required_degree) else 0
+            for required_degree in self.degrees.strings
+        ], dtype=np.float64)
+        education_score = education_points[self.degree_ids]
+
+        # Combine scores
+        score = skill_score + title_score + industry_score + experience_score + education_score
+        return np.clip(score, 0, 100)
+
+    def top_matches(self, user_profile: Dict[str, Any], limit: int = 10,
+                    rows: Optional["np.ndarray"] = None) -> List[Tuple[int, float]]:
+        """
+        Find the best matching jobs for a profile
+
+        Ties are ordered by catalogue position, as a stable sort of the jobs by
+        descending score would order them.
+
+        Args:
+            user_profile: User profile data
+            limit: Maximum number of matches to return
+            rows: Catalogue rows to consider (default: all jobs)
+
+        Returns:
+            List of (row, match score) tuples, best first
+        """
+        if rows is None:
+            rows = np.arange(len(self.jobs))
+        if limit <= 0 or len(rows) == 0:
+            return []
+
+        scores = self.score(user_profile)[rows]
+        if limit < len(rows):
+            candidates = np.argpartition(-scores, limit - 1)[:limit]
+            kth_score = scores[candidates].min()
+            above = np.flatnonzero(scores > kth_score)
+            tied = np.flatnonzero(scores == kth_score)[:limit - len(above)]
+            top = np.concatenate([above, tied])
+        else:
+            top = np.arange(len(rows))
+        top = top[np.lexsort((top, -scores[top]))]
+
+        matches = []
+        for position in top:
+            score = float(scores[position])
+            matches.append((int(rows[position]), int(score) if score.is_integer() else score))
+        return matches
@@ -8,18 +8,23 @@ generating personalized job recommendations, and scoring job fit.
 import logging
 import json
 import requests
-from backend.core.job_matching import JobMatcher
 from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 import random
 
 # Import utilities
-from backend.utils.preprocess import extract_skills, preprocess_text
+from backend.utils.preprocess import extract_skills
 from backend.utils.cache_utils import cache_result
 
 # Import settings
 from backend.config.settings import DEEPSEEK_API_KEY
 
+# Vectorised scoring (needs numpy and scipy)
+try:
+    from backend.core.job_match_engine import JobMatchEngine, NUMPY_AVAILABLE as MATCH_ENGINE_AVAILABLE
+except ImportError:
+    MATCH_ENGINE_AVAILABLE = False
+
 # Setup logger
 logger = logging.getLogger(__name__)
 
@@ -36,6 +41,9 @@ class JobMatcher:
         
         # Load industry keywords
         self.industry_keywords = self._load_industry_keywords()
+        
+        # Encoded job catalogue of the last match_jobs call
+        self._match_engine = None
     
     def _load_skill_taxonomy(self) -> Dict[str, List[str]]:
         """
@@ -147,6 +155,19 @@ class JobMatcher:
             if filters:
                 filtered_jobs = self._apply_job_filters(jobs, filters)
             
+            # Score all jobs at once and explain only the returned ones
+            engine = self._get_match_engine(jobs)
+            if engine is not None:
+                rows = engine.rows_for(filtered_jobs) if filters else None
+                return [
+                    {
+                        "job": jobs[row],
+                        "match_score": score,
+                        "match_factors": self._get_match_factors(user_profile, jobs[row], score)
+                    }
+                    for row, score in engine.top_matches(user_profile, limit, rows)
+                ]
+            
             # Calculate match scores for each job
             scored_jobs = []
             for job in filtered_jobs:
@@ -170,6 +191,33 @@ class JobMatcher:
             logger.error(f"Error matching jobs: {str(e)}")
             return []
     
+    def index_jobs(self, jobs: List[Dict[str, Any]]) -> bool:
+        """
+        Encode a job catalogue for vectorised matching
+        
+        match_jobs reuses the encoding while it is called with the same list
+        of the same length; call this again after editing jobs in place.
+        
+        Args:
+            jobs: List of job postings
+            
+        Returns:
+            True if the catalogue was encoded
+        """
+        if not MATCH_ENGINE_AVAILABLE:
+            return False
+        
+        self._match_engine = JobMatchEngine(jobs, self)
+        return True
+    
+    def _get_match_engine(self, jobs: List[Dict[str, Any]]) -> Optional["JobMatchEngine"]:
+        """Encoded catalogue for jobs, encoding it if it changed"""
+        engine = self._match_engine
+        if engine is not None and engine.jobs is jobs and len(engine) == len(jobs):
+            return engine
+        
+        return self._match_engine if self.index_jobs(jobs) else None
+    
     def _apply_job_filters(self, jobs: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Apply filters to job list
@@ -19,16 +19,7 @@ from backend.utils.preprocess import (
     extract_experience_from_text
 )
 from backend.utils.cache_utils import cache_result
-
-# Try to import optional dependencies
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    import numpy as np
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
-    logging.warning("scikit-learn not installed. Advanced recommendations will be unavailable. Install with: pip install scikit-learn")
+from backend.core.job_index import get_job_index, SKLEARN_AVAILABLE
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -39,16 +30,9 @@ class JobRecommender:
     
     def __init__(self):
         """Initialize job recommender"""
-        # Initialize TF-IDF vectorizer if scikit-learn is available
-        if SKLEARN_AVAILABLE:
-            self.vectorizer = TfidfVectorizer(
-                stop_words='english',
-                min_df=2,
-                max_df=0.85,
-                ngram_range=(1, 2)
-            )
-        else:
-            self.vectorizer = None
+        # Content-based recommendations query the shared job vector index,
+        # which is fitted once and kept in sync as jobs change
+        self.job_index = None
     
     def recommend_jobs_for_user(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -91,18 +75,16 @@ class JobRecommender:
                     if "title" in exp:
                         user_job_titles.append(normalize_job_title(exp["title"]))
             
-            # Get active jobs
-            jobs = Job.find_active_jobs()
-            job_dicts = [job.to_dict() for job in jobs]
-            
             # Generate recommendations
-            if SKLEARN_AVAILABLE and len(user_skills) > 0:
-                # Use content-based filtering
+            job_index = self._get_job_index() if len(user_skills) > 0 else None
+            if job_index is not None:
+                # Use content-based filtering over the job index
                 recommendations = self._content_based_recommendations(
-                    job_dicts, user_skills, user_job_titles, limit
+                    job_index, user_skills, user_job_titles, limit
                 )
             else:
                 # Fall back to simple matching
+                job_dicts = [job.to_dict() for job in Job.find_active_jobs()]
                 recommendations = self._simple_recommendations(
                     job_dicts, user_skills, user_job_titles, limit
                 )
@@ -144,16 +126,14 @@ class JobRecommender:
             
             job = jobs[0].to_dict()
             
-            # Get active jobs
-            all_jobs = Job.find_active_jobs()
-            job_dicts = [j.to_dict() for j in all_jobs if j.id != job_id]
-            
             # Generate recommendations
-            if SKLEARN_AVAILABLE:
-                # Use content-based filtering
-                recommendations = self._find_similar_jobs(job, job_dicts, limit)
+            job_index = self._get_job_index()
+            if job_index is not None:
+                # Use content-based filtering over the job index
+                recommendations = self._find_similar_jobs(job_index, job, limit)
             else:
                 # Fall back to simple matching
+                job_dicts = [j.to_dict() for j in Job.find_active_jobs() if j.id != job_id]
                 recommendations = self._simple_similar_jobs(job, job_dicts, limit)
             
             return recommendations
@@ -293,48 +273,86 @@ class JobRecommender:
             logger.error(f"Error getting skill recommendations: {str(e)}")
             return []
     
-    def _content_based_recommendations(self, jobs, user_skills, user_job_titles, limit):
-        """Generate content-based job recommendations"""
+    def _get_job_index(self):
+        """
+        Get the shared job index, fitting it from the active jobs on first use
+        
+        An index loaded from disk is checked against the job catalogue once, so
+        changes a previous process did not save are applied.
+        """
+        if not SKLEARN_AVAILABLE:
+            return None
+        
+        job_index = self.job_index if self.job_index is not None else get_job_index()
+        
+        if job_index is None:
+            return None
+        
+        if not job_index.is_ready:
+            # Import models here to avoid circular imports
+            from backend.database.models import Job
+            job_index.fit(job.to_dict() for job in Job.find_active_jobs())
+        elif not job_index.reconciled:
+            self._reconcile_job_index(job_index)
+        
+        return job_index if job_index.is_ready else None
+    
+    def _reconcile_job_index(self, job_index):
+        """Bring a loaded job index up to date with the jobs table"""
+        # Import here to avoid circular imports
+        from backend.database.connector import get_db
+        from backend.database.models import Job
+        
         try:
-            if not jobs:
-                return []
+            rows = get_db().execute("SELECT id, updated_at FROM jobs WHERE status = 'active'")
+            outdated, removed = job_index.stale_jobs({row["id"]: row["updated_at"] for row in rows})
             
-            # Create job texts for vectorization
-            job_texts = []
-            for job in jobs:
-                # Combine relevant fields
-                job_text = f"{job.get('title', '')} {job.get('description', '')} "
-                job_text += f"{' '.join(job.get('skills', []))} "
-                job_text += f"{job.get('company', '')} {job.get('location', '')}"
-                job_texts.append(job_text.lower())
+            if len(outdated) > len(rows) // 2:
+                # Mostly stale (or saved without job versions): refitting is cheaper
+                job_index.fit(job.to_dict() for job in Job.find_active_jobs())
+            else:
+                for job_id in removed:
+                    job_index.remove_job(job_id)
+                job_index.upsert_jobs(self._get_jobs_by_ids(outdated).values())
+                if outdated or removed:
+                    logger.info(f"Updated {len(outdated)} and removed {len(removed)} jobs in the loaded job index")
+            
+            job_index.reconciled = True
             
+        except Exception as e:
+            logger.error(f"Error reconciling job index: {str(e)}")
+    
+    def _get_jobs_by_ids(self, job_ids):
+        """Load jobs by ID, preserving the given order"""
+        # Import models here to avoid circular imports
+        from backend.database.models import Job
+        
+        jobs = {}
+        for job_id in job_ids:
+            found = Job.find_by_id(job_id)
+            if found:
+                jobs[job_id] = found[0].to_dict()
+        
+        return jobs
+    
+    def _content_based_recommendations(self, job_index, user_skills, user_job_titles, limit):
+        """Generate content-based job recommendations"""
+        try:
             # Create user profile text
             user_text = f"{' '.join(user_job_titles)} {' '.join(user_skills)}"
             
-            # Add user text to corpus
-            all_texts = job_texts + [user_text]
-            
-            # Transform texts to TF-IDF features
-            tfidf_matrix = self.vectorizer.fit_transform(all_texts)
-            
-            # Calculate similarity between user profile and jobs
-            user_vector = tfidf_matrix[-1]
-            job_vectors = tfidf_matrix[:-1]
-            
-            # Calculate cosine similarity
-            cosine_similarities = cosine_similarity(user_vector, job_vectors).flatten()
-            
-            # Get top job indices
-            top_indices = cosine_similarities.argsort()[-limit:][::-1]
+            # Score every indexed job against the user profile
+            results = job_index.query(user_text, limit)
+            jobs = self._get_jobs_by_ids([job_id for job_id, _ in results])
             
             # Create recommendation results
             recommendations = []
-            for idx in top_indices:
-                if cosine_similarities[idx] > 0:
-                    job = jobs[idx]
+            for job_id, score in results:
+                job = jobs.get(job_id)
+                if job:
                     recommendations.append({
                         "job": job,
-                        "score": float(cosine_similarities[idx]),
+                        "score": score,
                         "match_reason": self._get_match_reason(job, user_skills, user_job_titles)
                     })
             
@@ -342,6 +360,10 @@ class JobRecommender:
         
         except Exception as e:
             logger.error(f"Error in content-based recommendations: {str(e)}")
+            
+            # Import models here to avoid circular imports
+            from backend.database.models import Job
+            jobs = [job.to_dict() for job in Job.find_active_jobs()]
             return self._simple_recommendations(jobs, user_skills, user_job_titles, limit)
     
     def _simple_recommendations(self, jobs, user_skills, user_job_titles, limit):
@@ -403,50 +425,21 @@ class JobRecommender:
             logger.error(f"Error in simple recommendations: {str(e)}")
             return []
     
-    def _find_similar_jobs(self, job, other_jobs, limit):
+    def _find_similar_jobs(self, job_index, job, limit):
         """Find similar jobs using content-based filtering"""
         try:
-            if not other_jobs:
-                return []
-            
-            # Create job texts for vectorization
-            job_texts = []
-            for other_job in other_jobs:
-                # Combine relevant fields
-                job_text = f"{other_job.get('title', '')} {other_job.get('description', '')} "
-                job_text += f"{' '.join(other_job.get('skills', []))} "
-                job_text += f"{other_job.get('company', '')} {other_job.get('location', '')}"
-                job_texts.append(job_text.lower())
-            
-            # Create target job text
-            target_job_text = f"{job.get('title', '')} {job.get('description', '')} "
-            target_job_text += f"{' '.join(job.get('skills', []))} "
-            target_job_text += f"{job.get('company', '')} {job.get('location', '')}"
-            
-            # Add target job text to corpus
-            all_texts = job_texts + [target_job_text]
-            
-            # Transform texts to TF-IDF features
-            tfidf_matrix = self.vectorizer.fit_transform(all_texts)
-            
-            # Calculate similarity between target job and other jobs
-            target_vector = tfidf_matrix[-1]
-            other_vectors = tfidf_matrix[:-1]
-            
-            # Calculate cosine similarity
-            cosine_similarities = cosine_similarity(target_vector, other_vectors).flatten()
-            
-            # Get top job indices
-            top_indices = cosine_similarities.argsort()[-limit:][::-1]
+            # Score every indexed job against the target job
+            results = job_index.similar_to(job, limit)
+            other_jobs = self._get_jobs_by_ids([job_id for job_id, _ in results])
             
             # Create similar jobs results
             similar_jobs = []
-            for idx in top_indices:
-                if cosine_similarities[idx] > 0:
-                    similar_job = other_jobs[idx]
+            for job_id, score in results:
+                similar_job = other_jobs.get(job_id)
+                if similar_job:
                     similar_jobs.append({
                         "job": similar_job,
-                        "similarity_score": float(cosine_similarities[idx]),
+                        "similarity_score": score,
                         "common_skills": self._get_common_skills(job.get('skills', []), similar_job.get('skills', []))
                     })
             
@@ -454,6 +447,10 @@ class JobRecommender:
         
         except Exception as e:
             logger.error(f"Error finding similar jobs: {str(e)}")
+            
+            # Import models here to avoid circular imports
+            from backend.database.models import Job
+            other_jobs = [j.to_dict() for j in Job.find_active_jobs() if j.id != job.get('id')]
             return self._simple_similar_jobs(job, other_jobs, limit)
     
     def _simple_similar_jobs(self, job, other_jobs, limit):
@@ -3,8 +3,9 @@ import json
 import time
 import random
 import logging
-from typing import Dict, List, Tuple, Any, Optional, Union
+from typing import Dict, List, Tuple, Any, Optional, Union, Callable, Iterator
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import requests
 import re
 import hashlib
@@ -27,6 +28,17 @@ try:
 except ImportError:
     NLTK_AVAILABLE = False
 
+# Seconds to wait for a single job board, and for a whole multi-board search
+BOARD_TIMEOUT = float(os.environ.get('JOB_BOARD_TIMEOUT', 8))
+SEARCH_DEADLINE = float(os.environ.get('JOB_SEARCH_DEADLINE', 12))
+
+# Threads shared by a JobSearch's board requests (a timed-out request keeps
+# its thread until the board answers or its HTTP timeout fires)
+SEARCH_WORKERS = 16
+
+# A board adapter takes (query, location, filters) and returns job dicts
+BoardAdapter = Callable[[str, Optional[str], Dict[str, Any]], List[Dict[str, Any]]]
+
 
 class JobSearch:
     """
@@ -38,7 +50,10 @@ class JobSearch:
                api_keys: Optional[Dict[str, str]] = None,
                cache_dir: Optional[str] = None,
                cache_duration: int = 3600,  # 1 hour cache by default
-               user_agent: Optional[str] = None):
+               user_agent: Optional[str] = None,
+               board_adapters: Optional[Dict[str, BoardAdapter]] = None,
+               board_timeout: float = BOARD_TIMEOUT,
+               search_deadline: float = SEARCH_DEADLINE):
         """
         Initialize the job search engine
         
@@ -47,9 +62,17 @@ class JobSearch:
             cache_dir: Directory to cache job search results
             cache_duration: Duration to cache results (in seconds)
             user_agent: Custom user agent string for API requests
+            board_adapters: Search functions by board name, replacing or adding to
+                the built-in _search_<board> methods (e.g. local fakes for testing)
+            board_timeout: Seconds to wait for each job board
+            search_deadline: Seconds after which a search returns whatever has arrived
         """
         self.api_keys = api_keys or {}
         self.cache_duration = cache_duration
+        self.board_timeout = board_timeout
+        self.search_deadline = search_deadline
+        self.board_timeouts = {}
+        self._executor = None
         self.logger = logging.getLogger(__name__)
         
         # Set up cache directory
@@ -85,8 +108,36 @@ class JobSearch:
         self.available_boards.append("usajobs")
         self.available_boards.append("github_jobs")
         
+        # Boards with a search implementation
+        self.board_adapters = {}
+        for board in self.available_boards:
+            board_method = getattr(self, f"_search_{board}", None)
+            if board_method:
+                self.board_adapters[board] = board_method
+        for board, adapter in (board_adapters or {}).items():
+            self.register_board(board, adapter)
+        
         self.logger.info(f"Job search initialized with boards: {', '.join(self.available_boards)}")
         
+    def register_board(self,
+                     board: str,
+                     adapter: BoardAdapter,
+                     timeout: Optional[float] = None) -> None:
+        """
+        Add a job board, or replace how an existing one is searched
+        
+        Args:
+            board: Job board name
+            adapter: Function called as adapter(query, location, filters) that
+                returns a list of job dictionaries
+            timeout: Seconds to wait for this board (defaults to board_timeout)
+        """
+        if board not in self.available_boards:
+            self.available_boards.append(board)
+        self.board_adapters[board] = adapter
+        if timeout is not None:
+            self.board_timeouts[board] = timeout
+    
     def search_jobs(self, 
                   query: str,
                   location: Optional[str] = None,
@@ -108,48 +159,112 @@ class JobSearch:
         Returns:
             List of job listings
         """
+        return self.search_jobs_with_sources(query, location, job_boards, filters, limit, sort_by)["jobs"]
+    
+    def search_jobs_with_sources(self,
+                               query: str,
+                               location: Optional[str] = None,
+                               job_boards: Optional[List[str]] = None,
+                               filters: Optional[Dict[str, Any]] = None,
+                               limit: int = 50,
+                               sort_by: str = "relevance") -> Dict[str, Any]:
+        """
+        Search job boards concurrently and report which of them answered
+        
+        Every board is queried at once. A board that has not answered within its
+        timeout, or by the overall search deadline, is given up on and listed in
+        sources_failed, as is a board whose search raised. Jobs listed on several
+        boards (same normalised title, company and location) are kept once, from
+        the first board in job_boards order.
+        
+        Args:
+            query: Search query (job title, keywords, etc.)
+            location: Job location
+            job_boards: List of job boards to search (defaults to all available)
+            filters: Additional filters (experience level, job type, etc.)
+            limit: Maximum number of results to return
+            sort_by: How to sort results (relevance, date, salary)
+            
+        Returns:
+            Dictionary with jobs, sources (boards that answered), sources_failed,
+            errors (reason per failed board), partial and cached
+        """
         filters = filters or {}
         job_boards = job_boards or self.available_boards
+        boards = self._searchable_boards(job_boards)
         
         # Check cache first
         cache_key = self._generate_cache_key(query, location, job_boards, filters, sort_by)
         cached_results = self._get_cached_results(cache_key)
         if cached_results:
             self.logger.info(f"Returning cached results for query: {query}")
-            return cached_results[:limit]
+            return {"jobs": cached_results[:limit], "sources": boards, "sources_failed": [],
+                    "errors": {}, "partial": False, "cached": True}
+        
+        board_results = {}
+        errors = {}
+        for board, jobs, error in self._fan_out(query, location, boards, filters):
+            if error is None:
+                board_results[board] = jobs
+            else:
+                errors[board] = error
         
-        # Initialize results
+        # Merge in the requested order so results do not depend on which board answered first
+        seen = set()
         all_results = []
-        
-        # Search each job board
-        for board in job_boards:
-            if board not in self.available_boards:
-                self.logger.warning(f"Job board '{board}' is not available")
-                continue
-                
-            try:
-                board_method = getattr(self, f"_search_{board}", None)
-                if board_method:
-                    board_results = board_method(query, location, filters)
-                    if board_results:
-                        for job in board_results:
-                            job['source'] = board
-                        all_results.extend(board_results)
-                        self.logger.info(f"Found {len(board_results)} jobs on {board}")
-                else:
-                    self.logger.warning(f"Search method for '{board}' not implemented")
-            except Exception as e:
-                self.logger.error(f"Error searching {board}: {str(e)}")
+        for board in boards:
+            all_results.extend(self._unique_jobs(board_results.get(board, []), seen))
         
         # Sort results
         sorted_results = self._sort_results(all_results, sort_by)
         
-        # Cache results
-        if self.cache_dir:
+        # Cache results (partial results would hide the missing boards until expiry)
+        if self.cache_dir and not errors:
             self._cache_results(cache_key, sorted_results)
         
-        # Return limited results
-        return sorted_results[:limit]
+        sources_failed = [board for board in boards if board in errors]
+        if sources_failed:
+            self.logger.warning(f"Job search for '{query}' returned without: {', '.join(sources_failed)}")
+        
+        return {
+            "jobs": sorted_results[:limit],
+            "sources": [board for board in boards if board in board_results],
+            "sources_failed": sources_failed,
+            "errors": errors,
+            "partial": bool(sources_failed),
+            "cached": False
+        }
+    
+    def stream_jobs(self,
+                  query: str,
+                  location: Optional[str] = None,
+                  job_boards: Optional[List[str]] = None,
+                  filters: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Search job boards concurrently, yielding each board's jobs as it answers
+        
+        Jobs already yielded for another board are left out. Results are neither
+        sorted nor cached; the iterator ends once every board has answered or
+        failed, or the search deadline has passed.
+        
+        Args:
+            query: Search query (job title, keywords, etc.)
+            location: Job location
+            job_boards: List of job boards to search (defaults to all available)
+            filters: Additional filters (experience level, job type, etc.)
+            
+        Yields:
+            One dictionary per board: source, jobs and error (None, or the
+            reason the board failed, in which case jobs is empty)
+        """
+        boards = self._searchable_boards(job_boards or self.available_boards)
+        seen = set()
+        for board, jobs, error in self._fan_out(query, location, boards, filters or {}):
+            yield {
+                "source": board,
+                "jobs": self._unique_jobs(jobs, seen) if error is None else [],
+                "error": error
+            }
     
     def get_job_details(self, job_id: str, source: str) -> Optional[Dict[str, Any]]:
         """
@@ -395,6 +510,95 @@ class JobSearch:
         except Exception as e:
             self.logger.error(f"Error writing cache: {str(e)}")
             
+    def _searchable_boards(self, job_boards: List[str]) -> List[str]:
+        """Requested boards that can be searched, in order, without duplicates"""
+        boards = []
+        for board in job_boards:
+            if board not in self.available_boards:
+                self.logger.warning(f"Job board '{board}' is not available")
+            elif board not in self.board_adapters:
+                self.logger.warning(f"Search method for '{board}' not implemented")
+            elif board not in boards:
+                boards.append(board)
+        return boards
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="job-search")
+        return self._executor
+    
+    def _fan_out(self,
+               query: str,
+               location: Optional[str],
+               boards: List[str],
+               filters: Dict[str, Any]) -> Iterator[Tuple[str, List[Dict[str, Any]], Optional[str]]]:
+        """
+        Query boards concurrently, yielding (board, jobs, error) as each finishes
+        
+        A board that has not answered by min(its timeout, the search deadline)
+        is yielded with error "timeout"; its request is left to finish in the
+        background and its result is discarded.
+        """
+        if not boards:
+            return
+        
+        start = time.monotonic()
+        search_deadline = start + self.search_deadline
+        executor = self._get_executor()
+        
+        futures = {}
+        deadlines = {}
+        for board in boards:
+            future = executor.submit(self.board_adapters[board], query, location, filters)
+            futures[future] = board
+            deadlines[future] = min(start + self.board_timeouts.get(board, self.board_timeout), search_deadline)
+        
+        pending = set(futures)
+        while pending:
+            next_deadline = min(deadlines[future] for future in pending)
+            done, pending = wait(pending, timeout=max(0.0, next_deadline - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                board = futures[future]
+                try:
+                    jobs = future.result() or []
+                except Exception as e:
+                    self.logger.error(f"Error searching {board}: {str(e)}")
+                    yield board, [], f"error: {str(e)}"
+                    continue
+                for job in jobs:
+                    job['source'] = board
+                self.logger.info(f"Found {len(jobs)} jobs on {board} in {time.monotonic() - start:.2f}s")
+                yield board, jobs, None
+            
+            now = time.monotonic()
+            for future in [future for future in pending if deadlines[future] <= now]:
+                pending.discard(future)
+                future.cancel()
+                self.logger.warning(f"Job board '{futures[future]}' timed out after {now - start:.2f}s")
+                yield futures[future], [], "timeout"
+    
+    @staticmethod
+    def _dedupe_key(job: Dict[str, Any]) -> tuple:
+        """Normalised (title, company, location) identifying a job across boards"""
+        key = tuple(re.sub(r'[^a-z0-9]+', ' ', str(job.get(field) or '').lower()).strip()
+                    for field in ('title', 'company', 'location'))
+        if not any(key):
+            # Nothing to compare on; only drop exact repeats from the same board
+            return ('id', job.get('source'), job.get('id') or id(job))
+        return key
+    
+    def _unique_jobs(self, jobs: List[Dict[str, Any]], seen: set) -> List[Dict[str, Any]]:
+        """Jobs whose dedupe key is not in seen (which is updated)"""
+        unique = []
+        for job in jobs:
+            key = self._dedupe_key(job)
+            if key not in seen:
+                seen.add(key)
+                unique.append(job)
+        return unique
+    
     def _sort_results(self, 
                     results: List[Dict[str, Any]], 
                     sort_by: str) -> List[Dict[str, Any]]:
@@ -475,81 +679,83 @@ class JobSearch:
                      query: str, 
                      location: Optional[str], 
                      filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Search jobs on USAJobs"""
-        try:
-            # USAJobs API endpoint
-            url = "https://data.usajobs.gov/api/search"
-            
-            # Prepare request parameters
-            params = {
-                "Keyword": query,
-                "ResultsPerPage": 50
+        """
+        Search jobs on USAJobs
+        
+        Raises:
+            Exception: If the request fails or USAJobs answers with an error
+        """
+        # USAJobs API endpoint
+        url = "https://data.usajobs.gov/api/search"
+        
+        # Prepare request parameters
+        params = {
+            "Keyword": query,
+            "ResultsPerPage": 50
+        }
+        
+        if location:
+            params["LocationName"] = location
+            
+        # Map filters to USAJobs parameters
+        if "job_type" in filters:
+            job_type_map = {
+                "full_time": "Full-time",
+                "part_time": "Part-time",
+                "contract": "Term",
+                "temporary": "Temporary",
+                "internship": "Internship"
             }
+            params["WorkSchedule"] = job_type_map.get(filters["job_type"], "Full-time")
             
-            if location:
-                params["LocationName"] = location
-                
-            # Map filters to USAJobs parameters
-            if "job_type" in filters:
-                job_type_map = {
-                    "full_time": "Full-time",
-                    "part_time": "Part-time",
-                    "contract": "Term",
-                    "temporary": "Temporary",
-                    "internship": "Internship"
-                }
-                params["WorkSchedule"] = job_type_map.get(filters["job_type"], "Full-time")
-                
-            if "experience_level" in filters:
-                exp_level_map = {
-                    "entry": "15",  # GS-1/5
-                    "mid": "59",    # GS-6/9
-                    "senior": "1112"  # GS-11/12
-                }
-                params["PayGradeHigh"] = exp_level_map.get(filters["experience_level"], "")
-                
-            # Request headers
-            headers = {
-                "User-Agent": self.user_agent,
-                "Host": "data.usajobs.gov"
+        if "experience_level" in filters:
+            exp_level_map = {
+                "entry": "15",  # GS-1/5
+                "mid": "59",    # GS-6/9
+                "senior": "1112"  # GS-11/12
             }
+            params["PayGradeHigh"] = exp_level_map.get(filters["experience_level"], "")
             
-            # Add API key if available
-            if "usajobs_api_key" in self.api_keys:
-                headers["Authorization-Key"] = self.api_keys["usajobs_api_key"]
-                
-            # Make the request
-            response = requests.get(url, params=params, headers=headers)
+        # Request headers
+        headers = {
+            "User-Agent": self.user_agent,
+            "Host": "data.usajobs.gov"
+        }
+        
+        # Add API key if available
+        if "usajobs_api_key" in self.api_keys:
+            headers["Authorization-Key"] = self.api_keys["usajobs_api_key"]
             
-            if response.status_code != 200:
-                self.logger.error(f"USAJobs API error: {response.status_code}")
-                return []
-                
-            data = response.json()
-            
-            # Parse response
-            jobs = []
-            for item in data.get("SearchResult", {}).get("SearchResultItems", []):
-                job = {
-                    "id": item.get("MatchedObjectId", ""),
-                    "title": item.get("MatchedObjectDescriptor", {}).get("PositionTitle", ""),
-                    "company": item.get("MatchedObjectDescriptor", {}).get("DepartmentName", ""),
-                    "location": item.get("MatchedObjectDescriptor", {}).get("PositionLocationDisplay", ""),
-                    "description": item.get("MatchedObjectDescriptor", {}).get("QualificationSummary", ""),
-                    "url": item.get("MatchedObjectDescriptor", {}).get("ApplyURI", [""])[0],
-                    "date_posted": item.get("MatchedObjectDescriptor", {}).get("PublicationStartDate", ""),
-                    "job_type": item.get("MatchedObjectDescriptor", {}).get("PositionSchedule", [{}])[0].get("Name", ""),
-                    "salary_min": self._parse_salary(item.get("MatchedObjectDescriptor", {}).get("PositionRemuneration", [{}])[0].get("MinimumRange", "")),
-                    "salary_max": self._parse_salary(item.get("MatchedObjectDescriptor", {}).get("PositionRemuneration", [{}])[0].get("MaximumRange", "")),
-                    "source": "usajobs"
-                }
-                jobs.append(job)
-                
-            return jobs
+        # Make the request
+        response = requests.get(url, params=params, headers=headers,
+                                timeout=self.board_timeouts.get("usajobs", self.board_timeout))
+        
+        # Errors propagate so the search reports the board as failed
+        # instead of as a board with no jobs
+        if response.status_code != 200:
+            raise RuntimeError(f"USAJobs API error: {response.status_code}")
             
-        except Exception as e:
-            self.logger.error(f"USAJobs search error: {str(e)}")
-            return []
+        data = response.json()
+        
+        # Parse response
+        jobs = []
+        for item in data.get("SearchResult", {}).get("SearchResultItems", []):
+            job = {
+                "id": item.get("MatchedObjectId", ""),
+                "title": item.get("MatchedObjectDescriptor", {}).get("PositionTitle", ""),
+                "company": item.get("MatchedObjectDescriptor", {}).get("DepartmentName", ""),
+                "location": item.get("MatchedObjectDescriptor", {}).get("PositionLocationDisplay", ""),
+                "description": item.get("MatchedObjectDescriptor", {}).get("QualificationSummary", ""),
+                "url": item.get("MatchedObjectDescriptor", {}).get("ApplyURI", [""])[0],
+                "date_posted": item.get("MatchedObjectDescriptor", {}).get("PublicationStartDate", ""),
+                "job_type": item.get("MatchedObjectDescriptor", {}).get("PositionSchedule", [{}])[0].get("Name", ""),
+                "salary_min": self._parse_salary(item.get("MatchedObjectDescriptor", {}).get("PositionRemuneration", [{}])[0].get("MinimumRange", "")),
+                "salary_max": self._parse_salary(item.get("MatchedObjectDescriptor", {}).get("PositionRemuneration", [{}])[0].get("MaximumRange", "")),
+                "source": "usajobs"
+            }
+            jobs.append(job)
+            
+        return jobs
             
     def _generate_mock_jobs(self, 
                          query: str, 
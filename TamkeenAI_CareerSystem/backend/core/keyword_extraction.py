@@ -5,16 +5,15 @@ This module provides functionality for extracting relevant keywords from text,
 particularly focused on job descriptions and resumes.
 """
 
-import os
 import re
-import json
 import logging
 import string
 from typing import Dict, List, Any, Optional, Tuple, Union
 from collections import Counter
 
 # Import utilities
-from backend.utils.preprocess import clean_text, normalize_skill
+from backend.utils.preprocess import clean_text, normalize_skill, SKILL_ALIASES
+from backend.utils.skill_matcher import get_skill_matcher
 
 # Import settings
 from backend.config.settings import SKILLS_FILE
@@ -59,16 +58,6 @@ except ImportError:
     logging.warning("NLTK not installed. Some NLP functions will be unavailable. Install with: pip install nltk")
 
 
-# Load skills list if file exists
-SKILLS_LIST = []
-try:
-    if os.path.exists(SKILLS_FILE):
-        with open(SKILLS_FILE, 'r') as f:
-            SKILLS_LIST = json.load(f)
-except Exception as e:
-    logger.error(f"Error loading skills file: {str(e)}")
-
-
 def extract_keywords(text: str, method: str = "hybrid", max_keywords: int = 20) -> List[str]:
     """
     Extract keywords from text
@@ -127,13 +116,10 @@ def extract_skills(text: str, max_skills: int = 20) -> List[str]:
         # Extract skills
         skills = []
         
-        # Use global skills list if available
-        if SKILLS_LIST:
-            for skill in SKILLS_LIST:
-                # Check if skill is in text
-                skill_pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(skill_pattern, clean):
-                    skills.append(skill)
+        # Use the shared skills matcher if available
+        matcher = get_skill_matcher(SKILLS_FILE, aliases=SKILL_ALIASES, normalizer=normalize_skill)
+        if matcher:
+            skills.extend(matcher.find_all(clean))
         
         # Use rule-based extraction as backup
         if len(skills) < max_skills:
@@ -0,0 +1,372 @@
+"""
+Leaderboard Module
+
+XP leaderboards for the gamification features. Scores are persisted in a
+SQLite table (one row per board and user) and mirrored in memory by an
+order-statistic structure per board, updated on every XP change, so that
+any user's rank is an O(log n) lookup and a page of k entries costs
+O(log n + k) instead of sorting every user on each request.
+
+Besides the all-time board there is one board per ISO week holding the XP
+gained that week. Processes sharing the database pick up each other's
+updates incrementally on the next read: every write stamps its rows with a
+version taken from a counter under the database write lock, so versions
+follow commit order and a reader only re-reads rows newer than the highest
+version it has seen.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+# sortedcontainers gives O(log n) inserts; the bisect fallback is O(n) per insert
+try:
+    from sortedcontainers import SortedList
+    SORTEDCONTAINERS_AVAILABLE = True
+except ImportError:
+    SORTEDCONTAINERS_AVAILABLE = False
+    logging.warning("sortedcontainers not installed. Leaderboard updates will be slower for large boards. "
+                    "Install with: pip install sortedcontainers")
+
+from config.settings import DATA_DIR
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+ALL_TIME = "all_time"
+LEADERBOARD_FILE = os.environ.get("LEADERBOARD_FILE", os.path.join(DATA_DIR, "leaderboard.db"))
+# Weekly boards kept in the database
+WEEKLY_RETENTION_WEEKS = int(os.environ.get("LEADERBOARD_WEEKLY_RETENTION_WEEKS", "8"))
+# Weekly boards kept in memory (current and previous week)
+WEEKLY_BOARDS_IN_MEMORY = 2
+# Seconds between pruning passes of expired weekly boards
+PRUNE_INTERVAL = 3600
+
+# Upsert of one score row; the entry info fields given are merged into the stored ones
+_UPSERT_SCORE_SQL = (
+    "INSERT INTO scores (board, user_id, score, info, updated_at, version) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(board, user_id) DO UPDATE SET score = {score}, "
+    "info = COALESCE(json_patch(info, excluded.info), excluded.info, info), "
+    "updated_at = excluded.updated_at, version = excluded.version"
+)
+ADD_SCORE_SQL = _UPSERT_SCORE_SQL.format(score="score + excluded.score")
+SET_SCORE_SQL = _UPSERT_SCORE_SQL.format(score="excluded.score")
+
+
+def weekly_board(when: Optional[datetime] = None) -> str:
+    """
+    Name of the weekly board of a date
+
+    Args:
+        when: Date in the week (default: now)
+
+    Returns:
+        Board name, e.g. "weekly:2024-W07"
+    """
+    year, week, _ = (when or datetime.now()).isocalendar()
+    return f"weekly:{year}-W{week:02d}"
+
+
+class _SortedKeys:
+    """Minimal SortedList replacement on a plain list"""
+
+    def __init__(self, keys: Iterable[Tuple[int, str]] = ()):
+        self._keys = sorted(keys)
+
+    def add(self, key: Tuple[int, str]) -> None:
+        insort(self._keys, key)
+
+    def remove(self, key: Tuple[int, str]) -> None:
+        del self._keys[bisect_left(self._keys, key)]
+
+    def index(self, key: Tuple[int, str]) -> int:
+        return bisect_left(self._keys, key)
+
+    def __getitem__(self, index):
+        return self._keys[index]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class _Board:
+    """In-memory order of one board: keys (-score, user_id), scores and entry info"""
+
+    def __init__(self, rows: List[Tuple[str, int, Optional[str], int]]):
+        self.scores = {user_id: score for user_id, score, _, _ in rows}
+        # Info is kept as its JSON string and only decoded for returned entries
+        self.info = {user_id: info for user_id, _, info, _ in rows if info}
+        keys = [(-score, user_id) for user_id, score in self.scores.items()]
+        self.order = SortedList(keys) if SORTEDCONTAINERS_AVAILABLE else _SortedKeys(keys)
+        # Highest row version applied
+        self.version = 0
+
+    def set(self, user_id: str, score: int, info: Optional[str] = None) -> None:
+        """Set a user's score, moving them in the order"""
+        old_score = self.scores.get(user_id)
+        if old_score != score:
+            if old_score is not None:
+                self.order.remove((-old_score, user_id))
+            self.order.add((-score, user_id))
+            self.scores[user_id] = score
+        if info:
+            self.info[user_id] = info
+
+    def rank(self, user_id: str) -> Optional[int]:
+        """1-based rank of a user (ties ordered by user ID)"""
+        score = self.scores.get(user_id)
+        if score is None:
+            return None
+        return self.order.index((-score, user_id)) + 1
+
+    def entry(self, rank: int, user_id: str) -> Dict[str, Any]:
+        """Leaderboard entry of a ranked user"""
+        entry = json.loads(self.info[user_id]) if user_id in self.info else {}
+        entry.update({"rank": rank, "user_id": user_id, "xp": self.scores[user_id]})
+        return entry
+
+
+class Leaderboard:
+    """
+    Persistent XP leaderboards with O(log n) rank lookups.
+
+    Thread-safe; one instance is normally shared by the process (see
+    get_leaderboard).
+    """
+
+    def __init__(self, db_file: str = LEADERBOARD_FILE):
+        """
+        Open (or create) the leaderboard database
+
+        Args:
+            db_file: SQLite database file
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
+        self._conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS scores (
+                board TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                info TEXT,
+                updated_at REAL NOT NULL,
+                version INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (board, user_id)
+            )
+        """)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(scores)")]
+        if "version" not in columns:
+            self._conn.execute("ALTER TABLE scores ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("DROP INDEX IF EXISTS idx_scores_updated")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_scores_version ON scores(board, version)")
+        # Version counter, incremented by every write transaction
+        self._conn.execute("CREATE TABLE IF NOT EXISTS sync_version (id INTEGER PRIMARY KEY CHECK (id = 0), "
+                           "version INTEGER NOT NULL)")
+        self._conn.execute("INSERT OR IGNORE INTO sync_version (id, version) VALUES (0, 0)")
+
+        self._boards = {}
+        self._lock = threading.RLock()
+        self._last_prune = 0.0
+
+    def add_xp(self,
+               user_id: str,
+               amount: int,
+               total_xp: Optional[int] = None,
+               when: Optional[datetime] = None,
+               **info) -> int:
+        """
+        Record XP gained by a user on the all-time and weekly boards
+
+        Args:
+            user_id: User identifier
+            amount: XP gained (added to the weekly board)
+            total_xp: The user's new total XP, if the caller keeps it;
+                otherwise amount is added to the all-time score
+            when: Time of the gain (default: now)
+            **info: Extra fields shown in the user's entries (level, badges, ...),
+                merged into the fields stored by earlier calls
+
+        Returns:
+            int: The user's all-time score
+        """
+        user_id = str(user_id)
+        week = weekly_board(when)
+        info_json = json.dumps(info) if info else None
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = self._next_version()
+                if total_xp is None:
+                    self._conn.execute(ADD_SCORE_SQL, (ALL_TIME, user_id, amount, info_json, now, version))
+                else:
+                    self._conn.execute(SET_SCORE_SQL, (ALL_TIME, user_id, total_xp, info_json, now, version))
+                if amount > 0:
+                    self._conn.execute(ADD_SCORE_SQL, (week, user_id, amount, info_json, now, version))
+
+                rows = self._conn.execute(
+                    "SELECT board, score, info FROM scores WHERE user_id = ? AND board IN (?, ?)",
+                    (user_id, ALL_TIME, week)
+                ).fetchall()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            # Boards not in memory pick the update up when they are loaded
+            for board, score, merged_info in rows:
+                if board in self._boards:
+                    self._boards[board].set(user_id, score, merged_info)
+
+            if now - self._last_prune > PRUNE_INTERVAL:
+                self._prune_weekly_boards()
+
+        return next((score for board, score, _ in rows if board == ALL_TIME), 0)
+
+    def import_scores(self, rows: Iterable[Tuple[str, int, Dict[str, Any]]], board: str = ALL_TIME) -> int:
+        """
+        Set many users' scores on a board at once (backfills, migrations)
+
+        Args:
+            rows: (user_id, score, info) tuples
+            board: Board name
+
+        Returns:
+            int: Number of rows written
+        """
+        now = time.time()
+        data = [(board, str(user_id), int(score), json.dumps(info) if info else None, now)
+                for user_id, score, info in rows]
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = self._next_version()
+                data = [row + (version,) for row in data]
+                self._conn.executemany(SET_SCORE_SQL, data)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            # Reload on next access rather than applying row by row
+            self._boards.pop(board, None)
+
+        return len(data)
+
+    def _next_version(self) -> int:
+        """Next row version; must be called inside a write transaction"""
+        self._conn.execute("UPDATE sync_version SET version = version + 1 WHERE id = 0")
+        return self._conn.execute("SELECT version FROM sync_version WHERE id = 0").fetchone()[0]
+
+    def _board(self, board: str) -> _Board:
+        """In-memory board, loaded on first use and synced with other processes' updates"""
+        with self._lock:
+            current = self._boards.get(board)
+
+            if current is None:
+                rows = self._conn.execute("SELECT user_id, score, info, version FROM scores WHERE board = ?",
+                                          (board,)).fetchall()
+                current = _Board(rows)
+                current.version = max((row[3] for row in rows), default=0)
+                self._boards[board] = current
+
+                # Keep only the most recent weekly boards in memory
+                weekly = sorted(name for name in self._boards if name != ALL_TIME)
+                for name in weekly[:-WEEKLY_BOARDS_IN_MEMORY]:
+                    del self._boards[name]
+            else:
+                # Versions are assigned in commit order, so every row committed
+                # up to the highest version seen has already been applied
+                for user_id, score, info, version in self._conn.execute(
+                        "SELECT user_id, score, info, version FROM scores WHERE board = ? AND version > ?",
+                        (board, current.version)):
+                    current.set(user_id, score, info)
+                    current.version = max(current.version, version)
+
+            return current
+
+    def _prune_weekly_boards(self) -> None:
+        """Delete weekly boards older than the retention period"""
+        self._last_prune = time.time()
+        cutoff = weekly_board(datetime.now() - timedelta(weeks=WEEKLY_RETENTION_WEEKS))
+        try:
+            self._conn.execute("DELETE FROM scores WHERE board LIKE 'weekly:%' AND board < ?", (cutoff,))
+        except sqlite3.Error as e:
+            logger.error(f"Error pruning weekly leaderboards: {str(e)}")
+
+    def get_rank(self, user_id: str, board: str = ALL_TIME) -> Optional[int]:
+        """
+        Rank of a user on a board
+
+        Args:
+            user_id: User identifier
+            board: Board name (ALL_TIME or a weekly_board name)
+
+        Returns:
+            1-based rank, or None if the user has no score on the board
+        """
+        with self._lock:
+            return self._board(board).rank(str(user_id))
+
+    def get_entry(self, user_id: str, board: str = ALL_TIME) -> Optional[Dict[str, Any]]:
+        """Leaderboard entry (rank, user_id, xp and info) of a user, or None"""
+        with self._lock:
+            current = self._board(board)
+            rank = current.rank(str(user_id))
+            return current.entry(rank, str(user_id)) if rank else None
+
+    def get_page(self, offset: int = 0, limit: int = 10, board: str = ALL_TIME) -> List[Dict[str, Any]]:
+        """
+        A page of a board, highest score first
+
+        Args:
+            offset: Number of entries to skip
+            limit: Number of entries to return
+            board: Board name (ALL_TIME or a weekly_board name)
+
+        Returns:
+            list: Leaderboard entries with rank, user_id, xp and info
+        """
+        offset = max(0, offset)
+        with self._lock:
+            current = self._board(board)
+            keys = current.order[offset:offset + max(0, limit)]
+            return [current.entry(offset + i + 1, user_id) for i, (_, user_id) in enumerate(keys)]
+
+    def count(self, board: str = ALL_TIME) -> int:
+        """Number of users on a board"""
+        with self._lock:
+            return len(self._board(board).scores)
+
+    def close(self) -> None:
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+_leaderboard = None
+_leaderboard_lock = threading.Lock()
+
+
+def get_leaderboard() -> Leaderboard:
+    """
+    Get the process-wide leaderboard
+
+    Returns:
+        Leaderboard: Shared instance
+    """
+    global _leaderboard
+    with _leaderboard_lock:
+        if _leaderboard is None:
+            _leaderboard = Leaderboard()
+        return _leaderboard
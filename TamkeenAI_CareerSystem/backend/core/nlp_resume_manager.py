@@ -34,6 +34,8 @@ try:
 except ImportError:
     PANDAS_AVAILABLE = False
 
+from .resume_store import ResumeStore
+
 
 class ResumeManager:
     """
@@ -83,6 +85,10 @@ class ResumeManager:
         self.max_versions = max_versions
         self.auto_backup = auto_backup
         
+        # Version index and content-addressed file/text blobs
+        self.store = ResumeStore(self.storage_dir)
+        
+        
         # Initialize in-memory resume cache
         self.resume_cache = {}
         
@@ -106,9 +112,7 @@ class ResumeManager:
             Dictionary with storage result
         """
         try:
-            # Create user directory if it doesn't exist
-            user_dir = os.path.join(self.storage_dir, str(user_id))
-            os.makedirs(user_dir, exist_ok=True)
+            self._import_legacy_versions(user_id)
             
             # Get file info
             file_name = os.path.basename(file_path)
@@ -116,28 +120,23 @@ class ResumeManager:
             file_size = os.path.getsize(file_path)
             file_hash = self._calculate_file_hash(file_path)
             
-            # Check if this exact file already exists
-            version_info = self._get_user_resume_versions(user_id)
-            for existing_version in version_info:
-                if existing_version.get("file_hash") == file_hash:
-                    return {
-                        "success": False,
-                        "error": "duplicate_file",
-                        "message": "This exact resume file already exists",
-                        "version_id": existing_version.get("version_id")
-                    }
+            # Check if this exact file already exists (indexed lookup)
+            existing_version_id = self.store.find_by_hash(user_id, file_hash)
+            if existing_version_id:
+                return {
+                    "success": False,
+                    "error": "duplicate_file",
+                    "message": "This exact resume file already exists",
+                    "version_id": existing_version_id
+                }
             
             # Generate version ID and details
             version_id = str(uuid.uuid4())
             timestamp = datetime.now().isoformat()
+            version_count = self.store.count_versions(user_id)
             
             if not version_name:
-                version_name = f"Version {len(version_info) + 1}"
-            
-            # Copy file to storage location
-            storage_filename = f"{version_id}{file_ext}"
-            storage_path = os.path.join(user_dir, storage_filename)
-            shutil.copy2(file_path, storage_path)
+                version_name = f"Version {version_count + 1}"
             
             # Extract text content
             text_content = self._extract_text(file_path)
@@ -145,15 +144,10 @@ class ResumeManager:
             # Extract resume structure if possible
             resume_structure = self._extract_resume_structure(file_path, text_content)
             
-            # Generate JSON version for easy access
-            json_path = os.path.join(user_dir, f"{version_id}.json")
-            
             version_data = {
                 "version_id": version_id,
                 "user_id": user_id,
                 "original_filename": file_name,
-                "storage_filename": storage_filename,
-                "storage_path": storage_path,
                 "file_size": file_size,
                 "file_type": file_ext.replace(".", ""),
                 "file_hash": file_hash,
@@ -164,22 +158,18 @@ class ResumeManager:
                 "metadata": metadata or {}
             }
             
-            # Save JSON version
-            with open(json_path, 'w') as f:
-                json.dump(version_data, f, indent=2)
-            
-            # Update version index
-            self._update_version_index(user_id, version_data)
+            # Store the file (once per content) and index the version
+            version_data = self.store.save_version(version_data, source_path=file_path)
             
             # Clean up old versions if needed
-            if len(version_info) + 1 > self.max_versions:
+            if version_count + 1 > self.max_versions:
                 self._clean_old_versions(user_id)
             
             return {
                 "success": True,
                 "version_id": version_id,
                 "message": "Resume stored successfully",
-                "storage_path": storage_path,
+                "storage_path": version_data["storage_path"],
                 "version_name": version_name
             }
             
@@ -207,60 +197,23 @@ class ResumeManager:
             Dictionary with resume data
         """
         try:
-            # Get all user versions
-            versions = self._get_user_resume_versions(user_id)
-            if not versions:
-                return {
-                    "success": False,
-                    "error": "no_resume",
-                    "message": "No resume found for this user"
-                }
+            self._import_legacy_versions(user_id)
             
-            # Find requested version or use latest
-            target_version = None
-            if version_id:
-                for version in versions:
-                    if version.get("version_id") == version_id:
-                        target_version = version
-                        break
-                
-                if not target_version:
+            # Load requested version or the latest one from the index
+            target_version = self.store.get_version(user_id, version_id)
+            if not target_version:
+                if version_id and self.store.count_versions(user_id):
                     return {
                         "success": False,
                         "error": "version_not_found",
                         "message": f"Resume version {version_id} not found"
                     }
-            else:
-                # Get latest version (sorted by created_at)
-                versions.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-                target_version = versions[0]
-            
-            # Check if we have full data or need to load it
-            if "text_content" not in target_version:
-                # Load from JSON file
-                json_path = os.path.join(
-                    self.storage_dir, 
-                    str(user_id), 
-                    f"{target_version['version_id']}.json"
-                )
                 
-                if os.path.exists(json_path):
-                    with open(json_path, 'r') as f:
-                        target_version = json.load(f)
-                else:
-                    # Reconstruct missing data
-                    storage_path = os.path.join(
-                        self.storage_dir,
-                        str(user_id),
-                        target_version.get("storage_filename", f"{target_version['version_id']}.json")
-                    )
-                    
-                    if os.path.exists(storage_path):
-                        text_content = self._extract_text(storage_path)
-                        structure = self._extract_resume_structure(storage_path, text_content)
-                        
-                        target_version["text_content"] = text_content
-                        target_version["structure"] = structure
+                return {
+                    "success": False,
+                    "error": "no_resume",
+                    "message": "No resume found for this user"
+                }
             
             # Return in requested format
             if format == "json":
@@ -296,6 +249,28 @@ class ResumeManager:
                 "message": "Failed to retrieve resume"
             }
     
+    def get_resume_version(self, user_id: str, version_id: str) -> Dict[str, Any]:
+        """
+        Get the full record of a resume version
+        
+        Args:
+            user_id: User identifier
+            version_id: Version identifier
+            
+        Returns:
+            Version record, or a failure dictionary if it does not exist
+        """
+        self._import_legacy_versions(user_id)
+        version = self.store.get_version(user_id, version_id)
+        if not version:
+            return {
+                "success": False,
+                "error": "version_not_found",
+                "message": f"Resume version {version_id} not found"
+            }
+        
+        return version
+    
     def update_resume(self,
                     user_id: str,
                     version_id: str,
@@ -336,26 +311,11 @@ class ResumeManager:
                 timestamp = datetime.now().isoformat()
                 
                 if not version_name:
-                    versions = self._get_user_resume_versions(user_id)
-                    version_name = f"Version {len(versions) + 1}"
-                
-                # Copy existing file to new name
-                user_dir = os.path.join(self.storage_dir, str(user_id))
-                file_ext = f".{existing_resume.get('file_type', 'txt')}"
+                    version_name = f"Version {self.store.count_versions(user_id) + 1}"
                 
-                old_path = existing_resume.get("storage_path")
-                new_filename = f"{new_version_id}{file_ext}"
-                new_path = os.path.join(user_dir, new_filename)
-                
-                # Copy file if source exists
-                if old_path and os.path.exists(old_path):
-                    shutil.copy2(old_path, new_path)
-                
-                # Update version details
+                # Update version details (the new version shares the original file blob)
                 updated_resume["version_id"] = new_version_id
                 updated_resume["previous_version_id"] = version_id
-                updated_resume["storage_filename"] = new_filename
-                updated_resume["storage_path"] = new_path
                 updated_resume["version_name"] = version_name
                 updated_resume["created_at"] = timestamp
                 updated_resume["updated_at"] = timestamp
@@ -364,18 +324,11 @@ class ResumeManager:
                 changes = self._calculate_changes(existing_resume, updated_resume)
                 updated_resume["changes"] = changes
                 
-                # Save JSON version
-                json_path = os.path.join(user_dir, f"{new_version_id}.json")
-                
-                with open(json_path, 'w') as f:
-                    json.dump(updated_resume, f, indent=2)
-                
-                # Update version index
-                self._update_version_index(user_id, updated_resume)
+                # Save and index the new version
+                self.store.save_version(updated_resume)
                 
                 # Clean up old versions if needed
-                versions = self._get_user_resume_versions(user_id)
-                if len(versions) > self.max_versions:
+                if self.store.count_versions(user_id) > self.max_versions:
                     self._clean_old_versions(user_id)
                 
                 return {
@@ -392,18 +345,8 @@ class ResumeManager:
                 changes = self._calculate_changes(existing_resume, updated_resume)
                 updated_resume["changes"] = changes
                 
-                # Save JSON version
-                json_path = os.path.join(
-                    self.storage_dir, 
-                    str(user_id), 
-                    f"{version_id}.json"
-                )
-                
-                with open(json_path, 'w') as f:
-                    json.dump(updated_resume, f, indent=2)
-                
-                # Update version index
-                self._update_version_index(user_id, updated_resume)
+                # Replace the version in the index
+                self.store.save_version(updated_resume)
                 
                 return {
                     "success": True,
@@ -447,21 +390,8 @@ class ResumeManager:
             if preserve_backup:
                 self._backup_resume(user_id, resume)
             
-            # Delete files
-            user_dir = os.path.join(self.storage_dir, str(user_id))
-            
-            # Delete main file
-            storage_path = resume.get("storage_path")
-            if storage_path and os.path.exists(storage_path):
-                os.remove(storage_path)
-            
-            # Delete JSON file
-            json_path = os.path.join(user_dir, f"{version_id}.json")
-            if os.path.exists(json_path):
-                os.remove(json_path)
-            
-            # Update version index to remove this version
-            self._remove_from_version_index(user_id, version_id)
+            # Remove from the index; blobs go once no other version references them
+            self.store.delete_version(user_id, version_id)
             
             return {
                 "success": True,
@@ -487,11 +417,9 @@ class ResumeManager:
             Dictionary with list of versions
         """
         try:
+            # Index query, newest first
             versions = self._get_user_resume_versions(user_id)
             
-            # Sort by created_at (newest first)
-            versions.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-            
             # Clean up data for response
             clean_versions = []
             for version in versions:
@@ -502,7 +430,7 @@ class ResumeManager:
                     "file_type": version.get("file_type"),
                     "original_filename": version.get("original_filename"),
                     "file_size": version.get("file_size"),
-                    "has_changes": "changes" in version and bool(version.get("changes"))
+                    "has_changes": version.get("has_changes", False)
                 })
             
             return {
@@ -974,199 +902,84 @@ class ResumeManager:
         return structure
     
     def _get_user_resume_versions(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get all resume versions for a user"""
-        index_file = os.path.join(self.storage_dir, str(user_id), "resume_index.json")
-        
-        if os.path.exists(index_file):
-            try:
-                with open(index_file, 'r') as f:
-                    return json.load(f).get("versions", [])
-            except Exception as e:
-                self.logger.error(f"Error reading resume index: {str(e)}")
-                return []
+        """Get all resume versions for a user (index entries, newest first)"""
+        self._import_legacy_versions(user_id)
+        return self.store.list_versions(user_id)
+    
+    def _import_legacy_versions(self, user_id: str) -> None:
+        """Import version files of a user written before the version index existed"""
+        if not self.store.needs_legacy_import(user_id):
+            return
         
-        # If no index exists, scan directory for resume files
         user_dir = os.path.join(self.storage_dir, str(user_id))
-        if not os.path.exists(user_dir):
-            return []
-            
-        versions = []
-        for filename in os.listdir(user_dir):
-            if filename.endswith('.json') and not filename == "resume_index.json":
+        imported = 0
+        if os.path.isdir(user_dir):
+            for filename in os.listdir(user_dir):
+                if not filename.endswith('.json') or filename == "resume_index.json":
+                    continue
+                
                 try:
-                    file_path = os.path.join(user_dir, filename)
-                    with open(file_path, 'r') as f:
+                    with open(os.path.join(user_dir, filename), 'r') as f:
                         resume_data = json.load(f)
-                        if "version_id" in resume_data:
-                            # Add only essential version info to the index
-                            versions.append({
-                                "version_id": resume_data.get("version_id"),
-                                "version_name": resume_data.get("version_name"),
-                                "created_at": resume_data.get("created_at"),
-                                "file_type": resume_data.get("file_type"),
-                                "original_filename": resume_data.get("original_filename"),
-                                "storage_filename": resume_data.get("storage_filename"),
-                                "file_size": resume_data.get("file_size"),
-                                "file_hash": resume_data.get("file_hash")
-                            })
-                except Exception as e:
-                    self.logger.error(f"Error reading resume file {filename}: {str(e)}")
-        
-        # Create index file
-        self._update_version_index(user_id, None, versions)
-        
-        return versions
-    
-    def _update_version_index(self, 
-                            user_id: str, 
-                            new_version: Optional[Dict[str, Any]] = None,
-                            all_versions: Optional[List[Dict[str, Any]]] = None) -> None:
-        """Update the resume version index"""
-        index_file = os.path.join(self.storage_dir, str(user_id), "resume_index.json")
-        
-        # Create user directory if it doesn't exist
-        user_dir = os.path.dirname(index_file)
-        os.makedirs(user_dir, exist_ok=True)
-        
-        # Read existing index
-        versions = []
-        if os.path.exists(index_file):
-            try:
-                with open(index_file, 'r') as f:
-                    data = json.load(f)
-                    versions = data.get("versions", [])
-            except Exception as e:
-                self.logger.error(f"Error reading resume index: {str(e)}")
-        
-        # Use provided versions list if available
-        if all_versions is not None:
-            versions = all_versions
-        # Otherwise update with new version
-        elif new_version and "version_id" in new_version:
-            # Check if version already exists
-            version_exists = False
-            for i, version in enumerate(versions):
-                if version.get("version_id") == new_version["version_id"]:
-                    # Update existing version
-                    versions[i] = {
-                        "version_id": new_version.get("version_id"),
-                        "version_name": new_version.get("version_name"),
-                        "created_at": new_version.get("created_at"),
-                        "file_type": new_version.get("file_type"),
-                        "original_filename": new_version.get("original_filename"),
-                        "storage_filename": new_version.get("storage_filename"),
-                        "file_size": new_version.get("file_size"),
-                        "file_hash": new_version.get("file_hash")
-                    }
-                    version_exists = True
-                    break
+                    if "version_id" not in resume_data:
+                        continue
                     
-            if not version_exists:
-                # Add new version
-                versions.append({
-                    "version_id": new_version.get("version_id"),
-                    "version_name": new_version.get("version_name"),
-                    "created_at": new_version.get("created_at"),
-                    "file_type": new_version.get("file_type"),
-                    "original_filename": new_version.get("original_filename"),
-                    "storage_filename": new_version.get("storage_filename"),
-                    "file_size": new_version.get("file_size"),
-                    "file_hash": new_version.get("file_hash")
-                })
-        
-        # Sort versions by creation date (newest first)
-        versions.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+                    resume_data["user_id"] = user_id
+                    resume_data.setdefault("created_at", datetime.now().isoformat())
+                    
+                    # Move the original file into the blob store if it is still there
+                    file_path = os.path.join(user_dir, resume_data.get("storage_filename") or "")
+                    if os.path.isfile(file_path) and not file_path.endswith('.json'):
+                        resume_data["file_hash"] = self._calculate_file_hash(file_path)
+                        self.store.save_version(resume_data, source_path=file_path)
+                    else:
+                        resume_data["storage_filename"] = None
+                        self.store.save_version(resume_data)
+                    imported += 1
+                except Exception as e:
+                    self.logger.error(f"Error importing resume file {filename}: {str(e)}")
         
-        # Write updated index
-        try:
-            with open(index_file, 'w') as f:
-                json.dump({
-                    "user_id": user_id,
-                    "last_updated": datetime.now().isoformat(),
-                    "versions": versions
-                }, f, indent=2)
-        except Exception as e:
-            self.logger.error(f"Error writing resume index: {str(e)}")
+        self.store.mark_legacy_imported(user_id)
+        if imported:
+            self.logger.info(f"Imported {imported} resume version(s) of user {user_id} into the version index")
     
     def _clean_old_versions(self, user_id: str) -> None:
         """Remove old resume versions to stay within max_versions limit"""
-        versions = self._get_user_resume_versions(user_id)
-        
-        if len(versions) <= self.max_versions:
-            return
-            
-        # Sort by creation date (oldest first)
-        versions.sort(key=lambda x: x.get("created_at", ""))
-        
-        # Calculate how many to remove
-        to_remove = len(versions) - self.max_versions
-        
-        # Remove oldest versions
-        user_dir = os.path.join(self.storage_dir, str(user_id))
-        for i in range(to_remove):
-            version = versions[i]
-            version_id = version.get("version_id")
-            
+        # Index query for versions beyond the newest max_versions, oldest first
+        for version_id in self.store.oldest_versions(user_id, self.max_versions):
             # Backup if auto_backup enabled
             if self.auto_backup:
                 self._backup_version(user_id, version_id)
             
-            # Remove files
-            for ext in ['.json', '.pdf', '.docx', '.txt', version.get("file_type", "")]:
-                if not ext.startswith('.'):
-                    ext = f".{ext}"
-                    
-                file_path = os.path.join(user_dir, f"{version_id}{ext}")
-                if os.path.exists(file_path):
-                    try:
-                        os.remove(file_path)
-                    except Exception as e:
-                        self.logger.error(f"Error removing file {file_path}: {str(e)}")
-                        
-            # If storage_filename is different from version_id
-            storage_filename = version.get("storage_filename")
-            if storage_filename and storage_filename != f"{version_id}.{version.get('file_type', '')}":
-                storage_path = os.path.join(user_dir, storage_filename)
-                if os.path.exists(storage_path):
-                    try:
-                        os.remove(storage_path)
-                    except Exception as e:
-                        self.logger.error(f"Error removing file {storage_path}: {str(e)}")
-        
-        # Update index without the removed versions
-        remaining_versions = versions[to_remove:]
-        self._update_version_index(user_id, None, remaining_versions)
+            self.store.delete_version(user_id, version_id)
     
     def _backup_version(self, user_id: str, version_id: str) -> bool:
         """Backup a resume version"""
-        user_dir = os.path.join(self.storage_dir, str(user_id))
-        backup_user_dir = os.path.join(self.backup_dir, str(user_id))
-        os.makedirs(backup_user_dir, exist_ok=True)
-        
-        # Get version details
-        versions = self._get_user_resume_versions(user_id)
-        version = next((v for v in versions if v.get("version_id") == version_id), None)
+        version = self.store.get_version(user_id, version_id)
         
         if not version:
             self.logger.error(f"Version {version_id} not found for backup")
             return False
         
+        return self._backup_resume(user_id, version)
+    
+    def _backup_resume(self, user_id: str, resume: Dict[str, Any]) -> bool:
+        """Backup a resume record and its file to the backup directory"""
+        backup_user_dir = os.path.join(self.backup_dir, str(user_id))
+        os.makedirs(backup_user_dir, exist_ok=True)
+        version_id = resume.get("version_id")
+        
         try:
-            # Backup JSON metadata
-            json_path = os.path.join(user_dir, f"{version_id}.json")
+            # Backup JSON record
             backup_json_path = os.path.join(backup_user_dir, f"{version_id}.json")
-            
-            if os.path.exists(json_path):
-                shutil.copy2(json_path, backup_json_path)
+            with open(backup_json_path, 'w') as f:
+                json.dump({k: v for k, v in resume.items() if k != "storage_path"}, f, indent=2)
             
             # Backup resume file
-            storage_filename = version.get("storage_filename")
-            if storage_filename:
-                file_path = os.path.join(user_dir, storage_filename)
-                backup_file_path = os.path.join(backup_user_dir, storage_filename)
-                
-                if os.path.exists(file_path):
-                    shutil.copy2(file_path, backup_file_path)
+            storage_path = resume.get("storage_path")
+            if storage_path and os.path.exists(storage_path):
+                file_ext = os.path.splitext(storage_path)[1]
+                shutil.copy2(storage_path, os.path.join(backup_user_dir, f"{version_id}{file_ext}"))
             
             return True
             
@@ -1345,15 +1158,8 @@ class ResumeManager:
             
             resume_data["text_content"] = text_content
             
-            # Create a new version
-            json_path = os.path.join(self.storage_dir, str(user_id), f"{version_id}.json")
-            with open(json_path, 'w') as f:
-                json.dump(resume_data, f, indent=2)
-            
-            # Create text version for convenience
-            txt_path = os.path.join(self.storage_dir, str(user_id), f"{version_id}.txt")
-            with open(txt_path, 'w') as f:
-                f.write(text_content)
+            # Save the version (text is stored as a compressed blob)
+            self.store.save_version(resume_data)
             
             # TODO: Update PDF/DOCX versions if they exist
             
@@ -1446,21 +1252,8 @@ class ResumeManager:
                 # Generic section content update
                 self._apply_generic_recommendation(new_resume_data, recommendation)
             
-            # Save the new version
-            user_dir = os.path.join(self.storage_dir, str(user_id))
-            json_path = os.path.join(user_dir, f"{new_version_id}.json")
-            
-            with open(json_path, 'w') as f:
-                json.dump(new_resume_data, f, indent=2)
-                
-            # Update text content file
-            if "text_content" in new_resume_data:
-                txt_path = os.path.join(user_dir, f"{new_version_id}.txt")
-                with open(txt_path, 'w') as f:
-                    f.write(new_resume_data["text_content"])
-            
-            # Update version index
-            self._update_version_index(user_id, new_resume_data)
+            # Save and index the new version (it shares the original file blob)
+            self.store.save_version(new_resume_data)
             
             return {
                 "success": True,
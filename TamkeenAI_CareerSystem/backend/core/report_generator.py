@@ -6,13 +6,18 @@ and other insights for users of the Tamkeen AI Career Intelligence System.
 """
 
 import os
+import io
 import json
+import threading
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 import uuid
 
 # Import settings
-from config.settings import BASE_DIR, REPORT_FOLDER
+from config.settings import BASE_DIR, REPORT_FOLDER, REPORT_CONFIG
+
+# Chart rendering
+from core.chart_renderer import ChartRenderer, MATPLOTLIB_AVAILABLE
 
 # Try importing PDF generation libraries
 try:
@@ -29,18 +34,43 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
     print("Warning: ReportLab not available. Install with: pip install reportlab")
 
-# Try importing matplotlib for chart generation
-try:
-    import matplotlib
-    matplotlib.use('Agg')  # Use non-interactive backend
-    import matplotlib.pyplot as plt
-    import numpy as np
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
+if not MATPLOTLIB_AVAILABLE:
     print("Warning: matplotlib not available. Install with: pip install matplotlib")
 
 
+# Chart renderer shared by all report generators
+_chart_renderer = None
+_chart_renderer_lock = threading.Lock()
+
+def get_chart_renderer() -> ChartRenderer:
+    """
+    Get chart renderer instance
+    
+    Returns:
+        ChartRenderer: Chart renderer instance
+    """
+    global _chart_renderer
+    
+    if _chart_renderer is None:
+        with _chart_renderer_lock:
+            if _chart_renderer is None:
+                _chart_renderer = ChartRenderer(
+                    workers=REPORT_CONFIG.get("chart_workers", 2),
+                    cache_bytes=REPORT_CONFIG.get("chart_cache_mb", 64) * 1024 * 1024,
+                    cache_dir=REPORT_CONFIG.get("chart_cache_dir") or None
+                )
+    
+    return _chart_renderer
+
+
+class _PendingChart:
+    """Placeholder for a chart still rendering, replaced before the PDF is built"""
+    
+    def __init__(self, future, after: Optional[List[Any]] = None):
+        self.future = future
+        self.after = after or []
+
+
 class ReportGenerator:
     """Class for generating PDF reports"""
     
@@ -66,8 +96,8 @@ class ReportGenerator:
         if REPORTLAB_AVAILABLE:
             self.styles = getSampleStyleSheet()
             
-            # Add custom styles
-            self.styles.add(ParagraphStyle(
+            # Add custom styles (replacing sample styles of the same name)
+            self._set_style(ParagraphStyle(
                 name='Title',
                 parent=self.styles['Heading1'],
                 fontSize=18,
@@ -75,7 +105,7 @@ class ReportGenerator:
                 textColor=colors.darkblue
             ))
             
-            self.styles.add(ParagraphStyle(
+            self._set_style(ParagraphStyle(
                 name='Subtitle',
                 parent=self.styles['Heading2'],
                 fontSize=14,
@@ -83,7 +113,7 @@ class ReportGenerator:
                 textColor=colors.darkblue
             ))
             
-            self.styles.add(ParagraphStyle(
+            self._set_style(ParagraphStyle(
                 name='SectionTitle',
                 parent=self.styles['Heading3'],
                 fontSize=12,
@@ -91,14 +121,14 @@ class ReportGenerator:
                 textColor=colors.darkblue
             ))
             
-            self.styles.add(ParagraphStyle(
+            self._set_style(ParagraphStyle(
                 name='BodyText',
                 parent=self.styles['Normal'],
                 fontSize=10,
                 spaceAfter=6
             ))
             
-            self.styles.add(ParagraphStyle(
+            self._set_style(ParagraphStyle(
                 name='Bullet',
                 parent=self.styles['Normal'],
                 fontSize=10,
@@ -108,91 +138,38 @@ class ReportGenerator:
                 spaceAfter=2
             ))
     
+    def _set_style(self, style: "ParagraphStyle") -> None:
+        """Add a paragraph style, replacing a sample style with the same name"""
+        if style.name in self.styles:
+            self.styles.byName[style.name] = style
+        else:
+            self.styles.add(style)
+    
     def generate_chart_image(self, chart_data: Dict[str, Any], chart_type: str, 
                            filename: str = "chart.png") -> Optional[str]:
         """
-        Generate chart image using matplotlib
+        Generate chart image file
+        
+        Reports embed charts from memory; this is for callers that need a file.
         
         Args:
             chart_data: Data for chart
             chart_type: Type of chart (bar, pie, radar, etc.)
-            filename: Output filename
+            filename: Output filename, made unique per call
             
         Returns:
             str or None: Path to generated image, or None if failed
         """
-        if not MATPLOTLIB_AVAILABLE:
+        png = get_chart_renderer().render(chart_data, chart_type)
+        if png is None:
             return None
         
         try:
-            plt.figure(figsize=(6, 4))
-            
-            if chart_type == "bar":
-                labels = chart_data.get("labels", [])
-                values = chart_data.get("values", [])
-                
-                if not labels or not values or len(labels) != len(values):
-                    return None
-                
-                plt.bar(labels, values, color=chart_data.get("colors", "skyblue"))
-                plt.xlabel(chart_data.get("x_label", ""))
-                plt.ylabel(chart_data.get("y_label", ""))
-                plt.title(chart_data.get("title", ""))
-                plt.xticks(rotation=45, ha="right")
-                plt.tight_layout()
-                
-            elif chart_type == "pie":
-                labels = chart_data.get("labels", [])
-                values = chart_data.get("values", [])
-                
-                if not labels or not values or len(labels) != len(values):
-                    return None
-                
-                plt.pie(values, labels=labels, autopct='%1.1f%%', startangle=90,
-                       colors=chart_data.get("colors", None))
-                plt.axis('equal')
-                plt.title(chart_data.get("title", ""))
-                
-            elif chart_type == "radar":
-                categories = chart_data.get("categories", [])
-                values = chart_data.get("values", [])
-                
-                if not categories or not values or len(categories) != len(values):
-                    return None
-                
-                # Number of variables
-                N = len(categories)
-                
-                # What will be the angle of each axis in the plot
-                angles = [n / float(N) * 2 * np.pi for n in range(N)]
-                angles += angles[:1]  # Close the loop
-                
-                # Add values for plot
-                values += values[:1]  # Close the loop
-                
-                # Create radar plot
-                ax = plt.subplot(111, polar=True)
-                plt.xticks(angles[:-1], categories, color='grey', size=10)
-                ax.set_rlabel_position(0)
-                plt.yticks([20, 40, 60, 80, 100], ["20", "40", "60", "80", "100"], color="grey", size=8)
-                plt.ylim(0, 100)
-                
-                # Plot data
-                ax.plot(angles, values, linewidth=1, linestyle='solid')
-                ax.fill(angles, values, 'skyblue', alpha=0.4)
-                
-                # Add title
-                plt.title(chart_data.get("title", ""), size=15, y=1.1)
-            
-            else:
-                return None
-            
-            # Save image
             temp_dir = os.path.join(self.report_folder, 'temp')
             os.makedirs(temp_dir, exist_ok=True)
-            image_path = os.path.join(temp_dir, filename)
-            plt.savefig(image_path, dpi=100, bbox_inches='tight')
-            plt.close()
+            image_path = os.path.join(temp_dir, f"{uuid.uuid4().hex}_{filename}")
+            with open(image_path, 'wb') as f:
+                f.write(png)
             
             return image_path
             
@@ -200,6 +177,49 @@ class ReportGenerator:
             print(f"Error generating chart: {e}")
             return None
     
+    def _chart(self, chart_data: Dict[str, Any], chart_type: str,
+               after: Optional[List[Any]] = None) -> _PendingChart:
+        """
+        Start rendering a chart for the report being built
+        
+        Args:
+            chart_data: Data for chart
+            chart_type: Type of chart
+            after: Flowables to add after the chart if it renders
+            
+        Returns:
+            _PendingChart: Placeholder to append to the report elements
+        """
+        return _PendingChart(get_chart_renderer().submit(chart_data, chart_type), after)
+    
+    def _resolve_charts(self, elements: List[Any]) -> List[Any]:
+        """
+        Replace chart placeholders with images read from memory
+        
+        Args:
+            elements: Report elements
+            
+        Returns:
+            list: Elements ready for building; charts that failed are left out
+        """
+        resolved = []
+        for element in elements:
+            if not isinstance(element, _PendingChart):
+                resolved.append(element)
+                continue
+            
+            try:
+                png = element.future.result()
+            except Exception as e:
+                print(f"Error generating chart: {e}")
+                png = None
+            
+            if png is not None:
+                resolved.append(Image(io.BytesIO(png), width=400, height=300))
+                resolved.extend(element.after)
+        
+        return resolved
+    
     def generate_resume_analysis_report(self, analysis_data: Dict[str, Any], 
                                       job_title: Optional[str] = None) -> Optional[str]:
         """
@@ -312,10 +332,7 @@ class ReportGenerator:
                     "colors": "skyblue"
                 }
                 
-                chart_path = self.generate_chart_image(chart_data, "bar", f"kw_density_{timestamp}.png")
-                if chart_path:
-                    elements.append(Image(chart_path, width=400, height=300))
-                    elements.append(Spacer(1, 6))
+                elements.append(self._chart(chart_data, "bar", after=[Spacer(1, 6)]))
             
             # Content recommendations
             if "content_recommendations" in content_data and content_data["content_recommendations"]:
@@ -414,7 +431,7 @@ class ReportGenerator:
             canvas.restoreState()
         
         # Build PDF
-        doc.build(elements, onFirstPage=add_page_number, onLaterPages=add_page_number)
+        doc.build(self._resolve_charts(elements), onFirstPage=add_page_number, onLaterPages=add_page_number)
         
         return report_path
     
@@ -498,9 +515,7 @@ class ReportGenerator:
                     "title": "Career Readiness by Category"
                 }
                 
-                chart_path = self.generate_chart_image(chart_data, "radar", f"readiness_{timestamp}.png")
-                if chart_path:
-                    elements.append(Image(chart_path, width=400, height=300))
+                elements.append(self._chart(chart_data, "radar"))
                     
             elements.append(Spacer(1, 12))
             
@@ -681,7 +696,7 @@ class ReportGenerator:
             canvas.restoreState()
         
         # Build PDF
-        doc.build(elements, onFirstPage=add_page_number, onLaterPages=add_page_number)
+        doc.build(self._resolve_charts(elements), onFirstPage=add_page_number, onLaterPages=add_page_number)
         
         return report_path
     
@@ -750,13 +765,7 @@ class ReportGenerator:
                 if "chart" in section_data:
                     # Chart data
                     chart_type = section_data.get("chart_type", "bar")
-                    chart_path = self.generate_chart_image(
-                        section_data["chart"], 
-                        chart_type, 
-                        f"chart_{section_title.lower().replace(' ', '_')}_{timestamp}.png"
-                    )
-                    if chart_path:
-                        elements.append(Image(chart_path, width=400, height=300))
+                    elements.append(self._chart(section_data["chart"], chart_type))
                 
                 elif "table" in section_data:
                     # Table data
@@ -814,7 +823,7 @@ class ReportGenerator:
             canvas.restoreState()
         
         # Build PDF
-        doc.build(elements, onFirstPage=add_page_number, onLaterPages=add_page_number)
+        doc.build(self._resolve_charts(elements), onFirstPage=add_page_number, onLaterPages=add_page_number)
         
         return report_path
 
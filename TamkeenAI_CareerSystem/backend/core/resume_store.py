@@ -0,0 +1,328 @@
+"""
+Resume Version Store
+
+Storage engine behind ResumeManager. Version metadata lives in one indexed
+SQLite table, and file and text payloads in a content-addressed blob
+directory:
+
+    resume_index.db     versions (user_id, version_id, file_hash, created_at, ...)
+    blobs/ab/<sha256>.pdf       original uploaded files, stored once per content
+    blobs/cd/<sha256>.txt.z     zlib-compressed extracted text, stored once per content
+
+Each version row holds its searchable fields as columns plus the rest of the
+version record (structure, metadata, changes) as compressed JSON. Blobs are
+shared by every version that references them and removed with the last one.
+Blob writes and releases run inside SQLite write transactions, so worker
+processes sharing a storage directory do not remove a blob another one is
+about to reference.
+"""
+
+import os
+import json
+import zlib
+import uuid
+import shutil
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterator
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "resume_index.db"
+BLOB_DIRNAME = "blobs"
+TEXT_BLOB_SUFFIX = ".txt.z"
+
+# Version fields stored as index columns rather than in the compressed record
+INDEX_FIELDS = ["version_id", "user_id", "file_hash", "storage_filename", "created_at",
+                "version_name", "file_type", "original_filename", "file_size"]
+# Fields of the version summaries returned by list_versions
+SUMMARY_FIELDS = ["version_id", "version_name", "created_at", "file_type", "original_filename",
+                  "storage_filename", "file_size", "file_hash", "has_changes"]
+
+
+class ResumeStore:
+    """SQLite version index plus content-addressed blob directory"""
+
+    def __init__(self, storage_dir: str):
+        """
+        Open (or create) the store in a storage directory
+
+        Args:
+            storage_dir: Resume storage directory
+        """
+        self.storage_dir = storage_dir
+        self.blob_dir = os.path.join(storage_dir, BLOB_DIRNAME)
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._imported_users = set()
+        self._conn = sqlite3.connect(os.path.join(storage_dir, INDEX_FILENAME),
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS versions (
+                version_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                file_hash TEXT,
+                storage_filename TEXT,
+                text_blob TEXT,
+                created_at TEXT NOT NULL,
+                version_name TEXT,
+                file_type TEXT,
+                original_filename TEXT,
+                file_size INTEGER,
+                has_changes INTEGER DEFAULT 0,
+                record BLOB NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_versions_user_created ON versions(user_id, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_versions_user_hash ON versions(user_id, file_hash)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_versions_storage ON versions(storage_filename)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_versions_text ON versions(text_blob)")
+        # Users whose pre-index JSON files have been imported
+        self._conn.execute("CREATE TABLE IF NOT EXISTS legacy_imports (user_id TEXT PRIMARY KEY)")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction holding the database write lock"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def blob_path(self, blob: str) -> str:
+        """Path of a blob in the blob directory"""
+        return os.path.join(self.blob_dir, blob[:2], blob)
+
+    def _write_blob(self, blob: str, write) -> None:
+        """Write a blob unless it already exists; write(f) fills a temporary file"""
+        path = self.blob_path(blob)
+        if os.path.exists(path):
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def _copy_file(source_path: str, f) -> None:
+        """Copy a file into an open blob file"""
+        with open(source_path, 'rb') as source:
+            shutil.copyfileobj(source, f)
+
+    def read_text(self, blob: Optional[str]) -> str:
+        """Decompress a text blob"""
+        if not blob:
+            return ""
+        with open(self.blob_path(blob), 'rb') as f:
+            return zlib.decompress(f.read()).decode('utf-8')
+
+    def find_by_hash(self, user_id: str, file_hash: str) -> Optional[str]:
+        """
+        Find a user's version of an exact file
+
+        Args:
+            user_id: User identifier
+            file_hash: SHA256 of the file
+
+        Returns:
+            Version ID, or None if the user has no version of this file
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version_id FROM versions WHERE user_id = ? AND file_hash = ? LIMIT 1",
+                (str(user_id), file_hash)
+            ).fetchone()
+        return row["version_id"] if row else None
+
+    def count_versions(self, user_id: str) -> int:
+        """Number of versions a user has"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM versions WHERE user_id = ?",
+                                      (str(user_id),)).fetchone()[0]
+
+    def list_versions(self, user_id: str) -> List[Dict[str, Any]]:
+        """
+        Index entries of a user's versions, newest first
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            List of version summaries (no text, structure or metadata)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(SUMMARY_FIELDS)} FROM versions WHERE user_id = ? ORDER BY created_at DESC",
+                (str(user_id),)
+            ).fetchall()
+        # Plain tuples: much cheaper than sqlite3.Row for long histories
+        versions = [dict(zip(SUMMARY_FIELDS, tuple(row))) for row in rows]
+        for version in versions:
+            version["has_changes"] = bool(version["has_changes"])
+        return versions
+
+    def oldest_versions(self, user_id: str, keep: int) -> List[str]:
+        """IDs of a user's versions beyond the newest keep, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT version_id FROM versions WHERE user_id = ? ORDER BY created_at DESC LIMIT -1 OFFSET ?",
+                (str(user_id), keep)
+            ).fetchall()
+        return [row["version_id"] for row in reversed(rows)]
+
+    def get_version(self, user_id: str, version_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Load a full version record
+
+        Args:
+            user_id: User identifier
+            version_id: Version identifier (latest if None)
+
+        Returns:
+            Version record with text_content and storage_path, or None
+        """
+        with self._lock:
+            if version_id:
+                row = self._conn.execute("SELECT * FROM versions WHERE user_id = ? AND version_id = ?",
+                                         (str(user_id), version_id)).fetchone()
+            else:
+                row = self._conn.execute("SELECT * FROM versions WHERE user_id = ? ORDER BY created_at DESC LIMIT 1",
+                                         (str(user_id),)).fetchone()
+        if row is None:
+            return None
+
+        version = json.loads(zlib.decompress(row["record"]).decode('utf-8'))
+        for field in INDEX_FIELDS:
+            version[field] = row[field]
+        version["text_content"] = self.read_text(row["text_blob"])
+        if row["storage_filename"]:
+            version["storage_path"] = self.blob_path(row["storage_filename"])
+        return version
+
+    def save_version(self, version: Dict[str, Any], source_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Insert or replace a version
+
+        Args:
+            version: Version record (version_id, user_id, created_at, text_content, ...)
+            source_path: Original file to store; without it the version keeps
+                referencing the file blob named by its storage_filename
+
+        Returns:
+            The version, with storage_filename and storage_path set
+        """
+        version = dict(version)
+        text = version.pop("text_content", "") or ""
+        version.pop("storage_path", None)
+
+        if source_path:
+            ext = os.path.splitext(source_path)[1].lower()
+            version["storage_filename"] = f"{version['file_hash']}{ext}"
+
+        encoded_text = text.encode('utf-8')
+        text_blob = f"{hashlib.sha256(encoded_text).hexdigest()}{TEXT_BLOB_SUFFIX}" if text else None
+        record = {k: v for k, v in version.items() if k not in INDEX_FIELDS}
+
+        with self._transaction() as conn:
+            old = conn.execute("SELECT storage_filename, text_blob FROM versions WHERE version_id = ?",
+                               (version["version_id"],)).fetchone()
+
+            if source_path:
+                self._write_blob(version["storage_filename"], lambda f: self._copy_file(source_path, f))
+            if text_blob:
+                self._write_blob(text_blob, lambda f: f.write(zlib.compress(encoded_text)))
+
+            conn.execute(
+                "INSERT OR REPLACE INTO versions (version_id, user_id, file_hash, storage_filename, text_blob, "
+                "created_at, version_name, file_type, original_filename, file_size, has_changes, record) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (version["version_id"], str(version["user_id"]), version.get("file_hash"),
+                 version.get("storage_filename"), text_blob, version["created_at"], version.get("version_name"),
+                 version.get("file_type"), version.get("original_filename"), version.get("file_size"),
+                 int(bool(version.get("changes"))),
+                 zlib.compress(json.dumps(record, default=str).encode('utf-8')))
+            )
+
+            if old is not None:
+                self._release_blobs(conn, [old["storage_filename"], old["text_blob"]])
+
+        version["text_content"] = text
+        if version.get("storage_filename"):
+            version["storage_path"] = self.blob_path(version["storage_filename"])
+        return version
+
+    def delete_version(self, user_id: str, version_id: str) -> bool:
+        """
+        Delete a version and any blobs no other version references
+
+        Args:
+            user_id: User identifier
+            version_id: Version identifier
+
+        Returns:
+            True if the version existed
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT storage_filename, text_blob FROM versions WHERE user_id = ? AND version_id = ?",
+                               (str(user_id), version_id)).fetchone()
+            if row is None:
+                return False
+
+            conn.execute("DELETE FROM versions WHERE version_id = ?", (version_id,))
+            self._release_blobs(conn, [row["storage_filename"], row["text_blob"]])
+        return True
+
+    def _release_blobs(self, conn: sqlite3.Connection, blobs: List[Optional[str]]) -> None:
+        """Remove blobs that no version references any more (call inside a transaction)"""
+        for blob in blobs:
+            if not blob:
+                continue
+            column = "text_blob" if blob.endswith(TEXT_BLOB_SUFFIX) else "storage_filename"
+            if conn.execute(f"SELECT 1 FROM versions WHERE {column} = ? LIMIT 1", (blob,)).fetchone():
+                continue
+            try:
+                os.remove(self.blob_path(blob))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Error removing resume blob {blob}: {str(e)}")
+
+    def needs_legacy_import(self, user_id: str) -> bool:
+        """Whether a user's pre-index version files have not been imported yet"""
+        if str(user_id) in self._imported_users:
+            return False
+        with self._lock:
+            imported = self._conn.execute("SELECT 1 FROM legacy_imports WHERE user_id = ?",
+                                          (str(user_id),)).fetchone() is not None
+        if imported:
+            self._imported_users.add(str(user_id))
+        return not imported
+
+    def mark_legacy_imported(self, user_id: str) -> None:
+        """Record that a user's pre-index version files have been imported"""
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO legacy_imports (user_id) VALUES (?)", (str(user_id),))
+        self._imported_users.add(str(user_id))
+
+    def close(self) -> None:
+        """Close the index database"""
+        with self._lock:
+            self._conn.close()
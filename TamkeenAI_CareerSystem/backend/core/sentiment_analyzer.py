@@ -7,7 +7,10 @@ from typing import Dict, List, Tuple, Any, Optional, Union
 from datetime import datetime
 import hashlib
 import time
+import sqlite3
 import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Optional dependencies - allow graceful fallback if not available
 try:
@@ -50,6 +53,18 @@ except ImportError:
     SPACY_AVAILABLE = False
     nlp = None
 
+# Texts per transformer forward pass in analyze_batch
+TRANSFORMER_BATCH_SIZE = 32
+
+# Threads running the rule-based engines (VADER, TextBlob) in analyze_batch
+RULE_ENGINE_WORKERS = 4
+
+# Result cache database inside cache_dir
+CACHE_DB_FILENAME = "sentiment_cache.db"
+
+# SQLite limits the number of bound parameters per statement
+CACHE_LOOKUP_CHUNK = 500
+
 
 class SentimentAnalyzer:
     """
@@ -82,11 +97,15 @@ class SentimentAnalyzer:
         self.cache_ttl = cache_ttl
         
         # Set up cache
+        self._cache_conn = None
+        self._cache_lock = threading.Lock()
         if cache_dir:
             os.makedirs(cache_dir, exist_ok=True)
             self.cache_dir = cache_dir
+            self._open_cache()
         else:
             self.cache_dir = None
+        self._rule_pool = None
             
         # Initialize available engines
         self.available_engines = []
@@ -263,18 +282,10 @@ class SentimentAnalyzer:
             Dictionary with sentiment scores and analysis
         """
         if not text or not isinstance(text, str):
-            return {
-                "sentiment": "neutral",
-                "score": 0.0,
-                "compound": 0.0,
-                "positive": 0.0,
-                "negative": 0.0,
-                "neutral": 1.0,
-                "confidence": 0.0
-            }
+            return self._empty_result()
         
         # Check cache first
-        cache_key = f"{hashlib.md5(text.encode()).hexdigest()}_{include_emotions}"
+        cache_key = self._cache_key(text, include_emotions)
         cached_result = self._check_cache(cache_key)
         if cached_result:
             return cached_result
@@ -310,6 +321,103 @@ class SentimentAnalyzer:
         
         return combined_result
     
+    def analyze_batch(self, texts: List[str],
+                      include_emotions: bool = False) -> List[Dict[str, Any]]:
+        """
+        Analyze sentiment of many texts (e.g. all answers of an interview) in one call
+        
+        Duplicate texts are analyzed once and cached results are fetched with a
+        single cache lookup. The misses run through the transformer models in
+        batches while VADER and TextBlob run on a thread pool.
+        
+        Args:
+            texts: The texts to analyze
+            include_emotions: Whether to include detailed emotion analysis
+            
+        Returns:
+            One result per text, in input order, as analyze_sentiment returns them
+        """
+        unique_texts = {}  # cache key -> text, in first-seen order
+        text_keys = []
+        for text in texts:
+            if not text or not isinstance(text, str):
+                text_keys.append(None)
+                continue
+            key = self._cache_key(text, include_emotions)
+            unique_texts.setdefault(key, text)
+            text_keys.append(key)
+        
+        results = self._check_cache_many(list(unique_texts))
+        misses = [(key, text) for key, text in unique_texts.items() if key not in results]
+        if misses:
+            analyzed = self._analyze_uncached(misses, include_emotions)
+            self._cache_results(analyzed)
+            results.update(analyzed)
+        
+        return [dict(results[key]) if key else self._empty_result() for key in text_keys]
+    
+    def _analyze_uncached(self, items: List[Tuple[str, str]],
+                          include_emotions: bool) -> Dict[str, Dict[str, Any]]:
+        """Run every engine over (cache key, text) pairs, batching where the engine allows"""
+        texts = [text for _, text in items]
+        
+        # Rule-based engines on the pool, one chunk of texts per task
+        rule_engines = [(name, analyze) for name, analyze in
+                        (("vader", self._analyze_with_vader), ("textblob", self._analyze_with_textblob))
+                        if name in self.available_engines]
+        chunk_size = max(1, -(-len(texts) // RULE_ENGINE_WORKERS))
+        rule_futures = {}
+        if rule_engines:
+            if self._rule_pool is None:
+                self._rule_pool = ThreadPoolExecutor(max_workers=RULE_ENGINE_WORKERS,
+                                                     thread_name_prefix="sentiment")
+            for name, analyze in rule_engines:
+                rule_futures[name] = [
+                    self._rule_pool.submit(lambda chunk, analyze=analyze: [analyze(t) for t in chunk],
+                                           texts[start:start + chunk_size])
+                    for start in range(0, len(texts), chunk_size)
+                ]
+        
+        # Transformer batches on this thread meanwhile (torch releases the GIL)
+        transformer_results = None
+        if "transformers" in self.available_engines:
+            transformer_results = self._analyze_with_transformers_batch(texts)
+        emotions = None
+        if include_emotions and "emotion_transformer" in self.available_engines:
+            emotions = self._analyze_emotions_batch(texts)
+        
+        engine_results = {}
+        for name, futures in rule_futures.items():
+            engine_results[name] = [result for future in futures for result in future.result()]
+        if transformer_results is not None:
+            engine_results["transformers"] = transformer_results
+        
+        analyzed = {}
+        for i, (key, text) in enumerate(items):
+            combined = self._combine_results({name: results[i] for name, results in engine_results.items()})
+            combined = self._apply_domain_context(text, combined)
+            if emotions is not None:
+                combined["emotions"] = emotions[i]
+            analyzed[key] = combined
+        
+        return analyzed
+    
+    def _empty_result(self) -> Dict[str, Any]:
+        """Result for empty or non-string input"""
+        return {
+            "sentiment": "neutral",
+            "score": 0.0,
+            "compound": 0.0,
+            "positive": 0.0,
+            "negative": 0.0,
+            "neutral": 1.0,
+            "confidence": 0.0
+        }
+    
+    def _cache_key(self, text: str, include_emotions: bool) -> str:
+        """Cache key of a text and analysis options"""
+        return f"{hashlib.md5(text.encode()).hexdigest()}_{include_emotions}"
+    
     def _analyze_with_vader(self, text: str) -> Dict[str, float]:
         """Analyze text sentiment using NLTK VADER"""
         try:
@@ -380,89 +488,117 @@ class SentimentAnalyzer:
     
     def _analyze_with_transformers(self, text: str) -> Dict[str, float]:
         """Analyze text sentiment using transformer models"""
-        try:
-            # Truncate text if needed
-            if len(text) > 512:
-                text = text[:512]
+        return self._analyze_with_transformers_batch([text])[0]
+    
+    def _analyze_with_transformers_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Analyze many texts with the transformer sentiment model, in padded batches"""
+        results = [None] * len(texts)
+        for indices, inputs in self._transformer_batches(self.tokenizer, texts):
+            try:
+                with torch.no_grad():
+                    outputs = self.model(**inputs)
+                    
+                # Get probabilities
+                probs = F.softmax(outputs.logits, dim=1).tolist()
+            except Exception as e:
+                self.logger.error(f"Error in transformer analysis: {str(e)}")
+                probs = [None] * len(indices)
                 
-            inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-            with torch.no_grad():
-                outputs = self.model(**inputs)
+            for i, row in zip(indices, probs):
+                if row is None:
+                    results[i] = {
+                        "compound": 0.0,
+                        "positive": 0.0,
+                        "negative": 0.0,
+                        "neutral": 1.0,
+                        "sentiment": "neutral",
+                        "confidence": 0.0
+                    }
+                    continue
                 
-            # Get probabilities
-            probs = F.softmax(outputs.logits, dim=1)
-            
-            # For distilbert-sst2: [negative, positive]
-            neg_prob = probs[0][0].item()
-            pos_prob = probs[0][1].item()
-            
-            # Convert to compound score (-1 to 1)
-            compound = pos_prob - neg_prob
-            
-            # Calculate neutral score
-            neutral = 1.0 - (pos_prob + neg_prob) / 2
-            
-            return {
-                "compound": compound,
-                "positive": pos_prob,
-                "negative": neg_prob,
-                "neutral": neutral,
-                "sentiment": self._get_sentiment_label(compound),
-                "confidence": max(pos_prob, neg_prob)
-            }
-        except Exception as e:
-            self.logger.error(f"Error in transformer analysis: {str(e)}")
-            return {
-                "compound": 0.0,
-                "positive": 0.0,
-                "negative": 0.0,
-                "neutral": 1.0,
-                "sentiment": "neutral",
-                "confidence": 0.0
-            }
+                # For distilbert-sst2: [negative, positive]
+                neg_prob, pos_prob = row[0], row[1]
+                
+                # Convert to compound score (-1 to 1)
+                compound = pos_prob - neg_prob
+                
+                # Calculate neutral score
+                neutral = 1.0 - (pos_prob + neg_prob) / 2
+                
+                results[i] = {
+                    "compound": compound,
+                    "positive": pos_prob,
+                    "negative": neg_prob,
+                    "neutral": neutral,
+                    "sentiment": self._get_sentiment_label(compound),
+                    "confidence": max(pos_prob, neg_prob)
+                }
+        return results
     
     def _analyze_emotions(self, text: str) -> Dict[str, float]:
         """Analyze emotions in text using transformer models"""
-        try:
-            # Truncate text if needed
-            if len(text) > 512:
-                text = text[:512]
+        return self._analyze_emotions_batch([text])[0]
+    
+    def _analyze_emotions_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyze emotions in many texts with the emotion model, in padded batches"""
+        results = [None] * len(texts)
+        for indices, inputs in self._transformer_batches(self.emotion_tokenizer, texts):
+            try:
+                with torch.no_grad():
+                    outputs = self.emotion_model(**inputs)
+                    
+                # Get probabilities
+                batch_probs = F.softmax(outputs.logits, dim=1).tolist()
+            except Exception as e:
+                self.logger.error(f"Error in emotion analysis: {str(e)}")
+                batch_probs = [None] * len(indices)
                 
-            inputs = self.emotion_tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-            with torch.no_grad():
-                outputs = self.emotion_model(**inputs)
+            for i, probs in zip(indices, batch_probs):
+                if probs is None:
+                    results[i] = {
+                        "detailed": {"neutral": 1.0},
+                        "primary": {"neutral": 1.0}
+                    }
+                    continue
                 
-            # Get probabilities
-            probs = F.softmax(outputs.logits, dim=1)[0]
-            
-            # Get top emotions
-            top_emotions = {}
-            for i in range(len(probs)):
-                emotion_name = self.emotion_mapping.get(i, f"emotion_{i}")
-                emotion_score = probs[i].item()
+                # Get top emotions
+                top_emotions = {}
+                for j, emotion_score in enumerate(probs):
+                    emotion_name = self.emotion_mapping.get(j, f"emotion_{j}")
+                    
+                    # Only include emotions with non-negligible scores
+                    if emotion_score > 0.05:
+                        top_emotions[emotion_name] = emotion_score
                 
-                # Only include emotions with non-negligible scores
-                if emotion_score > 0.05:
-                    top_emotions[emotion_name] = emotion_score
-            
-            # Sort emotions by score
-            sorted_emotions = {k: v for k, v in sorted(
-                top_emotions.items(), key=lambda item: item[1], reverse=True
-            )}
-            
-            # Simplify to primary emotion categories for easier use
-            simplified_emotions = self._simplify_emotions(sorted_emotions)
-            
-            return {
-                "detailed": sorted_emotions,
-                "primary": simplified_emotions
-            }
-        except Exception as e:
-            self.logger.error(f"Error in emotion analysis: {str(e)}")
-            return {
-                "detailed": {"neutral": 1.0},
-                "primary": {"neutral": 1.0}
-            }
+                # Sort emotions by score
+                sorted_emotions = {k: v for k, v in sorted(
+                    top_emotions.items(), key=lambda item: item[1], reverse=True
+                )}
+                
+                # Simplify to primary emotion categories for easier use
+                results[i] = {
+                    "detailed": sorted_emotions,
+                    "primary": self._simplify_emotions(sorted_emotions)
+                }
+        return results
+    
+    def _transformer_batches(self, tokenizer, texts: List[str]):
+        """
+        Yield (indices, tokenized inputs) batches of TRANSFORMER_BATCH_SIZE texts
+        
+        Texts are truncated to 512 characters and grouped by length so that
+        each batch pads as little as possible.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), TRANSFORMER_BATCH_SIZE):
+            indices = order[start:start + TRANSFORMER_BATCH_SIZE]
+            try:
+                inputs = tokenizer([texts[i][:512] for i in indices], return_tensors="pt",
+                                   truncation=True, max_length=512, padding=True)
+            except Exception as e:
+                self.logger.error(f"Error tokenizing texts: {str(e)}")
+                inputs = None
+            yield indices, inputs
     
     def _simplify_emotions(self, emotions: Dict[str, float]) -> Dict[str, float]:
         """Simplify detailed emotions into primary categories"""
@@ -604,40 +740,74 @@ class SentimentAnalyzer:
         else:
             return "neutral"
     
+    def _open_cache(self):
+        """Open (or create) the result cache database in cache_dir"""
+        try:
+            self._cache_conn = sqlite3.connect(os.path.join(self.cache_dir, CACHE_DB_FILENAME),
+                                               check_same_thread=False, isolation_level=None)
+            self._cache_conn.execute("PRAGMA journal_mode=WAL")
+            self._cache_conn.execute("PRAGMA synchronous=NORMAL")
+            self._cache_conn.execute("PRAGMA busy_timeout=5000")
+            self._cache_conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (cache_key TEXT PRIMARY KEY, created_at REAL NOT NULL, "
+                "result TEXT NOT NULL)"
+            )
+            self._cache_conn.execute("CREATE INDEX IF NOT EXISTS idx_results_created ON results(created_at)")
+        except sqlite3.Error as e:
+            self.logger.error(f"Error opening sentiment cache: {str(e)}")
+            self._cache_conn = None
+    
     def _check_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Check if result is in cache"""
-        if not self.cache_dir:
-            return None
+        return self._check_cache_many([cache_key]).get(cache_key)
+    
+    def _check_cache_many(self, cache_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Unexpired cached results for the given keys"""
+        if self._cache_conn is None or not cache_keys:
+            return {}
             
-        cache_file = os.path.join(self.cache_dir, f"sentiment_{cache_key}.json")
-        
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r') as f:
-                    cached = json.load(f)
-                    
-                # Check if cache has expired
-                if time.time() - cached.get("timestamp", 0) < self.cache_ttl:
-                    return cached.get("result")
-            except Exception as e:
-                self.logger.error(f"Error reading cache: {str(e)}")
+        cached = {}
+        min_created = time.time() - self.cache_ttl
+        try:
+            with self._cache_lock:
+                for start in range(0, len(cache_keys), CACHE_LOOKUP_CHUNK):
+                    chunk = cache_keys[start:start + CACHE_LOOKUP_CHUNK]
+                    rows = self._cache_conn.execute(
+                        f"SELECT cache_key, result FROM results WHERE created_at >= ? "
+                        f"AND cache_key IN ({', '.join('?' * len(chunk))})",
+                        [min_created] + chunk
+                    ).fetchall()
+                    for cache_key, result in rows:
+                        cached[cache_key] = json.loads(result)
+        except (sqlite3.Error, ValueError) as e:
+            self.logger.error(f"Error reading cache: {str(e)}")
                 
-        return None
+        return cached
     
     def _cache_result(self, cache_key: str, result: Dict[str, Any]):
         """Cache sentiment analysis result"""
-        if not self.cache_dir:
+        self._cache_results({cache_key: result})
+    
+    def _cache_results(self, results: Dict[str, Dict[str, Any]]):
+        """Cache many results in one transaction, dropping expired entries"""
+        if self._cache_conn is None or not results:
             return
             
-        cache_file = os.path.join(self.cache_dir, f"sentiment_{cache_key}.json")
-        
+        now = time.time()
         try:
-            with open(cache_file, 'w') as f:
-                json.dump({
-                    "timestamp": time.time(),
-                    "result": result
-                }, f)
-        except Exception as e:
+            with self._cache_lock:
+                self._cache_conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._cache_conn.executemany(
+                        "INSERT OR REPLACE INTO results (cache_key, created_at, result) VALUES (?, ?, ?)",
+                        [(cache_key, now, json.dumps(result)) for cache_key, result in results.items()]
+                    )
+                    self._cache_conn.execute("DELETE FROM results WHERE created_at < ?", (now - self.cache_ttl,))
+                except BaseException:
+                    self._cache_conn.execute("ROLLBACK")
+                    raise
+                self._cache_conn.execute("COMMIT")
+        except sqlite3.Error as e:
             self.logger.error(f"Error writing cache: {str(e)}")
             
     def analyze_confidence(self, text: str) -> Dict[str, Any]:
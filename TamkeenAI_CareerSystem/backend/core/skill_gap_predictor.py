@@ -1,5 +1,4 @@
 import os
-import re
 import json
 import logging
 import hashlib
@@ -44,6 +43,8 @@ except ImportError:
     SPACY_AVAILABLE = False
     nlp = None
 
+from backend.utils.skill_matcher import SkillMatcher, flatten_skills
+
 
 class SkillGapPredictor:
     """
@@ -83,6 +84,7 @@ class SkillGapPredictor:
             
         # Load taxonomy data
         self.taxonomy_data = self._load_taxonomy_data(taxonomy_path)
+        self._skill_matcher = None
         
         # Load learning resources
         self.learning_resources = self._load_learning_resources(learning_resources_path)
@@ -537,18 +539,12 @@ class SkillGapPredictor:
             return []
     
     def _extract_skills_with_regex(self, text: str) -> List[str]:
-        """Extract skills from text using regex patterns"""
-        skills = []
-        
-        # Use known skills from taxonomy
-        for category, category_skills in self.taxonomy_data.get("skills", {}).items():
-            for skill in category_skills:
-                # Look for the skill with word boundaries
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, text, re.IGNORECASE):
-                    skills.append(skill)
-                    
-        return list(set(skills))  # Remove duplicates
+        """Extract skills from text by whole-word matching against the taxonomy"""
+        # Compile the taxonomy once; matching is then a single pass over the text
+        if self._skill_matcher is None:
+            self._skill_matcher = SkillMatcher(flatten_skills(self.taxonomy_data.get("skills", {})))
+            
+        return self._skill_matcher.find_all(text)
     
     def _get_skill_context(self, text: str, skill: str) -> str:
         """Get context surrounding a skill mention"""
@@ -0,0 +1,392 @@
+"""
+TTS Audio Cache
+
+Disk cache of synthesized speech for TTSModule:
+
+- an in-memory index of the cached files (size, last access) is built with
+  one directory scan when the cache opens and kept up to date on every
+  read and write, so lookups and cleanups do not list or stat the directory;
+- entries are evicted least recently used first whenever a write takes the
+  cache over its byte budget;
+- cached audio is copied to files and sockets with sendfile, without
+  passing through Python buffers;
+- split_sentences and stitch_audio let long texts be cached sentence by
+  sentence and reassembled from cached fragments.
+
+Several processes may share a cache directory. Each keeps its own index:
+files written by another process are adopted on first lookup, and files
+another process evicted are dropped from the index when they fail to open.
+"""
+
+import io
+import os
+import re
+import sys
+import time
+import uuid
+import wave
+import shutil
+import socket
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Any, Optional, BinaryIO
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+CACHE_SUFFIX = ".mp3"
+
+# Seconds between file timestamp updates of a frequently read entry
+TOUCH_INTERVAL = 60
+
+# Only Linux sendfile writes to any descriptor; elsewhere it needs a socket
+# (as in shutil)
+SENDFILE_TO_FILES = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
+# Sentence boundary: terminal punctuation followed by whitespace
+_SENTENCE_END = re.compile(r'(?<=[.!?؟])\s+')
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences
+
+    Args:
+        text: Text to split
+
+    Returns:
+        list: Non-empty sentences, in order
+    """
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text.strip()) if sentence.strip()]
+
+
+def _strip_id3(data: bytes) -> bytes:
+    """MP3 data without a leading ID3v2 tag"""
+    if len(data) >= 10 and data[:3] == b"ID3":
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        return data[10 + size + footer:]
+    return data
+
+
+def _is_mp3(data: bytes) -> bool:
+    """Whether data is MPEG audio: an MP3 frame sync, after any ID3v2 tag"""
+    data = _strip_id3(data)
+    return len(data) >= 2 and data[0] == 0xFF and data[1] & 0xE0 == 0xE0
+
+
+def stitch_audio(fragments: List[bytes]) -> Optional[bytes]:
+    """
+    Join audio fragments of one format into a single clip
+
+    WAV fragments must share channels, sample width and rate; their frames
+    are joined under one header. MP3 frames can be concatenated once the ID3
+    tags of later fragments are dropped. Other formats (e.g. the AIFF that
+    some engines write) cannot be joined.
+
+    Args:
+        fragments: Audio clips, in playback order
+
+    Returns:
+        bytes or None: Joined clip, or None if the fragments cannot be joined
+    """
+    if not fragments:
+        return None
+    if len(fragments) == 1:
+        return fragments[0]
+
+    is_wav = [fragment[:4] == b"RIFF" and fragment[8:12] == b"WAVE" for fragment in fragments]
+    if any(is_wav) != all(is_wav):
+        return None
+
+    if not all(is_wav):
+        if not all(_is_mp3(fragment) for fragment in fragments):
+            return None
+        return fragments[0] + b"".join(_strip_id3(fragment) for fragment in fragments[1:])
+
+    params = None
+    frames = []
+    try:
+        for fragment in fragments:
+            with wave.open(io.BytesIO(fragment), 'rb') as reader:
+                fragment_params = (reader.getnchannels(), reader.getsampwidth(), reader.getframerate())
+                if params is not None and fragment_params != params:
+                    return None
+                params = fragment_params
+                frames.append(reader.readframes(reader.getnframes()))
+    except (wave.Error, EOFError):
+        return None
+
+    output = io.BytesIO()
+    with wave.open(output, 'wb') as writer:
+        writer.setnchannels(params[0])
+        writer.setsampwidth(params[1])
+        writer.setframerate(params[2])
+        writer.writeframes(b"".join(frames))
+    return output.getvalue()
+
+
+class AudioCache:
+    """Size-bounded LRU cache of audio files with an in-memory index"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 100 * 1024 * 1024):
+        """
+        Open (or create) the cache
+
+        Args:
+            cache_dir: Cache directory
+            max_bytes: Byte budget; least recently used entries are evicted beyond it
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # key -> [size, last access time], least recently used first
+        self._index = OrderedDict()
+        self.total_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Index the files already in the cache directory"""
+        entries = []
+        with os.scandir(self.cache_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith(CACHE_SUFFIX) and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name[:-len(CACHE_SUFFIX)], stat.st_size))
+        for mtime, key, size in sorted(entries):
+            self._index[key] = [size, mtime]
+            self.total_bytes += size
+        if entries:
+            logger.info(f"Indexed {len(entries)} cached audio files ({self.total_bytes} bytes)")
+        self._evict()
+
+    def path(self, key: str) -> str:
+        """File path of a cache entry"""
+        return os.path.join(self.cache_dir, f"{key}{CACHE_SUFFIX}")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    # ===== Index =====
+
+    def _touch(self, key: str) -> None:
+        """Mark an entry as just used"""
+        now = time.time()
+        entry = self._index[key]
+        self._index.move_to_end(key)
+        if now - entry[1] > TOUCH_INTERVAL:
+            # Keep the file time close to the last access, so the order survives restarts
+            try:
+                os.utime(self.path(key), (now, now))
+            except OSError:
+                pass
+        entry[1] = now
+
+    def _drop(self, key: str) -> None:
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[0]
+
+    def _evict(self, max_bytes: Optional[int] = None) -> None:
+        """Remove least recently used entries until the cache fits max_bytes (default: its budget)"""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        while self.total_bytes > limit and self._index:
+            key, (size, _) = self._index.popitem(last=False)
+            self.total_bytes -= size
+            self.stats["evictions"] += 1
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Find a cached entry and mark it as used
+
+        Args:
+            key: Cache key
+
+        Returns:
+            str or None: Path of the cached file, or None on a miss
+        """
+        with self._lock:
+            if key not in self._index:
+                # Written by another process sharing the directory?
+                try:
+                    size = os.path.getsize(self.path(key))
+                except OSError:
+                    self.stats["misses"] += 1
+                    return None
+                self._index[key] = [size, time.time()]
+                self.total_bytes += size
+                self._evict()
+                if key not in self._index:
+                    self.stats["misses"] += 1
+                    return None
+            self._touch(key)
+            self.stats["hits"] += 1
+            return self.path(key)
+
+    # ===== Reads =====
+
+    def _open(self, key: str) -> Optional[BinaryIO]:
+        """Open a cached entry, or None on a miss"""
+        path = self.lookup(key)
+        if path is None:
+            return None
+        try:
+            return open(path, 'rb')
+        except OSError:
+            # Evicted by another process
+            with self._lock:
+                self._drop(key)
+            return None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached audio, or None on a miss"""
+        f = self._open(key)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def copy_to(self, key: str, output_path: str) -> bool:
+        """
+        Copy a cached entry to a file, in the kernel where the platform allows
+
+        Returns:
+            bool: False on a miss
+        """
+        f = self._open(key)
+        if f is None:
+            return False
+        with f, open(output_path, 'wb') as out:
+            _sendfile(f, out)
+        return True
+
+    def send(self, key: str, destination: Any) -> Optional[int]:
+        """
+        Write a cached entry to a socket or file object
+
+        Sockets and objects with a file descriptor are written with sendfile;
+        other file-like objects get a buffered copy.
+
+        Args:
+            key: Cache key
+            destination: Socket or writable binary file object
+
+        Returns:
+            int or None: Bytes written, or None on a miss
+        """
+        f = self._open(key)
+        if f is None:
+            return None
+        with f:
+            if isinstance(destination, socket.socket):
+                return destination.sendfile(f)
+            return _sendfile(f, destination)
+
+    # ===== Writes =====
+
+    def put(self, key: str, data: bytes) -> str:
+        """
+        Store audio and evict least recently used entries beyond the budget
+
+        Args:
+            key: Cache key
+            data: Audio data
+
+        Returns:
+            str: Path of the cached file
+        """
+        path = self.path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._drop(key)
+            self._index[key] = [len(data), time.time()]
+            self.total_bytes += len(data)
+            self.stats["writes"] += 1
+            self._evict()
+        return path
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._drop(key)
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def cleanup(self, max_bytes: Optional[int] = None, max_age: Optional[float] = None) -> int:
+        """
+        Remove entries not used within max_age seconds, then shrink to max_bytes
+
+        The byte budget used by later writes is not changed.
+
+        Args:
+            max_bytes: Optional size to shrink to (default: the byte budget)
+            max_age: Optional maximum seconds since last use
+
+        Returns:
+            int: Number of entries removed
+        """
+        removed = 0
+        with self._lock:
+            if max_age is not None:
+                cutoff = time.time() - max_age
+                # Least recently used first, so stop at the first recent entry
+                while self._index:
+                    key, (size, last_access) = next(iter(self._index.items()))
+                    if last_access >= cutoff:
+                        break
+                    self._drop(key)
+                    removed += 1
+                    try:
+                        os.remove(self.path(key))
+                    except OSError:
+                        pass
+            evictions = self.stats["evictions"]
+            self._evict(max_bytes)
+            removed += self.stats["evictions"] - evictions
+        return removed
+
+
+def _sendfile(source: BinaryIO, destination: Any) -> int:
+    """Copy an open file to a file object, with os.sendfile where the platform allows"""
+    size = os.fstat(source.fileno()).st_size
+    try:
+        out_fd = destination.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        out_fd = None
+
+    if out_fd is None or not SENDFILE_TO_FILES:
+        shutil.copyfileobj(source, destination)
+        return size
+
+    # Anything the destination has buffered goes first
+    if hasattr(destination, "flush"):
+        destination.flush()
+    offset = 0
+    try:
+        while offset < size:
+            sent = os.sendfile(out_fd, source.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    except OSError:
+        # Descriptor sendfile cannot write to (e.g. some filesystems): copy the rest
+        source.seek(offset)
+        shutil.copyfileobj(source, destination)
+        return size
+    return offset
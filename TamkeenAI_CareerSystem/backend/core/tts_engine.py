@@ -5,10 +5,11 @@ import base64
 import tempfile
 import hashlib
 from typing import Dict, List, Tuple, Any, Optional, Union, BinaryIO
-from datetime import datetime
 import logging
 import io
 
+from core.tts_cache import AudioCache, split_sentences, stitch_audio
+
 # Optional dependencies - allow graceful fallback if not available
 try:
     import gtts
@@ -44,7 +45,9 @@ class TTSModule:
                pitch: float = 1.0,
                volume: float = 1.0,
                cache_dir: Optional[str] = None,
-               api_keys: Optional[Dict[str, str]] = None):
+               api_keys: Optional[Dict[str, str]] = None,
+               cache_max_mb: int = 100,
+               sentence_cache: bool = True):
         """
         Initialize the TTS module
         
@@ -56,6 +59,8 @@ class TTSModule:
             volume: Volume level (0.0 to 1.0)
             cache_dir: Optional directory for caching audio files
             api_keys: Optional dictionary of API keys for cloud TTS services
+            cache_max_mb: Byte budget of the audio cache, in MB
+            sentence_cache: Cache long texts sentence by sentence and stitch them
         """
         self.engine = engine
         self.voice = voice
@@ -66,6 +71,7 @@ class TTSModule:
         self.tts_engine = None
         self.initialized = False
         self.api_keys = api_keys or {}
+        self.sentence_cache = sentence_cache
         
         # Setup logging
         self.logger = logging.getLogger(__name__)
@@ -77,6 +83,7 @@ class TTSModule:
         else:
             self.cache_dir = os.path.join(tempfile.gettempdir(), "tamkeen_tts_cache")
             os.makedirs(self.cache_dir, exist_ok=True)
+        self.cache = AudioCache(self.cache_dir, cache_max_mb * 1024 * 1024)
             
         # Check available engines
         if AZURE_TTS_AVAILABLE and "azure_speech_key" in self.api_keys and "azure_speech_region" in self.api_keys:
@@ -219,50 +226,33 @@ class TTSModule:
         # Check cache if enabled
         cache_key = None
         if use_cache:
-            cache_params = {
-                'text': text,
-                'engine': self.engine,
-                'voice': self.voice,
-                'rate': self.rate,
-                'pitch': self.pitch,
-                'volume': self.volume,
-                'ssml': ssml
-            }
-            cache_key = self._get_cache_key(cache_params)
-            cached_path = os.path.join(self.cache_dir, f"{cache_key}.mp3")
-            
-            if os.path.exists(cached_path):
-                # Use cached audio
-                if output_path:
-                    # Copy to requested output path
-                    with open(cached_path, 'rb') as src_file:
-                        with open(output_path, 'wb') as dst_file:
-                            dst_file.write(src_file.read())
+            cache_key = self._text_cache_key(text, ssml)
+            
+            if output_path:
+                # Copy to requested output path
+                if self.cache.copy_to(cache_key, output_path):
                     return output_path
-                else:
-                    # Return bytes
-                    with open(cached_path, 'rb') as f:
-                        return f.read()
+            else:
+                # Return bytes
+                cached_audio = self.cache.get(cache_key)
+                if cached_audio is not None:
+                    return cached_audio
         
         # Generate speech based on selected engine
         audio_data = None
         
         try:
-            if self.engine == "azure":
-                audio_data = self._synthesize_azure(text, ssml)
-            elif self.engine == "gtts":
-                audio_data = self._synthesize_gtts(text)
-            elif self.engine == "pyttsx3":
-                audio_data = self._synthesize_pyttsx3(text)
+            if use_cache:
+                audio_data = self._synthesize_with_fragments(text, ssml)
+            else:
+                audio_data = self._synthesize(text, ssml)
                 
             if audio_data is None:
                 return None
                 
             # Save to cache if enabled
             if use_cache and cache_key:
-                cache_path = os.path.join(self.cache_dir, f"{cache_key}.mp3")
-                with open(cache_path, 'wb') as f:
-                    f.write(audio_data)
+                self.cache.put(cache_key, audio_data)
             
             # Save to output path if provided
             if output_path:
@@ -275,6 +265,102 @@ class TTSModule:
         except Exception as e:
             self.logger.error(f"Error synthesizing speech: {str(e)}")
             return None
+    
+    def speech_file(self, text: str, ssml: bool = False) -> Optional[str]:
+        """
+        Get a cached audio file for text, synthesizing it on a miss
+        
+        The path can be served directly (e.g. Flask's send_file), which lets
+        the server send it with sendfile instead of reading it into memory.
+        
+        Args:
+            text: Text or SSML to convert to speech
+            ssml: Whether the input is SSML markup
+            
+        Returns:
+            Path to the cached audio file, or None if synthesis fails
+        """
+        if not text or not text.strip():
+            return None
+        
+        cache_key = self._text_cache_key(text, ssml)
+        cached_path = self.cache.lookup(cache_key)
+        if cached_path:
+            return cached_path
+        
+        if self.text_to_speech(text, ssml=ssml) is None:
+            return None
+        return self.cache.lookup(cache_key)
+    
+    def stream_speech(self, text: str, destination: Any, ssml: bool = False) -> Optional[int]:
+        """
+        Write speech for text to a socket or file object
+        
+        Cached audio is sent with sendfile, without copying it through Python.
+        
+        Args:
+            text: Text or SSML to convert to speech
+            destination: Socket or writable binary file object
+            ssml: Whether the input is SSML markup
+            
+        Returns:
+            Number of bytes written, or None if synthesis fails
+        """
+        if self.speech_file(text, ssml) is None:
+            return None
+        return self.cache.send(self._text_cache_key(text, ssml), destination)
+    
+    def _text_cache_key(self, text: str, ssml: bool) -> str:
+        """Cache key of text with the current engine and voice settings"""
+        cache_params = {
+            'text': text,
+            'engine': self.engine,
+            'voice': self.voice,
+            'rate': self.rate,
+            'pitch': self.pitch,
+            'volume': self.volume,
+            'ssml': ssml
+        }
+        return self._get_cache_key(cache_params)
+    
+    def _synthesize(self, text: str, ssml: bool = False) -> Optional[bytes]:
+        """Synthesize speech with the selected engine"""
+        if self.engine == "azure":
+            return self._synthesize_azure(text, ssml)
+        elif self.engine == "gtts":
+            return self._synthesize_gtts(text)
+        elif self.engine == "pyttsx3":
+            return self._synthesize_pyttsx3(text)
+        return None
+    
+    def _synthesize_with_fragments(self, text: str, ssml: bool = False) -> Optional[bytes]:
+        """
+        Synthesize text from cached sentences where possible
+        
+        Plain texts of several sentences are synthesized (or read from the
+        cache) one sentence at a time and stitched together, so prompts that
+        share sentences share their audio. SSML is synthesized whole.
+        """
+        sentences = split_sentences(text) if self.sentence_cache and not ssml else []
+        if len(sentences) < 2:
+            return self._synthesize(text, ssml)
+        
+        fragments = []
+        for sentence in sentences:
+            fragment_key = self._text_cache_key(sentence, False)
+            fragment = self.cache.get(fragment_key)
+            if fragment is None:
+                fragment = self._synthesize(sentence)
+                if fragment is None:
+                    return None
+                self.cache.put(fragment_key, fragment)
+            fragments.append(fragment)
+        
+        stitched = stitch_audio(fragments)
+        if stitched is None:
+            self.logger.warning("Could not stitch cached speech fragments, synthesizing the whole text")
+            return self._synthesize(text, ssml)
+        return stitched
             
     def _synthesize_azure(self, text: str, ssml: bool = False) -> Optional[bytes]:
         """Synthesize speech using Azure TTS"""
@@ -420,61 +506,20 @@ class TTSModule:
         # Generate a hash of the parameters
         return hashlib.md5(param_str.encode('utf-8')).hexdigest()
         
-    def cleanup_cache(self, max_size_mb: int = 100, max_age_days: int = 30):
-        """Clean up the cache directory to prevent it from growing too large"""
-        if not self.cache_dir or not os.path.exists(self.cache_dir):
-            return
-            
+    def cleanup_cache(self, max_size_mb: Optional[int] = None, max_age_days: int = 30):
+        """
+        Clean up the cache directory to prevent it from growing too large
+        
+        Args:
+            max_size_mb: Size to shrink the cache to now (defaults to cache_max_mb);
+                the budget of later writes stays cache_max_mb
+            max_age_days: Remove audio not used for this many days
+        """
         try:
-            # Get all cache files with their size and modification time
-            cache_files = []
-            total_size = 0
-            
-            for filename in os.listdir(self.cache_dir):
-                if not filename.endswith('.mp3'):
-                    continue
-                    
-                file_path = os.path.join(self.cache_dir, filename)
-                if not os.path.isfile(file_path):
-                    continue
-                    
-                file_size = os.path.getsize(file_path)
-                mod_time = os.path.getmtime(file_path)
-                cache_files.append((file_path, file_size, mod_time))
-                total_size += file_size
-                
-            # Convert max size to bytes
-            max_size_bytes = max_size_mb * 1024 * 1024
-            
-            # Calculate cutoff time for old files
-            now = datetime.now().timestamp()
-            max_age_seconds = max_age_days * 24 * 60 * 60
-            cutoff_time = now - max_age_seconds
-            
-            # First, remove files that are too old
-            for file_path, _, mod_time in cache_files:
-                if mod_time < cutoff_time:
-                    try:
-                        os.remove(file_path)
-                        # Update total size
-                        total_size -= file_size
-                    except:
-                        pass
-                        
-            # If still over max size, remove oldest files first
-            if total_size > max_size_bytes:
-                # Sort by modification time (oldest first)
-                cache_files.sort(key=lambda x: x[2])
-                
-                for file_path, file_size, _ in cache_files:
-                    if total_size <= max_size_bytes:
-                        break
-                        
-                    try:
-                        os.remove(file_path)
-                        total_size -= file_size
-                    except:
-                        pass
+            max_bytes = max_size_mb * 1024 * 1024 if max_size_mb is not None else None
+            removed = self.cache.cleanup(max_bytes=max_bytes, max_age=max_age_days * 24 * 60 * 60)
+            if removed:
+                self.logger.info(f"Removed {removed} cached audio files")
                         
         except Exception as e:
             self.logger.error(f"Error cleaning cache: {str(e)}")
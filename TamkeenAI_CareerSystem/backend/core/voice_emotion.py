@@ -8,6 +8,10 @@ import math
 import numpy as np
 from datetime import datetime
 import io
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 # Optional dependencies - allow graceful fallback if not available
 try:
@@ -35,6 +39,73 @@ try:
 except ImportError:
     TF_AVAILABLE = False
 
+# STFT settings shared by every spectral feature (librosa defaults)
+N_FFT = 2048
+HOP_LENGTH = 512
+
+# Size of the segment worker pool. Each web worker process (WEB_CONCURRENCY
+# under gunicorn) gets its own pool, so the CPUs are divided between them.
+SEGMENT_WORKERS = int(os.environ.get(
+    "VOICE_SEGMENT_WORKERS",
+    max(1, min(4, (os.cpu_count() or 1) // max(1, int(os.environ.get("WEB_CONCURRENCY", 1)))))
+))
+
+# Analyzer used by each interview segment worker process
+_segment_analyzer = None
+
+# Worker pool shared by interview analyses, with the settings it was created for
+_segment_pool = None
+_segment_pool_key = None
+_segment_pool_lock = threading.Lock()
+
+
+def _init_segment_worker(analysis_method: str, model_path: Optional[str]):
+    """Create the analyzer used by a segment worker process"""
+    global _segment_analyzer
+    _segment_analyzer = VoiceEmotionAnalyzer(analysis_method, model_path)
+
+
+def _analyze_segment(audio_data: Union[str, bytes, np.ndarray]) -> Dict[str, Any]:
+    """Analyze one interview segment in a worker process"""
+    return _segment_analyzer.analyze_voice(audio_data)
+
+
+def _get_segment_pool(analysis_method: str, model_path: Optional[str]) -> ProcessPoolExecutor:
+    """
+    Get the shared segment worker pool, creating it on first use
+    
+    Workers are started with "spawn" so they do not inherit TensorFlow state,
+    which is not fork-safe, and are kept for later interviews so the model is
+    only loaded once per worker. The pool always has SEGMENT_WORKERS processes,
+    whatever the number of segments of an interview.
+    """
+    global _segment_pool, _segment_pool_key
+    
+    key = (analysis_method, model_path)
+    with _segment_pool_lock:
+        if _segment_pool is None or _segment_pool_key != key:
+            if _segment_pool is not None:
+                _segment_pool.shutdown(wait=False)
+            _segment_pool = ProcessPoolExecutor(
+                max_workers=SEGMENT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_segment_worker,
+                initargs=(analysis_method, model_path)
+            )
+            _segment_pool_key = key
+        return _segment_pool
+
+
+def _shutdown_segment_pool():
+    """Discard the shared segment worker pool"""
+    global _segment_pool, _segment_pool_key
+    
+    with _segment_pool_lock:
+        if _segment_pool is not None:
+            _segment_pool.shutdown(wait=False)
+        _segment_pool = None
+        _segment_pool_key = None
+
 
 class VoiceEmotionAnalyzer:
     """
@@ -51,6 +122,7 @@ class VoiceEmotionAnalyzer:
             model_path: Optional path to custom model file
         """
         self.analysis_method = analysis_method
+        self.model_path = model_path
         self.available_methods = []
         self.initialized = False
         self.model = None
@@ -179,14 +251,17 @@ class VoiceEmotionAnalyzer:
                 print(f"Speech recognition failed: {str(e)}")
                 transcript = ""
         
+        # Compute the spectrogram once for every analysis method
+        spectra = self._compute_spectra(y, sr) if LIBROSA_AVAILABLE else None
+        
         # Process based on selected method
         if self.analysis_method == "acoustic":
-            analysis = self._analyze_acoustic_features(y, sr, transcript)
+            analysis = self._analyze_acoustic_features(y, sr, transcript, spectra)
         elif self.analysis_method == "ml":
-            analysis = self._analyze_with_ml(y, sr, transcript)
+            analysis = self._analyze_with_ml(y, sr, transcript, spectra)
         else:  # combined
-            acoustic_analysis = self._analyze_acoustic_features(y, sr, transcript)
-            ml_analysis = self._analyze_with_ml(y, sr, transcript)
+            acoustic_analysis = self._analyze_acoustic_features(y, sr, transcript, spectra)
+            ml_analysis = self._analyze_with_ml(y, sr, transcript, spectra, acoustic_analysis)
             
             # Combine the results
             analysis = self._combine_analyses(acoustic_analysis, ml_analysis)
@@ -205,13 +280,19 @@ class VoiceEmotionAnalyzer:
         
     def analyze_interview_audio(self, 
                              audio_segments: List[Union[str, bytes, np.ndarray]], 
-                             timestamps: Optional[List[float]] = None) -> Dict[str, Any]:
+                             timestamps: Optional[List[float]] = None,
+                             max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze emotions across a sequence of audio segments from an interview
         
+        Segments are analyzed in parallel worker processes, since feature
+        extraction is CPU-bound numpy work.
+        
         Args:
             audio_segments: List of audio files or data
             timestamps: Optional list of timestamps for each segment
+            max_workers: Maximum segments analyzed at once (defaults to
+                SEGMENT_WORKERS; 1 analyzes the segments in this process)
             
         Returns:
             Dictionary with emotional progression, patterns, and overall assessment
@@ -222,24 +303,23 @@ class VoiceEmotionAnalyzer:
         # Initialize results
         results = []
         
+        # Analyze the segments, in parallel when there is more than one
+        segment_results = self._analyze_segments(audio_segments, max_workers)
+        
         # Process each audio segment
-        for i, audio_data in enumerate(audio_segments):
+        for i, result in enumerate(segment_results):
             timestamp = timestamps[i] if timestamps and i < len(timestamps) else i
             
-            try:
-                # Analyze this segment
-                result = self.analyze_voice(audio_data)
-                
-                # Add timestamp
-                result["segment_index"] = i
-                result["timestamp"] = timestamp
-                
-                results.append(result)
-                
-            except Exception as e:
-                print(f"Error processing audio segment {i}: {str(e)}")
+            if isinstance(result, Exception):
+                print(f"Error processing audio segment {i}: {str(result)}")
                 continue
                 
+            # Add timestamp
+            result["segment_index"] = i
+            result["timestamp"] = timestamp
+            
+            results.append(result)
+                
         # If no valid results, return error
         if not results:
             return {"error": "No valid voice analyses in the provided segments"}
@@ -249,6 +329,51 @@ class VoiceEmotionAnalyzer:
         
         return analysis
         
+    def _analyze_segments(self, 
+                       audio_segments: List[Union[str, bytes, np.ndarray]], 
+                       max_workers: Optional[int] = None) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Analyze audio segments, in worker processes when there is more than one
+        
+        Args:
+            audio_segments: List of audio files or data
+            max_workers: Maximum segments analyzed at once
+            
+        Returns:
+            List with each segment's analysis, or the exception it raised
+        """
+        workers = min(max_workers or SEGMENT_WORKERS, SEGMENT_WORKERS, len(audio_segments))
+        
+        if workers > 1:
+            try:
+                pool = _get_segment_pool(self.analysis_method, self.model_path)
+                
+                # Keep at most `workers` segments in flight
+                futures = [pool.submit(_analyze_segment, audio_data) for audio_data in audio_segments[:workers]]
+                results = []
+                for index in range(len(audio_segments)):
+                    try:
+                        results.append(futures[index].result())
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        results.append(e)
+                    if index + workers < len(audio_segments):
+                        futures.append(pool.submit(_analyze_segment, audio_segments[index + workers]))
+                return results
+                
+            except BrokenProcessPool as e:
+                _shutdown_segment_pool()
+                print(f"Segment worker pool failed, analyzing serially: {str(e)}")
+        
+        results = []
+        for audio_data in audio_segments:
+            try:
+                results.append(self.analyze_voice(audio_data))
+            except Exception as e:
+                results.append(e)
+        return results
+        
     def _analyze_voice_sequence(self, analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze a sequence of voice analyses to identify patterns"""
         if not analyses:
@@ -442,14 +567,44 @@ class VoiceEmotionAnalyzer:
             
         return insights
         
-    def _analyze_acoustic_features(self, y: np.ndarray, sr: int, transcript: str = "") -> Dict[str, Any]:
+    def _compute_spectra(self, y: np.ndarray, sr: int) -> Dict[str, np.ndarray]:
+        """
+        Compute the spectral representations that all voice features derive from
+        
+        The STFT runs once per segment; pitch, onsets, spectral shape, MFCCs
+        and chroma are all computed from its magnitude instead of each librosa
+        call recomputing its own spectrogram.
+        
+        Args:
+            y: Audio signal
+            sr: Sample rate
+            
+        Returns:
+            Dictionary with the STFT magnitude, power and log-mel spectrograms
+        """
+        magnitude = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+        power = magnitude ** 2
+        mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=power, sr=sr))
+        
+        return {
+            "magnitude": magnitude,
+            "power": power,
+            "mel_db": mel_db
+        }
+        
+    def _analyze_acoustic_features(self, y: np.ndarray, sr: int, transcript: str = "",
+                                   spectra: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Any]:
         """Analyze acoustic features using librosa"""
         if not LIBROSA_AVAILABLE:
             return {"error": "Librosa not available for acoustic analysis"}
             
         try:
+            if spectra is None:
+                spectra = self._compute_spectra(y, sr)
+            S = spectra["magnitude"]
+            
             # Calculate pitch (fundamental frequency) features
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
+            pitches, magnitudes = librosa.piptrack(S=S, sr=sr, hop_length=HOP_LENGTH)
             pitches = pitches[pitches > 0]
             pitch_stats = {}
             
@@ -461,20 +616,21 @@ class VoiceEmotionAnalyzer:
                     "max": float(np.max(pitches))
                 }
                 
-            # Calculate voice energy/volume
-            rms = librosa.feature.rms(y=y)[0]
+            # Calculate voice energy/volume (time domain, no spectrogram needed)
+            rms = librosa.feature.rms(y=y, frame_length=N_FFT, hop_length=HOP_LENGTH)[0]
             energy = float(np.mean(rms))
             
             # Calculate speaking rate (based on detected onsets)
-            onsets = librosa.onset.onset_detect(y=y, sr=sr)
+            onset_envelope = librosa.onset.onset_strength(S=spectra["mel_db"], sr=sr)
+            onsets = librosa.onset.onset_detect(onset_envelope=onset_envelope, sr=sr, hop_length=HOP_LENGTH)
             speaking_rate = len(onsets) / (len(y) / sr) if len(y) > 0 else 0
             
             # Calculate voice stability features
-            spectral_bandwidth = np.mean(librosa.feature.spectral_bandwidth(y=y, sr=sr))
-            spectral_contrast = np.mean(librosa.feature.spectral_contrast(y=y, sr=sr))
+            spectral_bandwidth = np.mean(librosa.feature.spectral_bandwidth(S=S, sr=sr))
+            spectral_contrast = np.mean(librosa.feature.spectral_contrast(S=S, sr=sr))
             
             # Calculate MFCC features for voice quality
-            mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+            mfccs = librosa.feature.mfcc(S=spectra["mel_db"], sr=sr, n_mfcc=13)
             mfcc_means = np.mean(mfccs, axis=1).tolist()
             mfcc_vars = np.var(mfccs, axis=1).tolist()
             
@@ -561,15 +717,21 @@ class VoiceEmotionAnalyzer:
         except Exception as e:
             return {"error": f"Acoustic analysis error: {str(e)}"}
             
-    def _analyze_with_ml(self, y: np.ndarray, sr: int, transcript: str = "") -> Dict[str, Any]:
+    def _analyze_with_ml(self, y: np.ndarray, sr: int, transcript: str = "",
+                         spectra: Optional[Dict[str, np.ndarray]] = None,
+                         acoustic_analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analyze voice emotion using ML model"""
+        # Reuse the acoustic analysis when the caller already computed it
+        if acoustic_analysis is None:
+            acoustic_analysis = self._analyze_acoustic_features(y, sr, transcript, spectra)
+            
         # If no model is available, fall back to acoustic
         if self.model is None or not TF_AVAILABLE:
-            return self._analyze_acoustic_features(y, sr, transcript)
+            return acoustic_analysis
             
         try:
             # Extract features for ML model
-            features = self._extract_ml_features(y, sr)
+            features = self._extract_ml_features(y, sr, spectra)
             
             # Since we don't have an actual trained model here,
             # we'll return a placeholder result
@@ -587,8 +749,6 @@ class VoiceEmotionAnalyzer:
             confidence = 0.6
             
             # Use acoustic features for additional metrics
-            acoustic_analysis = self._analyze_acoustic_features(y, sr, transcript)
-            
             return {
                 "emotions": emotions,
                 "dominant_emotion": dominant_emotion,
@@ -603,24 +763,27 @@ class VoiceEmotionAnalyzer:
         except Exception as e:
             # Fall back to acoustic analysis on error
             print(f"ML analysis failed, falling back to acoustic: {str(e)}")
-            return self._analyze_acoustic_features(y, sr, transcript)
+            return acoustic_analysis
     
-    def _extract_ml_features(self, y: np.ndarray, sr: int) -> np.ndarray:
+    def _extract_ml_features(self, y: np.ndarray, sr: int,
+                             spectra: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
         """Extract features for ML model"""
         # This is a placeholder for feature extraction
         # In a real implementation, you'd extract proper features for your model
+        if spectra is None:
+            spectra = self._compute_spectra(y, sr)
         
         # Get MFCCs
-        mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+        mfccs = librosa.feature.mfcc(S=spectra["mel_db"], sr=sr, n_mfcc=13)
         mfcc_means = np.mean(mfccs, axis=1)
         mfcc_vars = np.var(mfccs, axis=1)
         
         # Get chroma
-        chroma = librosa.feature.chroma_stft(y=y, sr=sr)
+        chroma = librosa.feature.chroma_stft(S=spectra["power"], sr=sr)
         chroma_means = np.mean(chroma, axis=1)
         
         # Get spectral features
-        spectral_contrast = librosa.feature.spectral_contrast(y=y, sr=sr)
+        spectral_contrast = librosa.feature.spectral_contrast(S=spectra["magnitude"], sr=sr)
         contrast_means = np.mean(spectral_contrast, axis=1)
         
         # Combine features
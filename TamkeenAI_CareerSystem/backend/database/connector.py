@@ -3,12 +3,22 @@ Database Connector Module
 
 This module provides database connection and interaction functionality
 for the Tamkeen AI Career System.
+
+Each thread gets its own SQLite connection in WAL mode, so readers never block
+on writers and writers only contend on SQLite's own write lock. Statements
+outside an explicit transaction autocommit; high-volume inserts can be queued
+and written in batches.
 """
 
 import os
 import json
+import atexit
 import logging
 import sqlite3
+import weakref
+import threading
+from collections import deque
+from contextlib import contextmanager
 from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 
@@ -18,8 +28,15 @@ from backend.config.settings import DB_CONFIG, DB_TYPE
 # Setup logger
 logger = logging.getLogger(__name__)
 
+# Job columns indexed for full-text search
+JOB_SEARCH_FIELDS = ["title", "description", "company", "location", "skills"]
+# Integer key of a job in the search index; unlike the implicit rowid of a
+# table with a TEXT primary key, VACUUM keeps it
+SEARCH_ROWID = "search_rowid"
+
 # Database connection
 _db_connection = None
+_db_lock = threading.Lock()
 
 
 class DatabaseError(Exception):
@@ -27,6 +44,11 @@ class DatabaseError(Exception):
     pass
 
 
+class _Connection(sqlite3.Connection):
+    """sqlite3 connection that can be weakly referenced"""
+    pass
+
+
 def get_db():
     """
     Get database connection
@@ -37,7 +59,9 @@ def get_db():
     global _db_connection
     
     if _db_connection is None:
-        _db_connection = Database()
+        with _db_lock:
+            if _db_connection is None:
+                _db_connection = Database()
     
     return _db_connection
 
@@ -45,25 +69,71 @@ def get_db():
 class Database:
     """Database interface"""
     
-    def __init__(self):
-        """Initialize database connection"""
-        self.connection = None
+    def __init__(self, db_file: Optional[str] = None):
+        """
+        Initialize database connection
+        
+        Args:
+            db_file: SQLite database file (defaults to the configured file)
+        """
+        self.config = DB_CONFIG.get(DB_TYPE, {})
+        self.db_file = db_file or self.config.get('db_file', 'database.db')
+        
+        # Per-thread connections and transaction state
+        self._local = threading.local()
+        self._table_columns = {}
+        self.fts_available = False
+        # Weak references only: a connection is closed when its thread exits
+        self._connections = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
+        
+        # Write-behind buffer for high-volume inserts
+        self.batch_writer = BatchWriter(
+            self,
+            batch_size=self.config.get('batch_size', 500),
+            flush_interval=self.config.get('flush_interval', 0.5)
+        )
+        
         self.connect()
     
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection owned by the calling thread (opened on first use)"""
+        connection = getattr(self._local, 'connection', None)
+        
+        # Connections must not be shared across a fork (e.g. gunicorn preload)
+        if connection is None or getattr(self._local, 'pid', None) != os.getpid():
+            connection = self._open_connection()
+        
+        return connection
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and configure a connection for the calling thread"""
+        if DB_TYPE != 'sqlite':
+            raise DatabaseError(f"Unsupported database type: {DB_TYPE}")
+        
+        # Autocommit mode; transactions are managed explicitly by transaction()
+        connection = sqlite3.connect(self.db_file, isolation_level=None, check_same_thread=False,
+                                     factory=_Connection)
+        connection.row_factory = sqlite3.Row
+        
+        for pragma, value in self.config.get('pragmas', {'foreign_keys': 'ON'}).items():
+            connection.execute(f"PRAGMA {pragma} = {value}")
+        
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        self._local.tx_depth = 0
+        
+        with self._connections_lock:
+            self._connections.add(connection)
+        
+        return connection
+    
     def connect(self):
         """Connect to database"""
         try:
-            if DB_TYPE == 'sqlite':
-                db_file = DB_CONFIG.get('db_file', 'database.db')
-                self.connection = sqlite3.connect(db_file, check_same_thread=False)
-                self.connection.row_factory = sqlite3.Row
-                
-                # Enable foreign keys
-                self.connection.execute('PRAGMA foreign_keys = ON')
-            else:
-                raise DatabaseError(f"Unsupported database type: {DB_TYPE}")
-            
-            # Create tables if they don't exist
+            # Open this thread's connection and create tables if they don't exist
+            self.connection
             self._create_tables()
             
             return True
@@ -72,10 +142,56 @@ class Database:
             raise DatabaseError(f"Error connecting to database: {str(e)}")
     
     def close(self):
-        """Close database connection"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """Close all database connections"""
+        self.batch_writer.flush()
+        
+        with self._connections_lock:
+            for connection in list(self._connections):
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+            self._connections = weakref.WeakSet()
+        
+        self._local = threading.local()
+    
+    @contextmanager
+    def transaction(self, immediate: bool = True):
+        """
+        Run statements in a single transaction
+        
+        Nested transactions join the outermost one. The transaction commits when
+        the outermost block exits and rolls back if it raises.
+        
+        Args:
+            immediate: Take the write lock up front (avoids upgrade deadlocks)
+            
+        Yields:
+            Database: This database
+        """
+        connection = self.connection
+        depth = self._local.tx_depth
+        
+        if depth == 0:
+            connection.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        self._local.tx_depth = depth + 1
+        
+        try:
+            yield self
+        except Exception:
+            self._local.tx_depth = depth
+            if depth == 0:
+                connection.execute("ROLLBACK")
+            raise
+        else:
+            self._local.tx_depth = depth
+            if depth == 0:
+                connection.execute("COMMIT")
+    
+    @property
+    def in_transaction(self) -> bool:
+        """Whether the calling thread has an open transaction"""
+        return getattr(self._local, 'tx_depth', 0) > 0
     
     def _create_tables(self):
         """Create database tables if they don't exist"""
@@ -143,7 +259,8 @@ class Database:
                     external_url TEXT,
                     source TEXT,
                     created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
+                    updated_at TEXT NOT NULL,
+                    search_rowid INTEGER
                 )
                 """,
                 
@@ -263,18 +380,113 @@ class Database:
                 """
             ]
             
-            # Create each table
-            cursor = self.connection.cursor()
-            for table in tables:
-                cursor.execute(table)
+            # Secondary indexes on foreign keys and filter columns
+            indexes = [
+                "CREATE INDEX IF NOT EXISTS idx_users_status ON users (status)",
+                "CREATE INDEX IF NOT EXISTS idx_user_activity_user ON user_activity (user_id, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_user_activity_type ON user_activity (activity_type, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_resumes_user ON resumes (user_id, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_job_applications_user ON job_applications (user_id, job_id)",
+                "CREATE INDEX IF NOT EXISTS idx_job_applications_job ON job_applications (job_id)",
+                "CREATE INDEX IF NOT EXISTS idx_job_bookmarks_user ON job_bookmarks (user_id)",
+                "CREATE INDEX IF NOT EXISTS idx_career_paths_user ON career_paths (user_id)",
+                "CREATE INDEX IF NOT EXISTS idx_user_skills_user ON user_skills (user_id)",
+                "CREATE INDEX IF NOT EXISTS idx_job_market_data_type ON job_market_data (data_type, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_job_market_queries_user ON job_market_queries (user_id)",
+                "CREATE INDEX IF NOT EXISTS idx_cache_expiry ON cache (expiry)"
+            ]
             
-            self.connection.commit()
-            cursor.close()
+            # Create each table and index
+            with self.transaction():
+                for table in tables:
+                    self.connection.execute(table)
+                
+                for index in indexes:
+                    self.connection.execute(index)
+                
+                self._create_search_index()
             
         except Exception as e:
             logger.error(f"Error creating tables: {str(e)}")
             raise DatabaseError(f"Error creating tables: {str(e)}")
     
+    def _create_search_index(self):
+        """Create the FTS5 job search table and the triggers keeping it in sync with jobs"""
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(jobs)")]
+        if SEARCH_ROWID not in columns:
+            # Search table keyed on the implicit rowid: rebuild it on the new key
+            self.connection.execute(f"ALTER TABLE jobs ADD COLUMN {SEARCH_ROWID} INTEGER")
+            self.connection.execute("DROP TABLE IF EXISTS jobs_fts")
+            for trigger in ("jobs_fts_insert", "jobs_fts_delete", "jobs_fts_update"):
+                self.connection.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        self.connection.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_search_rowid ON jobs ({SEARCH_ROWID})"
+        )
+        
+        existing = self.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'"
+        ).fetchone()
+        
+        if existing:
+            self.fts_available = True
+            return
+        
+        try:
+            # External-content table: the text lives in jobs, FTS5 only stores the index
+            self.connection.execute(f"""
+                CREATE VIRTUAL TABLE jobs_fts USING fts5(
+                    {', '.join(JOB_SEARCH_FIELDS)},
+                    content='jobs', content_rowid='{SEARCH_ROWID}'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, job search will scan the jobs table: {str(e)}")
+            self.fts_available = False
+            return
+        
+        fields = ', '.join(JOB_SEARCH_FIELDS)
+        new_values = ', '.join(f"new.{field}" for field in JOB_SEARCH_FIELDS)
+        old_values = ', '.join(f"old.{field}" for field in JOB_SEARCH_FIELDS)
+        
+        # New jobs take the next search key unless they carry one
+        self.connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+                UPDATE jobs SET {SEARCH_ROWID} = (SELECT COALESCE(MAX({SEARCH_ROWID}), 0) + 1 FROM jobs)
+                    WHERE rowid = new.rowid AND new.{SEARCH_ROWID} IS NULL;
+                INSERT INTO jobs_fts (rowid, {fields})
+                    SELECT {SEARCH_ROWID}, {fields} FROM jobs WHERE rowid = new.rowid;
+            END
+        """)
+        self.connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, {fields}) VALUES ('delete', old.{SEARCH_ROWID}, {old_values});
+            END
+        """)
+        self.connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF {fields} ON jobs BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, {fields}) VALUES ('delete', old.{SEARCH_ROWID}, {old_values});
+                INSERT INTO jobs_fts (rowid, {fields}) VALUES (new.{SEARCH_ROWID}, {new_values});
+            END
+        """)
+        
+        # Key and index jobs that existed before the search table
+        self.connection.execute(
+            f"UPDATE jobs SET {SEARCH_ROWID} = rowid + (SELECT COALESCE(MAX({SEARCH_ROWID}), 0) FROM jobs) "
+            f"WHERE {SEARCH_ROWID} IS NULL"
+        )
+        self.rebuild_search_index()
+    
+    def rebuild_search_index(self):
+        """
+        Re-index every job in jobs_fts
+        
+        The triggers keep the index in sync, so this is only needed as
+        maintenance, e.g. after editing jobs with the triggers dropped.
+        """
+        self.connection.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+        self.fts_available = True
+    
     def execute(self, query, params=None):
         """
         Execute SQL query
@@ -287,9 +499,6 @@ class Database:
             list: Query results
         """
         try:
-            if not self.connection:
-                self.connect()
-            
             cursor = self.connection.cursor()
             
             if params:
@@ -297,14 +506,13 @@ class Database:
             else:
                 cursor.execute(query)
             
-            if query.strip().upper().startswith(('SELECT', 'PRAGMA')):
+            if query.strip().upper().startswith(('SELECT', 'PRAGMA', 'WITH')):
                 # Fetch results for SELECT queries
                 results = [dict(row) for row in cursor.fetchall()]
                 cursor.close()
                 return results
             else:
-                # Commit for non-SELECT queries
-                self.connection.commit()
+                # Statements autocommit unless inside transaction()
                 last_id = cursor.lastrowid
                 cursor.close()
                 return last_id
@@ -313,7 +521,30 @@ class Database:
             logger.error(f"Error executing query: {str(e)}")
             raise DatabaseError(f"Error executing query: {str(e)}")
     
-    def find(self, table, conditions=None, limit=None, order_by=None):
+    def executemany(self, query, params_list):
+        """
+        Execute SQL statement once per parameter set in a single transaction
+        
+        Args:
+            query: SQL statement
+            params_list: Sequence of parameter lists
+            
+        Returns:
+            int: Number of affected rows
+        """
+        try:
+            with self.transaction():
+                cursor = self.connection.executemany(query, params_list)
+                rowcount = cursor.rowcount
+                cursor.close()
+            
+            return rowcount
+            
+        except Exception as e:
+            logger.error(f"Error executing batch query: {str(e)}")
+            raise DatabaseError(f"Error executing batch query: {str(e)}")
+    
+    def find(self, table, conditions=None, limit=None, order_by=None, offset=None):
         """
         Find records in table
         
@@ -322,6 +553,7 @@ class Database:
             conditions: Optional conditions dict
             limit: Optional result limit
             order_by: Optional sort field and direction
+            offset: Optional number of records to skip
             
         Returns:
             list: Query results
@@ -347,6 +579,9 @@ class Database:
             # Add limit
             if limit:
                 query += f" LIMIT {int(limit)}"
+                
+                if offset:
+                    query += f" OFFSET {int(offset)}"
             
             # Execute query
             return self.execute(query, params)
@@ -377,6 +612,151 @@ class Database:
             logger.error(f"Error finding record by ID: {str(e)}")
             raise DatabaseError(f"Error finding record by ID: {str(e)}")
     
+    def find_by_field(self, table, field, value):
+        """
+        Find records by a single field
+        
+        Args:
+            table: Table name
+            field: Field name
+            value: Field value
+            
+        Returns:
+            list: Query results
+        """
+        return self.find(table, {field: value})
+    
+    def find_by_fields(self, table, fields):
+        """
+        Find records matching all given fields
+        
+        Args:
+            table: Table name
+            fields: Field values
+            
+        Returns:
+            list: Query results
+        """
+        return self.find(table, fields)
+    
+    def find_all(self, table, limit=1000, offset=0, sort_by=None, sort_dir='asc'):
+        """
+        Find all records in table
+        
+        Args:
+            table: Table name
+            limit: Maximum number of records
+            offset: Number of records to skip
+            sort_by: Optional sort field
+            sort_dir: Sort direction (asc or desc)
+            
+        Returns:
+            list: Query results
+        """
+        order_by = None
+        if sort_by:
+            order_by = f"{sort_by} {'DESC' if str(sort_dir).lower() == 'desc' else 'ASC'}"
+        
+        return self.find(table, limit=limit, offset=offset, order_by=order_by)
+    
+    def delete_all(self, table):
+        """
+        Delete all records in table
+        
+        Args:
+            table: Table name
+            
+        Returns:
+            bool: Success status
+        """
+        self.execute(f"DELETE FROM {table}")
+        return True
+    
+    def search(self, table, fields, query, filters=None, limit=100, offset=0):
+        """
+        Search records whose fields contain the query (full table scan)
+        
+        Args:
+            table: Table name
+            fields: Fields to search
+            query: Search text
+            filters: Optional exact-match filters
+            limit: Maximum number of records
+            offset: Number of records to skip
+            
+        Returns:
+            list: Query results
+        """
+        sql = f"SELECT * FROM {table} WHERE "
+        params = []
+        
+        like_clauses = []
+        for field in fields:
+            like_clauses.append(f"{field} LIKE ?")
+            params.append(f"%{query}%")
+        sql += "(" + " OR ".join(like_clauses) + ")"
+        
+        for key, value in (filters or {}).items():
+            sql += f" AND {key} = ?"
+            params.append(value)
+        
+        sql += f" LIMIT {int(limit)} OFFSET {int(offset)}"
+        
+        return self.execute(sql, params)
+    
+    def full_text_search(self, table, query, filters=None, limit=100, offset=0):
+        """
+        Search records through the table's FTS5 index, best matches first
+        
+        Args:
+            table: Table name (searched through {table}_fts)
+            query: Search text; every word must match
+            filters: Optional exact-match filters on the table
+            limit: Maximum number of records
+            offset: Number of records to skip
+            
+        Returns:
+            list: Query results with a bm25 "rank" (lower is better)
+        """
+        # Quote each word so user input cannot inject FTS5 query syntax
+        terms = [term.replace('"', '""') for term in query.split()]
+        if not terms:
+            return []
+        match = " ".join(f'"{term}"' for term in terms)
+        
+        sql = f"""
+            SELECT {table}.*, bm25({table}_fts) AS rank
+            FROM {table}_fts JOIN {table} ON {table}.{SEARCH_ROWID} = {table}_fts.rowid
+            WHERE {table}_fts MATCH ?
+        """
+        params = [match]
+        
+        for key, value in (filters or {}).items():
+            sql += f" AND {table}.{key} = ?"
+            params.append(value)
+        
+        sql += f" ORDER BY rank LIMIT {int(limit)} OFFSET {int(offset)}"
+        
+        return self.execute(sql, params)
+    
+    def table_columns(self, table):
+        """
+        Get the column names of a table
+        
+        Args:
+            table: Table name
+            
+        Returns:
+            set: Column names
+        """
+        columns = self._table_columns.get(table)
+        
+        if columns is None:
+            columns = {row['name'] for row in self.execute(f"PRAGMA table_info({table})")}
+            self._table_columns[table] = columns
+        
+        return columns
+    
     def insert(self, table, data):
         """
         Insert record
@@ -452,4 +832,213 @@ class Database:
             
         except Exception as e:
             logger.error(f"Error deleting record: {str(e)}")
-            raise DatabaseError(f"Error deleting record: {str(e)}") 
\ No newline at end of file
+            raise DatabaseError(f"Error deleting record: {str(e)}") 
+    
+    def _group_rows(self, rows):
+        """Group rows by their column set so each group is one statement"""
+        groups = {}
+        for row in rows:
+            groups.setdefault(tuple(row.keys()), []).append(row)
+        return groups
+    
+    def bulk_insert(self, table, rows):
+        """
+        Insert many records in one transaction
+        
+        Args:
+            table: Table name
+            rows: Record dicts
+            
+        Returns:
+            int: Number of inserted rows
+        """
+        count = 0
+        
+        with self.transaction():
+            for fields, group in self._group_rows(rows).items():
+                placeholders = ', '.join(['?'] * len(fields))
+                query = f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({placeholders})"
+                count += self.executemany(query, [[row[f] for f in fields] for row in group])
+        
+        return count
+    
+    def upsert(self, table, data, id_field='id'):
+        """
+        Insert a record, or update it if the ID already exists
+        
+        Args:
+            table: Table name
+            data: Record data
+            id_field: ID field name
+            
+        Returns:
+            bool: Success status
+        """
+        self.bulk_upsert(table, [data], id_field)
+        return True
+    
+    def bulk_upsert(self, table, rows, id_field='id'):
+        """
+        Insert or update many records in one transaction
+        
+        Args:
+            table: Table name
+            rows: Record dicts
+            id_field: ID field name
+            
+        Returns:
+            int: Number of written rows
+        """
+        count = 0
+        
+        with self.transaction():
+            for fields, group in self._group_rows(rows).items():
+                placeholders = ', '.join(['?'] * len(fields))
+                updates = ', '.join(f"{f} = excluded.{f}" for f in fields if f != id_field)
+                query = f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({placeholders})"
+                query += f" ON CONFLICT ({id_field}) DO "
+                query += f"UPDATE SET {updates}" if updates else "NOTHING"
+                count += self.executemany(query, [[row[f] for f in fields] for row in group])
+        
+        return count
+    
+    def queue_insert(self, table, data):
+        """
+        Queue a record for a batched insert
+        
+        The record is written by the background batch writer within
+        flush_interval seconds, together with other queued records.
+        
+        Args:
+            table: Table name
+            data: Record data
+        """
+        self.batch_writer.add(table, data)
+    
+    def flush(self, table=None):
+        """
+        Write queued records now
+        
+        Args:
+            table: Only flush this table (default: all tables)
+        """
+        self.batch_writer.flush(table)
+
+
+class BatchWriter:
+    """Buffers inserts and writes them in batched transactions"""
+    
+    def __init__(self, db: 'Database', batch_size: int = 500, flush_interval: float = 0.5):
+        """
+        Initialize batch writer
+        
+        Args:
+            db: Database to write to
+            batch_size: Number of queued rows that triggers an immediate flush
+            flush_interval: Maximum seconds a queued row waits before being written
+        """
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        self._reset()
+        
+        # Rows that could not be written, as (table, row, error)
+        self.dead_letters = deque(maxlen=1000)
+        self.stats = {"written": 0, "failed": 0}
+        
+        atexit.register(self.flush)
+        if hasattr(os, 'register_at_fork'):
+            # A weak reference, so the fork hook does not keep this writer alive
+            reset = weakref.WeakMethod(self._reset)
+            
+            def reset_in_child():
+                method = reset()
+                if method is not None:
+                    method()
+            
+            os.register_at_fork(after_in_child=reset_in_child)
+    
+    def _reset(self):
+        """
+        Start with no queued rows, fresh locks and no writer thread
+        
+        Also run in a forked child: the parent's thread does not exist there,
+        its locks may have been held at fork time, and its queued rows are
+        written by the parent.
+        """
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._pending_count = 0
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+    
+    def add(self, table: str, row: Dict[str, Any]):
+        """Queue a row"""
+        with self._condition:
+            self._pending.setdefault(table, []).append(row)
+            self._pending_count += 1
+            
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-batch-writer", daemon=True)
+                self._thread.start()
+            
+            if self._pending_count >= self.batch_size:
+                self._condition.notify()
+    
+    def _run(self):
+        """Flush queued rows whenever the batch fills up or the interval elapses"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending_count >= self.batch_size, self.flush_interval)
+            self.flush()
+    
+    def flush(self, table: Optional[str] = None) -> int:
+        """
+        Write queued rows
+        
+        A batch that fails is retried row by row, so only the rows that cannot
+        be written (e.g. a foreign key to a missing user) are dropped; those go
+        to dead_letters.
+        
+        Returns:
+            int: Number of rows written
+        """
+        written = 0
+        
+        # Serialize flushes so rows are written in the order they were queued
+        with self._flush_lock:
+            with self._condition:
+                if table is None:
+                    pending, self._pending = self._pending, {}
+                else:
+                    pending = {table: self._pending.pop(table, [])}
+                self._pending_count -= sum(len(rows) for rows in pending.values())
+            
+            for table_name, rows in pending.items():
+                if not rows:
+                    continue
+                try:
+                    self.db.bulk_insert(table_name, rows)
+                    written += len(rows)
+                except Exception as e:
+                    logger.warning(f"Batch of {len(rows)} queued rows to {table_name} failed, "
+                                   f"retrying row by row: {str(e)}")
+                    written += self._write_rows(table_name, rows)
+            
+            self.stats["written"] += written
+        
+        return written
+    
+    def _write_rows(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows one at a time, dead-lettering the ones that fail"""
+        written = 0
+        for row in rows:
+            try:
+                self.db.bulk_insert(table, [row])
+                written += 1
+            except Exception as e:
+                self.stats["failed"] += 1
+                self.dead_letters.append((table, row, str(e)))
+                logger.error(f"Dropped queued row {row.get('id')} for {table}: {str(e)}")
+        return written
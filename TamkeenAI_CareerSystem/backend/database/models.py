@@ -75,6 +75,27 @@ class BaseModel:
         
         return data
     
+    def _to_record(self, columns=None) -> Dict[str, Any]:
+        """Convert model to a database row"""
+        # Convert to dict
+        data = self.to_dict()
+        
+        # Convert datetime to string
+        for key, value in data.items():
+            if isinstance(value, datetime):
+                data[key] = format_date(value)
+        
+        # Convert JSON fields
+        for field in getattr(self, "json_fields", []):
+            if field in data and not isinstance(data[field], str):
+                data[field] = json.dumps(data[field])
+        
+        # Only keep attributes the table can store
+        if columns:
+            data = {key: value for key, value in data.items() if key in columns}
+        
+        return data
+    
     def save(self) -> bool:
         """Save model to database"""
         try:
@@ -84,28 +105,8 @@ class BaseModel:
             # Get database connection
             db = get_db()
             
-            # Convert to dict
-            data = self.to_dict()
-            
-            # Convert datetime to string
-            for key, value in data.items():
-                if isinstance(value, datetime):
-                    data[key] = format_date(value)
-            
-            # Convert JSON fields
-            for field in getattr(self, "json_fields", []):
-                if field in data and not isinstance(data[field], str):
-                    data[field] = json.dumps(data[field])
-            
-            # Find existing record
-            existing = self.find_by_id(getattr(self, self.id_field))
-            
-            if existing:
-                # Update existing record
-                db.update(self.table_name, self.id_field, getattr(self, self.id_field), data)
-            else:
-                # Insert new record
-                db.insert(self.table_name, data)
+            # Insert or update in a single statement
+            db.upsert(self.table_name, self._to_record(db.table_columns(self.table_name)), self.id_field)
             
             return True
             
@@ -120,7 +121,7 @@ class BaseModel:
             db = get_db()
             
             # Delete record
-            db.delete(self.table_name, self.id_field, getattr(self, self.id_field))
+            db.delete(self.table_name, getattr(self, self.id_field), self.id_field)
             
             return True
             
@@ -128,6 +129,48 @@ class BaseModel:
             logger.error(f"Error deleting {self.__class__.__name__}: {str(e)}")
             return False
     
+    @classmethod
+    def bulk_save(cls, instances: List['BaseModel']) -> bool:
+        """Insert or update many records in one transaction"""
+        try:
+            if not instances:
+                return True
+            
+            # Get database connection
+            db = get_db()
+            columns = db.table_columns(cls.table_name)
+            
+            timestamp = now()
+            for instance in instances:
+                instance.updated_at = timestamp
+            
+            db.bulk_upsert(cls.table_name, [instance._to_record(columns) for instance in instances], cls.id_field)
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error bulk saving {cls.__name__}: {str(e)}")
+            return False
+    
+    @classmethod
+    def bulk_insert(cls, instances: List['BaseModel']) -> bool:
+        """Insert many new records in one transaction"""
+        try:
+            if not instances:
+                return True
+            
+            # Get database connection
+            db = get_db()
+            columns = db.table_columns(cls.table_name)
+            
+            db.bulk_insert(cls.table_name, [instance._to_record(columns) for instance in instances])
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error bulk inserting {cls.__name__}: {str(e)}")
+            return False
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'BaseModel':
         """Create model from dictionary"""
@@ -174,10 +217,10 @@ class BaseModel:
             db = get_db()
             
             # Get record
-            records = db.find_by_id(cls.table_name, cls.id_field, id_value)
+            record = db.find_by_id(cls.table_name, id_value, cls.id_field)
             
             # Convert to model instances
-            return [cls.from_dict(record) for record in records]
+            return [cls.from_dict(record)] if record else []
             
         except Exception as e:
             logger.error(f"Error finding {cls.__name__} by ID: {str(e)}")
@@ -314,6 +357,78 @@ class Job(BaseModel):
         if not hasattr(self, "status"):
             self.status = "active"
     
+    def save(self) -> bool:
+        """Save job and update the job vector index"""
+        saved = super().save()
+        
+        if saved:
+            self._sync_job_index()
+        
+        return saved
+    
+    def delete(self) -> bool:
+        """Delete job and remove it from the job vector index"""
+        deleted = super().delete()
+        
+        if deleted:
+            self._sync_job_index(removed=True)
+        
+        return deleted
+    
+    @classmethod
+    def bulk_save(cls, instances: List['Job']) -> bool:
+        """Save many jobs in one transaction and update the job vector index"""
+        saved = super().bulk_save(instances)
+        
+        if saved:
+            cls._sync_job_index_batch(instances)
+        
+        return saved
+    
+    @classmethod
+    def bulk_insert(cls, instances: List['Job']) -> bool:
+        """Insert many jobs in one transaction and update the job vector index"""
+        inserted = super().bulk_insert(instances)
+        
+        if inserted:
+            cls._sync_job_index_batch(instances)
+        
+        return inserted
+    
+    def _sync_job_index(self, removed: bool = False) -> None:
+        """Apply this job's changes to the job vector index"""
+        if removed:
+            try:
+                # Import here to avoid circular imports
+                from backend.core.job_index import get_job_index
+                
+                job_index = get_job_index()
+                if job_index is not None:
+                    job_index.remove_job(getattr(self, self.id_field))
+                
+            except Exception as e:
+                logger.error(f"Error updating job vector index: {str(e)}")
+        else:
+            self._sync_job_index_batch([self])
+    
+    @classmethod
+    def _sync_job_index_batch(cls, instances: List['Job']) -> None:
+        """Apply changes to many jobs to the job vector index in one update"""
+        try:
+            # Import here to avoid circular imports
+            from backend.core.job_index import get_job_index
+            
+            job_index = get_job_index()
+            if job_index is None:
+                return
+            
+            # Closed jobs are dropped by upsert_jobs based on their status;
+            # the index saves the whole batch once, on its autosave timer
+            job_index.upsert_jobs([job.to_dict() for job in instances])
+            
+        except Exception as e:
+            logger.error(f"Error updating job vector index: {str(e)}")
+    
     @classmethod
     def find_active_jobs(cls) -> List['Job']:
         """Find active jobs"""
@@ -334,7 +449,7 @@ class Job(BaseModel):
     @classmethod
     def search(cls, query: str, filters: Dict[str, Any] = None, 
               limit: int = 100, offset: int = 0) -> List['Job']:
-        """Search jobs"""
+        """Search jobs, best matches first when the full-text index is available"""
         try:
             # Get database connection
             db = get_db()
@@ -353,8 +468,13 @@ class Job(BaseModel):
                 # Additional filters (would be more complex in a real system)
                 # ...
             
-            # Execute search
-            records = db.search(cls.table_name, search_fields, query, filter_fields, limit, offset)
+            # Execute search: BM25-ranked FTS5 lookup, or a LIKE scan without FTS5
+            if db.fts_available:
+                records = db.full_text_search(cls.table_name, query, filter_fields, limit, offset)
+                for record in records:
+                    record.pop("rank", None)
+            else:
+                records = db.search(cls.table_name, search_fields, query, filter_fields, limit, offset)
             
             # Convert to model instances
             return [cls.from_dict(record) for record in records]
@@ -413,7 +533,7 @@ class UserActivity(BaseModel):
     """User activity model"""
     
     # Database table name
-    table_name = "user_activities"
+    table_name = "user_activity"
     
     # JSON fields
     json_fields = ["activity_data"]
@@ -429,11 +549,14 @@ class UserActivity(BaseModel):
     @classmethod
     def find_by_user_id(cls, user_id: str) -> List['UserActivity']:
         """Find activities by user ID"""
+        # Include activities still waiting in the batch writer
+        get_db().flush(cls.table_name)
         return cls.find_by_field("user_id", user_id)
     
     @classmethod
     def find_by_activity_type(cls, activity_type: str) -> List['UserActivity']:
         """Find activities by type"""
+        get_db().flush(cls.table_name)
         return cls.find_by_field("activity_type", activity_type)
     
     @classmethod
@@ -448,8 +571,23 @@ class UserActivity(BaseModel):
                 activity_data=activity_data
             )
             
-            # Save activity
-            return activity.save()
+            # Activity rows are append-only, so they are queued and written in
+            # batches instead of committing one row at a time. Check the user up
+            # front: a row the batch cannot write would only be dropped later.
+            db = get_db()
+            if not db.execute("SELECT 1 FROM users WHERE id = ?", [user_id]):
+                logger.error(f"Error recording user activity: unknown user {user_id}")
+                return False
+            
+            db.queue_insert(cls.table_name, {
+                "id": activity.id,
+                "user_id": activity.user_id,
+                "activity_type": activity.activity_type,
+                "activity_data": json.dumps(activity.activity_data),
+                "created_at": format_date(activity.created_at)
+            })
+            
+            return True
             
         except Exception as e:
             logger.error(f"Error recording user activity: {str(e)}")
@@ -6,15 +6,19 @@ It provides endpoints for analyzing resumes, matching jobs, and generating caree
 """
 
 import os
+import re
+import json
+import time
+import uuid
 import tempfile
 import logging
 from typing import Dict, Any, List, Optional
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import argparse
 
 # Import PredictAPI modules
-from api.services.predict_api import DeepSeekClient
+from api.services.predict_api import DeepSeekClient, MockDataProvider
 from api.services.ats.resume_extractor import extract_text_from_resume
 
 # Setup logging
@@ -288,6 +292,69 @@ def test_connection():
             "status": "exception"
         }), 500
 
+# Mock provider behind the OpenAI-compatible endpoint
+mock_chat_provider = MockDataProvider(provider='local', simulate_latency=False)
+
+# Simulated provider timing for the OpenAI-compatible endpoint
+MOCK_FIRST_TOKEN_DELAY = float(os.environ.get('MOCK_FIRST_TOKEN_DELAY', '0.5'))
+MOCK_TOKEN_DELAY = float(os.environ.get('MOCK_TOKEN_DELAY', '0.05'))
+
+@app.route('/v1/chat/completions', methods=['POST'])
+def chat_completions():
+    """
+    OpenAI-compatible chat completions answered from mock data
+    
+    Lets the backend run offline against this server (set LOCAL_LLM_URL, or
+    OPENAI_BASE_URL / DEEPSEEK_BASE_URL to http://host:port/v1). Answers take
+    MOCK_FIRST_TOKEN_DELAY plus MOCK_TOKEN_DELAY per word; with "stream": true
+    each word is sent as a server-sent event chunk as it is "generated".
+    
+    Returns:
+        Chat completion JSON, or an event stream of completion chunks
+    """
+    data = request.get_json() or {}
+    model = data.get('model', 'mock-model')
+    mock_response = mock_chat_provider.get_mock_response('chat', data)
+    tokens = re.findall(r'\S+\s*', mock_response['content'])
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+    
+    if not data.get('stream'):
+        time.sleep(MOCK_FIRST_TOKEN_DELAY + MOCK_TOKEN_DELAY * len(tokens))
+        return jsonify({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": mock_response['content']},
+                "finish_reason": "stop"
+            }],
+            "usage": {"completion_tokens": len(tokens)}
+        })
+    
+    def chunk(delta, finish_reason=None):
+        return "data: " + json.dumps({
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        }, ensure_ascii=False) + "\n\n"
+    
+    def generate():
+        time.sleep(MOCK_FIRST_TOKEN_DELAY)
+        yield chunk({"role": "assistant"})
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(MOCK_TOKEN_DELAY)
+            yield chunk({"content": token})
+        yield chunk({}, finish_reason="stop")
+        yield "data: [DONE]\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
 if __name__ == '__main__':
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Start PredictAPI Server')
@@ -3,24 +3,142 @@ Cache Utilities Module
 
 This module provides caching functionality to improve performance by storing
 frequently accessed or computationally expensive results.
+
+The cache has two tiers: a bounded in-process LRU for hot keys in front of the
+shared database cache table. Both tiers hold values JSON-encoded and every read
+decodes a fresh copy, so callers may modify what they get back. Concurrent
+misses on the same key are collapsed so the value is only computed once.
 """
 
 import os
+import copy
 import json
+import time
 import logging
 import hashlib
 import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple, Union, Callable
 from datetime import datetime, timedelta
 
 # Import utilities
 from backend.utils.date_utils import now
-from backend.database.models import Cache
+from backend.database.connector import get_db
+
+# Import settings
+from backend.config.settings import CACHE_CONFIG
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
 
+class MemoryCache:
+    """Thread-safe in-process LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize memory cache
+
+        Args:
+            max_entries: Maximum number of entries before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key: str) -> Any:
+        """
+        Get a value, or None if missing or expired
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def set(self, key: str, value: Any, timeout: float) -> None:
+        """
+        Set a value
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            timeout: Time to live in seconds
+        """
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + timeout)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def delete(self, key: str) -> None:
+        """Delete a value"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Delete all values whose key starts with prefix"""
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Delete all values"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide memory tier
+memory_cache = MemoryCache(CACHE_CONFIG.get("memory_max_entries", 10000))
+
+# Database tier counters
+_db_stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+# Deferred database writes and background purging
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-writer")
+_purger = None
+_purger_lock = threading.Lock()
+
+# In-flight computations for singleflight
+_inflight: Dict[str, '_Call'] = {}
+_inflight_lock = threading.Lock()
+
+
+class _Call:
+    """A computation shared by concurrent callers of the same key"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
 def generate_cache_key(prefix: str, *args, **kwargs) -> str:
     """
     Generate a cache key from function arguments
@@ -45,39 +163,100 @@ def generate_cache_key(prefix: str, *args, **kwargs) -> str:
     return f"{prefix}:{hash_str}"
 
 
-def get_cache(key: str) -> Optional[Dict[str, Any]]:
+def _memory_timeout(timeout: int) -> int:
+    """Cap memory TTL so other workers' writes become visible reasonably soon"""
+    return min(timeout, CACHE_CONFIG.get("memory_max_ttl", timeout))
+
+
+def _db_get(key: str) -> Tuple[Optional[str], Optional[datetime]]:
+    """Read a JSON-encoded value and its expiry from the database tier"""
+    rows = get_db().execute(
+        "SELECT data_value, expiry FROM cache WHERE cache_key = ?", [key]
+    )
+
+    if not rows:
+        return None, None
+
+    row = rows[0]
+    expires_at = datetime.fromisoformat(row["expiry"]) if row.get("expiry") else None
+    if expires_at and expires_at < now():
+        return None, None
+
+    return row.get("data_value"), expires_at
+
+
+def _db_set(key: str, encoded: str, timeout: int) -> bool:
+    """Write a JSON-encoded value to the database tier with a single upsert"""
+    try:
+        timestamp = now()
+        get_db().execute(
+            """
+            INSERT INTO cache (cache_key, data_value, expiry, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (cache_key) DO UPDATE SET
+                data_value = excluded.data_value,
+                expiry = excluded.expiry,
+                updated_at = excluded.updated_at
+            """,
+            [
+                key,
+                encoded,
+                (timestamp + timedelta(seconds=timeout)).isoformat(),
+                timestamp.isoformat(),
+                timestamp.isoformat()
+            ]
+        )
+        _db_stats["writes"] += 1
+        _start_purger()
+        return True
+
+    except Exception as e:
+        _db_stats["errors"] += 1
+        logger.error(f"Error writing cache: {str(e)}")
+        return False
+
+
+def get_cache(key: str, memory_only: bool = False) -> Optional[Dict[str, Any]]:
     """
     Get cached data by key
     
     Args:
         key: Cache key
+        memory_only: Skip the database tier
         
     Returns:
         dict: Cached data or None
     """
     try:
-        # Try to get from database cache
-        cache_entry = Cache.find_by_key(key)
+        # Hot keys are served from memory
+        encoded = memory_cache.get(key)
+        if encoded is not None or memory_only:
+            return json.loads(encoded) if encoded is not None else None
         
-        if cache_entry:
-            # Check if cache is expired
-            if hasattr(cache_entry, 'expires_at') and cache_entry.expires_at:
-                expires_at = datetime.fromisoformat(cache_entry.expires_at)
-                if expires_at < now():
-                    # Cache is expired
-                    return None
+        # Fall back to the database cache
+        encoded, expires_at = _db_get(key)
             
-            # Return cache data
-            return cache_entry.data_value
+        if encoded is None:
+            _db_stats["misses"] += 1
+            return None
         
-        return None
+        _db_stats["hits"] += 1
+
+        # Promote to memory for the remainder of its lifetime
+        remaining = (expires_at - now()).total_seconds() if expires_at else CACHE_CONFIG.get("memory_max_ttl", 300)
+        if remaining > 0:
+            memory_cache.set(key, encoded, _memory_timeout(remaining))
+
+        return json.loads(encoded)
     
     except Exception as e:
+        _db_stats["errors"] += 1
         logger.error(f"Error getting cache: {str(e)}")
         return None
 
 
-def set_cache(key: str, data: Any, timeout: int = 3600) -> bool:
+def set_cache(key: str, data: Any, timeout: int = 3600,
+              memory_only: bool = False, write_through: bool = True) -> bool:
     """
     Set cached data
     
@@ -85,33 +264,26 @@ def set_cache(key: str, data: Any, timeout: int = 3600) -> bool:
         key: Cache key
         data: Data to cache
         timeout: Cache timeout in seconds
+        memory_only: Keep the value in this process only
+        write_through: Write to the database before returning; otherwise the
+            database write happens in the background
         
     Returns:
         bool: Success status
     """
     try:
-        # Calculate expiration time
-        expires_at = (now() + timedelta(seconds=timeout)).isoformat()
+        # Stored encoded so later changes to data do not reach the cache
+        encoded = json.dumps(data)
+        memory_cache.set(key, encoded, timeout if memory_only else _memory_timeout(timeout))
         
-        # Check if cache exists
-        cache_entry = Cache.find_by_key(key)
+        if memory_only:
+            return True
         
-        if cache_entry:
-            # Update existing cache
-            cache_entry.data_value = data
-            cache_entry.expires_at = expires_at
-            cache_entry.updated_at = now().isoformat()
-            return cache_entry.save()
-        else:
-            # Create new cache
-            cache_entry = Cache(
-                cache_key=key,
-                data_value=data,
-                expires_at=expires_at,
-                created_at=now().isoformat(),
-                updated_at=now().isoformat()
-            )
-            return cache_entry.save()
+        if write_through:
+            return _db_set(key, encoded, timeout)
+
+        _writer.submit(_db_set, key, encoded, timeout)
+        return True
     
     except Exception as e:
         logger.error(f"Error setting cache: {str(e)}")
@@ -129,12 +301,8 @@ def delete_cache(key: str) -> bool:
         bool: Success status
     """
     try:
-        # Delete from database cache
-        cache_entry = Cache.find_by_key(key)
-        
-        if cache_entry:
-            return cache_entry.delete()
-        
+        memory_cache.delete(key)
+        get_db().execute("DELETE FROM cache WHERE cache_key = ?", [key])
         return True
     
     except Exception as e:
@@ -153,13 +321,19 @@ def clear_cache_by_prefix(prefix: str) -> bool:
         bool: Success status
     """
     try:
-        # In a SQL database, we would use a LIKE query
-        # Since we're using a generic model, we'll get all and filter
-        all_cache = Cache.find_all()
+        memory_cache.delete_prefix(prefix)
         
-        for cache_entry in all_cache:
-            if cache_entry.cache_key.startswith(prefix):
-                cache_entry.delete()
+        if not prefix:
+            get_db().execute("DELETE FROM cache")
+            return True
+
+        # A half-open key range lets SQLite walk the primary key index,
+        # which LIKE 'prefix%' cannot do with the default collation
+        upper_bound = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        get_db().execute(
+            "DELETE FROM cache WHERE cache_key >= ? AND cache_key < ?",
+            [prefix, upper_bound]
+        )
         
         return True
     
@@ -168,40 +342,168 @@ def clear_cache_by_prefix(prefix: str) -> bool:
         return False
 
 
-def cache_result(timeout: int = 3600, prefix: str = None):
+def purge_expired_cache() -> bool:
+    """
+    Delete expired entries from the database cache
+
+    Returns:
+        bool: Success status
+    """
+    try:
+        get_db().execute(
+            "DELETE FROM cache WHERE expiry IS NOT NULL AND expiry < ?",
+            [now().isoformat()]
+        )
+        return True
+
+    except Exception as e:
+        logger.error(f"Error purging expired cache: {str(e)}")
+        return False
+
+
+def _purge_loop(interval: int):
+    """Periodically purge expired database cache entries"""
+    while True:
+        time.sleep(interval)
+        purge_expired_cache()
+
+
+def _start_purger():
+    """Start the background purge thread on first database write"""
+    global _purger
+
+    if _purger is not None:
+        return
+
+    with _purger_lock:
+        if _purger is None:
+            interval = CACHE_CONFIG.get("purge_interval", 600)
+            _purger = threading.Thread(target=_purge_loop, args=(interval,), name="cache-purger", daemon=True)
+            _purger.start()
+
+
+def get_or_set_cache(key: str, compute: Callable[[], Any], timeout: int = 3600,
+                     memory_only: bool = False, write_through: bool = True) -> Any:
+    """
+    Get cached data, computing and caching it on a miss
+
+    Concurrent misses on the same key wait for a single computation instead of
+    each recomputing the value. Every caller gets its own copy of the value.
+
+    Args:
+        key: Cache key
+        compute: Function producing the value on a miss
+        timeout: Cache timeout in seconds
+        memory_only: Keep the value in this process only
+        write_through: Write to the database before returning
+
+    Returns:
+        Cached or computed value
+    """
+    cached_data = get_cache(key, memory_only=memory_only)
+    if cached_data is not None:
+        return cached_data
+
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = _Call()
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
+
+    try:
+        # The previous leader may have cached the value after our miss
+        result = get_cache(key, memory_only=memory_only)
+        if result is None:
+            result = compute()
+            if result is not None:
+                set_cache(key, result, timeout, memory_only=memory_only, write_through=write_through)
+
+        # Waiting callers copy a snapshot the caller cannot modify
+        call.result = copy.deepcopy(result)
+        return result
+
+    except Exception as e:
+        call.error = e
+        raise
+
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        call.done.set()
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get cache hit, miss and eviction counters
+
+    Returns:
+        dict: Counters for the memory and database tiers
+    """
+    memory_stats = dict(memory_cache.stats)
+    memory_stats["entries"] = len(memory_cache)
+
+    return {
+        "memory": memory_stats,
+        "database": dict(_db_stats)
+    }
+
+
+def cache_result(timeout: int = 3600, prefix: str = None, memory_only: bool = False,
+                 write_through: bool = True, ttl: int = None, expires: int = None):
     """
     Decorator to cache function results
     
     Args:
         timeout: Cache timeout in seconds
         prefix: Cache key prefix
+        memory_only: Keep results in this process only
+        write_through: Write results to the database before returning
+        ttl: Alias for timeout
+        expires: Alias for timeout
         
     Returns:
         function: Decorated function
     """
+    timeout = ttl or expires or timeout
+
     def decorator(func):
+        func_prefix = prefix or f"func:{func.__module__}.{func.__name__}"
+        stats = {"hits": 0, "misses": 0}
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
-            func_prefix = prefix or f"func:{func.__module__}.{func.__name__}"
             cache_key = generate_cache_key(func_prefix, *args, **kwargs)
             
-            # Try to get from cache
-            cached_data = get_cache(cache_key)
+            computed = []
             
-            if cached_data is not None:
+            def compute():
+                computed.append(True)
+                return func(*args, **kwargs)
+
+            result = get_or_set_cache(
+                cache_key, compute, timeout,
+                memory_only=memory_only, write_through=write_through
+            )
+
+            if computed:
+                stats["misses"] += 1
+                logger.debug(f"Cache miss for {cache_key}")
+            else:
+                stats["hits"] += 1
                 logger.debug(f"Cache hit for {cache_key}")
-                return cached_data
-            
-            # Not in cache, call the function
-            logger.debug(f"Cache miss for {cache_key}")
-            result = func(*args, **kwargs)
-            
-            # Cache the result
-            set_cache(cache_key, result, timeout)
             
             return result
+
+        wrapper.cache_stats = lambda: dict(stats)
+        wrapper.cache_clear = lambda: clear_cache_by_prefix(f"{func_prefix}:")
         
         return wrapper
     
-    return decorator 
\ No newline at end of file
+    return decorator 
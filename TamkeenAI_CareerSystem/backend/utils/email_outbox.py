@@ -0,0 +1,407 @@
+"""
+Email Outbox Module
+
+Persistent queue between EmailSender and the SMTP server. Messages are
+rendered and written to a SQLite outbox when a request sends them; a
+background sender delivers them:
+
+- one authenticated SMTP connection is reused across messages and closed
+  after a period without mail;
+- due messages are claimed in batches and sent no faster than the
+  configured rate;
+- temporary failures (4xx replies, dropped connections) are retried with
+  exponential backoff, and messages that fail permanently (5xx replies) or
+  run out of attempts are kept as dead letters;
+- every message has a status (queued, sending, sent, dead) that can be
+  queried by id.
+
+Claims are taken inside SQLite write transactions with a lease, so several
+worker processes can share one outbox file; messages claimed by a process
+that died are picked up again when the lease expires.
+"""
+
+import json
+import time
+import uuid
+import sqlite3
+import smtplib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Callable, Iterator
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_DEAD = "dead"
+
+# Seconds a claimed message stays with its sender before another may retry it
+CLAIM_LEASE = 300
+# Longest wait between retries, in seconds
+MAX_RETRY_DELAY = 3600
+
+
+class PermanentEmailError(Exception):
+    """Delivery failure that retrying will not fix"""
+
+
+def classify_error(error: Exception) -> bool:
+    """
+    Whether an SMTP error is permanent
+
+    Args:
+        error: Exception raised while sending
+
+    Returns:
+        True for 5xx replies, refused recipients and authentication failures
+    """
+    if isinstance(error, PermanentEmailError):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+class EmailOutbox:
+    """SQLite-backed email queue with a background SMTP sender"""
+
+    def __init__(self, db_file: str, connect: Callable[[], smtplib.SMTP],
+                 batch_size: int = 50, rate_limit: float = 10.0,
+                 max_attempts: int = 5, retry_backoff: float = 30.0,
+                 idle_timeout: float = 60.0):
+        """
+        Open (or create) the outbox
+
+        Args:
+            db_file: Outbox database file
+            connect: Function returning a connected, authenticated SMTP client
+            batch_size: Messages claimed per batch
+            rate_limit: Maximum messages sent per second (0 for no limit)
+            max_attempts: Attempts before a message is dead-lettered
+            retry_backoff: Delay before the first retry, doubled for each further one
+            idle_timeout: Seconds without mail before the SMTP connection is closed
+        """
+        self.db_file = db_file
+        self.connect = connect
+        self.batch_size = batch_size
+        self.rate_limit = rate_limit
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._sender = None
+        self._smtp = None
+        self._last_used = 0.0
+        self._next_send = 0.0
+        self.stats = {"sent": 0, "retried": 0, "dead": 0, "connections": 0}
+
+        self._conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                message_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                sender TEXT NOT NULL,
+                recipients TEXT NOT NULL,
+                subject TEXT,
+                message TEXT NOT NULL,
+                attempts INTEGER DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                claimed_until REAL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                sent_at REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(status, next_attempt_at)")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction holding the database write lock"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # ===== Queue =====
+
+    def enqueue(self, sender: str, recipients: List[str], message: str, subject: str = "") -> str:
+        """
+        Queue a message for delivery
+
+        Args:
+            sender: Envelope sender address
+            recipients: Envelope recipient addresses
+            message: Complete message, as returned by Message.as_string()
+            subject: Subject, kept for status queries
+
+        Returns:
+            Message id
+        """
+        message_id = uuid.uuid4().hex
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO outbox (message_id, status, sender, recipients, subject, message, "
+                "next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (message_id, STATUS_QUEUED, sender, json.dumps(recipients), subject, message, now, now)
+            )
+        self._start_sender()
+        self._wake.set()
+        return message_id
+
+    def status(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a message's delivery status
+
+        Args:
+            message_id: Id returned by enqueue
+
+        Returns:
+            Status dictionary or None if the id is unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT message_id, status, recipients, subject, attempts, last_error, created_at, "
+                "next_attempt_at, sent_at FROM outbox WHERE message_id = ?", (message_id,)
+            ).fetchone()
+        return self._status_dict(row) if row is not None else None
+
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """List the most recent messages that could not be delivered"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT message_id, status, recipients, subject, attempts, last_error, created_at, "
+                "next_attempt_at, sent_at FROM outbox WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                (STATUS_DEAD, limit)
+            ).fetchall()
+        return [self._status_dict(row) for row in rows]
+
+    def requeue(self, message_id: str) -> bool:
+        """Queue a dead letter for delivery again"""
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = ? WHERE message_id = ? AND status = ?",
+                (STATUS_QUEUED, time.time(), message_id, STATUS_DEAD)
+            ).rowcount
+        if updated:
+            self._start_sender()
+            self._wake.set()
+        return bool(updated)
+
+    def pending_count(self) -> int:
+        """Number of messages not yet sent or dead-lettered"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status IN (?, ?)", (STATUS_QUEUED, STATUS_SENDING)
+            ).fetchone()[0]
+
+    @staticmethod
+    def _status_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "message_id": row["message_id"],
+            "status": row["status"],
+            "recipients": json.loads(row["recipients"]),
+            "subject": row["subject"],
+            "attempts": row["attempts"],
+            "last_error": row["last_error"],
+            "created_at": row["created_at"],
+            "next_attempt_at": row["next_attempt_at"] if row["status"] == STATUS_QUEUED else None,
+            "sent_at": row["sent_at"]
+        }
+
+    # ===== Sending =====
+
+    def _claim_batch(self) -> List[sqlite3.Row]:
+        """Claim the due messages of the next batch"""
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT message_id, sender, recipients, message, attempts FROM outbox "
+                "WHERE (status = ? AND next_attempt_at <= ?) OR (status = ? AND claimed_until < ?) "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (STATUS_QUEUED, now, STATUS_SENDING, now, self.batch_size)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE outbox SET status = ?, claimed_until = ? WHERE message_id = ?",
+                [(STATUS_SENDING, now + CLAIM_LEASE, row["message_id"]) for row in rows]
+            )
+        return rows
+
+    def _next_due_in(self) -> Optional[float]:
+        """Seconds until the next queued message is due, or None if there is none"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE status = ?", (STATUS_QUEUED,)
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def _get_smtp(self) -> smtplib.SMTP:
+        """The open SMTP connection, reconnecting if needed"""
+        if self._smtp is not None and time.time() - self._last_used > self.idle_timeout:
+            self._close_smtp()
+        if self._smtp is None:
+            self._smtp = self.connect()
+            self.stats["connections"] += 1
+        return self._smtp
+
+    def _close_smtp(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            pass
+        self._smtp = None
+
+    def _throttle(self) -> None:
+        """Wait for the rate limit before the next send"""
+        if not self.rate_limit:
+            return
+        now = time.monotonic()
+        if self._next_send > now:
+            time.sleep(self._next_send - now)
+            now = self._next_send
+        self._next_send = now + 1.0 / self.rate_limit
+
+    def _deliver(self, row: sqlite3.Row) -> None:
+        """Send one claimed message and record the outcome"""
+        message_id = row["message_id"]
+        attempts = row["attempts"] + 1
+        self._throttle()
+        try:
+            smtp = self._get_smtp()
+            refused = smtp.sendmail(row["sender"], json.loads(row["recipients"]), row["message"])
+            self._last_used = time.time()
+        except Exception as e:
+            if not isinstance(e, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)) \
+                    or getattr(e, "smtp_code", None) == 421:
+                # The connection may be unusable; open a new one for the next message
+                self._close_smtp()
+            self._record_failure(message_id, attempts, e)
+            return
+
+        if refused:
+            logger.warning(f"Email {message_id} refused for some recipients: {refused}")
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, sent_at = ?, claimed_until = NULL, "
+                "last_error = NULL WHERE message_id = ?",
+                (STATUS_SENT, attempts, time.time(), message_id)
+            )
+        self.stats["sent"] += 1
+
+    def _record_failure(self, message_id: str, attempts: int, error: Exception) -> None:
+        """Schedule a retry, or dead-letter the message"""
+        error_msg = f"{type(error).__name__}: {str(error)}"
+        if classify_error(error) or attempts >= self.max_attempts:
+            status, next_attempt_at = STATUS_DEAD, time.time()
+            self.stats["dead"] += 1
+            logger.error(f"Email {message_id} dead-lettered after {attempts} attempts: {error_msg}")
+        else:
+            delay = min(self.retry_backoff * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+            status, next_attempt_at = STATUS_QUEUED, time.time() + delay
+            self.stats["retried"] += 1
+            logger.warning(f"Email {message_id} failed (attempt {attempts}), retrying in {delay:.0f}s: {error_msg}")
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, claimed_until = NULL, "
+                "last_error = ? WHERE message_id = ?",
+                (status, attempts, next_attempt_at, error_msg, message_id)
+            )
+
+    def process_batch(self) -> int:
+        """
+        Send one batch of due messages
+
+        Returns:
+            Number of messages attempted
+        """
+        rows = self._claim_batch()
+        for row in rows:
+            self._deliver(row)
+        return len(rows)
+
+    def _send_loop(self) -> None:
+        while not self._stopping:
+            try:
+                if self.process_batch():
+                    continue
+                wait = self._next_due_in()
+            except Exception as e:
+                logger.error(f"Error in email sender: {str(e)}")
+                wait = self.retry_backoff
+
+            # Close the connection when idle, then sleep until mail is due or queued
+            if self._smtp is not None:
+                idle_left = self.idle_timeout - (time.time() - self._last_used)
+                if idle_left <= 0:
+                    self._close_smtp()
+                else:
+                    wait = idle_left if wait is None else min(wait, idle_left)
+            self._wake.wait(wait)
+            self._wake.clear()
+        self._close_smtp()
+
+    def _start_sender(self) -> None:
+        """Start the background sender on first use"""
+        if self._sender is not None:
+            return
+        with self._lock:
+            if self._sender is None and not self._stopping:
+                self._sender = threading.Thread(target=self._send_loop, name="email-outbox", daemon=True)
+                self._sender.start()
+
+    def start(self) -> None:
+        """Start the background sender, e.g. to deliver mail queued before a restart"""
+        self._start_sender()
+        self._wake.set()
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """
+        Wait until no message is due for sending
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if nothing is left to send now (retries may still be scheduled)
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._lock:
+                due = self._conn.execute(
+                    "SELECT COUNT(*) FROM outbox WHERE status = ? OR (status = ? AND next_attempt_at <= ?)",
+                    (STATUS_SENDING, STATUS_QUEUED, time.time())
+                ).fetchone()[0]
+            if not due:
+                return True
+            self._wake.set()
+            time.sleep(0.01)
+        return False
+
+    def close(self) -> None:
+        """Stop the background sender and close the SMTP connection"""
+        self._stopping = True
+        self._wake.set()
+        if self._sender is not None:
+            self._sender.join(timeout=10)
+        with self._lock:
+            self._conn.close()
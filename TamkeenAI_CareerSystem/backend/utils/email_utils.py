@@ -9,6 +9,7 @@ import re
 import json
 import smtplib
 import logging
+import threading
 from typing import Dict, List, Any, Optional, Tuple, Union
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -19,6 +20,7 @@ from string import Template
 
 # Import settings
 from backend.config.settings import EMAIL_CONFIG
+from backend.utils.email_outbox import EmailOutbox
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -32,6 +34,8 @@ class EmailSender:
         self.config = EMAIL_CONFIG
         self.template_dir = self.config.get('template_dir')
         self.templates = self._load_templates()
+        self._outbox = None
+        self._outbox_lock = threading.Lock()
     
     def _load_templates(self) -> Dict[str, Template]:
         """
@@ -63,13 +67,120 @@ class EmailSender:
             logger.error(f"Error loading email templates: {str(e)}")
             return {}
     
+    def _build_message(self, to_email: Union[str, List[str]], subject: str, body: str,
+                       attachments: Optional[List[str]] = None,
+                       cc: Optional[List[str]] = None,
+                       bcc: Optional[List[str]] = None,
+                       is_html: bool = True) -> Tuple[MIMEMultipart, List[str]]:
+        """
+        Build a MIME message
+        
+        Returns:
+            tuple: (message, all recipients including CC and BCC)
+        """
+        msg = MIMEMultipart()
+        msg['From'] = formataddr((self.config.get('from_name', ''), self.config.get('from_email', '')))
+        
+        # Handle multiple recipients
+        if isinstance(to_email, list):
+            msg['To'] = ', '.join(to_email)
+        else:
+            msg['To'] = to_email
+        
+        # Add CC recipients
+        if cc:
+            msg['Cc'] = ', '.join(cc)
+        
+        msg['Subject'] = subject
+        msg['Date'] = formatdate(localtime=True)
+        
+        # Attach body
+        if is_html:
+            msg.attach(MIMEText(body, 'html', 'utf-8'))
+        else:
+            msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        
+        # Attach files
+        if attachments:
+            for file_path in attachments:
+                if os.path.exists(file_path):
+                    with open(file_path, 'rb') as f:
+                        attachment = MIMEApplication(f.read())
+                    
+                    filename = os.path.basename(file_path)
+                    attachment.add_header('Content-Disposition', 'attachment', filename=filename)
+                    msg.attach(attachment)
+                else:
+                    logger.warning(f"Attachment not found: {file_path}")
+        
+        # Determine all recipients for sending (BCC recipients are not shown in headers)
+        all_recipients = []
+        
+        if isinstance(to_email, list):
+            all_recipients.extend(to_email)
+        else:
+            all_recipients.append(to_email)
+        
+        if cc:
+            all_recipients.extend(cc)
+        
+        if bcc:
+            all_recipients.extend(bcc)
+        
+        return msg, all_recipients
+    
+    def _connect(self) -> smtplib.SMTP:
+        """
+        Open an authenticated SMTP connection
+        
+        Returns:
+            SMTP client
+        """
+        smtp_server = self.config.get('server')
+        smtp_port = self.config.get('port')
+        
+        if self.config.get('use_ssl', False):
+            server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30)
+        else:
+            server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
+            if self.config.get('use_tls', True):
+                server.starttls()
+        
+        # Login if credentials provided
+        smtp_user = self.config.get('username')
+        smtp_password = self.config.get('password')
+        
+        if smtp_user and smtp_password:
+            server.login(smtp_user, smtp_password)
+        
+        return server
+    
+    @property
+    def outbox(self) -> EmailOutbox:
+        """Persistent outbox delivering queued mail over a pooled SMTP connection"""
+        if self._outbox is None:
+            with self._outbox_lock:
+                if self._outbox is None:
+                    self._outbox = EmailOutbox(
+                        self.config.get('outbox_file'),
+                        self._connect,
+                        batch_size=self.config.get('outbox_batch_size', 50),
+                        rate_limit=self.config.get('outbox_rate_limit', 10),
+                        max_attempts=self.config.get('outbox_max_attempts', 5),
+                        retry_backoff=self.config.get('outbox_retry_backoff', 30),
+                        idle_timeout=self.config.get('smtp_idle_timeout', 60)
+                    )
+                    # Deliver anything left queued by a previous run
+                    self._outbox.start()
+        return self._outbox
+    
     def send_email(self, to_email: str, subject: str, body: str, 
                   attachments: Optional[List[str]] = None, 
                   cc: Optional[List[str]] = None,
                   bcc: Optional[List[str]] = None,
                   is_html: bool = True) -> Tuple[bool, Optional[str]]:
         """
-        Send email
+        Send email now, over a connection of its own
         
         Args:
             to_email: Recipient email address or list of addresses
@@ -88,86 +199,14 @@ class EmailSender:
             return False, "Email sending is disabled"
         
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = formataddr((self.config.get('from_name', ''), self.config.get('from_email', '')))
-            
-            # Handle multiple recipients
-            if isinstance(to_email, list):
-                msg['To'] = ', '.join(to_email)
-            else:
-                msg['To'] = to_email
-            
-            # Add CC recipients
-            if cc:
-                msg['Cc'] = ', '.join(cc)
-            
-            # Add BCC recipients (not shown in headers)
-            if bcc:
-                msg['Bcc'] = ', '.join(bcc)
-            
-            msg['Subject'] = subject
-            msg['Date'] = formatdate(localtime=True)
-            
-            # Attach body
-            if is_html:
-                msg.attach(MIMEText(body, 'html', 'utf-8'))
-            else:
-                msg.attach(MIMEText(body, 'plain', 'utf-8'))
-            
-            # Attach files
-            if attachments:
-                for file_path in attachments:
-                    if os.path.exists(file_path):
-                        with open(file_path, 'rb') as f:
-                            attachment = MIMEApplication(f.read())
-                        
-                        filename = os.path.basename(file_path)
-                        attachment.add_header('Content-Disposition', 'attachment', filename=filename)
-                        msg.attach(attachment)
-                    else:
-                        logger.warning(f"Attachment not found: {file_path}")
-            
-            # Determine all recipients for sending
-            all_recipients = []
-            
-            if isinstance(to_email, list):
-                all_recipients.extend(to_email)
-            else:
-                all_recipients.append(to_email)
-            
-            if cc:
-                all_recipients.extend(cc)
-            
-            if bcc:
-                all_recipients.extend(bcc)
-            
-            # Connect to SMTP server
-            smtp_server = self.config.get('smtp_server')
-            smtp_port = self.config.get('smtp_port')
-            
-            if self.config.get('use_ssl', False):
-                server = smtplib.SMTP_SSL(smtp_server, smtp_port)
-            else:
-                server = smtplib.SMTP(smtp_server, smtp_port)
-            
-            if self.config.get('use_tls', True):
-                server.starttls()
+            msg, all_recipients = self._build_message(to_email, subject, body, attachments, cc, bcc, is_html)
             
-            # Login if credentials provided
-            smtp_user = self.config.get('smtp_user')
-            smtp_password = self.config.get('smtp_password')
-            
-            if smtp_user and smtp_password:
-                server.login(smtp_user, smtp_password)
-            
-            # Send email
+            server = self._connect()
             server.sendmail(
                 self.config.get('from_email'), 
                 all_recipients, 
                 msg.as_string()
             )
-            
             server.quit()
             
             logger.info(f"Email sent to {msg['To']} with subject: {subject}")
@@ -179,6 +218,71 @@ class EmailSender:
             logger.error(error_msg)
             return False, error_msg
     
+    def queue_email(self, to_email: Union[str, List[str]], subject: str, body: str,
+                   attachments: Optional[List[str]] = None,
+                   cc: Optional[List[str]] = None,
+                   bcc: Optional[List[str]] = None,
+                   is_html: bool = True) -> Optional[str]:
+        """
+        Queue email for delivery by the outbox
+        
+        Attachments are read into the message now, so the files may be
+        removed once this returns.
+        
+        Args:
+            to_email: Recipient email address or list of addresses
+            subject: Email subject
+            body: Email body
+            attachments: Optional list of attachment file paths
+            cc: Optional list of CC recipients
+            bcc: Optional list of BCC recipients
+            is_html: Whether the body is HTML
+            
+        Returns:
+            str: Message id, for get_email_status, or None if email is disabled
+        """
+        if not self.config.get('enabled', False):
+            logger.warning("Email sending is disabled in configuration")
+            return None
+        
+        msg, all_recipients = self._build_message(to_email, subject, body, attachments, cc, bcc, is_html)
+        message_id = self.outbox.enqueue(self.config.get('from_email'), all_recipients, msg.as_string(), subject)
+        logger.info(f"Email {message_id} to {msg['To']} queued with subject: {subject}")
+        return message_id
+    
+    def get_email_status(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the delivery status of a queued email
+        
+        Args:
+            message_id: Id returned by queue_email or queue_template_email
+            
+        Returns:
+            dict: Status (queued, sending, sent or dead), attempts and last error, or None if unknown
+        """
+        return self.outbox.status(message_id)
+    
+    def _render_template(self, template_name: str, context: Dict[str, Any]) -> str:
+        """Render a template with context"""
+        if template_name not in self.templates:
+            raise KeyError(f"Email template not found: {template_name}")
+        return self.templates[template_name].safe_substitute(context)
+    
+    def queue_template_email(self, to_email: str, template_name: str,
+                            context: Dict[str, Any], subject: str,
+                            attachments: Optional[List[str]] = None,
+                            cc: Optional[List[str]] = None,
+                            bcc: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Queue email using template
+        
+        Returns:
+            str: Message id, for get_email_status, or None if email is disabled
+        """
+        body = self._render_template(template_name, context)
+        return self.queue_email(to_email, subject, body, attachments, cc, bcc,
+                                is_html=template_name.endswith('_html'))
+    
     def send_template_email(self, to_email: str, template_name: str, 
                            context: Dict[str, Any], subject: str,
                            attachments: Optional[List[str]] = None, 
@@ -187,6 +291,9 @@ class EmailSender:
         """
         Send email using template
         
+        With the outbox enabled this returns once the email is queued;
+        delivery happens in the background.
+        
         Args:
             to_email: Recipient email address
             template_name: Template name
@@ -203,16 +310,20 @@ class EmailSender:
             logger.error(f"Email template not found: {template_name}")
             return False, f"Email template not found: {template_name}"
         
+        if not self.config.get('enabled', False):
+            logger.warning("Email sending is disabled in configuration")
+            return False, "Email sending is disabled"
+        
         try:
-            # Render template with context
-            template = self.templates[template_name]
-            body = template.safe_substitute(context)
+            if self.config.get('use_outbox', True):
+                self.queue_template_email(to_email, template_name, context, subject, attachments, cc, bcc)
+                return True, None
             
             # Send email
             return self.send_email(
                 to_email=to_email, 
                 subject=subject, 
-                body=body, 
+                body=self._render_template(template_name, context), 
                 attachments=attachments,
                 cc=cc,
                 bcc=bcc,
@@ -265,6 +376,12 @@ def send_template_email(to_email: str, template_name: str,
     return sender.send_template_email(to_email, template_name, context, subject, attachments, cc, bcc)
 
 
+def get_email_status(message_id: str) -> Optional[Dict[str, Any]]:
+    """Get the delivery status of a queued email"""
+    sender = get_email_sender()
+    return sender.get_email_status(message_id)
+
+
 def send_welcome_email(user_email: str, username: str) -> Tuple[bool, Optional[str]]:
     """
     Send welcome email to new user
@@ -5,16 +5,17 @@ This module provides utilities for text preprocessing, normalization, and extrac
 used across various components of the system.
 """
 
-import os
 import re
-import json
 import logging
 import string
 from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 
 # Import settings
-from backend.config.settings import SKILLS_FILE, EDUCATION_PATTERNS, JOB_TITLE_PATTERNS
+from backend.config.settings import SKILLS_FILE
+
+# Import utilities
+from backend.utils.skill_matcher import get_skill_matcher, get_skill_matcher_for
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -89,6 +90,25 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
+# Common skill abbreviations and spellings mapped to their normalized name
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "c/c++": "c++",
+    "reactjs": "react",
+    "react.js": "react",
+    "node.js": "nodejs",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "aws": "amazon web services",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "dl": "deep learning",
+    "oop": "object oriented programming"
+}
+
+
 def normalize_skill(skill: str) -> str:
     """
     Normalize skill name
@@ -116,27 +136,7 @@ def normalize_skill(skill: str) -> str:
             normalized = normalized[:-len(suffix)]
     
     # Handle special cases
-    replacements = {
-        "js": "javascript",
-        "ts": "typescript",
-        "py": "python",
-        "c/c++": "c++",
-        "reactjs": "react",
-        "react.js": "react",
-        "node.js": "nodejs",
-        "vuejs": "vue",
-        "vue.js": "vue",
-        "aws": "amazon web services",
-        "ml": "machine learning",
-        "ai": "artificial intelligence",
-        "dl": "deep learning",
-        "oop": "object oriented programming"
-    }
-    
-    # Apply replacements
-    for old, new in replacements.items():
-        if normalized == old:
-            normalized = new
+    normalized = SKILL_ALIASES.get(normalized, normalized)
     
     return normalized.strip()
 
@@ -155,25 +155,9 @@ def extract_skills_from_text(text: str) -> List[str]:
         # Clean text
         clean = clean_text(text)
         
-        # Load skills list if available
-        skills_list = []
-        try:
-            if os.path.exists(SKILLS_FILE):
-                with open(SKILLS_FILE, 'r') as f:
-                    skills_list = json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading skills file: {str(e)}")
-        
-        # Find skills in text
-        found_skills = []
-        
-        # Match skills from list
-        if skills_list:
-            for skill in skills_list:
-                # Check if skill is in text
-                skill_pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(skill_pattern, clean):
-                    found_skills.append(skill)
+        # Match skills from the shared taxonomy matcher
+        matcher = get_skill_matcher(SKILLS_FILE, aliases=SKILL_ALIASES, normalizer=normalize_skill)
+        found_skills = matcher.find_all(clean) if matcher else []
         
         # Extract additional skills using patterns
         skill_patterns = [
@@ -205,6 +189,30 @@ def extract_skills_from_text(text: str) -> List[str]:
         return []
 
 
+def extract_skills(text: str, skills: Optional[List[str]] = None) -> List[str]:
+    """
+    Extract known skills from text
+    
+    Args:
+        text: Input text
+        skills: Skills to look for (defaults to the skills taxonomy)
+        
+    Returns:
+        list: Matched skills
+    """
+    try:
+        if skills:
+            matcher = get_skill_matcher_for(skills)
+        else:
+            matcher = get_skill_matcher(SKILLS_FILE, aliases=SKILL_ALIASES, normalizer=normalize_skill)
+        
+        return matcher.find_all(clean_text(text)) if matcher else []
+    
+    except Exception as e:
+        logger.error(f"Error extracting skills: {str(e)}")
+        return []
+
+
 def normalize_job_title(title: str) -> str:
     """
     Normalize job title
@@ -0,0 +1,260 @@
+"""
+Skill Matcher Module
+
+This module provides a compiled, process-wide skill matching engine. Skills are
+compiled into an Aho-Corasick automaton over word tokens, so a text is scanned
+once regardless of the taxonomy size and only whole words (or whole multi-word
+phrases) are matched.
+"""
+
+import os
+import json
+import string
+import logging
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterable
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Punctuation is treated as a word separator, except for + and # which are part
+# of technical terms such as "c++" and "c#"
+_TOKEN_TABLE = str.maketrans({
+    p: ' ' for p in string.punctuation.replace('+', '').replace('#', '')
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lower-cased word tokens used for skill matching
+
+    Args:
+        text: Input text
+
+    Returns:
+        list: Word tokens
+    """
+    if not text:
+        return []
+
+    return text.lower().translate(_TOKEN_TABLE).split()
+
+
+def flatten_skills(data: Any) -> List[str]:
+    """
+    Flatten a skills taxonomy into a list of skill names
+
+    Accepts a plain list of skills, a mapping of category to skills, or a
+    taxonomy document with a top-level "skills" mapping.
+
+    Args:
+        data: Skills taxonomy
+
+    Returns:
+        list: Skill names in taxonomy order
+    """
+    if isinstance(data, dict):
+        if isinstance(data.get("skills"), (dict, list)):
+            return flatten_skills(data["skills"])
+
+        skills = []
+        for category_skills in data.values():
+            skills.extend(flatten_skills(category_skills))
+        return skills
+
+    if isinstance(data, (list, tuple)):
+        return [skill for skill in data if isinstance(skill, str) and skill.strip()]
+
+    return []
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton matching whole-word skills in a single pass"""
+
+    def __init__(self, skills: Iterable[str], aliases: Optional[Dict[str, str]] = None,
+                 normalizer: Optional[Callable[[str], str]] = None):
+        """
+        Compile a skill matcher
+
+        Args:
+            skills: Skill names to match; matches are reported with this spelling
+            aliases: Mapping of alias to normalized skill name (e.g. "js" -> "javascript")
+            normalizer: Function mapping a skill name to its normalized form
+        """
+        self.skills: List[str] = []
+
+        # Automaton state: transitions, failure links and emitted skill ids
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        pending_out: Dict[int, set] = {}
+        skills_by_key: Dict[str, List[int]] = {}
+        seen = set()
+
+        for skill in skills:
+            skill = skill.strip()
+            if not skill or skill.lower() in seen:
+                continue
+            seen.add(skill.lower())
+
+            skill_id = len(self.skills)
+            self.skills.append(skill)
+
+            # Match the skill as written and in its normalized form
+            key = normalizer(skill) if normalizer else skill.lower()
+            skills_by_key.setdefault(key, []).append(skill_id)
+
+            for pattern in {skill, key}:
+                self._add_pattern(tokenize(pattern), [skill_id], pending_out)
+
+        # Aliases emit every skill that normalizes to the alias target
+        for alias, target in (aliases or {}).items():
+            skill_ids = skills_by_key.get(target)
+            if skill_ids:
+                self._add_pattern(tokenize(alias), skill_ids, pending_out)
+
+        for state, skill_ids in pending_out.items():
+            self._out[state] = tuple(sorted(skill_ids))
+
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def _add_pattern(self, tokens: List[str], skill_ids: List[int], pending_out: Dict[int, set]):
+        """Insert a token sequence into the trie"""
+        if not tokens:
+            return
+
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][token] = next_state
+            state = next_state
+
+        pending_out.setdefault(state, set()).update(skill_ids)
+
+    def _build_failure_links(self):
+        """Compute failure links breadth-first and merge suffix outputs"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fallback = self._goto[fail].get(token, 0)
+                self._fail[next_state] = fallback if fallback != next_state else 0
+
+                # A state also emits everything its longest proper suffix emits
+                suffix_out = self._out[self._fail[next_state]]
+                if suffix_out:
+                    self._out[next_state] = tuple(sorted(set(self._out[next_state]) | set(suffix_out)))
+
+    def find_all(self, text: str) -> List[str]:
+        """
+        Find all skills mentioned in text
+
+        Args:
+            text: Input text
+
+        Returns:
+            list: Matched skills in taxonomy order
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+
+        found = set()
+        state = 0
+        for token in tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if out[state]:
+                found.update(out[state])
+
+        return [self.skills[skill_id] for skill_id in sorted(found)]
+
+
+# Process-wide matchers keyed by skills file, aliases and normalizer,
+# rebuilt when the file changes
+_FILE_MATCHERS: Dict[Tuple, Tuple[float, SkillMatcher]] = {}
+_FILE_MATCHERS_LOCK = threading.Lock()
+
+
+def get_skill_matcher(skills_file: str, aliases: Optional[Dict[str, str]] = None,
+                      normalizer: Optional[Callable[[str], str]] = None) -> Optional[SkillMatcher]:
+    """
+    Get the shared skill matcher for a skills file
+
+    The matcher is compiled on first use and recompiled only when the file's
+    modification time changes. Callers passing different aliases or
+    normalizers get separate matchers.
+
+    Args:
+        skills_file: Path to a JSON skills list or taxonomy
+        aliases: Mapping of alias to normalized skill name
+        normalizer: Function mapping a skill name to its normalized form
+
+    Returns:
+        SkillMatcher: Compiled matcher, or None if the file is unavailable
+    """
+    try:
+        mtime = os.path.getmtime(skills_file)
+    except (OSError, TypeError):
+        return None
+
+    key = (skills_file, tuple(sorted(aliases.items())) if aliases else (), normalizer)
+    cached = _FILE_MATCHERS.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with _FILE_MATCHERS_LOCK:
+        # Another thread may have rebuilt it while we waited
+        cached = _FILE_MATCHERS.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(skills_file, 'r') as f:
+                skills = flatten_skills(json.load(f))
+        except Exception as e:
+            logger.error(f"Error loading skills file: {str(e)}")
+            return cached[1] if cached else None
+
+        matcher = SkillMatcher(skills, aliases=aliases, normalizer=normalizer)
+        _FILE_MATCHERS[key] = (mtime, matcher)
+        logger.info(f"Compiled skill matcher with {len(matcher)} skills from {skills_file}")
+
+        return matcher
+
+
+@lru_cache(maxsize=32)
+def _compile_skill_list(skills: Tuple[str, ...]) -> SkillMatcher:
+    return SkillMatcher(skills)
+
+
+def get_skill_matcher_for(skills: Iterable[str]) -> SkillMatcher:
+    """
+    Get a cached skill matcher for an in-memory skill list
+
+    Args:
+        skills: Skill names
+
+    Returns:
+        SkillMatcher: Compiled matcher
+    """
+    return _compile_skill_list(tuple(skills))